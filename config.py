@@ -7,6 +7,8 @@ class Settings(BaseSettings):
     SCRAPER_DEFAULT_MIN_DELAY: float = 2.5
     SCRAPER_DEFAULT_MAX_DELAY: float = 6.0
     SCRAPER_DEFAULT_HEADLESS: bool = True
+    API_CACHE_TTL: float = 60.0
+    API_CACHE_MAX_ENTRIES: int = 512
     # Add other environment variables as needed, with type hints and default values.
     # Example: API_KEY: str
 
@@ -13,6 +13,7 @@ if _current_dir not in sys.path:
 from .mongodb_setup import MongoDBSetup
 from .quality_scorer import QualityScorer
 from .data_migration import DataMigration
+from .bulk_writer import BulkWriter
 
 # Clean up sys.path if added
 if _current_dir in sys.path and sys.path[0] == _current_dir :
@@ -20,4 +21,4 @@ if _current_dir in sys.path and sys.path[0] == _current_dir :
 
 
 __version__ = "1.0.0"
-__all__ = ["MongoDBSetup", "QualityScorer", "DataMigration"]
\ No newline at end of file
+__all__ = ["MongoDBSetup", "QualityScorer", "DataMigration", "BulkWriter"]
\ No newline at end of file
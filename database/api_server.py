@@ -2,14 +2,29 @@
 FastAPI server for accessing MongoDB event data with quality filtering
 """
 from config import settings
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 import motor.motor_asyncio # Replaced pymongo
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+import asyncio
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Dict, Any
+from pydantic import BaseModel, Field, TypeAdapter
 import uvicorn
 
+from database.event_queries import listing_filter, upcoming_filter, venue_events_filter
+from database.event_summaries import SUMMARIES_COLLECTION
+from database.method_stats import (
+    METHODS_COLLECTION, WINDOWS_COLLECTION, combine_windows, summarize_method_stats, window_cutoff
+)
+from database.materialized_stats import (
+    OVERALL_ID, QUALITY_STATS_COLLECTION, VENUE_STATS_COLLECTION, is_stale,
+    refresh_materialized_stats_async
+)
+from database.pagination import CURSOR_FIELD, EVENT_SORT, InvalidCursor, after_cursor, next_page
+from database.response_cache import ResponseCache, cache_key, etag_matches, read_data_version
+from database.venue_registry import registry as venue_registry
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Tickets Ibiza Event API",
@@ -24,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "ETag"],  # pagination/cache headers readable by browser apps
 )
 
 # MongoDB connection
@@ -100,6 +116,123 @@ class QualityStats(BaseModel):
     topVenues: List[Dict[str, Any]]
 
 
+class ExtractionMethodStats(BaseModel):
+    method: Optional[str]
+    totalUses: int
+    lastUsed: Optional[datetime]
+    avgQuality: Optional[float]
+    stdDev: Optional[float]
+    minQuality: Optional[float]
+    maxQuality: Optional[float]
+    p50: Optional[float]
+    p90: Optional[float]
+    histogram: List[int] = Field(..., description="Counts per 0.1-wide quality bucket")
+
+
+EVENT_SUMMARIES = TypeAdapter(List[EventSummary])
+
+# Rendered responses for the hot listing endpoints, dropped when a scrape
+# run or migration bumps the data version (see database/response_cache.py)
+response_cache = ResponseCache(
+    max_entries=settings.API_CACHE_MAX_ENTRIES,
+    ttl=settings.API_CACHE_TTL
+)
+CACHED_HEADERS = ("X-Next-Cursor", "Link")
+
+
+async def current_data_version() -> int:
+    """The events data version, re-read at most every version_check_interval seconds"""
+    if response_cache.version_due():
+        response_cache.observe_version(await read_data_version(db))
+    return response_cache.version
+
+
+async def cached_json(request: Request, build: Callable[[Response], Awaitable[Any]],
+                      adapter: Optional[TypeAdapter] = None) -> Response:
+    """
+    Serve ``build``'s result from the response cache
+    
+    ``build`` receives a scratch Response for headers it wants to set (only
+    CACHED_HEADERS are kept). Bodies carry an ETag; a matching If-None-Match
+    gets a 304 without touching the database.
+    """
+    key = cache_key(request.url.path, request.query_params.multi_items())
+    version = await current_data_version()
+    entry = response_cache.get(key)
+    if entry is None:
+        scratch = Response()
+        content = await build(scratch)
+        if adapter is not None:
+            content = adapter.dump_python(adapter.validate_python(content), mode="json", by_alias=True)
+        else:
+            content = jsonable_encoder(content)
+        headers = {name: scratch.headers[name] for name in CACHED_HEADERS if name in scratch.headers}
+        entry = response_cache.put(key, content, headers, version=version)
+    
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+EVENT_SUMMARY_PROJECTION = {
+    "_id": {"$toString": "$_id"},
+    "url": 1,
+    "title": 1,
+    "venue": "$location.venue",
+    "date": "$dateTime.displayText",
+    "qualityScore": "$_quality.overall",
+    "status": "$ticketInfo.status"
+}
+
+
+async def resolve_venue_keys(text: Optional[str]) -> Optional[List[str]]:
+    """
+    Canonical venue keys matching user input, None for blank input
+    
+    Prefix input is resolved against the keys in venue_stats, so the events
+    query is an exact $in that the venue index can merge in sort order
+    instead of a regex range that needs an in-memory sort.
+    """
+    lookup = venue_registry.lookup(text)
+    if lookup is None:
+        return None
+    if isinstance(lookup, str):
+        return [lookup]
+    docs = await db[VENUE_STATS_COLLECTION].find({"_id": lookup}, {"_id": 1}).to_list(length=None)
+    known = [key for key in lookup["$in"] if isinstance(key, str)]
+    return sorted({*known, *(doc["_id"] for doc in docs)})
+
+
+async def find_event_page(query: Dict[str, Any], cursor: Optional[str], limit: int,
+                          request: Request, response: Response, skip: int = 0) -> List[Dict[str, Any]]:
+    """
+    One page of event summaries in (dateTime.start, _id) order, read from
+    the slim event_summaries collection rather than full event documents
+    
+    The token for the following page is returned in the X-Next-Cursor header
+    (plus a Link rel="next" URL); it is absent on the last page.
+    """
+    try:
+        query = after_cursor(query, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    find = db[SUMMARIES_COLLECTION].find(
+        query, {**EVENT_SUMMARY_PROJECTION, CURSOR_FIELD: "$dateTime.start"}
+    ).sort(EVENT_SORT)
+    if skip and not cursor:
+        find = find.skip(skip)
+    docs = await find.limit(limit + 1).to_list(length=limit + 1)
+    
+    events, next_cursor = next_page(docs, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.remove_query_params(["cursor", "skip"]).include_query_params(cursor=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return events
+
+
 @app.get("/", tags=["Health"])
 async def root():
     """Health check endpoint"""
@@ -112,40 +245,27 @@ async def root():
 
 @app.get("/api/events", response_model=List[EventSummary], tags=["Events"])
 async def get_events(
+    request: Request,
     min_quality: float = Query(0.7, ge=0, le=1, description="Minimum quality score"),
-    venue: Optional[str] = Query(None, description="Filter by venue name"),
+    venue: Optional[str] = Query(None, description="Filter by venue name (any spelling, or its beginning)"),
     future_only: bool = Query(True, description="Only show future events"),
     limit: int = Query(50, ge=1, le=200, description="Number of results"),
-    skip: int = Query(0, ge=0, description="Skip results for pagination")
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset pagination; use cursor instead")
 ):
     """
     Get events filtered by quality and other criteria
-    """
-    # Build query
-    query = {"_quality.overall": {"$gte": min_quality}}
-    
-    if venue:
-        query["location.venue"] = {"$regex": venue, "$options": "i"}
-    
-    if future_only:
-        query["dateTime.start"] = {"$gte": datetime.utcnow()}
     
-    # Execute query
-    cursor = db.events.find(
-        query,
-        {
-            "_id": {"$toString": "$_id"},
-            "url": 1,
-            "title": 1,
-            "venue": "$location.venue",
-            "date": "$dateTime.displayText",
-            "qualityScore": "$_quality.overall",
-            "status": "$ticketInfo.status"
-        }
-    ).sort("dateTime.start", 1).skip(skip).limit(limit)
-    events = await cursor.to_list(length=limit)
+    Pages are keyset-paginated: pass the previous response's X-Next-Cursor
+    header as ``cursor`` to continue. Responses are cached until the next
+    scrape run and carry an ETag for conditional requests.
+    """
+    async def build(response: Response):
+        venue_keys = await resolve_venue_keys(venue)
+        query = listing_filter(min_quality, future_only, venue_keys)
+        return await find_event_page(query, cursor, limit, request, response, skip=skip)
     
-    return events
+    return await cached_json(request, build, EVENT_SUMMARIES)
 
 
 @app.get("/api/events/{event_id}", response_model=Event, tags=["Events"])
@@ -201,146 +321,116 @@ async def search_events(
     return events
 
 
+_stats_refresh_lock = asyncio.Lock()
+
+
+async def fresh_quality_overview() -> Optional[Dict[str, Any]]:
+    """
+    The materialized quality_stats document, refreshing venue_stats and
+    quality_stats first if they are missing or older than STATS_MAX_AGE
+    """
+    overall = await db[QUALITY_STATS_COLLECTION].find_one({"_id": OVERALL_ID})
+    if is_stale(overall):
+        async with _stats_refresh_lock:
+            # Another request may have refreshed while we waited
+            overall = await db[QUALITY_STATS_COLLECTION].find_one({"_id": OVERALL_ID})
+            if is_stale(overall):
+                await refresh_materialized_stats_async(db)
+                overall = await db[QUALITY_STATS_COLLECTION].find_one({"_id": OVERALL_ID})
+    return overall
+
+
 @app.get("/api/venues", tags=["Venues"])
-async def get_venues():
+async def get_venues(request: Request):
     """
-    Get list of all venues with event counts
+    Get list of all venues with event counts (from the venue_stats view)
     """
-    pipeline = [
-        {"$group": {
-            "_id": "$location.venue",
-            "eventCount": {"$sum": 1},
-            "avgQuality": {"$avg": "$_quality.overall"},
-            "upcomingEvents": {
-                "$sum": {
-                    "$cond": [
-                        {"$gte": ["$dateTime.start", datetime.utcnow()]},
-                        1, 0
-                    ]
-                }
-            }
-        }},
-        {"$match": {"_id": {"$ne": None}}},
-        {"$sort": {"eventCount": -1}},
-        {"$project": {
-            "venue": "$_id",
-            "eventCount": 1,
-            "avgQuality": {"$round": ["$avgQuality", 3]},
-            "upcomingEvents": 1,
-            "_id": 0
-        }}
-    ]
+    async def build(response: Response):
+        await fresh_quality_overview()
+        cursor = db[VENUE_STATS_COLLECTION].find(
+            {},
+            {"_id": 0, "venue": 1, "venueKey": 1, "eventCount": 1, "avgQuality": 1, "upcomingEvents": 1}
+        ).sort("eventCount", -1)
+        return await cursor.to_list(length=None)
     
-    cursor = db.events.aggregate(pipeline)
-    venues = await cursor.to_list(length=None) # Fetch all matching documents
-    return venues
+    return await cached_json(request, build)
 
 
 @app.get("/api/venues/{venue_name}/events", response_model=List[EventSummary], tags=["Venues"])
 async def get_venue_events(
     venue_name: str,
+    request: Request,
+    response: Response,
     future_only: bool = Query(True),
-    limit: int = Query(50, ge=1, le=200)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ):
     """
-    Get all events for a specific venue
-    """
-    query = {"location.venue": {"$regex": venue_name, "$options": "i"}}
-    
-    if future_only:
-        query["dateTime.start"] = {"$gte": datetime.utcnow()}
+    Get all events for a specific venue, keyset-paginated like /api/events
     
-    cursor = db.events.find(
-        query,
-        {
-            "_id": {"$toString": "$_id"},
-            "url": 1,
-            "title": 1,
-            "venue": "$location.venue",
-            "date": "$dateTime.displayText",
-            "qualityScore": "$_quality.overall",
-            "status": "$ticketInfo.status"
-        }
-    ).sort("dateTime.start", 1).limit(limit)
-    events = await cursor.to_list(length=limit)
+    ``venue_name`` may be any spelling of a known venue ("Hi Ibiza",
+    "hï ibiza", "hi-ibiza") or the start of a venue key.
+    """
+    venue_keys = await resolve_venue_keys(venue_name)
+    if venue_keys is None:
+        raise HTTPException(status_code=404, detail="Venue not found")
+    if not venue_keys:
+        return []
     
-    return events
+    query = venue_events_filter(venue_keys, future_only)
+    return await find_event_page(query, cursor, limit, request, response)
 
 
 @app.get("/api/stats/quality", response_model=QualityStats, tags=["Statistics"])
 async def get_quality_stats():
     """
-    Get overall quality statistics
+    Get overall quality statistics (from the quality_stats and venue_stats views)
     """
-    # Overall stats
-    pipeline = [
-        {
-            "$group": {
-                "_id": None,
-                "totalEvents": {"$sum": 1},
-                "avgQuality": {"$avg": "$_quality.overall"},
-                "excellent": {"$sum": {"$cond": [{"$gte": ["$_quality.overall", 0.9]}, 1, 0]}},
-                "good": {"$sum": {"$cond": [
-                    {"$and": [
-                        {"$gte": ["$_quality.overall", 0.8]},
-                        {"$lt": ["$_quality.overall", 0.9]}
-                    ]}, 1, 0
-                ]}},
-                "fair": {"$sum": {"$cond": [
-                    {"$and": [
-                        {"$gte": ["$_quality.overall", 0.7]},
-                        {"$lt": ["$_quality.overall", 0.8]}
-                    ]}, 1, 0
-                ]}},
-                "poor": {"$sum": {"$cond": [{"$lt": ["$_quality.overall", 0.7]}, 1, 0]}}
-            }
-        }
-    ]
-    
-    stats_cursor = db.events.aggregate(pipeline)
-    stats_result = await stats_cursor.to_list(length=1) # Expecting a single document
-    
-    if not stats_result:
+    stats = await fresh_quality_overview()
+    if not stats:
         raise HTTPException(status_code=404, detail="No statistics available")
     
-    stats = stats_result[0]
-    
     # Top venues by quality
-    venue_pipeline = [
-        {"$group": {
-            "_id": "$location.venue",
-            "avgQuality": {"$avg": "$_quality.overall"},
-            "eventCount": {"$sum": 1}
-        }},
-        {"$match": {"_id": {"$ne": None}}},
-        {"$sort": {"avgQuality": -1}},
-        {"$limit": 10},
-        {"$project": {
-            "venue": "$_id",
-            "avgQuality": {"$round": ["$avgQuality", 3]},
-            "eventCount": 1,
-            "_id": 0
-        }}
-    ]
-    
-    top_venues_cursor = db.events.aggregate(venue_pipeline)
-    top_venues = await top_venues_cursor.to_list(length=10) # Corresponds to $limit: 10
+    top_venues_cursor = db[VENUE_STATS_COLLECTION].find(
+        {},
+        {"_id": 0, "venue": 1, "venueKey": 1, "avgQuality": 1, "eventCount": 1}
+    ).sort("avgQuality", -1).limit(10)
+    top_venues = await top_venues_cursor.to_list(length=10)
     
     return {
         "totalEvents": stats["totalEvents"],
-        "averageQuality": round(stats["avgQuality"], 3),
-        "distribution": {
-            "excellent": stats["excellent"],
-            "good": stats["good"],
-            "fair": stats["fair"],
-            "poor": stats["poor"]
-        },
+        "averageQuality": stats["averageQuality"],
+        "distribution": stats["distribution"],
         "topVenues": top_venues
     }
 
 
+@app.get("/api/stats/extraction-methods", response_model=List[ExtractionMethodStats], tags=["Statistics"])
+async def get_extraction_method_stats(
+    window_days: Optional[int] = Query(None, ge=1, le=90, description="Only the last N days (daily windows)")
+):
+    """
+    Get extraction method effectiveness from the rolling aggregates
+    
+    Reads one small document per method (or per method and day), never the events.
+    """
+    if window_days is None:
+        cursor = db[METHODS_COLLECTION].find({}, {"qualityScores": 0})
+        docs = await cursor.to_list(length=None)
+    else:
+        cursor = db[WINDOWS_COLLECTION].find({"windowStart": {"$gte": window_cutoff(window_days)}})
+        by_method: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in await cursor.to_list(length=None):
+            by_method.setdefault(doc.get("method"), []).append(doc)
+        docs = [combine_windows(windows) for windows in by_method.values()]
+    
+    summaries = [summarize_method_stats(doc) for doc in docs]
+    return sorted(summaries, key=lambda s: s["totalUses"], reverse=True)
+
+
 @app.get("/api/upcoming", response_model=List[EventSummary], tags=["Events"])
 async def get_upcoming_events(
+    request: Request,
     days: int = Query(7, ge=1, le=30, description="Number of days ahead"),
     min_quality: float = Query(0.75, ge=0, le=1),
     limit: int = Query(20, ge=1, le=100)
@@ -348,25 +438,15 @@ async def get_upcoming_events(
     """
     Get upcoming events within specified days
     """
-    end_date = datetime.utcnow() + timedelta(days=days)
-    
-    cursor = db.events.find(
-        {
-            "dateTime.start": {
-                "$gte": datetime.utcnow(),
-                "$lte": end_date
-            },
-            "_quality.overall": {"$gte": min_quality}
-        },
-        {
-            "_id": {"$toString": "$_id"},
-            "url": 1,
-            "title": 1,
-            "venue": "$location.venue",
-            "date": "$dateTime.displayText",
-            "qualityScore": "$_quality.overall",
-            "status": "$ticketInfo.status"
-        }
+    return await cached_json(
+        request, lambda response: find_upcoming_events(days, min_quality, limit), EVENT_SUMMARIES
+    )
+
+
+async def find_upcoming_events(days: int, min_quality: float, limit: int) -> List[Dict[str, Any]]:
+    cursor = db[SUMMARIES_COLLECTION].find(
+        upcoming_filter(days, min_quality),
+        EVENT_SUMMARY_PROJECTION
     ).sort("dateTime.start", 1).limit(limit)
     events = await cursor.to_list(length=limit)
     
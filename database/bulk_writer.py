@@ -0,0 +1,210 @@
+"""
+Buffered, batched MongoDB writer
+
+Scraping one page used to cost three synchronous round-trips (an events
+upsert, an extraction_methods update and a quality_scores insert).
+BulkWriter queues write models (UpdateOne, InsertOne, ...) per collection and
+sends them as unordered ``bulk_write`` batches from a background thread:
+
+* a batch goes out once a collection has ``batch_size`` pending operations,
+  or once its oldest operation has waited ``flush_interval`` seconds;
+* at most ``max_pending_batches`` batches wait for the writer thread; past
+  that, ``add`` blocks until the database catches up (backpressure);
+* operations that fail with a transient error (network, primary stepdown,
+  a duplicate-key race between concurrent upserts) are retried with backoff,
+  the rest are logged and counted;
+* ``flush()`` waits until everything queued so far is written, ``close()``
+  flushes and stops the thread.
+
+Because batches are unordered, two operations on the same document that land
+in one batch may be applied in either order.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError, ConnectionFailure
+
+logger = logging.getLogger(__name__)
+
+# Server error codes worth retrying: duplicate key (two upserts racing on a
+# unique index), interrupted/not-primary/shutdown states and network errors.
+RETRYABLE_CODES = {
+    6, 7, 89, 91, 189, 262, 9001, 10107, 11000, 11600, 11602, 13435, 13436,
+}
+
+_STOP = object()
+
+
+@dataclass
+class BulkWriteStats:
+    """Outcome counters for one collection"""
+    inserted: int = 0
+    upserted: int = 0
+    matched: int = 0
+    modified: int = 0
+    deleted: int = 0
+    errors: int = 0
+    batches: int = 0
+    retries: int = 0
+
+    @property
+    def written(self) -> int:
+        """Documents inserted, upserted or modified"""
+        return self.inserted + self.upserted + self.modified
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class BulkWriter:
+    """Groups write operations into unordered bulk_write batches per collection"""
+
+    def __init__(self, db, batch_size: int = 500, flush_interval: float = 1.0,
+                 max_pending_batches: int = 8, max_retries: int = 3,
+                 retry_backoff: float = 0.5):
+        """
+        Args:
+            db: pymongo Database the collections belong to
+            batch_size: Operations per bulk_write call
+            flush_interval: Longest an operation waits in the buffer (seconds)
+            max_pending_batches: Batches queued for the writer before add() blocks
+            max_retries: Attempts for operations failing with a transient error
+            retry_backoff: Base delay between retries, doubled each attempt
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.stats: Dict[str, BulkWriteStats] = defaultdict(BulkWriteStats)
+
+        self._buffers: Dict[str, List[Any]] = defaultdict(list)
+        self._first_added: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # held while the writer thread writes
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending_batches)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="mongo-bulk-writer", daemon=True)
+        self._thread.start()
+
+    # --- Producer side ---
+
+    def add(self, collection: str, operation: Any) -> None:
+        """Queue one write model (UpdateOne, InsertOne, ...) for ``collection``"""
+        if self._closed:
+            raise RuntimeError("BulkWriter is closed")
+        with self._lock:
+            buffer = self._buffers[collection]
+            if not buffer:
+                self._first_added[collection] = time.monotonic()
+            buffer.append(operation)
+            batch = self._take(collection) if len(buffer) >= self.batch_size else None
+        if batch:
+            self._queue.put(batch)  # blocks while the writer is behind
+
+    def flush(self) -> None:
+        """Send every buffered operation and wait until all are written"""
+        for batch in self._take_all():
+            self._queue.put(batch)
+        self._queue.join()
+        with self._write_lock:  # a timed flush may still be writing
+            pass
+
+    def close(self) -> None:
+        """Flush outstanding operations and stop the writer thread"""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self) -> "BulkWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _take(self, collection: str) -> Optional[Tuple[str, List[Any]]]:
+        """Detach a collection's buffer; caller holds the lock"""
+        operations = self._buffers.pop(collection, [])
+        self._first_added.pop(collection, None)
+        return (collection, operations) if operations else None
+
+    def _take_all(self, older_than: Optional[float] = None) -> List[Tuple[str, List[Any]]]:
+        with self._lock:
+            names = [
+                name for name, since in self._first_added.items()
+                if older_than is None or since <= older_than
+            ]
+            return [batch for batch in (self._take(name) for name in names) if batch]
+
+    # --- Writer thread ---
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Nothing reached batch_size lately: push out what has waited too long
+                with self._write_lock:
+                    for batch in self._take_all(older_than=time.monotonic() - self.flush_interval):
+                        self._write(*batch)
+                continue
+            try:
+                if item is _STOP:
+                    return
+                with self._write_lock:
+                    self._write(*item)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, collection: str, operations: List[Any]) -> None:
+        stats = self.stats[collection]
+        attempt = 0
+        while operations:
+            stats.batches += 1
+            retry: List[Any] = []
+            try:
+                result = self.db[collection].bulk_write(operations, ordered=False)
+                self._count(stats, result.bulk_api_result)
+                return
+            except BulkWriteError as e:
+                self._count(stats, e.details)
+                for error in e.details.get("writeErrors", []):
+                    if error.get("code") in RETRYABLE_CODES and attempt < self.max_retries:
+                        retry.append(operations[error["index"]])
+                    else:
+                        stats.errors += 1
+                        logger.error(f"Bulk write to {collection} failed: {error.get('errmsg')}")
+            except ConnectionFailure as e:
+                if attempt >= self.max_retries:
+                    stats.errors += len(operations)
+                    logger.error(f"Bulk write to {collection} gave up after {attempt} retries: {e}")
+                    return
+                logger.warning(f"Bulk write to {collection} interrupted ({e}); retrying")
+                retry = operations
+            except Exception as e:
+                stats.errors += len(operations)
+                logger.error(f"Bulk write to {collection} failed: {e}")
+                return
+
+            if retry:
+                attempt += 1
+                stats.retries += len(retry)
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            operations = retry
+
+    @staticmethod
+    def _count(stats: BulkWriteStats, details: Dict[str, Any]) -> None:
+        stats.inserted += details.get("nInserted", 0)
+        stats.upserted += details.get("nUpserted", 0)
+        stats.matched += details.get("nMatched", 0)
+        stats.modified += details.get("nModified", 0)
+        stats.deleted += details.get("nRemoved", 0)
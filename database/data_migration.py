@@ -3,18 +3,31 @@ Data Migration Script for Tickets Ibiza Event Data
 Consolidates data from JSON files into MongoDB with quality scoring
 """
 
+import itertools
 import json
 import os
+import sys
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 from pymongo import MongoClient, UpdateOne
-from pymongo.errors import BulkWriteError
 import logging
 import re
 from pathlib import Path
 
+from bulk_writer import BulkWriter
+from event_summaries import sync_event_summaries
+from materialized_stats import refresh_materialized_stats
 from mongodb_setup import MongoDBSetup
 from quality_scorer import QualityScorer
+from response_cache import bump_data_version
+from venue_registry import annotate_venue_key
+
+# The NDJSON reader and snapshot store live with the scraping components
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_components.ndjson_sink import iter_ndjson
+from scraping_components.snapshot_store import SnapshotStore
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl", ".gz", ".zst")
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -46,6 +59,17 @@ class DataMigration:
             logger.error(f"Error loading {filepath}: {e}")
             return None
     
+    def iter_scraped_events(self, filepath: str) -> Iterator[Dict]:
+        """Yield raw scraped events from an NDJSON output (lazily) or a legacy JSON dump"""
+        if Path(filepath).suffix in NDJSON_SUFFIXES:
+            yield from iter_ndjson(filepath)
+            return
+        scraped_data = self.load_json_file(filepath)
+        if isinstance(scraped_data, list):
+            yield from scraped_data
+        elif isinstance(scraped_data, dict) and "events" in scraped_data:
+            yield from scraped_data["events"]
+    
     def parse_event_from_scraped_data(self, event_data: Dict) -> Dict:
         """Parse event from ticketsibiza_scraped_data.json format"""
         parsed_event = {
@@ -96,6 +120,7 @@ class DataMigration:
             if "country" not in location_data:
                 location_data["country"] = "Spain"
         parsed_event["location"] = location_data
+        annotate_venue_key(parsed_event)
         
         # Parse date/time
         datetime_data = {}
@@ -163,8 +188,11 @@ class DataMigration:
     
     def deduplicate_events(self, events: List[Dict]) -> List[Dict]:
         """Remove duplicate events based on URL and date"""
+        return list(self.iter_unique_events(events))
+    
+    def iter_unique_events(self, events: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield events whose URL and date have not been seen yet"""
         seen = set()
-        unique_events = []
         
         for event in events:
             # Create unique key from URL and date
@@ -174,82 +202,88 @@ class DataMigration:
             
             if key not in seen:
                 seen.add(key)
-                unique_events.append(event)
+                yield event
             else:
                 self.stats["duplicates_found"] += 1
                 logger.info(f"Duplicate found: {event.get('title', 'Unknown')}")
-        
-        return unique_events
     
-    def migrate_events(self, events: List[Dict], batch_size: int = 100):
-        """Migrate events to MongoDB in batches"""
-        logger.info(f"Starting migration of {len(events)} events")
+    def migrate_events(self, events: Iterable[Dict], batch_size: int = 100):
+        """Migrate events to MongoDB in batches; ``events`` may be a lazy iterator"""
+        logger.info("Starting migration")
         
-        for i in range(0, len(events), batch_size):
-            batch = events[i:i + batch_size]
-            operations = []
-            
-            for event in batch:
-                self.stats["total_processed"] += 1
-                
-                # Calculate quality scores
-                quality_data = self.scorer.calculate_event_quality(event)
-                event.update(quality_data)
-                
-                # Track quality scores
-                self.stats["quality_scores"].append(quality_data["_quality"]["overall"])
+        # Upserts are grouped into unordered bulk_write batches by the same
+        # writer the scraper uses; close() flushes the final partial batch
+        events = iter(events)
+        with BulkWriter(self.db, batch_size=batch_size) as writer:
+            while True:
+                batch = list(itertools.islice(events, batch_size))
+                if not batch:
+                    break
+                self.stats["total_processed"] += len(batch)
                 
-                # Create upsert operation
-                operations.append(
-                    UpdateOne(
+                # Calculate quality scores for the whole batch at once
+                for event, quality_data in zip(batch, self.scorer.calculate_batch_quality(batch)):
+                    event.update(quality_data)
+                    
+                    # Track quality scores
+                    self.stats["quality_scores"].append(quality_data["_quality"]["overall"])
+                    
+                    # Queue upsert operation
+                    writer.add("events", UpdateOne(
                         {"url": event["url"]},
                         {"$set": event},
                         upsert=True
-                    )
-                )
-            
-            # Execute batch operation
-            try:
-                result = self.db.events.bulk_write(operations)
-                self.stats["successfully_migrated"] += result.modified_count + result.upserted_count
-                logger.info(f"Batch {i//batch_size + 1}: Migrated {result.modified_count + result.upserted_count} events")
-            except BulkWriteError as e:
-                logger.error(f"Batch write error: {e}")
-                self.stats["errors"] += len(batch)
+                    ))
+        
+        result = writer.stats["events"]
+        self.stats["successfully_migrated"] += result.modified + result.upserted
+        self.stats["errors"] += result.errors
+        logger.info(f"Migrated {result.modified + result.upserted} events in {result.batches} batches")
     
     def migrate_from_json_files(self, json_file_path: str, parsed_md_path: Optional[str] = None):
         """Main migration function"""
         logger.info("Starting data migration process")
         
-        # Load main JSON file
-        scraped_data = self.load_json_file(json_file_path)
-        if not scraped_data:
-            logger.error("Failed to load scraped data JSON file")
+        # Events are read, parsed, deduplicated and written batch by batch,
+        # so memory does not grow with the size of the scrape output
+        if not os.path.exists(json_file_path):
+            logger.error("Failed to load scraped data file")
             return
+        events = (
+            self.parse_event_from_scraped_data(event_data)
+            for event_data in self.iter_scraped_events(json_file_path)
+        )
+        self.migrate_events(self.iter_unique_events(events))
         
-        # Parse events
-        events = []
-        if isinstance(scraped_data, list):
-            for event_data in scraped_data:
-                parsed_event = self.parse_event_from_scraped_data(event_data)
-                events.append(parsed_event)
-        elif isinstance(scraped_data, dict) and "events" in scraped_data:
-            for event_data in scraped_data["events"]:
-                parsed_event = self.parse_event_from_scraped_data(event_data)
-                events.append(parsed_event)
-        
-        logger.info(f"Parsed {len(events)} events from JSON file")
-        
-        # Deduplicate
-        unique_events = self.deduplicate_events(events)
-        logger.info(f"Found {len(unique_events)} unique events after deduplication")
-        
-        # Migrate to MongoDB
-        self.migrate_events(unique_events)
+        # Venue and quality views read by the API
+        sync_event_summaries(self.db)
+        refresh_materialized_stats(self.db)
+        bump_data_version(self.db)
         
         # Print summary
         self.print_migration_summary()
     
+    def move_html_to_snapshots(self, store: Optional[SnapshotStore] = None,
+                               batch_size: int = 500) -> int:
+        """
+        Move markup left in event documents by older scraper versions into the
+        snapshot store, replacing it with an htmlSnapshot digest
+        
+        Returns the number of events rewritten.
+        """
+        store = store or SnapshotStore()
+        moved = 0
+        with BulkWriter(self.db, batch_size=batch_size) as writer:
+            for event in self.db.events.find({"html": {"$type": "string"}}, {"url": 1, "html": 1}):
+                digest = store.put(event["html"], url=event.get("url"))
+                writer.add("events", UpdateOne(
+                    {"_id": event["_id"]},
+                    {"$set": {"htmlSnapshot": digest}, "$unset": {"html": ""}}
+                ))
+                moved += 1
+        logger.info(f"Moved HTML of {moved} events to the snapshot store. {store.report()}")
+        return moved
+    
     def print_migration_summary(self):
         """Print migration statistics"""
         print("\n" + "="*50)
@@ -324,7 +358,9 @@ class DataMigration:
 def main():
     """Main migration function"""
     # File paths - adjust these to your actual file locations
-    json_file_path = "../ticketsibiza_scraped_data.json"
+    json_file_path = "../ticketsibiza_scraped_data.ndjson"
+    if not os.path.exists(json_file_path):
+        json_file_path = "../ticketsibiza_scraped_data.json"  # output of older scraper runs
     
     # Check if files exist
     if not os.path.exists(json_file_path):
@@ -338,6 +374,7 @@ def main():
     try:
         # Run migration
         migration.migrate_from_json_files(json_file_path)
+        migration.move_html_to_snapshots()
         
         # Generate quality report
         print("\nGenerating quality report...")
@@ -0,0 +1,213 @@
+"""
+Query shapes and indexes for the events collection
+
+The API's listings combine a quality floor, a start-date range, an optional
+venue and a (dateTime.start, _id) sort. The filter builders here are the
+ones api_server uses, and EVENT_INDEXES is designed from them following the
+equality / sort / range rule:
+
+* ``listing_start_id_quality``: (dateTime.start, _id, _quality.overall).
+  Walks in sort order and checks the quality floor on index keys, so
+  /api/events, /api/upcoming and the query_examples exports never sort in
+  memory. Supersedes the (dateTime.start, _id) pagination index.
+* ``listing_quality_floor``: (dateTime.start, _id), partial on
+  ``_quality.overall >= QUALITY_FLOOR``. The default listings (0.7 and 0.75)
+  skip low-quality events without examining their keys.
+* ``venue_start_id_quality``: (location.venueKey, dateTime.start, _id,
+  _quality.overall). Venue filters are equality/``$in`` on resolved keys,
+  which Mongo answers with one index scan per key merged in sort order.
+  Supersedes the single-field venueKey index.
+
+The API listings read ``event_summaries`` (see event_summaries.py), which
+keeps the events' field paths and gets the three listing indexes
+(SUMMARY_INDEXES); events keep them for query_examples and other readers.
+
+``check_query_plans`` runs ``explain()`` for every shape in
+``query_shapes()`` and reports any plan that falls back to COLLSCAN or an
+in-memory SORT; tests/unit/test_event_queries.py runs it against a local
+mongod, and ``python database/event_queries.py [uri]`` against any server.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+QUALITY_FLOOR = 0.7
+LISTING_SORT = [("dateTime.start", ASCENDING), ("_id", ASCENDING)]
+
+EVENT_INDEXES = [
+    IndexModel([("url", ASCENDING)], unique=True),
+    IndexModel(
+        [("dateTime.start", ASCENDING), ("_id", ASCENDING), ("_quality.overall", ASCENDING)],
+        name="listing_start_id_quality"
+    ),
+    IndexModel(
+        [("dateTime.start", ASCENDING), ("_id", ASCENDING)],
+        name="listing_quality_floor",
+        partialFilterExpression={"_quality.overall": {"$gte": QUALITY_FLOOR}}
+    ),
+    IndexModel(
+        [("location.venueKey", ASCENDING), ("dateTime.start", ASCENDING),
+         ("_id", ASCENDING), ("_quality.overall", ASCENDING)],
+        name="venue_start_id_quality"
+    ),
+    IndexModel([("_quality.overall", DESCENDING)]),
+    IndexModel([("scrapedAt", DESCENDING)]),
+    IndexModel([("title", "text"), ("fullDescription", "text")])
+]
+
+LISTING_INDEX_NAMES = ("listing_start_id_quality", "listing_quality_floor", "venue_start_id_quality")
+SUMMARY_INDEXES = [index for index in EVENT_INDEXES if index.document.get("name") in LISTING_INDEX_NAMES]
+
+# Default-named indexes from earlier releases, covered by the compound ones above
+SUPERSEDED_INDEXES = ["dateTime.start_1", "dateTime.start_1__id_1", "location.venue_1", "location.venueKey_1"]
+
+
+def venue_filter(keys: Sequence[str]) -> Any:
+    """Filter value for location.venueKey given resolved canonical keys"""
+    return keys[0] if len(keys) == 1 else {"$in": list(keys)}
+
+
+def listing_filter(min_quality: float, future_only: bool = True,
+                   venue_keys: Optional[Sequence[str]] = None,
+                   now: Optional[datetime] = None) -> Dict[str, Any]:
+    """/api/events: quality floor, optional venue keys and upcoming-only"""
+    query: Dict[str, Any] = {"_quality.overall": {"$gte": min_quality}}
+    if venue_keys is not None:
+        query["location.venueKey"] = venue_filter(venue_keys)
+    if future_only:
+        query["dateTime.start"] = {"$gte": now or datetime.utcnow()}
+    return query
+
+
+def venue_events_filter(venue_keys: Sequence[str], future_only: bool = True,
+                        now: Optional[datetime] = None) -> Dict[str, Any]:
+    """/api/venues/{venue}/events"""
+    query: Dict[str, Any] = {"location.venueKey": venue_filter(venue_keys)}
+    if future_only:
+        query["dateTime.start"] = {"$gte": now or datetime.utcnow()}
+    return query
+
+
+def upcoming_filter(days: int, min_quality: float, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """/api/upcoming: events starting within ``days`` above a quality floor"""
+    now = now or datetime.utcnow()
+    return {
+        "dateTime.start": {"$gte": now, "$lte": now + timedelta(days=days)},
+        "_quality.overall": {"$gte": min_quality}
+    }
+
+
+def create_event_indexes(collection, indexes: Sequence[IndexModel] = EVENT_INDEXES) -> List[str]:
+    """Create ``indexes`` and drop the single-field indexes they replace"""
+    existing = set(collection.index_information())
+    for name in SUPERSEDED_INDEXES:
+        if name in existing:
+            collection.drop_index(name)
+    return collection.create_indexes(list(indexes))
+
+
+@dataclass
+class QueryShape:
+    """One representative events query, as an endpoint issues it"""
+    name: str
+    filter: Dict[str, Any]
+    collection: str = "event_summaries"
+    sort: List[Tuple[str, Any]] = field(default_factory=lambda: list(LISTING_SORT))
+    limit: int = 51
+    # $text results are ordered by relevance, which no index provides
+    allow_sort: bool = False
+
+
+def query_shapes(now: Optional[datetime] = None) -> List[QueryShape]:
+    """The queries issued by api_server (on summaries) and query_examples (on events)"""
+    try:
+        from database.pagination import after_cursor, encode_cursor
+    except ImportError:  # run as a script from database/
+        from pagination import after_cursor, encode_cursor
+
+    now = now or datetime.utcnow()
+    cursor = encode_cursor(now + timedelta(days=3), "65f0c0ffee0000000000abcd")
+    return [
+        QueryShape("events default", listing_filter(0.7, now=now)),
+        QueryShape("events low floor", listing_filter(0.3, now=now)),
+        QueryShape("events all dates", listing_filter(0.7, future_only=False, now=now)),
+        QueryShape("events next page", after_cursor(listing_filter(0.7, now=now), cursor)),
+        QueryShape("events by venue", listing_filter(0.7, venue_keys=["pacha"], now=now)),
+        QueryShape("events by venue prefix", listing_filter(0.7, venue_keys=["hi-ibiza", "hive"], now=now)),
+        QueryShape("venue events", venue_events_filter(["amnesia"], now=now)),
+        QueryShape("venue events next page", after_cursor(venue_events_filter(["amnesia"], now=now), cursor)),
+        QueryShape("upcoming", upcoming_filter(7, 0.75, now=now), sort=[("dateTime.start", ASCENDING)], limit=20),
+        QueryShape("examples high quality", {"_quality.overall": {"$gte": 0.8}}, "events",
+                   sort=[("dateTime.start", ASCENDING)], limit=10),
+        QueryShape("examples export", {"_quality.overall": {"$gte": 0.8}, "dateTime.start": {"$gte": now}},
+                   "events", sort=[("dateTime.start", ASCENDING)], limit=100),
+        QueryShape("examples by venue", {"location.venueKey": "pacha"}, "events",
+                   sort=[("dateTime.start", ASCENDING)], limit=20),
+        QueryShape("search", {"$text": {"$search": "techno"}, "_quality.overall": {"$gte": 0.6}}, "events",
+                   sort=[("score", {"$meta": "textScore"})], limit=20, allow_sort=True),
+    ]
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    if "queryPlan" in plan:  # slot-based engine (MongoDB 7+)
+        plan = plan["queryPlan"]
+    yield plan
+    children = list(plan.get("inputStages", []))
+    if "inputStage" in plan:
+        children.append(plan["inputStage"])
+    for child in children:
+        yield from _plan_nodes(child)
+
+
+def plan_stages(explain: Dict[str, Any]) -> List[str]:
+    """Stage names of the winning plan, outermost first"""
+    return [node.get("stage") for node in _plan_nodes(explain["queryPlanner"]["winningPlan"])]
+
+
+def plan_problems(explain: Dict[str, Any], allow_sort: bool = False) -> List[str]:
+    """COLLSCAN / in-memory SORT stages in an explain() result"""
+    problems = []
+    for node in _plan_nodes(explain["queryPlanner"]["winningPlan"]):
+        stage = node.get("stage")
+        if stage == "COLLSCAN":
+            problems.append("COLLSCAN")
+        elif stage in ("SORT", "SORT_KEY_GENERATOR") and not allow_sort:
+            problems.append(f"in-memory {stage}")
+    return problems
+
+
+def check_query_plans(db, shapes: Optional[List[QueryShape]] = None) -> Dict[str, List[str]]:
+    """Explain every shape; returns {shape name: problems} for the failing ones"""
+    failures = {}
+    for shape in shapes or query_shapes():
+        projection = {"score": {"$meta": "textScore"}} if "$text" in shape.filter else None
+        find = db[shape.collection].find(shape.filter, projection)
+        explain = find.sort(shape.sort).limit(shape.limit).explain()
+        problems = plan_problems(explain, allow_sort=shape.allow_sort)
+        if problems:
+            failures[shape.name] = problems
+    return failures
+
+
+def main():
+    from pymongo import MongoClient
+
+    uri = sys.argv[1] if len(sys.argv) > 1 else "mongodb://localhost:27017/"
+    client = MongoClient(uri)
+    try:
+        failures = check_query_plans(client["tickets_ibiza_events"])
+    finally:
+        client.close()
+    for name, problems in failures.items():
+        print(f"❌ {name}: {', '.join(problems)}")
+    if not failures:
+        print("✅ All event queries use indexes without in-memory sorts")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Slim event summary documents for the API listings
+
+Event documents carry ``fullDescription``, ``_validation``, line-up lists
+and an ``htmlSnapshot`` reference (the page itself lives in the snapshot
+store), so listing queries pulled whole event bodies into the working set
+only to project seven fields out of them. ``event_summaries``
+holds one small document per event with just the fields ``EventSummary``
+(and the listing filters/sort) need. Summaries keep the event's ``_id`` and
+field paths, so the filter builders, projection, keyset cursor and index
+layout of event_queries.py apply unchanged.
+
+Summaries are derived server-side with a ``$merge`` pipeline: for the URLs a
+scrape run wrote once its writes are flushed, and for the whole collection
+after a migration or at setup (which also drops summaries of events that no
+longer exist).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+SUMMARIES_COLLECTION = "event_summaries"
+URL_BATCH_SIZE = 1000
+
+# Field paths copied from events; everything EventSummary and the listing filters read
+SUMMARY_FIELDS = [
+    "url",
+    "title",
+    "location.venue",
+    "location.venueKey",
+    "dateTime.start",
+    "dateTime.displayText",
+    "_quality.overall",
+    "ticketInfo.status",
+]
+
+
+def summary_pipeline(match: Dict[str, Any], now: datetime) -> List[Dict[str, Any]]:
+    """Project matching events to summaries and merge them into event_summaries"""
+    projection: Dict[str, Any] = {field: 1 for field in SUMMARY_FIELDS}
+    projection["syncedAt"] = {"$literal": now}
+    return [
+        {"$match": match},
+        {"$project": projection},
+        {"$merge": {
+            "into": SUMMARIES_COLLECTION,
+            "on": "_id",
+            "whenMatched": "replace",
+            "whenNotMatched": "insert"
+        }}
+    ]
+
+
+def sync_event_summaries(db, urls: Optional[Iterable[str]] = None,
+                         now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Rebuild summaries for ``urls``, or for every event when urls is None
+
+    A full sync also removes summaries whose event is gone.
+    """
+    now = now or datetime.utcnow()
+    if urls is None:
+        list(db.events.aggregate(summary_pipeline({}, now)))
+        removed = db[SUMMARIES_COLLECTION].delete_many({"syncedAt": {"$lt": now}}).deleted_count
+        return {"synced": "all", "removed": removed}
+
+    urls = sorted(set(urls))
+    for start in range(0, len(urls), URL_BATCH_SIZE):
+        batch = urls[start:start + URL_BATCH_SIZE]
+        list(db.events.aggregate(summary_pipeline({"url": {"$in": batch}}, now)))
+    return {"synced": len(urls), "removed": 0}
@@ -0,0 +1,148 @@
+"""
+Materialized venue and quality statistics
+
+/api/venues and /api/stats/quality used to run full-collection $group
+aggregations on every request. The same aggregations now run as a refresh
+job that ``$merge``s their output into two small collections:
+
+* ``venue_stats``: one document per canonical venue key (event count,
+  upcoming events, average quality), replaced on every refresh; venues that
+  no longer have events are removed;
+* ``quality_stats``: a single ``overall`` document with the event total,
+  average quality and quality-bucket distribution.
+
+The scraper and the data migration refresh after each run, and the API
+refreshes on read when the materialized data is older than
+``STATS_MAX_AGE`` (upcoming counts drift as events start). The pipeline
+builders are shared by the sync (pymongo) and async (motor) callers.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+VENUE_STATS_COLLECTION = "venue_stats"
+QUALITY_STATS_COLLECTION = "quality_stats"
+OVERALL_ID = "overall"
+STATS_MAX_AGE = timedelta(minutes=15)
+
+
+def _between(low: Optional[float], high: Optional[float]) -> Dict[str, Any]:
+    conditions = []
+    if low is not None:
+        conditions.append({"$gte": ["$_quality.overall", low]})
+    if high is not None:
+        conditions.append({"$lt": ["$_quality.overall", high]})
+    condition = conditions[0] if len(conditions) == 1 else {"$and": conditions}
+    return {"$sum": {"$cond": [condition, 1, 0]}}
+
+
+QUALITY_BUCKETS = {
+    "excellent": (0.9, None),
+    "good": (0.8, 0.9),
+    "fair": (0.7, 0.8),
+    "poor": (None, 0.7),
+}
+
+
+def venue_stats_pipeline(now: datetime) -> List[Dict[str, Any]]:
+    """Per-venue counts and average quality, merged into venue_stats"""
+    return [
+        {"$group": {
+            # Spellings of one venue share a key; events from before venue
+            # keys existed fall back to their raw name
+            "_id": {"$ifNull": ["$location.venueKey", "$location.venue"]},
+            "venue": {"$first": "$location.venue"},
+            "eventCount": {"$sum": 1},
+            "avgQuality": {"$avg": "$_quality.overall"},
+            "upcomingEvents": {
+                "$sum": {"$cond": [{"$gte": ["$dateTime.start", now]}, 1, 0]}
+            }
+        }},
+        {"$match": {"_id": {"$ne": None}}},
+        {"$set": {
+            "venueKey": "$_id",
+            "avgQuality": {"$round": ["$avgQuality", 3]},
+            "refreshedAt": now
+        }},
+        {"$merge": {
+            "into": VENUE_STATS_COLLECTION,
+            "on": "_id",
+            "whenMatched": "replace",
+            "whenNotMatched": "insert"
+        }}
+    ]
+
+
+def quality_stats_pipeline(now: datetime) -> List[Dict[str, Any]]:
+    """Collection-wide totals and quality distribution, merged into quality_stats"""
+    group: Dict[str, Any] = {
+        "_id": None,
+        "totalEvents": {"$sum": 1},
+        "avgQuality": {"$avg": "$_quality.overall"},
+    }
+    for bucket, (low, high) in QUALITY_BUCKETS.items():
+        group[bucket] = _between(low, high)
+    return [
+        {"$group": group},
+        {"$project": {
+            "_id": {"$literal": OVERALL_ID},
+            "totalEvents": 1,
+            "averageQuality": {"$round": [{"$ifNull": ["$avgQuality", 0]}, 3]},
+            "distribution": {bucket: f"${bucket}" for bucket in QUALITY_BUCKETS},
+            "refreshedAt": {"$literal": now}
+        }},
+        {"$merge": {
+            "into": QUALITY_STATS_COLLECTION,
+            "on": "_id",
+            "whenMatched": "replace",
+            "whenNotMatched": "insert"
+        }}
+    ]
+
+
+def is_stale(overall: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> bool:
+    """Whether the materialized stats are missing or older than STATS_MAX_AGE"""
+    if not overall or not overall.get("refreshedAt"):
+        return True
+    return (now or datetime.utcnow()) - overall["refreshedAt"] > STATS_MAX_AGE
+
+
+def refresh_materialized_stats(db, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Recompute venue_stats and quality_stats from events (pymongo)"""
+    now = now or datetime.utcnow()
+    list(db.events.aggregate(venue_stats_pipeline(now)))
+    list(db.events.aggregate(quality_stats_pipeline(now)))
+    removed = db[VENUE_STATS_COLLECTION].delete_many({"refreshedAt": {"$lt": now}}).deleted_count
+    if not db.events.estimated_document_count():
+        db[QUALITY_STATS_COLLECTION].delete_many({})
+    logger.info(f"Refreshed materialized stats ({removed} stale venue(s) removed)")
+    return {"refreshedAt": now, "staleVenuesRemoved": removed}
+
+
+async def refresh_materialized_stats_async(db, now: Optional[datetime] = None) -> None:
+    """Motor counterpart of refresh_materialized_stats, for the API"""
+    now = now or datetime.utcnow()
+    await db.events.aggregate(venue_stats_pipeline(now)).to_list(length=None)
+    await db.events.aggregate(quality_stats_pipeline(now)).to_list(length=None)
+    await db[VENUE_STATS_COLLECTION].delete_many({"refreshedAt": {"$lt": now}})
+    if not await db.events.estimated_document_count():
+        await db[QUALITY_STATS_COLLECTION].delete_many({})
+
+
+def main():
+    """Refresh from the command line, e.g. from cron between scrape runs"""
+    from pymongo import MongoClient
+
+    logging.basicConfig(level=logging.INFO)
+    client = MongoClient("mongodb://localhost:27017/")
+    try:
+        refresh_materialized_stats(client["tickets_ibiza_events"])
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Rolling aggregates for extraction method effectiveness
+
+extraction_methods documents used to ``$push`` every quality score into a
+``qualityScores`` array, so each document grew without bound toward the 16 MB
+BSON limit and got slower to update. The stats are now fixed-size aggregates
+maintained with ``$inc``/``$min``/``$max``:
+
+* ``totalUses``, ``qualitySum``, ``qualitySumSq``, ``qualityMin``, ``qualityMax``
+* ``qualityHistogram``: counts in ten 0.1-wide score buckets (``b0``..``b9``)
+
+Optional time-windowed buckets live in ``extraction_method_windows``, one
+small document per method and day, expired by a TTL index.
+``summarize_method_stats`` turns either kind of document into mean, standard
+deviation and histogram-estimated percentiles without touching events.
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+HISTOGRAM_BUCKETS = 10
+METHODS_COLLECTION = "extraction_methods"
+WINDOWS_COLLECTION = "extraction_method_windows"
+WINDOW_RETENTION_DAYS = 90
+
+
+def histogram_bucket(score: float) -> str:
+    """Histogram key for a 0..1 quality score (1.0 falls in the top bucket)"""
+    index = min(max(int(score * HISTOGRAM_BUCKETS), 0), HISTOGRAM_BUCKETS - 1)
+    return f"b{index}"
+
+
+def _aggregate_update(score: float, now: datetime) -> Dict[str, Any]:
+    return {
+        "$inc": {
+            "totalUses": 1,
+            "qualitySum": score,
+            "qualitySumSq": score * score,
+            f"qualityHistogram.{histogram_bucket(score)}": 1,
+        },
+        "$min": {"qualityMin": score},
+        "$max": {"qualityMax": score},
+        "$set": {"lastUsed": now},
+    }
+
+
+def method_stats_operations(method: str, score: float, now: Optional[datetime] = None,
+                            windowed: bool = True) -> List[Tuple[str, UpdateOne]]:
+    """(collection, upsert) pairs recording one use of ``method`` with quality ``score``"""
+    now = now or datetime.utcnow()
+    operations = [
+        (METHODS_COLLECTION, UpdateOne({"method": method}, _aggregate_update(score, now), upsert=True))
+    ]
+    if windowed:
+        window_start = datetime(now.year, now.month, now.day)
+        operations.append((WINDOWS_COLLECTION, UpdateOne(
+            {"method": method, "windowStart": window_start},
+            _aggregate_update(score, now),
+            upsert=True
+        )))
+    return operations
+
+
+def _histogram_percentile(histogram: List[int], fraction: float) -> Optional[float]:
+    """Estimate a percentile by interpolating inside the histogram bucket"""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = fraction * total
+    seen = 0
+    width = 1.0 / HISTOGRAM_BUCKETS
+    for index, count in enumerate(histogram):
+        if count and seen + count >= target:
+            return round((index + (target - seen) / count) * width, 3)
+        seen += count
+    return 1.0
+
+
+def summarize_method_stats(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Mean, spread and distribution from a rolling-aggregate document"""
+    count = doc.get("totalUses", 0)
+    total = doc.get("qualitySum", 0.0)
+    histogram_doc = doc.get("qualityHistogram", {})
+    histogram = [histogram_doc.get(f"b{i}", 0) for i in range(HISTOGRAM_BUCKETS)]
+    summary = {
+        "method": doc.get("method"),
+        "totalUses": count,
+        "lastUsed": doc.get("lastUsed"),
+        "avgQuality": None,
+        "stdDev": None,
+        "minQuality": doc.get("qualityMin"),
+        "maxQuality": doc.get("qualityMax"),
+        "p50": _histogram_percentile(histogram, 0.5),
+        "p90": _histogram_percentile(histogram, 0.9),
+        "histogram": histogram,
+    }
+    if count:
+        mean = total / count
+        variance = max(doc.get("qualitySumSq", 0.0) / count - mean * mean, 0.0)
+        summary["avgQuality"] = round(mean, 3)
+        summary["stdDev"] = round(math.sqrt(variance), 3)
+    if "windowStart" in doc:
+        summary["windowStart"] = doc["windowStart"]
+    return summary
+
+
+def aggregate_from_scores(scores: List[float]) -> Dict[str, Any]:
+    """Rolling-aggregate fields equivalent to a legacy ``qualityScores`` array"""
+    histogram: Dict[str, int] = {}
+    for score in scores:
+        key = histogram_bucket(score)
+        histogram[key] = histogram.get(key, 0) + 1
+    fields = {
+        "qualitySum": float(sum(scores)),
+        "qualitySumSq": float(sum(score * score for score in scores)),
+        "qualityHistogram": histogram,
+    }
+    if scores:
+        fields["qualityMin"] = min(scores)
+        fields["qualityMax"] = max(scores)
+    return fields
+
+
+def compact_legacy_method_stats(db) -> int:
+    """Fold existing ``qualityScores`` arrays into aggregates; returns documents converted"""
+    converted = 0
+    for doc in db[METHODS_COLLECTION].find({"qualityScores": {"$exists": True}}):
+        scores = [s for s in doc.get("qualityScores", []) if isinstance(s, (int, float))]
+        fields = aggregate_from_scores(scores)
+        fields["totalUses"] = max(doc.get("totalUses", 0), len(scores))
+        db[METHODS_COLLECTION].update_one(
+            {"_id": doc["_id"]},
+            {"$set": fields, "$unset": {"qualityScores": ""}}
+        )
+        converted += 1
+    return converted
+
+
+def window_cutoff(days: int, now: Optional[datetime] = None) -> datetime:
+    """Start of the oldest daily window covering the last ``days`` days"""
+    now = now or datetime.utcnow()
+    today = datetime(now.year, now.month, now.day)
+    return today - timedelta(days=days - 1)
+
+
+def combine_windows(docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge daily window documents of one method into a single aggregate"""
+    merged: Dict[str, Any] = {"totalUses": 0, "qualitySum": 0.0, "qualitySumSq": 0.0,
+                              "qualityHistogram": {}}
+    for doc in docs:
+        merged["method"] = doc.get("method")
+        merged["totalUses"] += doc.get("totalUses", 0)
+        merged["qualitySum"] += doc.get("qualitySum", 0.0)
+        merged["qualitySumSq"] += doc.get("qualitySumSq", 0.0)
+        for key, count in doc.get("qualityHistogram", {}).items():
+            merged["qualityHistogram"][key] = merged["qualityHistogram"].get(key, 0) + count
+        for field, pick in (("qualityMin", min), ("qualityMax", max)):
+            if doc.get(field) is not None:
+                merged[field] = pick(merged.get(field, doc[field]), doc[field])
+        if doc.get("lastUsed") and (not merged.get("lastUsed") or doc["lastUsed"] > merged["lastUsed"]):
+            merged["lastUsed"] = doc["lastUsed"]
+    return merged
@@ -9,6 +9,12 @@ from pymongo import MongoClient, ASCENDING, DESCENDING, IndexModel
 from pymongo.errors import ConnectionFailure, OperationFailure
 import logging
 
+from event_queries import SUMMARY_INDEXES, create_event_indexes
+from event_summaries import SUMMARIES_COLLECTION, sync_event_summaries
+from materialized_stats import VENUE_STATS_COLLECTION
+from method_stats import WINDOW_RETENTION_DAYS, WINDOWS_COLLECTION, compact_legacy_method_stats
+from venue_registry import backfill_venue_keys
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -59,6 +65,12 @@ class MongoDBSetup:
         # 4. Extraction Methods Collection
         self._create_extraction_methods_collection()
         
+        # 5. Materialized statistics read by the API
+        self._create_stats_collections()
+        
+        # 6. Slim summaries the API listings read instead of full events
+        self._create_event_summaries_collection()
+        
         logger.info("All collections created successfully")
     
     def _create_events_collection(self):
@@ -69,17 +81,9 @@ class MongoDBSetup:
             self.db.create_collection("events")
             logger.info("Created 'events' collection")
         
-        # Define indexes
-        indexes = [
-            IndexModel([("url", ASCENDING)], unique=True),
-            IndexModel([("dateTime.start", ASCENDING)]),
-            IndexModel([("location.venue", ASCENDING)]),
-            IndexModel([("_quality.overall", DESCENDING)]),
-            IndexModel([("scrapedAt", DESCENDING)]),
-            IndexModel([("title", "text"), ("fullDescription", "text")])
-        ]
-        
-        self.db.events.create_indexes(indexes)
+        # Compound/partial indexes designed from the API query shapes
+        # (see event_queries.py, which also checks the plans)
+        create_event_indexes(self.db.events)
         logger.info("Created indexes for 'events' collection")
         
         # Define validation schema
@@ -109,6 +113,7 @@ class MongoDBSetup:
                         "bsonType": "object",
                         "properties": {
                             "venue": {"bsonType": "string"},
+                            "venueKey": {"bsonType": "string"},
                             "address": {"bsonType": "string"},
                             "city": {"bsonType": "string"},
                             "country": {"bsonType": "string"},
@@ -187,6 +192,11 @@ class MongoDBSetup:
             logger.info("Applied validation schema to 'events' collection")
         except OperationFailure as e:
             logger.warning(f"Could not apply validation schema: {e}")
+        
+        # Events stored before venue keys existed
+        backfilled = backfill_venue_keys(self.db)
+        if backfilled:
+            logger.info(f"Added venue keys to {backfilled} event(s)")
     
     def _create_quality_scores_collection(self):
         """Create quality_scores collection for tracking score history"""
@@ -238,6 +248,43 @@ class MongoDBSetup:
         
         self.db.extraction_methods.create_indexes(indexes)
         logger.info("Created indexes for 'extraction_methods' collection")
+        
+        # Older documents kept every score in a growing qualityScores array
+        compacted = compact_legacy_method_stats(self.db)
+        if compacted:
+            logger.info(f"Converted {compacted} extraction method(s) to rolling aggregates")
+        
+        # Daily rolling-aggregate windows, expired after the retention period
+        if WINDOWS_COLLECTION not in self.db.list_collection_names():
+            self.db.create_collection(WINDOWS_COLLECTION)
+            logger.info(f"Created '{WINDOWS_COLLECTION}' collection")
+        
+        self.db[WINDOWS_COLLECTION].create_indexes([
+            IndexModel([("method", ASCENDING), ("windowStart", DESCENDING)], unique=True),
+            IndexModel([("windowStart", ASCENDING)],
+                       expireAfterSeconds=WINDOW_RETENTION_DAYS * 24 * 3600)
+        ])
+        logger.info(f"Created indexes for '{WINDOWS_COLLECTION}' collection")
+    
+    def _create_stats_collections(self):
+        """Create venue_stats for the materialized views refreshed by $merge"""
+        
+        # quality_stats holds a single document and needs no extra index
+        self.db[VENUE_STATS_COLLECTION].create_indexes([
+            IndexModel([("eventCount", DESCENDING)]),
+            IndexModel([("avgQuality", DESCENDING)]),
+            IndexModel([("refreshedAt", ASCENDING)])
+        ])
+        logger.info(f"Created indexes for '{VENUE_STATS_COLLECTION}' collection")
+    
+    def _create_event_summaries_collection(self):
+        """Create event_summaries with the listing indexes and sync it from events"""
+        
+        create_event_indexes(self.db[SUMMARIES_COLLECTION], SUMMARY_INDEXES)
+        logger.info(f"Created indexes for '{SUMMARIES_COLLECTION}' collection")
+        
+        result = sync_event_summaries(self.db)
+        logger.info(f"Synced '{SUMMARIES_COLLECTION}' from events ({result['removed']} stale removed)")
     
     def insert_sample_data(self):
         """Insert sample event data with quality metadata"""
@@ -0,0 +1,75 @@
+"""
+Keyset (cursor) pagination for event listings
+
+``.skip(n)`` makes the server walk and discard n documents, so deep pages of
+the calendar got slower the further back a client scrolled. Listings are now
+sorted on ``(dateTime.start, _id)`` — unique, and backed by the compound
+index created in MongoDBSetup — and each page continues strictly after the
+last ``(dateTime.start, _id)`` of the previous one, which costs the same on
+every page.
+
+The continuation token is that pair, JSON-encoded and base64url'd. Clients
+should treat it as opaque.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+EVENT_SORT = [("dateTime.start", 1), ("_id", 1)]
+# Extra projected field carrying the raw sort key of each listed event
+CURSOR_FIELD = "cursorStart"
+
+
+class InvalidCursor(ValueError):
+    """Raised for a continuation token that cannot be decoded"""
+
+
+def encode_cursor(start: Optional[datetime], object_id: Any) -> str:
+    payload = {"s": start.isoformat() if start else None, "i": str(object_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Optional[datetime], ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        start = datetime.fromisoformat(payload["s"]) if payload["s"] else None
+        return start, ObjectId(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor(f"Invalid cursor: {token!r}") from e
+
+
+def after_cursor(query: Dict[str, Any], token: Optional[str]) -> Dict[str, Any]:
+    """Restrict ``query`` to events sorting strictly after the cursor position"""
+    if not token:
+        return query
+    start, object_id = decode_cursor(token)
+    if start is None:
+        # Events without a start date sort first; after them come all dated events
+        keyset = [
+            {"dateTime.start": None, "_id": {"$gt": object_id}},
+            {"dateTime.start": {"$ne": None}},
+        ]
+    else:
+        keyset = [
+            {"dateTime.start": {"$gt": start}},
+            {"dateTime.start": start, "_id": {"$gt": object_id}},
+        ]
+    return {"$and": [query, {"$or": keyset}]}
+
+
+def next_page(docs: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Split a ``limit + 1`` fetch into the page and the cursor for the next one"""
+    page = docs[:limit]
+    next_cursor = None
+    if len(docs) > limit and page:
+        last = page[-1]
+        next_cursor = encode_cursor(last.get(CURSOR_FIELD), last["_id"])
+    return page, next_cursor
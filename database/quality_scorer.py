@@ -1,16 +1,235 @@
 """
 Quality Scoring Engine for Event Data
 Implements field-specific validation and confidence scoring
+
+``calculate_event_quality`` scores one event. ``rescore_event`` does the
+same for an event already in the database: each field's score is kept with
+a hash of its input under ``_quality.inputs``, only fields whose input
+changed are rescored, and the ``$set`` it returns names only the changed
+sub-paths.
+
+Migrations and reports that score thousands of events use
+``calculate_batch_quality``. It reduces each event to a row of primitive
+features (``quality_features``) and computes every rule, field score and
+the weighted overall score column-wise with NumPy
+(``QualityScorer.score_batch``). The results are identical to the scalar
+path, which is also the fallback when NumPy is not installed.
 """
 
+import hashlib
+import json
 import re
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Any
 from collections import defaultdict
 import logging
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - batches are scored one event at a time
+    np = None
+    HAS_NUMPY = False
+
 logger = logging.getLogger(__name__)
 
+DATE_PATTERN = re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}')
+SPECIAL_CHARS = re.compile(r'[^a-zA-Z0-9\s\-&]')
+KNOWN_VENUES = ("Hï Ibiza", "Ushuaïa", "Pacha", "Amnesia", "DC10", "Privilege")
+VALID_TICKET_STATUSES = ("available", "sold_out", "coming_soon")
+MADRID_TIMEZONES = ("Europe/Madrid", "CET", "CEST")
+MAX_DAYS_PAST = 30
+MAX_DAYS_FUTURE = 365
+
+# Bump when scoring rules change so stored field scores stop being reused
+SCORING_VERSION = 1
+
+# Flags per field in the order the scalar scorers append them
+FIELD_FLAGS = {
+    "title": ("missing_title", "title_too_short", "excessive_special_chars"),
+    "location": ("missing_location", "missing_venue", "missing_address", "missing_city",
+                 "coordinates_outside_ibiza"),
+    "dateTime": ("missing_datetime", "invalid_date_format", "date_too_far_past",
+                 "date_too_far_future", "missing_start_date"),
+    "lineUp": ("missing_lineup",),
+    "ticketInfo": ("missing_ticket_info", "missing_ticket_status", "invalid_ticket_status",
+                   "unusual_price_range", "invalid_ticket_url"),
+}
+
+
+def _as_utc(now: Optional[datetime] = None) -> datetime:
+    """Aware UTC time; naive values are taken as UTC, None means now"""
+    if now is None:
+        return datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=timezone.utc)
+    return now.astimezone(timezone.utc)
+
+
+def _parse_start(start_date: Any) -> Tuple[Optional[datetime], bool]:
+    """(aware start datetime or None, whether it was an unparseable string)"""
+    if isinstance(start_date, str):
+        try:
+            start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        except ValueError:
+            return None, True
+    if isinstance(start_date, datetime):
+        return _as_utc(start_date), False
+    return None, False
+
+
+def _date_window(datetime_info: Any, now: datetime) -> str:
+    """Where the start falls relative to the accepted range around ``now``"""
+    if not datetime_info or not datetime_info.get("start"):
+        return ""
+    start, _ = _parse_start(datetime_info["start"])
+    if start is None:
+        return ""
+    if start < now - timedelta(days=MAX_DAYS_PAST):
+        return "past"
+    if start > now + timedelta(days=MAX_DAYS_FUTURE):
+        return "future"
+    return "ok"
+
+
+def field_input_hash(field: str, value: Any, now: datetime) -> str:
+    """
+    Hash of everything a field's score depends on
+
+    That is the field value, plus for dateTime which side of the accepted
+    date range the start falls on, so events drifting out of the range get
+    rescored without any change to the document.
+    """
+    payload = f"{SCORING_VERSION}|" + json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    if field == "dateTime":
+        payload += "|" + _date_window(value, _as_utc(now))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _without_timestamps(details: Any) -> Any:
+    if isinstance(details, dict):
+        return {k: v for k, v in details.items() if k != "lastChecked"}
+    return details
+
+
+def _score_artist(artist: Dict) -> Optional[float]:
+    """Confidence of one lineup entry, None when it has no name"""
+    if not artist.get("name"):
+        return None
+    artist_score = 0.6
+    # Check name quality
+    if len(artist["name"]) >= 2:
+        artist_score += 0.2
+    # Has headliner designation
+    if "headliner" in artist:
+        artist_score += 0.1
+    # Has genre
+    if artist.get("genre"):
+        artist_score += 0.1
+    return min(artist_score, 1.0)
+
+
+def _item_validation(lineup: List[Dict]) -> Dict[str, Dict]:
+    """Per-artist confidence for the lineup validation details"""
+    item_validation = {}
+    for artist in lineup:
+        artist_score = _score_artist(artist)
+        if artist_score is not None:
+            item_validation[artist["name"]] = {
+                "confidence": artist_score,
+                "verified": artist_score >= 0.8
+            }
+    return item_validation
+
+
+# Feature column -> dtype, in the order _feature_row produces them
+FEATURE_COLUMNS = {
+    "title_present": "bool", "title_length": "int64", "title_has_date": "bool",
+    "title_words": "int64", "title_special": "int64", "title_capitalized": "bool",
+    "location_present": "bool", "venue_present": "bool", "venue_known": "bool",
+    "address_present": "bool", "city_present": "bool", "city_ibiza": "bool",
+    "lat": "float64", "lng": "float64",
+    "datetime_present": "bool", "start_present": "bool", "start_invalid": "bool",
+    "start": "datetime64[us]", "end_present": "bool", "display_present": "bool",
+    "timezone_present": "bool", "timezone_madrid": "bool",
+    "lineup_present": "bool", "lineup_size": "int64", "lineup_named": "int64",
+    "lineup_headliner": "bool",
+    "ticket_present": "bool", "status_present": "bool", "status_valid": "bool",
+    "price_present": "bool", "price": "float64", "currency_present": "bool",
+    "currency_eur": "bool", "url_present": "bool", "url_valid": "bool", "provider_present": "bool",
+}
+
+_NAN = float("nan")
+
+
+def _feature_row(event: Dict[str, Any]) -> Tuple:
+    title = event.get("title", "")
+    if title:
+        row = (True, len(title), bool(DATE_PATTERN.search(title)), len(title.split()),
+               len(SPECIAL_CHARS.findall(title)), title[0].isupper() and not title.isupper())
+    else:
+        row = (False, 0, False, 0, 0, False)
+
+    location = event.get("location", {})
+    if location:
+        venue, city = location.get("venue"), location.get("city")
+        coords = location.get("coordinates")
+        lat = lng = _NAN
+        if coords and coords.get("lat") and coords.get("lng"):
+            lat, lng = float(coords["lat"]), float(coords["lng"])
+        row += (True, bool(venue), bool(venue) and any(v in venue for v in KNOWN_VENUES),
+                bool(location.get("address")), bool(city), bool(city) and "ibiza" in city.lower(),
+                lat, lng)
+    else:
+        row += (False, False, False, False, False, False, _NAN, _NAN)
+
+    datetime_info = event.get("dateTime", {})
+    if datetime_info:
+        start_present = bool(datetime_info.get("start"))
+        start, invalid = _parse_start(datetime_info["start"]) if start_present else (None, False)
+        tz = datetime_info.get("timezone")
+        row += (True, start_present, invalid, start.replace(tzinfo=None) if start else None,
+                bool(datetime_info.get("end")), bool(datetime_info.get("displayText")),
+                bool(tz), bool(tz) and tz in MADRID_TIMEZONES)
+    else:
+        row += (False, False, False, None, False, False, False, False)
+
+    lineup = event.get("lineUp", [])
+    if lineup:
+        row += (True, len(lineup), sum(1 for artist in lineup if artist.get("name")),
+                any(artist.get("headliner") for artist in lineup))
+    else:
+        row += (False, 0, 0, False)
+
+    ticket_info = event.get("ticketInfo", {})
+    if ticket_info:
+        status, price = ticket_info.get("status"), ticket_info.get("startingPrice")
+        currency, url = ticket_info.get("currency"), ticket_info.get("url")
+        row += (True, bool(status), bool(status) and status in VALID_TICKET_STATUSES,
+                price is not None, _NAN if price is None else float(price),
+                bool(currency), bool(currency) and currency == "EUR",
+                bool(url), bool(url) and url.startswith(("http://", "https://")),
+                bool(ticket_info.get("provider")))
+    else:
+        row += (False, False, False, False, _NAN, False, False, False, False, False)
+    return row
+
+
+def quality_features(events: Sequence[Dict[str, Any]]) -> Dict[str, "np.ndarray"]:
+    """
+    Columnar inputs of every scoring rule for ``events``
+
+    Strings and nested documents are reduced to booleans, counts,
+    coordinates, prices and UTC start times (datetime64, NaT when there is
+    no usable start), one NumPy array per FEATURE_COLUMNS entry.
+    """
+    rows = [_feature_row(event) for event in events]
+    columns = zip(*rows) if rows else [()] * len(FEATURE_COLUMNS)
+    return {
+        name: np.array(list(values), dtype=dtype)
+        for (name, dtype), values in zip(FEATURE_COLUMNS.items(), columns)
+    }
+
 
 class QualityScorer:
     """Calculate quality scores for event data fields"""
@@ -24,39 +243,50 @@ class QualityScorer:
             "lineUp": 0.15,
             "ticketInfo": 0.15
         }
+        # Field -> (scorer, value used when the event lacks the field)
+        self.field_scorers = {
+            "title": (self._score_title, ""),
+            "location": (self._score_location, {}),
+            "dateTime": (self._score_datetime, {}),
+            "lineUp": (self._score_lineup, []),
+            "ticketInfo": (self._score_ticket_info, {})
+        }
         
-    def calculate_event_quality(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+    def calculate_event_quality(self, event_data: Dict[str, Any],
+                                now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Calculate quality scores for an entire event
         
         Args:
             event_data: Event data dictionary
+            now: Reference time for date checks and timestamps (default: now)
             
         Returns:
             Dictionary with quality scores and metadata
         """
+        now = _as_utc(now)
         scores = {}
         validation_details = {}
         
         # Calculate individual field scores
         scores["title"], validation_details["title"] = self._score_title(
-            event_data.get("title", "")
+            event_data.get("title", ""), now
         )
         
         scores["location"], validation_details["location"] = self._score_location(
-            event_data.get("location", {})
+            event_data.get("location", {}), now
         )
         
         scores["dateTime"], validation_details["dateTime"] = self._score_datetime(
-            event_data.get("dateTime", {})
+            event_data.get("dateTime", {}), now
         )
         
         scores["lineUp"], validation_details["lineUp"] = self._score_lineup(
-            event_data.get("lineUp", [])
+            event_data.get("lineUp", []), now
         )
         
         scores["ticketInfo"], validation_details["ticketInfo"] = self._score_ticket_info(
-            event_data.get("ticketInfo", {})
+            event_data.get("ticketInfo", {}), now
         )
         
         # Calculate overall score
@@ -66,21 +296,83 @@ class QualityScorer:
             "_quality": {
                 "scores": scores,
                 "overall": overall_score,
-                "lastCalculated": datetime.utcnow()
+                "lastCalculated": now.replace(tzinfo=None)
             },
             "_validation": validation_details
         }
     
-    def _score_title(self, title: str) -> Tuple[float, Dict]:
+    def rescore_event(self, event_data: Dict[str, Any], previous: Optional[Dict[str, Any]] = None,
+                      now: Optional[datetime] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Rescore only the fields whose inputs changed since ``previous``
+        
+        Args:
+            event_data: Event data dictionary
+            previous: The stored event (its ``_quality`` and ``_validation``), if any
+            now: Reference time for date checks and timestamps (default: now)
+            
+        Returns:
+            (quality data as calculate_event_quality returns it, plus
+            ``_quality.inputs``; ``$set`` document for the stored event).
+            The ``$set`` names only changed sub-paths, is empty when nothing
+            changed, and holds both whole subtrees when nothing was stored.
+        """
+        now = _as_utc(now)
+        old_quality = (previous or {}).get("_quality") or {}
+        old_validation = (previous or {}).get("_validation") or {}
+        old_inputs = old_quality.get("inputs") or {}
+        old_scores = old_quality.get("scores") or {}
+        scores, validation, inputs, updates = {}, {}, {}, {}
+        
+        for field, (scorer, default) in self.field_scorers.items():
+            value = event_data.get(field, default)
+            inputs[field] = field_input_hash(field, value, now)
+            if (old_inputs.get(field) == inputs[field]
+                    and field in old_scores and field in old_validation):
+                scores[field], validation[field] = old_scores[field], old_validation[field]
+                continue
+            
+            scores[field], validation[field] = scorer(value, now)
+            updates[f"_quality.inputs.{field}"] = inputs[field]
+            if scores[field] != old_scores.get(field):
+                updates[f"_quality.scores.{field}"] = scores[field]
+            if _without_timestamps(validation[field]) == _without_timestamps(old_validation.get(field)):
+                validation[field] = old_validation[field]
+            else:
+                updates[f"_validation.{field}"] = validation[field]
+        
+        overall = self._calculate_overall_score(scores)
+        if overall != old_quality.get("overall"):
+            updates["_quality.overall"] = overall
+        last_calculated = old_quality.get("lastCalculated")
+        if updates or not old_quality:
+            last_calculated = now.replace(tzinfo=None)
+            updates["_quality.lastCalculated"] = last_calculated
+        
+        quality_data = {
+            "_quality": {
+                "scores": scores,
+                "overall": overall,
+                "lastCalculated": last_calculated,
+                "inputs": inputs
+            },
+            "_validation": validation
+        }
+        if not old_quality:
+            updates = dict(quality_data)
+        return quality_data, updates
+    
+    def _score_title(self, title: str, now: Optional[datetime] = None) -> Tuple[float, Dict]:
         """Score title field"""
         score = 0.0
         flags = []
+        checked_at = _as_utc(now).replace(tzinfo=None)
         
         if not title:
             return 0.0, {
                 "confidence": 0.0,
                 "flags": ["missing_title"],
-                "lastChecked": datetime.utcnow()
+                "lastChecked": checked_at
             }
         
         # Length check
@@ -90,7 +382,7 @@ class QualityScorer:
             flags.append("title_too_short")
         
         # Contains date pattern
-        if re.search(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}', title):
+        if DATE_PATTERN.search(title):
             score += 0.2
         
         # Contains venue/artist name
@@ -98,7 +390,7 @@ class QualityScorer:
             score += 0.2
         
         # No excessive special characters
-        special_char_ratio = len(re.findall(r'[^a-zA-Z0-9\s\-&]', title)) / len(title)
+        special_char_ratio = len(SPECIAL_CHARS.findall(title)) / len(title)
         if special_char_ratio < 0.2:
             score += 0.2
         else:
@@ -111,27 +403,27 @@ class QualityScorer:
         return min(score, 1.0), {
             "confidence": min(score, 1.0),
             "flags": flags,
-            "lastChecked": datetime.utcnow()
+            "lastChecked": checked_at
         }
     
-    def _score_location(self, location: Dict) -> Tuple[float, Dict]:
+    def _score_location(self, location: Dict, now: Optional[datetime] = None) -> Tuple[float, Dict]:
         """Score location field"""
         score = 0.0
         flags = []
+        checked_at = _as_utc(now).replace(tzinfo=None)
         
         if not location:
             return 0.0, {
                 "confidence": 0.0,
                 "flags": ["missing_location"],
-                "lastChecked": datetime.utcnow()
+                "lastChecked": checked_at
             }
         
         # Venue name
         if location.get("venue"):
             score += 0.3
             # Known Ibiza venues get bonus
-            known_venues = ["Hï Ibiza", "Ushuaïa", "Pacha", "Amnesia", "DC10", "Privilege"]
-            if any(venue in location["venue"] for venue in known_venues):
+            if any(venue in location["venue"] for venue in KNOWN_VENUES):
                 score += 0.1
         else:
             flags.append("missing_venue")
@@ -163,40 +455,35 @@ class QualityScorer:
         return min(score, 1.0), {
             "confidence": min(score, 1.0),
             "flags": flags,
-            "lastChecked": datetime.utcnow()
+            "lastChecked": checked_at
         }
     
-    def _score_datetime(self, datetime_info: Dict) -> Tuple[float, Dict]:
+    def _score_datetime(self, datetime_info: Dict, now: Optional[datetime] = None) -> Tuple[float, Dict]:
         """Score datetime field"""
         score = 0.0
         flags = []
+        checked_at = _as_utc(now).replace(tzinfo=None)
         
         if not datetime_info:
             return 0.0, {
                 "confidence": 0.0,
                 "flags": ["missing_datetime"],
-                "lastChecked": datetime.utcnow()
+                "lastChecked": checked_at
             }
         
         # Start date
         if datetime_info.get("start"):
             score += 0.4
             # Check if date is reasonable (not too far in past or future)
-            start_date = datetime_info["start"]
-            if isinstance(start_date, str):
-                try:
-                    start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                except:
-                    flags.append("invalid_date_format")
+            start_date, invalid_format = _parse_start(datetime_info["start"])
+            if invalid_format:
+                flags.append("invalid_date_format")
             
-            if isinstance(start_date, datetime):
-                now = datetime.now(timezone.utc) # Use timezone-aware UTC now
-                if start_date.tzinfo is None: # If start_date became naive (e.g. passed as naive datetime object)
-                    start_date = start_date.replace(tzinfo=timezone.utc) # Assume UTC if naive
-
-                if start_date < now - timedelta(days=30):
+            if start_date is not None:
+                now = _as_utc(now)
+                if start_date < now - timedelta(days=MAX_DAYS_PAST):
                     flags.append("date_too_far_past")
-                elif start_date > now + timedelta(days=365):
+                elif start_date > now + timedelta(days=MAX_DAYS_FUTURE):
                     flags.append("date_too_far_future")
                 else:
                     score += 0.1
@@ -214,26 +501,26 @@ class QualityScorer:
         # Timezone
         if datetime_info.get("timezone"):
             score += 0.1
-            if datetime_info["timezone"] in ["Europe/Madrid", "CET", "CEST"]:
+            if datetime_info["timezone"] in MADRID_TIMEZONES:
                 score += 0.05
         
         return min(score, 1.0), {
             "confidence": min(score, 1.0),
             "flags": flags,
-            "lastChecked": datetime.utcnow()
+            "lastChecked": checked_at
         }
     
-    def _score_lineup(self, lineup: List[Dict]) -> Tuple[float, Dict]:
+    def _score_lineup(self, lineup: List[Dict], now: Optional[datetime] = None) -> Tuple[float, Dict]:
         """Score lineup field"""
         score = 0.0
         flags = []
-        item_validation = {}
+        checked_at = _as_utc(now).replace(tzinfo=None)
         
         if not lineup:
             return 0.0, {
                 "confidence": 0.0,
                 "flags": ["missing_lineup"],
-                "lastChecked": datetime.utcnow(),
+                "lastChecked": checked_at,
                 "itemValidation": {}
             }
         
@@ -242,36 +529,8 @@ class QualityScorer:
             score += 0.4
         
         # Score individual artists
-        valid_artists = 0
-        for artist in lineup:
-            artist_score = 0.0
-            artist_flags = []
-            
-            if artist.get("name"):
-                artist_score += 0.6
-                # Check name quality
-                if len(artist["name"]) >= 2:
-                    artist_score += 0.2
-                else:
-                    artist_flags.append("name_too_short")
-                
-                # Has headliner designation
-                if "headliner" in artist:
-                    artist_score += 0.1
-                
-                # Has genre
-                if artist.get("genre"):
-                    artist_score += 0.1
-                
-                item_validation[artist["name"]] = {
-                    "confidence": min(artist_score, 1.0),
-                    "verified": artist_score >= 0.8
-                }
-                
-                if artist_score >= 0.6:
-                    valid_artists += 1
-            else:
-                artist_flags.append("missing_artist_name")
+        item_validation = _item_validation(lineup)
+        valid_artists = sum(1 for artist in lineup if artist.get("name"))
         
         # Overall lineup score based on valid artists
         if valid_artists > 0:
@@ -290,26 +549,27 @@ class QualityScorer:
         return min(score, 1.0), {
             "confidence": min(score, 1.0),
             "flags": flags,
-            "lastChecked": datetime.utcnow(),
+            "lastChecked": checked_at,
             "itemValidation": item_validation
         }
     
-    def _score_ticket_info(self, ticket_info: Dict) -> Tuple[float, Dict]:
+    def _score_ticket_info(self, ticket_info: Dict, now: Optional[datetime] = None) -> Tuple[float, Dict]:
         """Score ticket information field"""
         score = 0.0
         flags = []
+        checked_at = _as_utc(now).replace(tzinfo=None)
         
         if not ticket_info:
             return 0.0, {
                 "confidence": 0.0,
                 "flags": ["missing_ticket_info"],
-                "lastChecked": datetime.utcnow()
+                "lastChecked": checked_at
             }
         
         # Status
         if ticket_info.get("status"):
             score += 0.3
-            if ticket_info["status"] in ["available", "sold_out", "coming_soon"]:
+            if ticket_info["status"] in VALID_TICKET_STATUSES:
                 score += 0.1
             else:
                 flags.append("invalid_ticket_status")
@@ -347,7 +607,7 @@ class QualityScorer:
         return min(score, 1.0), {
             "confidence": min(score, 1.0),
             "flags": flags,
-            "lastChecked": datetime.utcnow()
+            "lastChecked": checked_at
         }
     
     def _calculate_overall_score(self, field_scores: Dict[str, float]) -> float:
@@ -364,6 +624,156 @@ class QualityScorer:
             return round(total_score / total_weight, 3)
         return 0.0
     
+    def score_batch(self, features: Mapping[str, Any],
+                    now: Optional[datetime] = None) -> Dict[str, "np.ndarray"]:
+        """
+        Field scores and overall scores for a columnar batch
+        
+        Args:
+            features: FEATURE_COLUMNS arrays, as built by quality_features
+                (NumPy arrays or anything np.asarray accepts, e.g. pyarrow)
+            now: Reference time for the date range check (default: now)
+            
+        Returns:
+            {field: scores, "overall": overall scores}, equal element for
+            element to what calculate_event_quality gives
+        """
+        scores, _ = self._batch_rules(features, _as_utc(now))
+        return scores
+    
+    def calculate_batch_quality(self, events: Sequence[Dict[str, Any]],
+                                now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """calculate_event_quality for many events, scored column-wise"""
+        if not HAS_NUMPY:
+            return [self.calculate_event_quality(event, now) for event in events]
+        
+        now = _as_utc(now)
+        checked_at = now.replace(tzinfo=None)
+        scores, flag_masks = self._batch_rules(quality_features(events), now)
+        columns = {name: values.tolist() for name, values in scores.items()}
+        flag_rows = {name: mask.tolist() for name, mask in flag_masks.items()}
+        
+        results = []
+        for i, event in enumerate(events):
+            validation = {
+                field: {
+                    "confidence": columns[field][i],
+                    "flags": [flag for flag in flags if flag_rows[flag][i]],
+                    "lastChecked": checked_at
+                }
+                for field, flags in FIELD_FLAGS.items()
+            }
+            validation["lineUp"]["itemValidation"] = _item_validation(event.get("lineUp") or [])
+            results.append({
+                "_quality": {
+                    "scores": {field: columns[field][i] for field in FIELD_FLAGS},
+                    "overall": columns["overall"][i],
+                    "lastCalculated": checked_at
+                },
+                "_validation": validation
+            })
+        return results
+    
+    def _batch_rules(self, features: Mapping[str, Any],
+                     now: datetime) -> Tuple[Dict[str, "np.ndarray"], Dict[str, "np.ndarray"]]:
+        """
+        Vectorized field scorers: (scores, flag masks)
+        
+        Points are added in the same order as the scalar scorers add them,
+        so the float sums are bit-for-bit the same.
+        """
+        f = {name: np.asarray(features[name]) for name in FEATURE_COLUMNS}
+        n = len(f["title_present"])
+        scores: Dict[str, np.ndarray] = {}
+        flags: Dict[str, np.ndarray] = {}
+        
+        def points(*rules: Tuple[Any, float]) -> np.ndarray:
+            score = np.zeros(n)
+            for mask, value in rules:
+                score = score + np.where(mask, value, 0.0)
+            return np.minimum(score, 1.0)
+        
+        # Title
+        present, length = f["title_present"], f["title_length"]
+        ratio = np.divide(f["title_special"], length, out=np.ones(n), where=length > 0)
+        scores["title"] = np.where(present, points(
+            (length >= 5, 0.3), (f["title_has_date"], 0.2), (f["title_words"] >= 2, 0.2),
+            (ratio < 0.2, 0.2), (f["title_capitalized"], 0.1)
+        ), 0.0)
+        flags["missing_title"] = ~present
+        flags["title_too_short"] = present & (length < 5)
+        flags["excessive_special_chars"] = present & (ratio >= 0.2)
+        
+        # Location
+        present = f["location_present"]
+        lat, lng = f["lat"], f["lng"]
+        has_coords = ~np.isnan(lat) & ~np.isnan(lng)
+        in_ibiza = (lat >= 38.8) & (lat <= 39.1) & (lng >= 1.2) & (lng <= 1.6)
+        scores["location"] = np.where(present, points(
+            (f["venue_present"], 0.3), (f["venue_known"], 0.1), (f["address_present"], 0.2),
+            (f["city_present"], 0.2), (f["city_ibiza"], 0.1), (has_coords & in_ibiza, 0.2)
+        ), 0.0)
+        flags["missing_location"] = ~present
+        flags["missing_venue"] = present & ~f["venue_present"]
+        flags["missing_address"] = present & ~f["address_present"]
+        flags["missing_city"] = present & ~f["city_present"]
+        flags["coordinates_outside_ibiza"] = present & has_coords & ~in_ibiza
+        
+        # Date and time
+        present, start_present = f["datetime_present"], f["start_present"]
+        start = f["start"].astype("datetime64[us]")
+        now64 = np.datetime64(now.replace(tzinfo=None), "us")
+        dated = start_present & ~np.isnat(start)
+        too_past = dated & (start < now64 - np.timedelta64(MAX_DAYS_PAST, "D"))
+        too_future = dated & ~too_past & (start > now64 + np.timedelta64(MAX_DAYS_FUTURE, "D"))
+        scores["dateTime"] = np.where(present, points(
+            (start_present, 0.4), (dated & ~too_past & ~too_future, 0.1), (f["end_present"], 0.2),
+            (f["display_present"], 0.2), (f["timezone_present"], 0.1), (f["timezone_madrid"], 0.05)
+        ), 0.0)
+        flags["missing_datetime"] = ~present
+        flags["invalid_date_format"] = present & start_present & f["start_invalid"]
+        flags["date_too_far_past"] = present & too_past
+        flags["date_too_far_future"] = present & too_future
+        flags["missing_start_date"] = present & ~start_present
+        
+        # Lineup
+        present, size, named = f["lineup_present"], f["lineup_size"], f["lineup_named"]
+        score = np.where(size > 0, 0.4, 0.0)
+        score = score + np.where(named > 0, 0.3 * (named / np.maximum(size, 1)), 0.0)
+        score = score + np.where(size >= 3, 0.2, np.where(size >= 2, 0.1, 0.0))
+        score = score + np.where(f["lineup_headliner"], 0.1, 0.0)
+        scores["lineUp"] = np.where(present, np.minimum(score, 1.0), 0.0)
+        flags["missing_lineup"] = ~present
+        
+        # Ticket info
+        present, price_present = f["ticket_present"], f["price_present"]
+        price = f["price"]
+        fair_price = (price >= 20) & (price <= 200)
+        scores["ticketInfo"] = np.where(present, points(
+            (f["status_present"], 0.3), (f["status_valid"], 0.1), (price_present, 0.2),
+            (price_present & fair_price, 0.1), (f["currency_present"], 0.1), (f["currency_eur"], 0.05),
+            (f["url_present"], 0.2), (f["url_valid"], 0.05), (f["provider_present"], 0.1)
+        ), 0.0)
+        flags["missing_ticket_info"] = ~present
+        flags["missing_ticket_status"] = present & ~f["status_present"]
+        flags["invalid_ticket_status"] = present & f["status_present"] & ~f["status_valid"]
+        flags["unusual_price_range"] = present & price_present & ~fair_price
+        flags["invalid_ticket_url"] = present & f["url_present"] & ~f["url_valid"]
+        
+        # Weighted overall, accumulated in the same order as _calculate_overall_score
+        total_score, total_weight = np.zeros(n), 0.0
+        for field in FIELD_FLAGS:
+            if field in self.field_weights:
+                total_score = total_score + scores[field] * self.field_weights[field]
+                total_weight += self.field_weights[field]
+        if total_weight > 0:
+            # Python's round, not np.round: they disagree on some halfway cases
+            overall = [round(value, 3) for value in (total_score / total_weight).tolist()]
+            scores["overall"] = np.array(overall, dtype="float64")
+        else:
+            scores["overall"] = np.zeros(n)
+        return scores, flags
+    
     def get_quality_summary(self, quality_data: Dict) -> Dict[str, Any]:
         """Generate a human-readable quality summary"""
         overall = quality_data["_quality"]["overall"]
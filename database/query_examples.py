@@ -6,6 +6,8 @@ from pymongo import MongoClient
 from datetime import datetime, timedelta
 import json
 
+from venue_registry import registry
+
 
 def get_high_quality_events(min_score=0.8):
     """Get events with quality score above threshold"""
@@ -42,9 +44,9 @@ def get_events_by_venue(venue_name):
     client = MongoClient()
     db = client.tickets_ibiza_events
     
-    # Case-insensitive search
+    # Any spelling of the venue, via the indexed canonical key
     events = list(db.events.find(
-        {"location.venue": {"$regex": venue_name, "$options": "i"}},
+        {"location.venueKey": registry.lookup(venue_name)},
         {
             "title": 1,
             "dateTime.displayText": 1,
@@ -0,0 +1,226 @@
+"""
+Offline re-extraction of stored event pages
+
+A fixed selector in ``extract_wordpress_data`` or
+``extract_ibiza_spotlight_data`` used to take a re-crawl of the live sites to
+reach the database. Every scraped page is now kept in the snapshot store
+(events reference it as ``htmlSnapshot``), so this replays those pages
+through the current parsers and QualityScorer without touching the network:
+
+* events are streamed from MongoDB with a three-field projection and fanned
+  out to a process pool; each worker reads its pages from the store itself,
+  so only digests and finished documents cross process boundaries;
+* a worker compares the ``extractionFingerprint`` of its result with the
+  stored one and returns nothing for events that came out the same;
+* changed events are bulk-upserted through BulkWriter (with a quality
+  history entry), then summaries, stats and the API data version are
+  refreshed once at the end.
+
+Scrape timestamps (``scrapedAt``, ``lastCheckedAt``) are left alone, since
+nothing was fetched; rewritten events get ``lastUpdated`` and
+``reextractedAt``.
+
+Usage: ``python database/reextract.py [--workers N] [--url-prefix URL]``
+"""
+
+import itertools
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from pymongo import InsertOne, UpdateOne
+
+from bulk_writer import BulkWriter
+from event_summaries import sync_event_summaries
+from materialized_stats import refresh_materialized_stats
+from quality_scorer import QualityScorer
+from response_cache import bump_data_version
+from venue_registry import annotate_venue_key
+
+# Parsers live with the scrapers; the snapshot store with the scraping components
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from parse_components.content_fingerprint import extraction_fingerprint
+from scraping_components.snapshot_store import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# Host suffix -> (module in my_scrapers, scraper class) whose parse_event_html handles it
+SITE_PARSERS = {
+    "ibiza-spotlight.com": ("mono_ibiza_spotlight_improved", "ImprovedMultiLayerEventScraper"),
+}
+DEFAULT_PARSER = ("mono_ticketmaster", "MultiLayerEventScraper")
+
+# (url, htmlSnapshot digest, stored extractionFingerprint)
+Job = Tuple[str, str, Optional[str]]
+
+# Per-process state, set up by _init_worker
+_store: Optional[SnapshotStore] = None
+_scorer: Optional[QualityScorer] = None
+_parsers: Dict[Tuple[str, str], Any] = {}
+
+
+def parser_for(url: str) -> Tuple[str, str]:
+    """(module, class) of the scraper whose parser handles ``url``"""
+    host = (urlparse(url).hostname or "").lower()
+    for suffix, parser in SITE_PARSERS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return parser
+    return DEFAULT_PARSER
+
+
+def _init_worker(snapshot_dir: str):
+    global _store, _scorer
+    sys.path.insert(0, str(ROOT / "my_scrapers"))
+    _store = SnapshotStore(snapshot_dir, train_after=None)
+    _scorer = QualityScorer()
+    _parsers.clear()
+
+
+def _parser(url: str):
+    key = parser_for(url)
+    if key not in _parsers:
+        module_name, class_name = key
+        module = __import__(module_name)
+        _parsers[key] = getattr(module, class_name)(use_browser=False)
+    return _parsers[key]
+
+
+def reextract_event(job: Job) -> Optional[Dict[str, Any]]:
+    """
+    Parse and score one stored page (runs in a worker process)
+
+    Returns the event fields to ``$set``, or None when the snapshot is
+    missing, nothing could be extracted, or the result matches the stored
+    fingerprint.
+    """
+    url, digest, stored_fingerprint = job
+    try:
+        html = _store.get(digest)
+    except KeyError:
+        logger.warning(f"Snapshot {digest[:12]} of {url} is missing")
+        return None
+    try:
+        event_data = _parser(url).parse_event_html(url, html)
+    except Exception as e:
+        logger.error(f"Re-extraction failed for {url}: {e}")
+        return None
+    if not event_data:
+        return None
+
+    for field in ("html", "scrapedAt", "lastCheckedAt"):
+        event_data.pop(field, None)
+    annotate_venue_key(event_data)
+    # Scored like the scraper scores, so fingerprints of unchanged events match
+    event_data.update(_scorer.rescore_event(event_data)[0])
+    fingerprint = extraction_fingerprint(event_data)
+    if fingerprint == stored_fingerprint:
+        return None
+    event_data["extractionFingerprint"] = fingerprint
+    event_data["htmlSnapshot"] = digest
+    return event_data
+
+
+def iter_jobs(db, url_prefix: Optional[str] = None) -> Iterator[Job]:
+    """Events that have a stored page, in _id order"""
+    query: Dict[str, Any] = {"htmlSnapshot": {"$type": "string"}}
+    if url_prefix:
+        query["url"] = {"$gte": url_prefix, "$lt": url_prefix + "\uffff"}
+    projection = {"_id": 0, "url": 1, "htmlSnapshot": 1, "extractionFingerprint": 1}
+    for event in db.events.find(query, projection).sort("_id", 1):
+        yield event["url"], event["htmlSnapshot"], event.get("extractionFingerprint")
+
+
+def _event_operations(event_data: Dict[str, Any], now: datetime) -> List[Tuple[str, Any]]:
+    url = event_data["url"]
+    event_data["lastUpdated"] = now
+    event_data["reextractedAt"] = now
+    quality = event_data["_quality"]
+    history_entry = {
+        "eventUrl": url,
+        "calculatedAt": now,
+        "overallScore": quality["overall"],
+        "fieldScores": quality["scores"],
+        "validationFlags": {
+            field: len(data.get("flags", []))
+            for field, data in event_data.get("_validation", {}).items()
+            if isinstance(data, dict)
+        },
+        "source": "reextract",
+    }
+    return [
+        ("events", UpdateOne(
+            {"url": url},
+            {"$set": event_data, "$setOnInsert": {"firstScraped": now}, "$unset": {"html": ""}},
+            upsert=True
+        )),
+        ("quality_scores", InsertOne(history_entry)),
+    ]
+
+
+def reextract_all(db, snapshot_dir=DEFAULT_SNAPSHOT_DIR, workers: Optional[int] = None,
+                  url_prefix: Optional[str] = None, chunksize: int = 16,
+                  window: int = 2000) -> Dict[str, int]:
+    """
+    Replay every stored page through the current parsers and save what changed
+
+    Jobs are submitted ``window`` at a time, so the event cursor is streamed
+    rather than read into memory up front.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {"processed": 0, "changed": 0}
+    changed_urls = set()
+    now = datetime.utcnow()
+    jobs = iter_jobs(db, url_prefix)
+    with BulkWriter(db) as writer, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(str(snapshot_dir),)) as pool:
+        while True:
+            batch = list(itertools.islice(jobs, window))
+            if not batch:
+                break
+            for event_data in pool.map(reextract_event, batch, chunksize=chunksize):
+                stats["processed"] += 1
+                if event_data is None:
+                    continue
+                for collection, operation in _event_operations(event_data, now):
+                    writer.add(collection, operation)
+                changed_urls.add(event_data["url"])
+            logger.info(f"Re-extracted {stats['processed']} events, {len(changed_urls)} changed")
+    stats["changed"] = len(changed_urls)
+
+    if changed_urls:
+        sync_event_summaries(db, changed_urls)
+        refresh_materialized_stats(db)
+        bump_data_version(db)
+    return stats
+
+
+def main():
+    """Re-extract from the command line after a parser change"""
+    import argparse
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Replay stored event pages through the current parsers")
+    parser.add_argument("--uri", default="mongodb://localhost:27017/")
+    parser.add_argument("--database", default="tickets_ibiza_events")
+    parser.add_argument("--snapshots", default=str(DEFAULT_SNAPSHOT_DIR))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--url-prefix", help="only events whose URL starts with this")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    client = MongoClient(args.uri)
+    try:
+        stats = reextract_all(client[args.database], args.snapshots, args.workers, args.url_prefix)
+    finally:
+        client.close()
+    print(f"Re-extracted {stats['processed']} events; {stats['changed']} changed and were saved")
+
+
+if __name__ == "__main__":
+    main()
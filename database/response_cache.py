@@ -0,0 +1,148 @@
+"""
+In-process response cache for the event API
+
+Event listings only change when a scrape run or a migration writes, yet
+every app launch re-ran the same queries. ``ResponseCache`` keeps rendered
+JSON bodies keyed by path and normalized query parameters, bounded by a TTL
+and an LRU entry limit, and gives each body an ETag so clients can
+revalidate with ``If-None-Match`` and get a ``304``.
+
+Writers live in other processes, so invalidation goes through a version
+counter in Mongo: the scraper and DataMigration call ``bump_data_version``
+after their writes land, and the API drops every entry cached under an
+older version. The API reads the counter at most once per
+``version_check_interval`` seconds, so a hit costs no database round trip.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+DATA_VERSION_COLLECTION = "data_version"
+EVENTS_VERSION_ID = "events"
+
+
+def bump_data_version(db) -> None:
+    """Record that events changed so API caches drop their entries (pymongo)"""
+    db[DATA_VERSION_COLLECTION].update_one(
+        {"_id": EVENTS_VERSION_ID},
+        {"$inc": {"version": 1}, "$set": {"updatedAt": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+async def read_data_version(db) -> int:
+    """Current events version (motor); 0 before the first bump"""
+    doc = await db[DATA_VERSION_COLLECTION].find_one({"_id": EVENTS_VERSION_ID}, {"version": 1})
+    return (doc or {}).get("version", 0)
+
+
+def cache_key(path: str, params: Iterable[Tuple[str, str]]) -> str:
+    """Path plus sorted, de-blanked query parameters, so ?a=1&b=2 == ?b=2&a=1"""
+    normalized = sorted((k, v) for k, v in params if v != "")
+    return path + "?" + "&".join(f"{k}={v}" for k, v in normalized)
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 weak comparison against an If-None-Match header value"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    version: int
+    stored_at: float
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """TTL + LRU bounded map from cache key to rendered response"""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 60.0,
+                 version_check_interval: float = 2.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._version_checked_at: Optional[float] = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def version_due(self, now: Optional[float] = None) -> bool:
+        """Whether the data version should be re-read from the database"""
+        now = time.monotonic() if now is None else now
+        return (self._version_checked_at is None
+                or now - self._version_checked_at >= self.version_check_interval)
+
+    def observe_version(self, version: int, now: Optional[float] = None) -> int:
+        """Adopt the database's data version, clearing the cache if it moved"""
+        with self._lock:
+            self._version_checked_at = time.monotonic() if now is None else now
+            if version != self._version:
+                self._version = version
+                self._entries.clear()
+                self.stats["invalidations"] += 1
+            return self._version
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[CachedResponse]:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != self._version or now - entry.stored_at > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry
+
+    def put(self, key: str, content: Any, headers: Optional[Dict[str, str]] = None,
+            version: Optional[int] = None, now: Optional[float] = None) -> CachedResponse:
+        """Render ``content`` (JSON-compatible) and store it; returns the entry"""
+        body = json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        entry = CachedResponse(
+            body=body,
+            etag=etag_for(body),
+            version=self._version if version is None else version,
+            stored_at=time.monotonic() if now is None else now,
+            headers=dict(headers or {})
+        )
+        with self._lock:
+            if entry.version != self._version:
+                # Rendered from data older than what the cache now serves
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
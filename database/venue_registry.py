@@ -0,0 +1,123 @@
+"""
+Canonical venue keys for index-friendly venue lookups
+
+Venue filters used to be case-insensitive ``$regex`` matches on
+``location.venue``, which Mongo can only answer with a collection scan. Each
+event now also stores ``location.venueKey``: the venue name case-folded,
+accent-stripped and slugged ("Hï Ibiza" and "Hi Ibiza" both become
+``hi-ibiza``), then resolved through the alias table below so that spellings
+of one club share one key. The key is indexed, and the API turns user input
+into either an exact key or an anchored, case-sensitive prefix, both of which
+are index range scans.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Pattern, Union
+
+from pymongo import UpdateOne
+
+VENUE_KEY_FIELD = "location.venueKey"
+
+# Canonical key -> display name and known alternative spellings
+KNOWN_VENUES: Dict[str, Dict[str, Any]] = {
+    "hi-ibiza": {"name": "Hï Ibiza", "aliases": ["Hi Ibiza", "Hï Ibiza Club"]},
+    "ushuaia": {"name": "Ushuaïa", "aliases": ["Ushuaïa Ibiza", "Ushuaïa Ibiza Beach Hotel"]},
+    "pacha": {"name": "Pacha", "aliases": ["Pacha Ibiza", "Pacha Ibiza Town"]},
+    "amnesia": {"name": "Amnesia", "aliases": ["Amnesia Ibiza"]},
+    "dc10": {"name": "DC10", "aliases": ["DC-10", "DC 10", "DC10 Ibiza"]},
+    "privilege": {"name": "Privilege", "aliases": ["Privilege Ibiza"]},
+}
+
+
+def normalize_venue(name: Optional[str]) -> str:
+    """Case-folded, accent-stripped slug of a venue name ('' for blanks)"""
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"[^a-z0-9]+", "-", stripped.casefold()).strip("-")
+
+
+class VenueRegistry:
+    """Maps venue spellings to canonical keys and user input to key filters"""
+
+    def __init__(self, venues: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.venues = dict(KNOWN_VENUES if venues is None else venues)
+        self._aliases: Dict[str, str] = {}
+        for key, info in self.venues.items():
+            for spelling in [key, info.get("name"), *info.get("aliases", [])]:
+                slug = normalize_venue(spelling)
+                if slug:
+                    self._aliases[slug] = key
+
+    def key_for(self, name: Optional[str]) -> Optional[str]:
+        """Canonical key for a stored venue name; unknown venues keep their slug"""
+        slug = normalize_venue(name)
+        if not slug:
+            return None
+        return self._aliases.get(slug, slug)
+
+    def name_for(self, key: str) -> Optional[str]:
+        info = self.venues.get(key)
+        return info["name"] if info else None
+
+    def lookup(self, text: Optional[str]) -> Optional[Union[str, Dict[str, List[Union[str, Pattern]]]]]:
+        """
+        Filter value for ``location.venueKey`` matching user input
+
+        An exact spelling of a known venue resolves to its key; anything else
+        matches keys that start with the input, plus known venues having an
+        alias that does ("ushuaia ib" finds ``ushuaia``). None for blank input.
+        """
+        slug = normalize_venue(text)
+        if not slug:
+            return None
+        if slug in self._aliases:
+            return self._aliases[slug]
+        keys = sorted({key for alias, key in self._aliases.items() if alias.startswith(slug)})
+        return {"$in": keys + [re.compile("^" + re.escape(slug))]}
+
+
+registry = VenueRegistry()
+
+
+def annotate_venue_key(event: Dict[str, Any], venues: VenueRegistry = registry) -> Optional[str]:
+    """Set ``location.venueKey`` on an event document from its venue name"""
+    location = event.get("location")
+    if not isinstance(location, dict):
+        return None
+    key = venues.key_for(location.get("venue"))
+    if key:
+        location["venueKey"] = key
+    else:
+        location.pop("venueKey", None)
+    return key
+
+
+def backfill_venue_keys(db, venues: VenueRegistry = registry, batch_size: int = 500) -> int:
+    """Add or correct venueKey on stored events; returns documents updated"""
+    operations: List[UpdateOne] = []
+    updated = 0
+    cursor = db.events.find(
+        {"location.venue": {"$exists": True}},
+        {"location.venue": 1, "location.venueKey": 1}
+    )
+    for doc in cursor:
+        location = doc.get("location") or {}
+        key = venues.key_for(location.get("venue"))
+        if key and location.get("venueKey") != key:
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {VENUE_KEY_FIELD: key}}))
+        if len(operations) >= batch_size:
+            updated += _flush(db, operations)
+    return updated + _flush(db, operations)
+
+
+def _flush(db, operations: List[UpdateOne]) -> int:
+    if not operations:
+        return 0
+    batch = operations[:]
+    operations.clear()
+    db.events.bulk_write(batch, ordered=False)
+    return len(batch)
+
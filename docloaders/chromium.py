@@ -22,6 +22,7 @@ class ChromiumLoader(BaseLoader):
         proxy: A dictionary containing proxy settings; None disables protection.
         urls: A list of URLs to scrape content from.
         requires_js_support: Flag to determine if JS rendering is required.
+        fetch_profile: Fetch profile for every URL; None picks each URL's site profile.
     """
 
     def __init__(
@@ -37,6 +38,7 @@ class ChromiumLoader(BaseLoader):
         browser_name: str = "chromium",  # default chromium
         retry_limit: int = 1,
         timeout: int = 60,
+        fetch_profile: Optional[Any] = None,
         **kwargs: Any,
     ):
         """Initialize the loader with a list of URL paths.
@@ -49,6 +51,8 @@ class ChromiumLoader(BaseLoader):
             requires_js_support: Whether to use JS rendering for scraping.
             retry_limit: Maximum number of retry attempts for scraping. Defaults to 3.
             timeout: Maximum time in seconds to wait for scraping. Defaults to 10.
+            fetch_profile: A ``FetchProfile`` controlling blocked resources and readiness
+                waits; defaults to the profile registered for each URL's site.
             kwargs: A dictionary containing additional browser kwargs.
 
         Raises:
@@ -72,6 +76,7 @@ class ChromiumLoader(BaseLoader):
         self.browser_name = kwargs.get("browser_name", browser_name)
         self.retry_limit = kwargs.get("retry_limit", retry_limit)
         self.timeout = kwargs.get("timeout", timeout)
+        self.fetch_profile = fetch_profile
 
     async def scrape(self, url: str) -> str:
         if self.backend == "playwright":
@@ -336,8 +341,14 @@ class ChromiumLoader(BaseLoader):
         """
         from playwright.async_api import async_playwright
         from undetected_playwright import Malenia
+        from scraping_components.fetch_profiles import (
+            apply_profile_async,
+            profile_for,
+            wait_until_ready_async,
+        )
 
         logger.info(f"Starting scraping with {self.backend}...")
+        profile = self.fetch_profile or profile_for(url)
         results = ""
         attempt = 0
 
@@ -362,11 +373,14 @@ class ChromiumLoader(BaseLoader):
                     context = await browser.new_context(
                         storage_state=self.storage_state,
                         ignore_https_errors=True,
+                        **profile.context_options(),
                     )
                     await Malenia.apply_stealth(context)
+                    await apply_profile_async(context, profile)
                     page = await context.new_page()
-                    await page.goto(url, wait_until="domcontentloaded")
+                    await page.goto(url, wait_until=profile.wait_until)
                     await page.wait_for_load_state(self.load_state)
+                    await wait_until_ready_async(page, profile)
                     results = await page.content()
                     logger.info("Content scraped")
                     await browser.close()
@@ -396,8 +410,14 @@ class ChromiumLoader(BaseLoader):
             ValueError: When an invalid browser name is provided
         """
         from playwright.async_api import async_playwright
+        from scraping_components.fetch_profiles import (
+            apply_profile_async,
+            navigate_async,
+            profile_for,
+        )
 
         logger.info(f"Starting scraping with JavaScript support for {url}...")
+        profile = self.fetch_profile or profile_for(url)
         attempt = 0
 
         while attempt < self.retry_limit:
@@ -419,10 +439,12 @@ class ChromiumLoader(BaseLoader):
                     else:
                         raise ValueError(f"Invalid browser name: {browser_name}")
                     context = await browser.new_context(
-                        storage_state=self.storage_state
+                        storage_state=self.storage_state,
+                        **profile.context_options(),
                     )
+                    await apply_profile_async(context, profile)
                     page = await context.new_page()
-                    await page.goto(url, wait_until="networkidle")
+                    await navigate_async(page, url, profile)
                     results = await page.content()
                     logger.info("Content scraped after JavaScript rendering")
                     return results
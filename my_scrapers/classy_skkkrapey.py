@@ -23,14 +23,14 @@ Key Features:
 import argparse
 import sys
 import json
-import time
 import random
 import re
 import logging
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
-from typing import Optional, List, Any, Type, TypedDict, Literal
+from typing import Optional, List, Any, Callable, Iterator, Type, TypedDict, Literal
 from dataclasses import dataclass
 
 # --- Dependency Imports ---
@@ -47,6 +47,18 @@ except ImportError:
     Page = None
     Browser = None
 
+# Shared infrastructure lives in the top-level component packages
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_components.browser_pool import acquire_shared_pool, release_shared_pool
+from scraping_components.crawl_engine import run_scrape
+from scraping_components.crawl_frontier import CrawlFrontier, open_frontier
+from scraping_components.fetch_profiles import navigate, profile_for
+from scraping_components.http_cache import install_http_cache, session_cache_report
+from scraping_components.ndjson_sink import NDJSONSink
+from scraping_components.rate_limiter import delay_options, shared_limiter
+from scraping_components.readiness import readiness_report
+from parse_components.site_specs import SiteExtractor, get_site_extractor
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -60,6 +72,7 @@ class ScraperConfig:
     min_delay: float
     max_delay: float
     verbose: bool # Added for more control over logging
+    resume: bool = False # Continue an interrupted crawl from its frontier checkpoint
 
 # --- Constants ---
 OUTPUT_DIR_DEFAULT = "output"
@@ -116,11 +129,18 @@ class EventSchema(TypedDict, total=False):
 class BaseEventScraper:
     """A base class for web scrapers with common, site-agnostic functionality."""
 
-    def __init__(self, use_browser: bool = False, headless: bool = True):
+    # Whether event pages on this site need JavaScript rendering
+    requires_browser: bool = False
+    # Name of this site's declarative extraction spec in parse_components/specs/
+    extraction_spec: Optional[str] = None
+    _extractor: Optional[SiteExtractor] = None
+
+    def __init__(self, use_browser: bool = False, headless: bool = True,
+                 min_delay: float = MIN_DELAY_DEFAULT, max_delay: float = MAX_DELAY_DEFAULT):
         self.use_browser_default = use_browser # Renamed to avoid conflict with method param
         self.headless = headless
-        self.browser: Any = None  # Changed from Optional[Browser] to Any to avoid type expression error
-        self.playwright_context = None # Renamed from playwright to avoid conflict with module
+        self.random_delay_range = (min_delay, max_delay)
+        self.browser_pool: Any = None  # Shared BrowserPool, acquired on first browser use
         self.current_user_agent = random.choice(MODERN_USER_AGENTS)
         self.session = self._create_session()
         self.pages_scraped_since_ua_rotation = 0
@@ -130,8 +150,22 @@ class BaseEventScraper:
             if sync_playwright is None:
                 raise ImportError("Playwright is not installed. Please run 'pip install playwright' and 'playwright install'.")
             print("[INFO] Starting Playwright...")
-            self.playwright_context = sync_playwright().start()
-            self.browser = self.playwright_context.chromium.launch(headless=self.headless)
+            self._get_browser_pool().start()
+
+    def _get_browser_pool(self):
+        """Acquires the process-wide browser pool on first use."""
+        if self.browser_pool is None:
+            self.browser_pool = acquire_shared_pool(headless=self.headless)
+        return self.browser_pool
+
+    @property
+    def extractor(self) -> SiteExtractor:
+        """The compiled extractor for ``extraction_spec``, shared by every scraper using that spec."""
+        if self._extractor is None:
+            if not self.extraction_spec:
+                raise NotImplementedError(f"{type(self).__name__} does not define an extraction_spec.")
+            self._extractor = get_site_extractor(self.extraction_spec)
+        return self._extractor
 
     def _create_session(self) -> requests.Session:
         session = requests.Session()
@@ -140,6 +174,7 @@ class BaseEventScraper:
         adapter = HTTPAdapter(max_retries=retries)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
+        install_http_cache(session) # Conditional GETs against the shared on-disk cache
         return session
 
     def rotate_user_agent(self):
@@ -156,46 +191,53 @@ class BaseEventScraper:
             self.rotate_user_agent()
 
         if self.use_browser_default or use_browser_override:
-            if not self.browser: # Ensure browser is initialized if default is False but override is True
-                if sync_playwright is None:
-                    raise ImportError("Playwright is not installed for on-demand browser use.")
-                if not self.playwright_context: # Initialize Playwright if not already done
-                    print("[INFO] Starting Playwright for on-demand browser use...")
-                    self.playwright_context = sync_playwright().start()
-                self.browser = self.playwright_context.chromium.launch(headless=self.headless)
-
-            page: Optional["Page"] = None # Ensure page is defined for finally block
+            if sync_playwright is None:
+                raise ImportError("Playwright is not installed for on-demand browser use.")
+
+            # The site's fetch profile blocks what extraction never reads and
+            # replaces the old networkidle wait with the site's readiness signal
+            profile = profile_for(url)
             try:
-                page = self.browser.new_page(user_agent=self.current_user_agent)
-                print(f"[INFO] Fetching with Playwright: {url}")
-                page.goto(url, wait_until="networkidle", timeout=45000) # Increased timeout
-                content = page.content()
+                with self._get_browser_pool().page(user_agent=self.current_user_agent, profile=profile) as page:
+                    print(f"[INFO] Fetching with Playwright: {url}")
+                    navigate(page, url, profile)
+                    content = page.content()
             except Exception as e:
                 print(f"[ERROR] Playwright fetch failed for {url}: {e}")
                 raise # Re-raise the exception to be handled by the caller
-            finally:
-                if page:
-                    page.close()
             return content
         else:
             print(f"[INFO] Fetching with Requests: {url}")
-            time.sleep(random.uniform(1, 3))  # Respectful rate limiting
-            response = self.session.get(url, timeout=20) # Increased timeout
+            limiter = shared_limiter()
+            # Per-host adaptive spacing within the configured delay range, shared with the crawl engine
+            limiter.wait(url, **delay_options(*self.random_delay_range))
+            try:
+                response = self.session.get(url, timeout=20) # Increased timeout
+            except requests.RequestException as e:
+                limiter.record_exception(url, e)
+                raise
+            limiter.record(url, response.status_code, response.headers)
             response.raise_for_status()
             return response.text
 
     def close(self):
-        """Closes the browser and playwright instances gracefully."""
-        if self.browser:
-            self.browser.close()
-        if self.playwright_context:
-            self.playwright_context.stop()
+        """Releases this scraper's hold on the shared browser pool."""
+        if self.browser_pool is not None:
+            release_shared_pool(self.browser_pool)
+            self.browser_pool = None
+        for report in (session_cache_report(self.session), readiness_report()):
+            if report:
+                print(f"[INFO] {report}")
         print("[INFO] Scraper resources closed.")
 
     def scrape_event_data(self, url: str) -> Optional[EventSchema]:
         """Abstract method for site-specific event data scraping."""
         raise NotImplementedError("Each scraper subclass must implement 'scrape_event_data'.")
 
+    def parse_event_html(self, url: str, html: str) -> Optional[EventSchema]:
+        """Abstract method turning an already-fetched event page into an EventSchema."""
+        raise NotImplementedError("Each scraper subclass must implement 'parse_event_html'.")
+
     def crawl_listing_for_events(self, url: str) -> List[str]:
         """Abstract method for site-specific event link crawling."""
         raise NotImplementedError("Each scraper subclass must implement 'crawl_listing_for_events'.")
@@ -205,6 +247,8 @@ class BaseEventScraper:
 class TicketsIbizaScraper(BaseEventScraper):
     """Scraper for ticketsibiza.com, using a multi-layered extraction strategy."""
 
+    extraction_spec = "ticketsibiza-event"
+
     def _parse_json_ld(self, soup: BeautifulSoup) -> Optional[EventSchema]:
         scripts = soup.find_all("script", type="application/ld+json")
         for script_tag in scripts: # Renamed variable
@@ -250,32 +294,36 @@ class TicketsIbizaScraper(BaseEventScraper):
             extractionMethod="microdata"
         )
 
-    def _parse_html_fallback(self, soup: BeautifulSoup) -> Optional[EventSchema]:
-        title_tag = soup.select_one("h1.entry-title") # Specific to TicketsIbiza
-        if not title_tag: return None
+    def _parse_html_fallback(self, html: str) -> Optional[EventSchema]:
+        fields = self.extractor.extract(html)
+        if not fields: return None
         return EventSchema(
-            title=title_tag.text.strip(),
+            title=fields["title"],
             extractionMethod="html-fallback"
         )
 
+    def parse_event_html(self, url: str, html: str) -> Optional[EventSchema]:
+        soup = BeautifulSoup(html, "html.parser")
+
+        event_data = self._parse_json_ld(soup)
+        if not event_data:
+            event_data = self._parse_microdata(soup)
+        if not event_data:
+            event_data = self._parse_html_fallback(html)
+
+        if event_data:
+            event_data["url"] = url
+            event_data["scrapedAt"] = datetime.utcnow().isoformat() + "Z"
+            return event_data
+
+        print(f"[WARNING] No data could be extracted for {url}")
+        return None
+
     def scrape_event_data(self, url: str) -> Optional[EventSchema]:
         print(f"[INFO] Scraping (TicketsIbiza): {url}")
         try:
             html = self.fetch_page(url) # Defaults to requests for this scraper
-            soup = BeautifulSoup(html, "html.parser")
-            
-            event_data = self._parse_json_ld(soup)
-            if not event_data:
-                event_data = self._parse_microdata(soup)
-            if not event_data:
-                event_data = self._parse_html_fallback(soup)
-            
-            if event_data:
-                event_data["url"] = url
-                event_data["scrapedAt"] = datetime.utcnow().isoformat() + "Z"
-                return event_data
-            
-            print(f"[WARNING] No data could be extracted for {url}")
+            return self.parse_event_html(url, html)
         except requests.exceptions.RequestException as e:
             print(f"[ERROR] Request failed for {url}: {e}")
         except Exception as e:
@@ -305,36 +353,63 @@ class TicketsIbizaScraper(BaseEventScraper):
 class IbizaSpotlightScraper(BaseEventScraper):
     """Scraper for ibiza-spotlight.com, with forced browser rendering and refined link filtering."""
 
+    # Individual event pages on Spotlight might also need JS, so force browser
+    requires_browser = True
+    extraction_spec = "ibiza-spotlight-event"
+
+    def parse_event_html(self, url: str, html: str) -> Optional[EventSchema]:
+        fields = self.extractor.extract(html)
+
+        if not fields or not fields.get("title"):
+            print(f"[WARNING] No title found for {url}. This might be a calendar page or unexpected structure.")
+            # Attempt to see if it's a calendar page title to avoid mislabeling
+            # Calendar page titles are usually like "Ibiza Spotlight Party Calendar Month Year"
+            # If we correctly filter links, we shouldn't land here often for calendar pages.
+            # However, if a link was misidentified, this helps.
+            # For now, if no specific event title, return None.
+            return None
+
+        event_data: EventSchema = {
+            "title": fields["title"],
+            "url": url,
+            "scrapedAt": datetime.utcnow().isoformat() + "Z",
+            "extractionMethod": "html-dynamic"
+        }
+        if fields.get("venue"):
+            event_data["location"] = LocationSchema(venue=fields["venue"])
+
+        date_time = DateTimeSchema()
+        if fields.get("date_text"):
+            date_time["startDate"] = fields["date_text"]  # time[datetime] when present, else the visible text
+        if fields.get("start_time"):
+            date_time["doorTime"] = fields["start_time"].strftime("%H:%M")
+        display = " ".join(part for part in (fields.get("date_text"), fields.get("time_text")) if part)
+        if display:
+            date_time["displayText"] = display
+        if date_time:
+            event_data["dateTime"] = date_time
+
+        lineup = [ArtistSchema(name=name) for name in fields.get("lineup") or [] if name]
+        if lineup:
+            lineup[0]["headliner"] = True
+            event_data["lineUp"] = lineup
+
+        ticket_info = TicketInfoSchema()
+        if fields.get("price_value") is not None:
+            ticket_info["startingPrice"] = fields["price_value"]
+        if fields.get("currency"):
+            ticket_info["currency"] = fields["currency"]
+        if ticket_info:
+            event_data["ticketInfo"] = ticket_info
+        if fields.get("description"):
+            event_data["description"] = fields["description"]
+        return event_data
+
     def scrape_event_data(self, url: str) -> Optional[EventSchema]:
         print(f"[INFO] Scraping (IbizaSpotlight): {url}")
         try:
-            # Individual event pages on Spotlight might also need JS, so force browser
-            html = self.fetch_page(url, use_browser_override=True)
-            soup = BeautifulSoup(html, "html.parser")
-            
-            # Try a more specific title selector first, then fallback
-            title_tag = soup.select_one("h1.eventTitle") # Common pattern for event detail pages
-            if not title_tag:
-                title_tag = soup.select_one("h1") # General fallback
-                
-            if not title_tag:
-                print(f"[WARNING] No title found for {url}. This might be a calendar page or unexpected structure.")
-                # Attempt to see if it's a calendar page title to avoid mislabeling
-                # Calendar page titles are usually like "Ibiza Spotlight Party Calendar Month Year"
-                # If we correctly filter links, we shouldn't land here often for calendar pages.
-                # However, if a link was misidentified, this helps.
-                # For now, if no specific event title, return None.
-                return None 
-            
-            event_data: EventSchema = {
-                "title": title_tag.text.strip(),
-                "url": url,
-                "scrapedAt": datetime.utcnow().isoformat() + "Z",
-                "extractionMethod": "html-dynamic"
-                # TODO: Add more detailed field extraction for Spotlight event pages
-                # (e.g., date, venue, lineup) using selectors from reverse-scrape log.
-            }
-            return event_data
+            html = self.fetch_page(url, use_browser_override=self.requires_browser)
+            return self.parse_event_html(url, html)
         except Exception as e: # Catch Playwright errors or others
             print(f"[ERROR] Error scraping Ibiza Spotlight event page {url}: {e}")
         return None
@@ -469,6 +544,7 @@ def _parse_arguments() -> ScraperConfig:
     parser.add_argument("--min_delay", type=float, default=MIN_DELAY_DEFAULT, help="Minimum delay (seconds) between individual event scrapes during crawling.")
     parser.add_argument("--max_delay", type=float, default=MAX_DELAY_DEFAULT, help="Maximum delay (seconds) between individual event scrapes during crawling.")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging.")
+    parser.add_argument("--resume", action="store_true", help="Resume an interrupted crawl of the same URL, skipping events already scraped.")
 
     args = parser.parse_args()
 
@@ -486,16 +562,18 @@ def _parse_arguments() -> ScraperConfig:
         output_dir=output_path,
         min_delay=args.min_delay,
         max_delay=args.max_delay,
-        verbose=args.verbose
+        verbose=args.verbose,
+        resume=args.resume
     )
 
 def _initialize_scraper(config: ScraperConfig) -> BaseEventScraper:
     """Initializes and returns the appropriate scraper instance."""
     try:
         ScraperClass = get_scraper_class(config.url)
-        # Default to use_browser=True for instantiation, as Spotlight needs it for crawling.
-        # Individual fetch_page calls within classes can decide if they need browser.
-        scraper_instance = ScraperClass(use_browser=True, headless=config.headless)
+        # Only sites that need rendering start a browser up front (Spotlight crawls with it);
+        # the others fetch over HTTP and the shared browser pool starts on first override.
+        scraper_instance = ScraperClass(use_browser=ScraperClass.requires_browser, headless=config.headless,
+                                        min_delay=config.min_delay, max_delay=config.max_delay)
         return scraper_instance
     except ValueError as e:
         logger.fatal(f"Configuration error: {e}")
@@ -504,91 +582,128 @@ def _initialize_scraper(config: ScraperConfig) -> BaseEventScraper:
         logger.fatal(f"Dependency error: {e}. Please ensure Playwright is installed ('pip install playwright' and 'playwright install').")
         sys.exit(1)
 
-def _execute_scraping(scraper_instance: BaseEventScraper, config: ScraperConfig) -> List[EventSchema]:
-    """Executes the scraping or crawling process based on the configuration."""
-    all_events: List[EventSchema] = []
+def _execute_scraping(scraper_instance: BaseEventScraper, config: ScraperConfig,
+                      on_event: Callable[[EventSchema], None]) -> None:
+    """Executes the scraping or crawling process, handing each event to ``on_event`` as it arrives."""
     try:
         if config.action == SCRAPE_ACTION:
             event = scraper_instance.scrape_event_data(config.url)
             if event:
-                all_events.append(event)
+                on_event(event)
         
         elif config.action == CRAWL_ACTION:
-            event_urls = scraper_instance.crawl_listing_for_events(config.url)
-            
-            # Enhanced logging with actionable information
-            url_count = len(event_urls)
-            
-            if url_count > 0:
-                # Calculate time estimate based on delay settings
-                min_time = url_count * config.min_delay
-                max_time = url_count * config.max_delay
-                
-                logger.info(
-                    f"✓ Found {url_count} potential event link{'s' if url_count != 1 else ''} to scrape "
-                    f"(estimated time: {min_time:.0f}-{max_time:.0f} seconds)"
-                )
-                
-                # Log sample URLs in debug mode
-                if logger.isEnabledFor(logging.DEBUG):
-                    sample = min(3, url_count)
-                    logger.debug(f"First {sample} URLs: {event_urls[:sample]}")
-            else:
-                logger.warning(
-                    "⚠️  No event URLs found after filtering.\n"
-                    "   Troubleshooting:\n"
-                    "   • Run with --no-headless to see the page\n"
-                    "   • Check if CSS selectors need updating\n"
-                    "   • Verify JavaScript loads completely\n"
-                    "   • Test a different page with known events"
-                )
-
-            for i, url_to_scrape in enumerate(event_urls, 1):
-                logger.info(f"--- Scraping event {i}/{len(event_urls)}: {url_to_scrape} ---")
-                event = scraper_instance.scrape_event_data(url_to_scrape)
-                if event:
-                    all_events.append(event)
-                # Add a small delay between scraping individual event pages
-                time.sleep(random.uniform(config.min_delay, config.max_delay))
+            with open_frontier(f"{CRAWL_ACTION}:{config.url}", resume=config.resume) as frontier:
+                _crawl_with_frontier(scraper_instance, config, on_event, frontier)
     except Exception as e:
         logger.fatal(f"An unexpected error occurred during {config.action}: {e}", exc_info=True)
-    return all_events
 
-def _save_results(all_events: List[EventSchema], config: ScraperConfig):
-    """Saves the scraped events to JSON and Markdown files."""
-    if not all_events:
-        logger.info("No events were ultimately scraped. Skipping file output.")
-        return
+def _crawl_with_frontier(scraper_instance: BaseEventScraper, config: ScraperConfig,
+                         on_event: Callable[[EventSchema], None], frontier: CrawlFrontier) -> None:
+    """Crawls the listing and scrapes its events, checkpointing progress in ``frontier``.
+
+    On ``--resume`` the listing is not re-walked once its links are stored, and
+    events finished by the interrupted run are skipped.
+    """
+    if frontier.get_meta("listing_complete"):
+        event_urls = frontier.urls()
+        logger.info(f"Resuming crawl: {frontier.report()}")
+    else:
+        event_urls = scraper_instance.crawl_listing_for_events(config.url)
+        frontier.add(event_urls)
+        frontier.set_meta("listing_complete", True)
+
+    # Enhanced logging with actionable information
+    url_count = len(event_urls)
+    
+    if url_count > 0:
+        # Calculate time estimate based on delay settings
+        min_time = url_count * config.min_delay
+        max_time = url_count * config.max_delay
+        
+        logger.info(
+            f"✓ Found {url_count} potential event link{'s' if url_count != 1 else ''} to scrape "
+            f"(estimated time: {min_time:.0f}-{max_time:.0f} seconds)"
+        )
+        
+        # Log sample URLs in debug mode
+        if logger.isEnabledFor(logging.DEBUG):
+            sample = min(3, url_count)
+            logger.debug(f"First {sample} URLs: {event_urls[:sample]}")
+    else:
+        logger.warning(
+            "⚠️  No event URLs found after filtering.\n"
+            "   Troubleshooting:\n"
+            "   • Run with --no-headless to see the page\n"
+            "   • Check if CSS selectors need updating\n"
+            "   • Verify JavaScript loads completely\n"
+            "   • Test a different page with known events"
+        )
+
+    # Event pages are fetched concurrently; the engine still spaces requests
+    # to each host by min_delay..max_delay, as the old serial loop did.
+    # Events are written as they arrive instead of being held until the end.
+    run_scrape(
+        event_urls,
+        scraper_instance.parse_event_html,
+        on_result=lambda url, event: on_event(event) if event else None,
+        collect=False,
+        frontier=frontier,
+        # HTTP-capable sites escalate to the browser only for page types the router has seen need it
+        fetch_mode="browser" if scraper_instance.requires_browser else "auto",
+        min_delay=config.min_delay,
+        max_delay=config.max_delay,
+        headers=dict(scraper_instance.session.headers),
+        user_agents=MODERN_USER_AGENTS,
+        rotate_after=scraper_instance.rotate_ua_after_pages,
+        headless=config.headless,
+    )
+    logger.info(frontier.report())
+
+@contextmanager
+def _stream_results(config: ScraperConfig) -> Iterator[Callable[[EventSchema], None]]:
+    """Streams scraped events to NDJSON and Markdown files as they are produced.
 
-    logger.info(f"Successfully scraped {len(all_events)} events.")
+    A crash keeps everything written so far; empty outputs are removed on exit.
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     hostname = urlparse(config.url).hostname
+    json_path = config.output_dir / f"events_{hostname}_{timestamp}.ndjson"
+    md_path = config.output_dir / f"events_{hostname}_{timestamp}.md"
+
+    sink = NDJSONSink(json_path, default=datetime_serializer)
+    md_file = md_path.open("w", encoding="utf-8")
+    md_file.write(f"# Scrape Report - {timestamp}\n")
+    md_file.write(f"**Source URL**: {config.url}\n")
+    md_file.write(f"**Action**: {config.action}\n\n---\n\n")
+
+    def write_event(event_item: EventSchema) -> None:
+        try:
+            sink.write(event_item)
+            md_file.write(format_event_to_markdown(event_item))
+            md_file.write("\n\n---\n\n")
+            # On disk before the crawl frontier checkpoints the URL as done
+            sink.flush()
+            md_file.flush()
+        except (IOError, TypeError, ValueError) as e:
+            # Re-raised so the frontier leaves the URL in flight for --resume
+            logger.error(f"Failed to write event {event_item.get('url')}: {e}")
+            raise
 
-    # Save to JSON
-    json_filename = f"events_{hostname}_{timestamp}.json"
-    json_path = config.output_dir / json_filename
-    try:
-        with json_path.open("w", encoding="utf-8") as f:
-            json.dump({"events": all_events, "source_url": config.url, "action": config.action}, f, indent=2, default=datetime_serializer)
-        logger.info(f"Saved JSON to: {json_path}")
-    except IOError as e:
-        logger.error(f"Failed to save JSON to {json_path}: {e}")
-
-    # Save to Markdown
-    md_filename = f"events_{hostname}_{timestamp}.md"
-    md_path = config.output_dir / md_filename
     try:
-        with md_path.open("w", encoding="utf-8") as f:
-            f.write(f"# Scrape Report - {timestamp}\n")
-            f.write(f"**Source URL**: {config.url}\n")
-            f.write(f"**Action**: {config.action}\n")
-            f.write(f"**Total Events Scraped**: {len(all_events)}\n\n---\n\n")
-            for event_item in all_events:
-                f.write(format_event_to_markdown(event_item))
-                f.write("\n\n---\n\n")
-        logger.info(f"Saved Markdown to: {md_path}")
-    except IOError as e:
-        logger.error(f"Failed to save Markdown to {md_path}: {e}")
+        yield write_event
+    finally:
+        sink.close()
+        if sink.count:
+            md_file.write(f"**Total Events Scraped**: {sink.count}\n")
+        md_file.close()
+        if not sink.count:
+            logger.info("No events were ultimately scraped. Skipping file output.")
+            for path in sink.paths + [md_path]:
+                path.unlink(missing_ok=True)
+        else:
+            logger.info(f"Successfully scraped {sink.count} events.")
+            logger.info(f"Saved NDJSON to: {', '.join(str(p) for p in sink.paths)}")
+            logger.info(f"Saved Markdown to: {md_path}")
 
 def main():
     """Main function to orchestrate the scraping process."""
@@ -596,8 +711,8 @@ def main():
     scraper_instance: Optional[BaseEventScraper] = None
     try:
         scraper_instance = _initialize_scraper(config)
-        all_events = _execute_scraping(scraper_instance, config)
-        _save_results(all_events, config)
+        with _stream_results(config) as write_event:
+            _execute_scraping(scraper_instance, config, write_event)
     finally:
         if scraper_instance:
             scraper_instance.close()
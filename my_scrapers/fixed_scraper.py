@@ -14,13 +14,13 @@ import csv
 import json
 import random
 import re
+import sys
 import time
 import traceback
 from dataclasses import dataclass, asdict
 from datetime import datetime, date, time as dt_time
 from pathlib import Path
 from typing import List, Dict, Optional, Any
-from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
@@ -35,6 +35,10 @@ except ImportError:
     sync_playwright, Page, Browser, Route, Locator, stealth_sync = (None,) * 6
     PLAYWRIGHT_AVAILABLE = False
 
+# Shared infrastructure lives in the top-level component packages
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from parse_components.site_specs import get_site_extractor
+
 # --- Configuration ---
 SNAPSHOT_DIR = Path("debug_snapshots")
 OUTPUT_DIR = Path("output")
@@ -74,31 +78,21 @@ class Event:
         """
         Create an Event object from a single event card's HTML (BeautifulSoup object).
         This method now assumes venue and date are provided from the parent context.
+        Card fields are defined in parse_components/specs/ibiza-spotlight-card.yaml.
         """
         try:
-            title_elem = card_soup.select_one("h3.h3 a.trackEventSpotlight")
-            if not title_elem:
+            fields = get_site_extractor("ibiza-spotlight-card").extract(str(card_soup), base_url=base_url)
+            if not fields:
                 return None
 
-            title = title_elem.get_text(strip=True)
-            url = urljoin(base_url, title_elem.get("href", ""))
-
-            time_elem = card_soup.select_one("time")
-            start_time = cls._parse_time(time_elem.get_text(strip=True)) if time_elem else None
-
-            price_elem = card_soup.select_one(".price, .ticket-price")
-            price = cls._parse_price(price_elem.get_text(strip=True)) if price_elem else None
-            
-            djs = [dj.get_text(strip=True) for dj in card_soup.select(".partyDj a")]
-
             return cls(
-                title=title,
+                title=fields["title"],
                 date=event_date,
                 venue=venue,
-                url=url,
-                start_time=start_time,
-                price=price,
-                djs=djs or None,
+                url=fields.get("url", base_url),
+                start_time=fields.get("start_time"),
+                price=fields.get("price"),
+                djs=fields.get("djs") or None,
                 extraction_method="html_parsing"
             )
         except Exception as e:
@@ -106,20 +100,6 @@ class Event:
             print(f"[DEBUG] Card content: {str(card_soup)[:300]}...")
             return None
 
-    @staticmethod
-    def _parse_time(ts: Optional[str]) -> Optional[dt_time]:
-        if not ts: return None
-        match = re.search(r'(\d{1,2}):(\d{2})', ts)
-        if match:
-            return dt_time(hour=int(match.group(1)), minute=int(match.group(2)))
-        return None
-
-    @staticmethod
-    def _parse_price(price_str: Optional[str]) -> Optional[float]:
-        if not price_str: return None
-        numbers = re.findall(r'\d+\.?\d*', re.sub(r'[€$£,]', '', price_str))
-        return float(numbers[0]) if numbers else None
-
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to a dictionary for serialization."""
         data = asdict(self)
@@ -6,7 +6,6 @@ and better code organization.
 
 import asyncio
 import time
-import random
 import logging
 from typing import List, Optional, Dict, Any, Callable
 from dataclasses import dataclass, field
@@ -19,6 +18,8 @@ from classy_skkkrapey import (
     BaseEventScraper, EventSchema, ScraperConfig,
     SCRAPE_ACTION, CRAWL_ACTION
 )
+from scraping_components.crawl_frontier import CrawlFrontier, open_frontier
+from scraping_components.rate_limiter import delay_options, shared_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -64,10 +65,12 @@ class ScrapingProgress:
 class ScrapingExecutor:
     """Enhanced scraping executor with improved error handling and performance features."""
     
-    def __init__(self, scraper_instance: BaseEventScraper, config: ScraperConfig):
+    def __init__(self, scraper_instance: BaseEventScraper, config: ScraperConfig,
+                 frontier: Optional[CrawlFrontier] = None):
         self.scraper = scraper_instance
         self.config = config
         self.progress = ScrapingProgress()
+        self.frontier = frontier  # Checkpoints crawl progress so --resume can skip finished URLs
         
     def execute(self) -> List[EventSchema]:
         """Execute the scraping process with enhanced error handling and progress tracking."""
@@ -133,6 +136,10 @@ class ScrapingExecutor:
     
     def _crawl_with_validation(self) -> List[str]:
         """Crawl for event URLs with validation and logging."""
+        if self.frontier is not None and self.frontier.get_meta("listing_complete"):
+            logger.info(f"Resuming crawl for {self.config.url}: {self.frontier.report()}")
+            return self.frontier.urls()
+
         logger.info(f"Starting crawl operation for: {self.config.url}")
         
         try:
@@ -140,6 +147,9 @@ class ScrapingExecutor:
             
             # Validate and deduplicate URLs
             validated_urls = self._validate_urls(event_urls)
+            if self.frontier is not None:
+                self.frontier.add(validated_urls)
+                self.frontier.set_meta("listing_complete", True)
             
             logger.info(
                 f"Crawl complete: Found {len(event_urls)} URLs, "
@@ -174,6 +184,9 @@ class ScrapingExecutor:
     def _scrape_event_urls(self, event_urls: List[str]) -> List[EventSchema]:
         """Scrape a list of event URLs with progress tracking and error recovery."""
         all_events: List[EventSchema] = []
+        if self.frontier is not None:
+            # Skip URLs finished (or given up on) by an interrupted earlier run
+            event_urls = [url for url in event_urls if self.frontier.state(url) in (None, "queued")]
         self.progress.total_urls = len(event_urls)
         
         logger.info(f"Starting to scrape {len(event_urls)} event URLs")
@@ -196,6 +209,10 @@ class ScrapingExecutor:
             f"- Total time: {self.progress.elapsed_time:.1f}s"
         )
         
+        if self.frontier is not None:
+            logger.info(self.frontier.report())
+        logger.info(shared_limiter().report())
+        
         if self.progress.errors:
             logger.warning(f"Encountered {len(self.progress.errors)} errors during scraping")
             self._save_error_report()
@@ -203,10 +220,13 @@ class ScrapingExecutor:
         return all_events
     
     def _scrape_sequential(self, event_urls: List[str]) -> List[EventSchema]:
-        """Scrape URLs sequentially with delays."""
+        """Scrape URLs sequentially; the scraper's fetches are spaced by the shared rate limiter."""
         all_events: List[EventSchema] = []
+        limiter = shared_limiter()
         
         for i, url in enumerate(event_urls, 1):
+            # Hosts start at the configured delay range and adapt from there
+            limiter.controller(url, **delay_options(self.config.min_delay, self.config.max_delay))
             try:
                 # Progress update
                 logger.info(
@@ -215,7 +235,10 @@ class ScrapingExecutor:
                 )
                 
                 # Scrape with retry logic
+                if self.frontier is not None:
+                    self.frontier.begin(url)
                 event = self._scrape_with_retry(url)
+                self._checkpoint(url, event)
                 
                 if event:
                     all_events.append(event)
@@ -226,17 +249,12 @@ class ScrapingExecutor:
                     logger.warning(f"No data extracted from: {url}")
                 
             except Exception as e:
+                self._checkpoint(url, None, e)
                 self._handle_scraping_error(url, e)
             
             finally:
                 self.progress.processed_urls += 1
                 
-                # Add delay between requests (except for the last one)
-                if i < len(event_urls):
-                    delay = random.uniform(self.config.min_delay, self.config.max_delay)
-                    logger.debug(f"Waiting {delay:.2f}s before next request...")
-                    time.sleep(delay)
-                
                 # Log progress every 10 URLs or at specific percentages
                 if i % 10 == 0 or i in [len(event_urls) // 4, len(event_urls) // 2, 3 * len(event_urls) // 4]:
                     self.progress.log_progress()
@@ -251,6 +269,9 @@ class ScrapingExecutor:
         logger.info(f"Using concurrent scraping with {max_workers} workers")
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if self.frontier is not None:
+                for url in event_urls:
+                    self.frontier.begin(url)
             # Submit all tasks
             future_to_url = {
                 executor.submit(self._scrape_with_retry, url): url
@@ -262,6 +283,7 @@ class ScrapingExecutor:
                 url = future_to_url[future]
                 try:
                     event = future.result()
+                    self._checkpoint(url, event)
                     if event:
                         all_events.append(event)
                         self.progress.successful_scrapes += 1
@@ -269,6 +291,7 @@ class ScrapingExecutor:
                         self.progress.failed_scrapes += 1
                         
                 except Exception as e:
+                    self._checkpoint(url, None, e)
                     self._handle_scraping_error(url, e)
                 
                 finally:
@@ -299,6 +322,17 @@ class ScrapingExecutor:
         
         raise last_error
     
+    def _checkpoint(self, url: str, event: Optional[EventSchema], error: Optional[Exception] = None):
+        """Record a URL's outcome in the frontier, if the run has one."""
+        if self.frontier is None:
+            return
+        if event:
+            self.frontier.mark_done(url)
+        else:
+            # _scrape_with_retry already retried transient errors; leave the
+            # rest to a later --resume run rather than blocking this one.
+            self.frontier.mark_failed(url, f"{type(error).__name__}: {error}" if error else "no event data")
+    
     def _handle_scraping_error(self, url: str, error: Exception):
         """Handle and log scraping errors."""
         error_info = {
@@ -345,9 +379,13 @@ def execute_scraping_improved(scraper_instance: BaseEventScraper, config: Scrape
     Improved version of _execute_scraping with enhanced error handling and progress tracking.
     
     This is a drop-in replacement for the original _execute_scraping function.
+    Crawls are checkpointed in a frontier; ``config.resume`` continues the last
+    interrupted crawl of the same URL.
     """
-    executor = ScrapingExecutor(scraper_instance, config)
-    return executor.execute()
+    if config.action != CRAWL_ACTION:
+        return ScrapingExecutor(scraper_instance, config).execute()
+    with open_frontier(f"improved-{CRAWL_ACTION}:{config.url}", resume=config.resume) as frontier:
+        return ScrapingExecutor(scraper_instance, config, frontier=frontier).execute()
 
 
 # Example of how to integrate this into the existing code:
@@ -1,17 +1,17 @@
-import locale
 import argparse
 from datetime import datetime
 import json
 import random
 import re
 import sys
-import time
 from pathlib import Path
 from typing import Dict, List, Optional, TypedDict
 from urllib.parse import urljoin, urlparse
 
 # Add the current directory to sys.path to fix import issues
 sys.path.insert(0, str(Path(__file__).parent))
+# Shared infrastructure lives in the top-level component packages
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 # Import the specific module directly without going through __init__.py
 import importlib.util
@@ -30,6 +30,15 @@ try:
 except Exception:  # pragma: no cover - playwright may not be installed
     sync_playwright = None
 
+from scraping_components.async_fetcher import ACCEPT_ENCODING
+from scraping_components.browser_pool import acquire_shared_pool, release_shared_pool
+from scraping_components.crawl_engine import run_scrape
+from scraping_components.fetch_profiles import profile_for, wait_until_ready
+from scraping_components.http_cache import install_http_cache, session_cache_report
+from scraping_components.rate_limiter import delay_options, shared_limiter
+from scraping_components.readiness import readiness_report
+from parse_components.site_specs import get_site_extractor
+
 DEFAULT_TARGET_URL = "https://www.ibiza-spotlight.com/night/events/2025/05?daterange=26/05/2025-01/06/2025"
 
 MODERN_USER_AGENTS = [
@@ -264,12 +273,34 @@ class ImprovedMultiLayerEventScraper:
         self.current_user_agent: Optional[str] = None
         self.pages_scraped_since_ua_rotation: int = 0
         self.rotate_ua_after_pages: int = random.randint(6, 12)
+        self.browser_pool = None  # Shared BrowserPool, acquired on first browser fetch
+        self.session: Optional[requests.Session] = None
         self.rotate_user_agent()
 
+    def _get_browser_pool(self):
+        """Acquire the shared browser pool on first use."""
+        if self.browser_pool is None:
+            self.browser_pool = acquire_shared_pool(
+                headless=self.headless, slow_mo=self.playwright_slow_mo
+            )
+        return self.browser_pool
+
+    def close(self):
+        """Release this scraper's hold on the shared browser pool."""
+        if self.browser_pool is not None:
+            release_shared_pool(self.browser_pool)
+            self.browser_pool = None
+        for report in (session_cache_report(self.session), readiness_report()):
+            if report:
+                print(f"[INFO] {report}")
+
     def rotate_user_agent(self):
-        """Rotates the User-Agent and re-initializes the session."""
+        """Rotates the User-Agent in place, keeping the session's pooled connections."""
         self.current_user_agent = random.choice(self.user_agents)
-        self.session = self._setup_session()
+        if self.session is None:
+            self.session = self._setup_session()
+        else:
+            self.session.headers["User-Agent"] = self.current_user_agent
         self.pages_scraped_since_ua_rotation = 0
         self.rotate_ua_after_pages = random.randint(6, 12)
 
@@ -290,7 +321,7 @@ class ImprovedMultiLayerEventScraper:
             "User-Agent": self.current_user_agent or MODERN_USER_AGENTS[0],
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
             "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
+            "Accept-Encoding": ACCEPT_ENCODING,  # br only when brotli can decode it
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
             "Sec-Fetch-Dest": "document",
@@ -298,54 +329,49 @@ class ImprovedMultiLayerEventScraper:
             "Sec-Fetch-Site": "none",
             "Sec-Fetch-User": "?1",
         }
-# Set locale to C.UTF-8 to ensure English date parsing
-locale.setlocale(locale.LC_TIME, 'C.UTF-8')
-full_date_str = f"{dates[0]} {current_year}"
         session.headers.update(headers)
+        install_http_cache(session)  # Conditional GETs against the shared on-disk cache
         return session
 
     def fetch_page(self, url: str, use_browser_for_this_fetch: bool = False) -> Optional[str]:
         """Fetch page HTML with error handling and strategic browser use."""
         if self.use_browser and use_browser_for_this_fetch and sync_playwright is not None:
             try:
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(
-                        headless=self.headless, slow_mo=self.playwright_slow_mo
-                    )
-                    context = browser.new_context(
-                        user_agent=self.current_user_agent,
-                        viewport={'width': 1920, 'height': 1080}
-                    )
-                    page = context.new_page()
-                    
-                    # Handle cookie consent
-                    page.goto(url, timeout=30000)
-                    
-                    # Try to accept cookies if banner appears
+                profile = profile_for(url)
+                with self._get_browser_pool().page(
+                    user_agent=self.current_user_agent,
+                    profile=profile,
+                    viewport={'width': 1920, 'height': 1080},
+                ) as page:
+                    page.goto(url, wait_until=profile.wait_until, timeout=profile.navigation_timeout)
+
+                    # Try to accept cookies if banner appears. Pooled contexts keep
+                    # their cookies, so this only fires once per context.
                     try:
                         cookie_button = page.locator('text="NO PROBLEM"').first
                         if cookie_button.is_visible(timeout=3000):
                             cookie_button.click()
-                            time.sleep(1)
                     except:
                         pass  # Cookie banner might not appear
-                    
-                    # Wait for content to load
-                    page.wait_for_load_state('networkidle')
-                    content = page.content()
-                    browser.close()
-                    return content
+
+                    # Return as soon as the event content is in the DOM and has settled
+                    wait_until_ready(page, profile)
+                    return page.content()
             except Exception as e:
                 print(f"Browser fetch failed for {url}: {e}", file=sys.stderr)
                 return None
         else:
             # Fallback to requests
-            time.sleep(random.uniform(self.random_delay_range[0], self.random_delay_range[1]))
+            limiter = shared_limiter()
+            limiter.wait(url, **delay_options(*self.random_delay_range))
             try:
                 response = self.session.get(url, timeout=10)
+                limiter.record(url, response.status_code, response.headers)
                 response.raise_for_status()
                 return response.text
             except Exception as e:
+                if isinstance(e, requests.RequestException) and e.response is None:
+                    limiter.record(url, None)  # Timeouts and exhausted retries slow the host down
                 print(f"Error fetching {url} with requests: {e}", file=sys.stderr)
                 return None
 
@@ -476,7 +502,10 @@ full_date_str = f"{dates[0]} {current_year}"
         html = self.fetch_page(url, use_browser_for_this_fetch=attempt_with_browser)
         if not html:
             return {}
+        return self.parse_event_html(url, html)
 
+    def parse_event_html(self, url: str, html: str) -> Dict:
+        """Run the improved extraction strategies over already-fetched page HTML."""
         soup = BeautifulSoup(html, "html.parser")
         now_iso = datetime.utcnow().isoformat() + "Z"
 
@@ -491,7 +520,7 @@ full_date_str = f"{dates[0]} {current_year}"
         date_data = self.extract_improved_date_data(html)
         
         # Basic extraction (existing methods)
-        basic_data = self.extract_ibiza_spotlight_data(soup)
+        basic_data = self.extract_ibiza_spotlight_data(html)
         meta_data = self.extract_meta_data(soup)
         
         # Combine all data
@@ -635,59 +664,9 @@ full_date_str = f"{dates[0]} {current_year}"
                 continue
         return None
 
-    def extract_ibiza_spotlight_data(self, soup: BeautifulSoup) -> Dict:
-        """Extract data using Ibiza Spotlight specific selectors."""
-        data: Dict[str, str] = {}
-
-        # Title extraction
-        title_selectors = [
-            "h1:contains('presents')",
-            ".event-title", 
-            "h1",
-            ".entry-title"
-        ]
-        for selector in title_selectors:
-            try:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    data["title"] = title_elem.get_text(strip=True)
-                    break
-            except:
-                continue
-
-        # Venue extraction
-        venue_selectors = [
-            "a[href*='/night/venues/']",
-            ".venue",
-            ".venue-name",
-            '[class*="venue"]'
-        ]
-        for selector in venue_selectors:
-            try:
-                venue_elem = soup.select_one(selector)
-                if venue_elem:
-                    data["venue"] = venue_elem.get_text(strip=True)
-                    break
-            except:
-                continue
-
-        # Description extraction
-        desc_selectors = [
-            ".event-description",
-            ".description",
-            ".entry-content",
-            "p"
-        ]
-        for selector in desc_selectors:
-            try:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    data["description"] = desc_elem.get_text(strip=True)[:500]
-                    break
-            except:
-                continue
-
-        return data
+    def extract_ibiza_spotlight_data(self, html: str) -> Dict:
+        """Extract title, venue and description with the ``ibiza-spotlight-basic`` spec."""
+        return get_site_extractor("ibiza-spotlight-basic").extract(html) or {}
 
     def extract_meta_data(self, soup: BeautifulSoup) -> Dict:
         """Extract Open Graph and meta tag data."""
@@ -789,6 +768,19 @@ full_date_str = f"{dates[0]} {current_year}"
 
 # --- Crawling Logic (adapted from original script) ---
 
+async def accept_cookie_banner(page) -> None:
+    """Async counterpart of the cookie handling in fetch_page, for the crawl engine.
+
+    The engine waits for the page's readiness signal after this hook.
+    """
+    try:
+        cookie_button = page.locator('text="NO PROBLEM"').first
+        if await cookie_button.is_visible(timeout=3000):
+            await cookie_button.click()
+    except Exception:
+        pass  # Cookie banner might not appear
+
+
 def extract_ibiza_spotlight_event_links(html: str, base_url: str) -> List[str]:
     """Extract event links from Ibiza Spotlight calendar pages."""
     soup = BeautifulSoup(html, "html.parser")
@@ -896,28 +888,28 @@ def crawl_ibiza_spotlight_events(
         event_links = event_links[:max_events]
         print(f"[INFO] Limiting to {len(event_links)} events based on max_events={max_events}.")
     
-    for idx, event_url in enumerate(event_links, 1):
-        print(f"\n[INFO] Scraping event {idx}/{len(event_links)}: {event_url}")
-        
-        try:
-            event_data = scraper.scrape_event_strategically(event_url)
-            
-            if event_data:
-                events.append(event_data)
-                title_to_print = event_data.get('title') if isinstance(event_data, dict) and event_data.get('title') else "Unknown Event"
-                print(f"[SUCCESS] Scraped: {title_to_print}")
-            else:
-                print(f"[WARNING] No data extracted for {event_url}")
-            
-            if idx < len(event_links):
-                delay = random.uniform(scraper.random_delay_range[0], scraper.random_delay_range[1])
-                print(f"[INFO] Waiting {delay:.1f}s before next event scrape...")
-                time.sleep(delay)
-                
-        except Exception as e:
-            print(f"[ERROR] Failed to scrape event detail page {event_url}: {e}")
-            continue
-            
+    def report(event_url: str, event_data: Optional[Dict]) -> None:
+        if event_data:
+            title_to_print = event_data.get('title') if isinstance(event_data, dict) and event_data.get('title') else "Unknown Event"
+            print(f"[SUCCESS] Scraped: {title_to_print}")
+        else:
+            print(f"[WARNING] No data extracted for {event_url}")
+
+    # Event pages are scraped concurrently; requests to the site are still spaced
+    # by the scraper's random_delay_range, as the old serial loop's sleeps were.
+    events = run_scrape(
+        event_links,
+        scraper.parse_event_html,
+        on_result=report,
+        fetch_mode="browser_first" if scraper.use_browser else "http",
+        is_sufficient=is_data_sufficient,
+        min_delay=scraper.random_delay_range[0],
+        max_delay=scraper.random_delay_range[1],
+        headers=dict(scraper.session.headers),
+        headless=headless,
+        context_options={'viewport': {'width': 1920, 'height': 1080}},
+        page_hook=accept_cookie_banner,
+    )
     return events
 
 # --- End of Crawling Logic ---
@@ -1026,6 +1018,8 @@ def main():
         else:
             print("No events extracted during crawl.")
 
+    scraper.close()
+
 
 def format_event_to_markdown(event_data: EventSchemaTypedDict) -> str:
     """Format event data to markdown with improved formatting."""
@@ -4,12 +4,13 @@ import json
 import random
 import re
 import sys
-import time
 from pathlib import Path
-from typing import Dict, List, Optional, TypedDict
+from typing import Callable, Dict, List, Optional, TypedDict
 
 # Add the current directory to sys.path to fix import issues
 sys.path.insert(0, str(Path(__file__).parent))
+# Shared infrastructure lives in the top-level component packages
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 # Import the specific module directly without going through __init__.py
 import importlib.util
@@ -28,6 +29,25 @@ try:
 except Exception:  # pragma: no cover - playwright may not be installed
     sync_playwright = None
 
+from scraping_components.async_fetcher import ACCEPT_ENCODING
+from scraping_components.browser_pool import acquire_shared_pool, release_shared_pool
+from scraping_components.crawl_engine import run_scrape
+from scraping_components.crawl_frontier import CrawlFrontier, open_frontier
+from scraping_components.http_cache import install_http_cache, session_cache_report
+from scraping_components.fetch_profiles import navigate, profile_for
+from scraping_components.fetch_router import BROWSER, HTTP, HTTP_JSON, FetchRouter
+from scraping_components.ndjson_sink import NDJSONSink
+from scraping_components.rate_limiter import delay_options, shared_limiter
+from scraping_components.readiness import readiness_report
+from parse_components.embedded_json import find_embedded_event
+
+try:
+    from parse_components.extraction_engine import ExtractionEngine, PageExtraction
+    HAS_LXML = True
+except ImportError:  # pragma: no cover - lxml may not be installed
+    ExtractionEngine = PageExtraction = None
+    HAS_LXML = False
+
 DEFAULT_TARGET_URL = "https://ticketsibiza.com/ibiza-calendar/2025-events/"
 
 MODERN_USER_AGENTS = [
@@ -119,8 +139,8 @@ def is_data_sufficient(event_data: Dict) -> bool:
     """Checks if the extracted event data is sufficient."""
     if not event_data:
         return False
-    # Check if JSON-LD data was found and has a title
-    if event_data.get("extractionMethod") == "jsonld" and event_data.get("title"):
+    # Check if JSON-LD (or embedded app-state JSON) was found and has a title
+    if event_data.get("extractionMethod") in ("jsonld", "embedded_json") and event_data.get("title"):
         return True
     # Check if fallback data has a title and at least one other key piece of info
     if event_data.get("extractionMethod") == "fallback":
@@ -134,6 +154,70 @@ def is_data_sufficient(event_data: Dict) -> bool:
     return False
 
 
+# Selector priority lists for WordPress/WooCommerce event pages; the first
+# selector that matches anything wins for each field.
+WORDPRESS_FIELD_SELECTORS: Dict[str, List[str]] = {
+    "title": [
+        "h1.entry-title",
+        ".product_title",
+        "h1.product-title",
+        ".event-title",
+        "h1",
+    ],
+    "date_text": [
+        ".event-date",
+        ".wcs-event-date",
+        ".event-time",
+        '[class*="date"]',
+        '[class*="time"]',
+    ],
+    "venue": [
+        ".event-venue",
+        ".venue",
+        ".location",
+        '[class*="venue"]',
+        '[class*="location"]',
+    ],
+    "price_text": [
+        ".price",
+        ".woocommerce-price-amount",
+        ".amount",
+        '[class*="price"]',
+    ],
+    "description": [
+        ".entry-content",
+        ".product-description",
+        ".event-description",
+        ".description",
+    ],
+}
+DESCRIPTION_MAX_LENGTH = 500
+
+OG_META_MAPPINGS = {
+    "og:title": "title",
+    "og:description": "description",
+    "og:image": "image",
+    "og:url": "canonical_url",
+}
+NAMED_META_MAPPINGS = {
+    "description": "meta_description",
+    "keywords": "keywords",
+}
+
+# Compiled once; resolves all of the above plus JSON-LD, lineup and ticket
+# link in a single lxml traversal.
+WORDPRESS_EXTRACTOR = (
+    ExtractionEngine(
+        WORDPRESS_FIELD_SELECTORS,
+        max_lengths={"description": DESCRIPTION_MAX_LENGTH},
+        og_properties=OG_META_MAPPINGS,
+        meta_names=NAMED_META_MAPPINGS,
+    )
+    if HAS_LXML
+    else None
+)
+
+
 class MultiLayerEventScraper:
     def __init__(
         self,
@@ -142,6 +226,7 @@ class MultiLayerEventScraper:
         playwright_slow_mo: int = 62,
         random_delay_range: tuple = (0.5, 1.3),
         user_agents: Optional[List[str]] = None,
+        fetch_router: Optional[FetchRouter] = None,
     ):
         self.use_browser = use_browser and sync_playwright is not None
         self.headless = headless
@@ -151,13 +236,36 @@ class MultiLayerEventScraper:
         self.current_user_agent: Optional[str] = None
         self.pages_scraped_since_ua_rotation: int = 0
         self.rotate_ua_after_pages: int = random.randint(6, 12)
+        self.browser_pool = None  # Shared BrowserPool, acquired on first browser fetch
+        self.fetch_router = fetch_router or FetchRouter()  # Learns which fetch tier each page type needs
+        self.session: Optional[requests.Session] = None
         self.rotate_user_agent()  # Initial User-Agent selection and session setup
-        # self.session is initialized by rotate_user_agent calling _setup_session
+
+    def _get_browser_pool(self):
+        """Acquire the shared browser pool on first use."""
+        if self.browser_pool is None:
+            self.browser_pool = acquire_shared_pool(
+                headless=self.headless, slow_mo=self.playwright_slow_mo
+            )
+        return self.browser_pool
+
+    def close(self):
+        """Release this scraper's hold on the shared browser pool."""
+        if self.browser_pool is not None:
+            release_shared_pool(self.browser_pool)
+            self.browser_pool = None
+        for report in (session_cache_report(self.session), readiness_report(), self.fetch_router.report()):
+            if report:
+                print(f"[INFO] {report}")
+        self.fetch_router.close()  # Writes out the counts still buffered
 
     def rotate_user_agent(self):
-        """Rotates the User-Agent and re-initializes the session."""
+        """Rotates the User-Agent in place, keeping the session's pooled connections."""
         self.current_user_agent = random.choice(self.user_agents)
-        self.session = self._setup_session()
+        if self.session is None:
+            self.session = self._setup_session()
+        else:
+            self.session.headers["User-Agent"] = self.current_user_agent
         self.pages_scraped_since_ua_rotation = 0
         self.rotate_ua_after_pages = random.randint(6, 12)
 
@@ -178,7 +286,7 @@ class MultiLayerEventScraper:
             "User-Agent": self.current_user_agent or MODERN_USER_AGENTS[0],
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
             "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
+            "Accept-Encoding": ACCEPT_ENCODING,  # br only when brotli can decode it
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
             "Sec-Fetch-Dest": "document",
@@ -188,35 +296,35 @@ class MultiLayerEventScraper:
             # "TE": "trailers", # Optional, can sometimes cause issues
         }
         session.headers.update(headers)
+        install_http_cache(session)  # Conditional GETs against the shared on-disk cache
         return session
 
     def fetch_page(self, url: str, use_browser_for_this_fetch: bool = False) -> Optional[str]:
         """Fetch page HTML with error handling and strategic browser use."""
         if self.use_browser and use_browser_for_this_fetch and sync_playwright is not None:
             try:
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(
-                        headless=self.headless, slow_mo=self.playwright_slow_mo
-                    )
-                    page = browser.new_page()
-                    # Apply User-Agent to browser context if possible, or ensure session UA is used if not directly fetchable by browser
-                    # For now, Playwright uses its own UA management typically. Session UA is for requests.
-                    page.goto(url, timeout=30000)
-                    content = page.content()
-                    browser.close()
-                    return content
+                # Pooled contexts are keyed by User-Agent and fetch profile, so rotation
+                # carries over to the browser and resource blocking is set up once per context
+                profile = profile_for(url)
+                with self._get_browser_pool().page(user_agent=self.current_user_agent, profile=profile) as page:
+                    navigate(page, url, profile)
+                    return page.content()
             except Exception as e:
                 print(f"Browser fetch failed for {url}: {e}", file=sys.stderr)
                 # Optionally, could fall back to requests here if browser fails mid-operation, but current strategy is attempt-based.
                 return None # Explicitly return None on browser failure.
         else:
             # Fallback to requests, or if self.use_browser is False, or if sync_playwright is None, or if use_browser_for_this_fetch is False
-            time.sleep(random.uniform(self.random_delay_range[0], self.random_delay_range[1]))
+            limiter = shared_limiter()
+            limiter.wait(url, **delay_options(*self.random_delay_range))
             try:
                 response = self.session.get(url, timeout=10)
+                limiter.record(url, response.status_code, response.headers)
                 response.raise_for_status()
                 return response.text
             except Exception as e:
+                if isinstance(e, requests.RequestException) and e.response is None:
+                    limiter.record(url, None)  # Timeouts and exhausted retries slow the host down
                 print(f"Error fetching {url} with requests: {e}", file=sys.stderr)
                 return None
 
@@ -242,68 +350,15 @@ class MultiLayerEventScraper:
         """Extract data using WordPress/WooCommerce selectors."""
         data: Dict[str, str] = {}
 
-        title_selectors = [
-            "h1.entry-title",
-            ".product_title",
-            "h1.product-title",
-            ".event-title",
-            "h1",
-        ]
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                data["title"] = title_elem.get_text(strip=True)
-                break
-
-        date_selectors = [
-            ".event-date",
-            ".wcs-event-date",
-            ".event-time",
-            '[class*="date"]',
-            '[class*="time"]',
-        ]
-        for selector in date_selectors:
-            date_elem = soup.select_one(selector)
-            if date_elem:
-                data["date_text"] = date_elem.get_text(strip=True)
-                break
-
-        venue_selectors = [
-            ".event-venue",
-            ".venue",
-            ".location",
-            '[class*="venue"]',
-            '[class*="location"]',
-        ]
-        for selector in venue_selectors:
-            venue_elem = soup.select_one(selector)
-            if venue_elem:
-                data["venue"] = venue_elem.get_text(strip=True)
-                break
-
-        price_selectors = [
-            ".price",
-            ".woocommerce-price-amount",
-            ".amount",
-            '[class*="price"]',
-        ]
-        for selector in price_selectors:
-            price_elem = soup.select_one(selector)
-            if price_elem:
-                data["price_text"] = price_elem.get_text(strip=True)
-                break
+        for key, selectors in WORDPRESS_FIELD_SELECTORS.items():
+            for selector in selectors:
+                elem = soup.select_one(selector)
+                if elem:
+                    data[key] = elem.get_text(strip=True)
+                    break
 
-        desc_selectors = [
-            ".entry-content",
-            ".product-description",
-            ".event-description",
-            ".description",
-        ]
-        for selector in desc_selectors:
-            desc_elem = soup.select_one(selector)
-            if desc_elem:
-                data["description"] = desc_elem.get_text(strip=True)[:500]
-                break
+        if "description" in data:
+            data["description"] = data["description"][:DESCRIPTION_MAX_LENGTH]
 
         return data
 
@@ -311,22 +366,12 @@ class MultiLayerEventScraper:
         """Extract Open Graph and meta tag data."""
         data: Dict[str, str] = {}
 
-        og_mappings = {
-            "og:title": "title",
-            "og:description": "description",
-            "og:image": "image",
-            "og:url": "canonical_url",
-        }
-        for og_prop, key in og_mappings.items():
+        for og_prop, key in OG_META_MAPPINGS.items():
             meta = soup.find("meta", property=og_prop)
             if meta and meta.get("content"):
                 data[key] = meta["content"]
 
-        meta_mappings = {
-            "description": "meta_description",
-            "keywords": "keywords",
-        }
-        for name, key in meta_mappings.items():
+        for name, key in NAMED_META_MAPPINGS.items():
             meta = soup.find("meta", attrs={"name": name})
             if meta and meta.get("content"):
                 data[key] = meta["content"]
@@ -417,49 +462,83 @@ class MultiLayerEventScraper:
         html = self.fetch_page(url, use_browser_for_this_fetch=attempt_with_browser)
         if not html:
             return {}
+        return self.parse_event_html(url, html)
+
+    def parse_event_html(self, url: str, html: str) -> Dict:
+        """Run the extraction layers over already-fetched page HTML."""
+        if WORDPRESS_EXTRACTOR is None:
+            return self._parse_event_html_soup(url, html)
+
+        extraction = WORDPRESS_EXTRACTOR.extract(html)
+        now_iso = datetime.utcnow().isoformat() + "Z"
 
+        if extraction.jsonld:
+            return self._map_jsonld_to_event_schema(
+                extraction.jsonld, url, html, now_iso, extraction=extraction
+            )
+
+        pattern_data = self.extract_text_patterns(html)
+        combined_data = {**extraction.fields, **extraction.meta, **pattern_data}
+        return self._map_fallback_to_event_schema(
+            combined_data, url, html, now_iso, extraction=extraction
+        )
+
+    def _parse_event_html_soup(self, url: str, html: str) -> Dict:
+        """BeautifulSoup extraction path, used when lxml is unavailable."""
         soup = BeautifulSoup(html, "html.parser")
         now_iso = datetime.utcnow().isoformat() + "Z"
 
         jsonld_data = self.extract_jsonld_data(soup)
         if jsonld_data:
-            # Ensure 'html' key is populated even for jsonld for consistency if needed downstream,
-            # though original _build_schema_from_jsonld includes full html.
-            # If it's too large, it should be truncated in _build_schema_from_jsonld.
             return self._map_jsonld_to_event_schema(jsonld_data, url, html, now_iso)
 
         wp_data = self.extract_wordpress_data(soup)
         meta_data = self.extract_meta_data(soup)
         pattern_data = self.extract_text_patterns(html)
         combined_data = {**wp_data, **meta_data, **pattern_data}
-        # Ensure 'html' key is populated for fallback, possibly truncated.
-        # _build_schema_from_fallback already handles html (truncated).
         return self._map_fallback_to_event_schema(combined_data, url, html, now_iso)
 
-    def scrape_event_strategically(self, url: str) -> Dict:
-        """Orchestrates scraping, trying requests first, then Playwright if needed."""
-        event_data_requests = self.scrape_event_data(url, attempt_with_browser=False)
-
-        if is_data_sufficient(event_data_requests):
-            print(f"[INFO] Data sufficient from requests-only attempt for {url}")
-            return event_data_requests
+    def parse_embedded_json(self, url: str, html: str) -> Dict:
+        """Build the event from JSON the page embeds for client-side rendering."""
+        node = find_embedded_event(html)
+        if not node:
+            return {}
+        event_data = self._map_jsonld_to_event_schema(node, url, html, datetime.utcnow().isoformat() + "Z")
+        event_data["extractionMethod"] = "embedded_json"
+        return event_data
 
-        if self.use_browser and sync_playwright is not None:
-            print(
-                f"[INFO] Requests-only attempt insufficient for {url}. Attempting with browser."
-            )
-            event_data_browser = self.scrape_event_data(url, attempt_with_browser=True)
-            # Optionally, decide if browser data is "better" even if requests was "sufficient"
-            # For now, if requests was sufficient, we don't try browser.
-            # If browser data is empty or not better, could return requests data.
-            # For simplicity, returning browser data if we attempted it.
-            return event_data_browser
-        else:
-            # Playwright not available or not enabled, return initial requests attempt
-            return event_data_requests
+    def scrape_event_strategically(self, url: str) -> Dict:
+        """Orchestrates scraping, starting from the cheapest fetch tier known to work for this page type."""
+        available = [HTTP, HTTP_JSON] + ([BROWSER] if self.use_browser and sync_playwright is not None else [])
+        html: Optional[str] = None
+        best: Dict = {}
+        for tier in self.fetch_router.plan(url, available):
+            if tier == BROWSER:
+                page = self.fetch_page(url, use_browser_for_this_fetch=True)
+                event_data = self.parse_event_html(url, page) if page else {}
+            else:
+                if html is None:
+                    html = self.fetch_page(url) or ""  # Both HTTP tiers read the same response
+                page = html
+                if not html:
+                    event_data = {}
+                elif tier == HTTP:
+                    event_data = self.parse_event_html(url, html)
+                else:
+                    event_data = self.parse_embedded_json(url, html)
+            sufficient = is_data_sufficient(event_data)
+            if page:  # A failed fetch says nothing about what the tier can extract
+                self.fetch_router.record(url, tier, sufficient)
+            if sufficient:
+                print(f"[INFO] Data sufficient from {tier} tier for {url}")
+                return event_data
+            best = best or event_data
+            print(f"[INFO] {tier} tier insufficient for {url}")
+        return best
 
     def _map_jsonld_to_event_schema(
-        self, node: Dict, url: str, html: str, now_iso: str
+        self, node: Dict, url: str, html: str, now_iso: str,
+        extraction: Optional["PageExtraction"] = None,
     ) -> EventSchemaTypedDict:
         """Build schema from JSON-LD data, populating EventSchemaTypedDict."""
         
@@ -735,10 +814,9 @@ class MultiLayerEventScraper:
         
         # Extract additional data from HTML that's not in JSON-LD
         if html:
-            soup = BeautifulSoup(html, "html.parser")
+            html_artists, ticket_url = self._lineup_and_ticket_url(html, extraction)
             
             # Extract full lineup from HTML
-            html_artists = self.extract_lineup_from_html(soup)
             if html_artists:
                 # Merge with existing lineup, avoiding duplicates
                 existing_names = {artist["name"] for artist in event_data["lineUp"]}
@@ -751,8 +829,7 @@ class MultiLayerEventScraper:
                             "headliner": False  # Additional artists are not headliners
                         })
             
-            # Extract ticket URL from HTML
-            ticket_url = self.extract_ticket_url_from_html(soup)
+            # Ticket URL from HTML
             if ticket_url:
                 event_data["ticketsUrl"] = ticket_url
         
@@ -761,6 +838,15 @@ class MultiLayerEventScraper:
         
         return event_data
 
+    def _lineup_and_ticket_url(
+        self, html: str, extraction: Optional["PageExtraction"]
+    ) -> tuple:
+        """Lineup and ticket URL, reusing a single-pass extraction when one is available."""
+        if extraction is not None:
+            return extraction.lineup, extraction.ticket_url
+        soup = BeautifulSoup(html, "html.parser")
+        return self.extract_lineup_from_html(soup), self.extract_ticket_url_from_html(soup)
+
     def _populate_derived_fields(self, event_data: EventSchemaTypedDict) -> None:
         """Populates derived fields in the EventSchemaTypedDict."""
         
@@ -813,7 +899,8 @@ class MultiLayerEventScraper:
         event_data["imageCount"] = len(images) if images is not None else 0
 
     def _map_fallback_to_event_schema(
-        self, data: Dict, url: str, html: str, now_iso: str
+        self, data: Dict, url: str, html: str, now_iso: str,
+        extraction: Optional["PageExtraction"] = None,
     ) -> EventSchemaTypedDict:
         """Build schema from fallback extraction methods, populating EventSchemaTypedDict."""
 
@@ -941,16 +1028,14 @@ class MultiLayerEventScraper:
         
         # Extract additional data from HTML
         if html:
-            soup = BeautifulSoup(html, "html.parser")
+            html_artists, ticket_url = self._lineup_and_ticket_url(html, extraction)
             
-            # Extract lineup from HTML
-            html_artists = self.extract_lineup_from_html(soup)
+            # Lineup from HTML
             if html_artists:
                 event_data["lineUp"] = [{"name": artist_name, "affiliates": [], "genres": [], "headliner": idx == 0}
                                        for idx, artist_name in enumerate(html_artists)]
             
-            # Extract ticket URL from HTML
-            ticket_url = self.extract_ticket_url_from_html(soup)
+            # Ticket URL from HTML
             if ticket_url:
                 event_data["ticketsUrl"] = ticket_url
         
@@ -966,51 +1051,89 @@ def crawl_listing_for_events(
     max_pages: int = 4000,
     *,
     headless: bool = True,
+    on_event: Optional[Callable[[Dict], None]] = None,
+    frontier: Optional[CrawlFrontier] = None,
 ) -> List[Dict]:
-    """Crawl a listing page and scrape each linked event."""
+    """Crawl a listing page and scrape each linked event.
+
+    With ``on_event`` events are streamed to the callback and not returned.
+    With a ``frontier`` the listing's links are checkpointed: a resumed crawl
+    skips the listing page and the events already scraped.
+    """
+    if frontier is not None and frontier.get_meta("listing_complete"):
+        print(f"Resuming crawl of {listing_url}: {frontier.report()}")
+        return scrape_urls_concurrently(
+            frontier.urls(), scraper, on_event=on_event, frontier=frontier
+        )
+
     if sync_playwright is None:
         print("Playwright is not installed; cannot crawl listing", file=sys.stderr)
         return []
 
-    scraped: List[Dict] = []
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless)
-        page = browser.new_page()
-        page.goto(listing_url, timeout=30000)
-        try:
-            page.wait_for_selector("text=INFO", timeout=10000)
-        except Exception:
-            pass
-        links = [
-            elem.get_attribute("href")
-            for elem in page.query_selector_all("text=INFO")
-            if elem.get_attribute("href")
-        ]
-        browser.close()
-
-    count = 0
-    for link in links:
-        if count >= max_pages:
-            break
-        print(f"Scraping: {link}")
-
-        scraper.pages_scraped_since_ua_rotation += 1
-        if scraper.pages_scraped_since_ua_rotation >= scraper.rotate_ua_after_pages:
-            scraper.rotate_user_agent()
-            print(
-                f"[INFO] Rotating User-Agent during crawl to: {scraper.current_user_agent}"
-            )
-        # Random delay is now in fetch_page for requests-based fetching
-
-        data = scraper.scrape_event_strategically(link)
+    pool = acquire_shared_pool(headless=headless, slow_mo=scraper.playwright_slow_mo)
+    try:
+        with pool.page() as page:
+            page.goto(listing_url, timeout=30000)
+            try:
+                page.wait_for_selector("text=INFO", timeout=10000)
+            except Exception:
+                pass
+            links = [
+                elem.get_attribute("href")
+                for elem in page.query_selector_all("text=INFO")
+                if elem.get_attribute("href")
+            ]
+    finally:
+        release_shared_pool(pool)
+
+    links = links[:max_pages]
+    if frontier is not None:
+        frontier.add(links)
+        frontier.set_meta("listing_complete", True)
+    return scrape_urls_concurrently(links, scraper, on_event=on_event, frontier=frontier)
+
+
+def scrape_urls_concurrently(
+    urls: List[str],
+    scraper: "MultiLayerEventScraper",
+    on_event: Optional[Callable[[Dict], None]] = None,
+    frontier: Optional[CrawlFrontier] = None,
+) -> List[Dict]:
+    """Scrape event pages through the async crawl engine.
+
+    Mirrors ``scrape_event_strategically`` (the scraper's fetch router picks
+    the cheapest tier that works per page type) while keeping the scraper's
+    delay range as the starting per-host rate. With ``on_event`` each event is handed
+    over as soon as it is parsed and nothing is accumulated. With a
+    ``frontier`` URLs finished in an earlier run are skipped and failures are
+    retried with backoff.
+    """
+    def report(url: str, data: Optional[Dict]) -> None:
         if data:
-            scraped.append(data)
-            print(f"✓ Extracted data using: {data.get('extractionMethod', 'unknown')}")
+            print(f"✓ Extracted data using: {data.get('extractionMethod', 'unknown')} ({url})")
+            if on_event is not None:
+                on_event(data)
         else:
-            print("✗ No data extracted")
-        count += 1
-
-    return scraped
+            print(f"✗ No data extracted ({url})")
+
+    return run_scrape(
+        urls,
+        scraper.parse_event_html,
+        on_result=report,
+        collect=on_event is None,
+        frontier=frontier,
+        fetch_mode="auto" if scraper.use_browser else "http",
+        fetch_router=scraper.fetch_router,
+        parse_embedded=scraper.parse_embedded_json,
+        is_sufficient=is_data_sufficient,
+        min_delay=scraper.random_delay_range[0],
+        max_delay=scraper.random_delay_range[1],
+        headers=dict(scraper.session.headers),
+        # Same rotation as rotate_user_agent: a new agent every 6-12 pages per host
+        user_agents=scraper.user_agents,
+        rotate_after=(6, 12),
+        headless=scraper.headless,
+    )
 
 
 # Helper for JSON serialization of datetime objects
@@ -1232,6 +1355,11 @@ def main():
         default=None,
         help="Path to a file containing User-Agent strings (one per line). Overrides default list.",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run: skip events already scraped and append to the outputs.",
+    )
     args = parser.parse_args()
 
     user_agents_list = MODERN_USER_AGENTS  # Default
@@ -1265,14 +1393,7 @@ def main():
     )
     events_path = Path(args.events_path) if args.events_path else default_events_path
 
-    if args.crawl_listing:
-        all_event_data = crawl_listing_for_events(
-            args.target_url,
-            scraper,
-            max_pages=4000,
-            headless=args.headless,
-        )
-    else:
+    if not args.crawl_listing:
         if args.target_url:
             event_urls = [args.target_url]
         else:
@@ -1292,45 +1413,46 @@ def main():
             print("No event URLs to process.", file=sys.stderr)
             return
 
-        all_event_data: List[Dict] = []
-        max_pages = 4000
-        scraped_count = 0
-
-        for url in event_urls:
-            if scraped_count >= max_pages:
-                break
-            print(f"Scraping: {url}")
-
-            scraper.pages_scraped_since_ua_rotation += 1
-            if scraper.pages_scraped_since_ua_rotation >= scraper.rotate_ua_after_pages:
-                scraper.rotate_user_agent()
-                print(f"[INFO] Rotating User-Agent to: {scraper.current_user_agent}")
-            # Random delay is now in fetch_page for requests-based fetching
+    # Events are appended to both outputs as they are scraped, so an
+    # interrupted run keeps everything extracted so far; --resume continues
+    # both the outputs and the URL frontier of that run.
+    job_key = f"ticketsibiza:{'crawl' if args.crawl_listing else 'scrape'}:{args.target_url or events_path}"
+    frontier = open_frontier(job_key, resume=args.resume)
+    sink = NDJSONSink(
+        "ticketsibiza_scraped_data.ndjson", default=datetime_serializer, append=args.resume
+    )
+    with frontier, sink, open("ticketsibiza_event_data_parsed.md", "a" if args.resume else "w") as md_file:
+        if not args.resume:
+            md_file.write("# TicketsIbiza Scraped Data (New Schema)\n\n")
+
+        def write_event(ev_data: Dict) -> None: # ev_data is an EventSchemaTypedDict
+            sink.write(ev_data)
+            md_file.write(format_event_to_markdown(ev_data))
+            md_file.write("\n---\n\n") # Separator
+            # On disk before the crawl frontier checkpoints the URL as done
+            sink.flush()
+            md_file.flush()
 
-            event_data = scraper.scrape_event_strategically(url)
-            if event_data:
-                all_event_data.append(event_data)
-                print(
-                    f"✓ Extracted data using: {event_data.get('extractionMethod', 'unknown')}"
+        try:
+            if args.crawl_listing:
+                crawl_listing_for_events(
+                    args.target_url,
+                    scraper,
+                    max_pages=4000,
+                    headless=args.headless,
+                    on_event=write_event,
+                    frontier=frontier,
                 )
             else:
-                print("✗ No data extracted")
-            scraped_count += 1
-
-    output = {"events": all_event_data}
-    with open("ticketsibiza_scraped_data.json", "w") as f:
-        json.dump(output, f, indent=2, default=datetime_serializer)
-
-    markdown_content = "# TicketsIbiza Scraped Data (New Schema)\n\n"
-    for ev_data in all_event_data: # ev_data is an EventSchemaTypedDict
-        markdown_content += format_event_to_markdown(ev_data)
-        markdown_content += "\n---\n\n" # Separator
-        
-    with open("ticketsibiza_event_data_parsed.md", "w") as f:
-        f.write(markdown_content)
+                scrape_urls_concurrently(
+                    event_urls[:4000], scraper, on_event=write_event, frontier=frontier
+                )
+        finally:
+            scraper.close()
+        print(frontier.report())
 
-    print(f"\n✓ Scraped {len(all_event_data)} events")
-    print("✓ Data saved to ticketsibiza_scraped_data.json")
+    print(f"\n✓ Scraped {sink.count} events")
+    print(f"✓ Data saved to {', '.join(str(p) for p in sink.paths)}")
     print("✓ Markdown saved to ticketsibiza_event_data_parsed.md")
 
 
@@ -2,17 +2,27 @@
 Enhanced Ticketmaster/TicketsIbiza scraper with MongoDB integration and quality scoring
 """
 
-import json
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
-from pymongo import MongoClient
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set
+from pymongo import InsertOne, MongoClient, UpdateOne
 from pymongo.errors import ConnectionFailure
 
 # Import the original scraper
 from mono_ticketmaster import MultiLayerEventScraper
+from scraping_components.http_cache import session_cache_report
+from scraping_components.ndjson_sink import NDJSONSink
+from scraping_components.snapshot_store import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+from parse_components.content_fingerprint import content_fingerprint, extraction_fingerprint
 
 # Import our database modules
+from database.bulk_writer import BulkWriter
+from database.event_summaries import sync_event_summaries
+from database.materialized_stats import refresh_materialized_stats
+from database.method_stats import method_stats_operations
+from database.response_cache import bump_data_version
+from database.venue_registry import annotate_venue_key
 from database.quality_scorer import QualityScorer
 from database.mongodb_setup import MongoDBSetup
 
@@ -25,7 +35,8 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
     
     def __init__(self, use_browser: bool = True, 
                  db_connection: str = "mongodb://localhost:27017/",
-                 database_name: str = "tickets_ibiza_events"):
+                 database_name: str = "tickets_ibiza_events",
+                 snapshot_dir: Path = DEFAULT_SNAPSHOT_DIR):
         """
         Initialize scraper with MongoDB integration
         
@@ -33,18 +44,26 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
             use_browser: Whether to use browser for dynamic content
             db_connection: MongoDB connection string
             database_name: Name of the database to use
+            snapshot_dir: Where full page HTML is kept (referenced from events by digest)
         """
         super().__init__(use_browser)
+        self.snapshots = SnapshotStore(snapshot_dir)
         
         # Initialize database connection
         self.db_client = None
         self.db = None
+        self.writer: Optional[BulkWriter] = None
         self.scorer = QualityScorer()
+        self.unchanged_count = 0
+        # Events written since event_summaries was last synced
+        self.unsynced_urls: Set[str] = set()
         
         try:
             self.db_client = MongoClient(db_connection)
             self.db_client.admin.command('ping')
             self.db = self.db_client[database_name]
+            # Per-event writes are buffered and sent as unordered bulk batches
+            self.writer = BulkWriter(self.db)
             logger.info(f"Connected to MongoDB database: {database_name}")
         except ConnectionFailure as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
@@ -57,23 +76,54 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
         Args:
             url: Event URL to scrape
             
+        Pages whose normalized content fingerprint matches the stored one are
+        not re-parsed or re-scored; only their lastCheckedAt is bumped and the
+        stored document is returned.
+
         Returns:
             Event data with quality scores if successful, None otherwise
         """
+        html = self.fetch_page(url)
+        if not html:
+            logger.error(f"Failed to scrape data from {url}")
+            return None
+
+        fingerprint = content_fingerprint(html)
+        # One lookup serves both the fingerprint check and incremental rescoring
+        stored = self._get_stored_event(url)
+        if stored and stored.get("contentFingerprint") == fingerprint and "_quality" in stored:
+            self.writer.add("events", UpdateOne(
+                {"_id": stored["_id"]},
+                {"$set": {"lastCheckedAt": datetime.utcnow()}}
+            ))
+            self.unchanged_count += 1
+            logger.info(f"Unchanged since last scrape: {stored.get('title', url)}")
+            return stored
+
         # Scrape the event
-        event_data = self.scrape_event_data(url)
+        event_data = self.parse_event_html(url, html)
         
         if not event_data:
             logger.error(f"Failed to scrape data from {url}")
             return None
         
         # Add scraping metadata
-        event_data['scrapedAt'] = datetime.utcnow()
-        event_data['lastUpdated'] = datetime.utcnow()
+        now = datetime.utcnow()
+        event_data['scrapedAt'] = now
+        event_data['lastUpdated'] = now
+        event_data['lastCheckedAt'] = now
+        event_data['contentFingerprint'] = fingerprint
+        annotate_venue_key(event_data)
         
-        # Calculate quality scores
-        quality_data = self.scorer.calculate_event_quality(event_data)
+        # Full page goes to the snapshot store, not into the event document
+        event_data.pop('html', None)
+        event_data['htmlSnapshot'] = self.snapshots.put(html, url=url)
+        
+        # Rescore only the fields whose input changed since the stored version
+        quality_data, quality_updates = self.scorer.rescore_event(event_data, stored)
         event_data.update(quality_data)
+        # Lets offline re-extraction (database/reextract.py) skip events it would not change
+        event_data['extractionFingerprint'] = extraction_fingerprint(event_data)
         
         # Get quality summary
         summary = self.scorer.get_quality_summary(quality_data)
@@ -81,22 +131,24 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
         logger.info(f"Scraped: {event_data.get('title', 'Unknown')}")
         logger.info(f"Quality: {summary['qualityLevel']} ({quality_data['_quality']['overall']:.3f})")
         
-        # Save to MongoDB if connected
-        if self.db:
+        # Queue the MongoDB writes if connected; the bulk writer sends them
+        # in batches instead of three round-trips per event
+        if self.db is not None:
             try:
-                result = self.db.events.update_one(
+                # Scoring subtrees are written as the changed sub-paths only
+                fields = {k: v for k, v in event_data.items() if k not in ("_quality", "_validation")}
+                fields.update(quality_updates)
+                self.writer.add("events", UpdateOne(
                     {"url": url},
                     {
-                        "$set": event_data,
-                        "$setOnInsert": {"firstScraped": datetime.utcnow()}
+                        "$set": fields,
+                        "$setOnInsert": {"firstScraped": datetime.utcnow()},
+                        # Markup stored inline by older versions
+                        "$unset": {"html": ""}
                     },
                     upsert=True
-                )
-                
-                if result.upserted_id:
-                    logger.info(f"Inserted new event with ID: {result.upserted_id}")
-                elif result.modified_count:
-                    logger.info(f"Updated existing event")
+                ))
+                self.unsynced_urls.add(url)
                 
                 # Track extraction method effectiveness
                 self._update_extraction_method_stats(event_data)
@@ -109,6 +161,22 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
         
         return event_data
     
+    def _get_stored_event(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        The stored event for ``url``, read once per scrape: an unchanged page
+        returns it as is, a changed one rescores against its _quality and
+        _validation. Returns None when the page is new or the database is
+        unavailable.
+        """
+        if self.db is None:
+            return None
+        try:
+            # Markup stored inline by older versions is never needed here
+            return self.db.events.find_one({"url": url}, {"html": 0})
+        except Exception as e:
+            logger.error(f"Stored event lookup failed for {url}: {e}")
+            return None
+    
     def scrape_multiple_events(self, urls: List[str], 
                              save_to_file: bool = False) -> Dict[str, Any]:
         """
@@ -116,7 +184,8 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
         
         Args:
             urls: List of event URLs to scrape
-            save_to_file: Whether to also save results to JSON file
+            save_to_file: Whether to also stream events to an NDJSON file as
+                they are scraped (instead of collecting them in ``events``)
             
         Returns:
             Summary of scraping results
@@ -128,70 +197,98 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
             "quality_scores": [],
             "events": []
         }
+        unchanged_before = self.unchanged_count
+        sink = None
+        if save_to_file:
+            sink = NDJSONSink(f"scraping_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson", default=str)
         
-        for i, url in enumerate(urls, 1):
-            logger.info(f"\nProcessing {i}/{len(urls)}: {url}")
-            
-            try:
-                event_data = self.scrape_and_save_event(url)
+        try:
+            for i, url in enumerate(urls, 1):
+                logger.info(f"\nProcessing {i}/{len(urls)}: {url}")
                 
-                if event_data:
-                    results["successful"] += 1
-                    results["quality_scores"].append(event_data["_quality"]["overall"])
+                try:
+                    event_data = self.scrape_and_save_event(url)
                     
-                    # Remove internal fields for cleaner output
-                    clean_data = {k: v for k, v in event_data.items() 
-                                if not k.startswith("_")}
-                    results["events"].append(clean_data)
-                else:
+                    if event_data:
+                        results["successful"] += 1
+                        results["quality_scores"].append(event_data["_quality"]["overall"])
+                        
+                        # Remove internal fields for cleaner output
+                        clean_data = {k: v for k, v in event_data.items() 
+                                    if not k.startswith("_")}
+                        if sink:
+                            sink.write(clean_data)
+                        else:
+                            results["events"].append(clean_data)
+                    else:
+                        results["failed"] += 1
+                        
+                except Exception as e:
+                    logger.error(f"Error processing {url}: {e}")
                     results["failed"] += 1
-                    
-            except Exception as e:
-                logger.error(f"Error processing {url}: {e}")
-                results["failed"] += 1
+        finally:
+            if self.writer:
+                self.writer.flush()
+                self._publish_writes()
+            if sink:
+                sink.close()
+                results["output_files"] = [str(path) for path in sink.paths]
+                logger.info(f"Results saved to {', '.join(results['output_files'])}")
         
+        results["unchanged"] = self.unchanged_count - unchanged_before
+
         # Calculate statistics
         if results["quality_scores"]:
             results["avg_quality"] = sum(results["quality_scores"]) / len(results["quality_scores"])
             results["min_quality"] = min(results["quality_scores"])
             results["max_quality"] = max(results["quality_scores"])
         
-        # Save to file if requested
-        if save_to_file:
-            filename = f"scraping_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, default=str)
-            logger.info(f"Results saved to {filename}")
-        
         # Print summary
         self._print_summary(results)
         
         return results
     
+    def _sync_summaries(self):
+        """Rebuild the API's event_summaries for events written since the last sync"""
+        if not self.unsynced_urls:
+            return
+        urls, self.unsynced_urls = self.unsynced_urls, set()
+        try:
+            sync_event_summaries(self.db, urls)
+        except Exception as e:
+            # Retried at the next sync point
+            self.unsynced_urls |= urls
+            logger.error(f"Failed to sync event summaries: {e}")
+    
+    def _publish_writes(self):
+        """Sync summaries, recompute the venue/quality views and invalidate API response caches after a run's writes"""
+        self._sync_summaries()
+        try:
+            refresh_materialized_stats(self.db)
+        except Exception as e:
+            logger.error(f"Failed to refresh materialized stats: {e}")
+        try:
+            bump_data_version(self.db)
+        except Exception as e:
+            logger.error(f"Failed to bump data version: {e}")
+    
     def _update_extraction_method_stats(self, event_data: Dict):
-        """Update extraction method effectiveness statistics"""
-        if not self.db:
+        """Update extraction method effectiveness statistics (fixed-size rolling aggregates)"""
+        if self.db is None:
             return
         
         method = event_data.get("extractionMethod", "unknown")
         quality_score = event_data["_quality"]["overall"]
         
         try:
-            self.db.extraction_methods.update_one(
-                {"method": method},
-                {
-                    "$inc": {"totalUses": 1},
-                    "$push": {"qualityScores": quality_score},
-                    "$set": {"lastUsed": datetime.utcnow()}
-                },
-                upsert=True
-            )
+            for collection, operation in method_stats_operations(method, quality_score):
+                self.writer.add(collection, operation)
         except Exception as e:
             logger.error(f"Failed to update extraction method stats: {e}")
     
     def _save_quality_history(self, url: str, quality_data: Dict):
         """Save quality score history for tracking improvements"""
-        if not self.db:
+        if self.db is None:
             return
         
         try:
@@ -207,7 +304,7 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
                 }
             }
             
-            self.db.quality_scores.insert_one(history_entry)
+            self.writer.add("quality_scores", InsertOne(history_entry))
         except Exception as e:
             logger.error(f"Failed to save quality history: {e}")
     
@@ -219,12 +316,25 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
         print(f"Total URLs: {results['total']}")
         print(f"Successful: {results['successful']}")
         print(f"Failed: {results['failed']}")
+        if results.get("unchanged"):
+            print(f"Unchanged (skipped re-parse): {results['unchanged']}")
+        
+        if self.writer:
+            events_written = self.writer.stats["events"]
+            print(f"MongoDB: {events_written.written} event writes in {events_written.batches} batches"
+                  + (f", {events_written.errors} errors" if events_written.errors else ""))
         
         if results.get("avg_quality"):
             print(f"\nQuality Scores:")
             print(f"  Average: {results['avg_quality']:.3f}")
             print(f"  Minimum: {results['min_quality']:.3f}")
             print(f"  Maximum: {results['max_quality']:.3f}")
+
+        cache_report = session_cache_report(self.session)
+        if cache_report:
+            print(f"\n{cache_report}")
+        if self.snapshots.stats["stored"] or self.snapshots.stats["deduplicated"]:
+            print(self.snapshots.report())
         print("="*60)
     
     def get_events_needing_update(self, days_old: int = 7) -> List[str]:
@@ -237,16 +347,18 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
         Returns:
             List of event URLs that should be re-scraped
         """
-        if not self.db:
+        if self.db is None:
             return []
         
         cutoff_date = datetime.utcnow() - timedelta(days=days_old)
         
-        # Find events that are either old or have low quality
+        # Find events that are either old or have low quality. Staleness is
+        # measured from the last check, since unchanged pages keep lastUpdated.
         events = list(self.db.events.find(
             {
                 "$or": [
-                    {"lastUpdated": {"$lt": cutoff_date}},
+                    {"lastCheckedAt": {"$lt": cutoff_date}},
+                    {"lastCheckedAt": {"$exists": False}, "lastUpdated": {"$lt": cutoff_date}},
                     {"_quality.overall": {"$lt": 0.7}}
                 ]
             },
@@ -260,7 +372,16 @@ class MongoIntegratedEventScraper(MultiLayerEventScraper):
         return [event["url"] for event in events]
     
     def close(self):
-        """Close database connection"""
+        """Close database connection and release the shared browser pool"""
+        super().close()
+        if self.writer:
+            self.writer.close()
+            # Writes queued outside scrape_multiple_events land on close
+            self._sync_summaries()
+            try:
+                bump_data_version(self.db)
+            except Exception as e:
+                logger.error(f"Failed to bump data version: {e}")
         if self.db_client:
             self.db_client.close()
             logger.info("MongoDB connection closed")
@@ -14,6 +14,7 @@ import csv
 import json
 import random
 import re
+import sys
 import time
 import traceback
 from dataclasses import dataclass, asdict, fields
@@ -32,8 +33,12 @@ try:
 except ImportError:
     sync_playwright, Page, Browser, Locator, stealth_sync, PlaywrightTimeoutError = (None,) * 6
     PLAYWRIGHT_AVAILABLE = False
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_components.crawl_frontier import CrawlFrontier, open_frontier
+from scraping_components.snapshot_store import store_debug_snapshot
+
 # --- Configuration ---
-SNAPSHOT_DIR = Path("debug_snapshots")
 OUTPUT_DIR = Path("output")
 BASE_URL = "https://www.ibiza-spotlight.com"
 
@@ -44,7 +49,6 @@ MODERN_USER_AGENTS = [
 ]
 
 # Ensure directories exist
-SNAPSHOT_DIR.mkdir(exist_ok=True, parents=True)
 OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 
 # --- Data Model ---
@@ -88,6 +92,25 @@ class Event:
                 data[field.name] = value
         return data
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Event":
+        """Rebuild an event from ``to_dict`` output (e.g. a crawl checkpoint)."""
+        parsers = {
+            "start_date": date.fromisoformat,
+            "end_date": date.fromisoformat,
+            "start_time": dt_time.fromisoformat,
+            "end_time": dt_time.fromisoformat,
+            "scraped_at": datetime.fromisoformat,
+        }
+        values = {}
+        for field in fields(cls):
+            if field.name in data:
+                value = data[field.name]
+                if value is not None and field.name in parsers:
+                    value = parsers[field.name](value)
+                values[field.name] = value
+        return cls(**values)
+
 # --- Scraper Class ---
 class IbizaSpotlightUnifiedScraper:
     """A stealthy, robust scraper for ibiza-spotlight.com with scrape and crawl modes."""
@@ -214,9 +237,8 @@ class IbizaSpotlightUnifiedScraper:
             except PlaywrightTimeoutError:
                 print(f"[WARNING] Timed out waiting for '{content_ready_selector}'. Page might be incomplete or structured differently.")
                 # Save snapshot for debugging
-                snap_path = SNAPSHOT_DIR / f"timeout_content_{urlparse(url).path.replace('/', '_')}_{int(time.time())}.html"
-                snap_path.write_text(page.content(), encoding="utf-8", errors="replace")
-                print(f"[DEBUG] Saved content timeout snapshot to: {snap_path}")
+                digest = store_debug_snapshot(page.content(), url, "content timeout")
+                print(f"[DEBUG] Saved content timeout snapshot {digest[:12]}")
             
             self._get_random_delay() # Small delay for any final JS rendering
             return page.content()
@@ -224,10 +246,9 @@ class IbizaSpotlightUnifiedScraper:
         except Exception as e:
             print(f"[ERROR] Playwright fetch failed for {url}: {e}")
             if page:
-                snap_path = SNAPSHOT_DIR / f"error_fetch_{urlparse(url).path.replace('/', '_')}_{int(time.time())}.html"
                 try:
-                    snap_path.write_text(page.content(), encoding="utf-8", errors="replace")
-                    print(f"[DEBUG] Saved error snapshot to: {snap_path}")
+                    digest = store_debug_snapshot(page.content(), url, "fetch error")
+                    print(f"[DEBUG] Saved error snapshot {digest[:12]}")
                 except Exception as snap_err:
                     print(f"[ERROR] Could not save snapshot: {snap_err}")
             raise
@@ -371,9 +392,8 @@ class IbizaSpotlightUnifiedScraper:
         if not event_data.title: # If no title, it's probably not a valid event page
             print(f"[WARNING] No title found for {url}, skipping event data.")
             # Save HTML for debugging
-            debug_path = SNAPSHOT_DIR / f"no_title_debug_{int(time.time())}.html"
-            Path(debug_path).write_text(html_content, encoding="utf-8")
-            print(f"[DEBUG] Saved HTML content to {debug_path}")
+            digest = store_debug_snapshot(html_content, url, "no title")
+            print(f"[DEBUG] Saved HTML snapshot {digest[:12]}")
             return None
             
         return event_data
@@ -471,13 +491,30 @@ class IbizaSpotlightUnifiedScraper:
             traceback.print_exc()
             return None
 
-    def crawl_calendar(self, year: int, month: int) -> List[Event]:
-        """Public method for 'crawl' mode."""
+    def crawl_calendar(self, year: int, month: int, frontier: Optional[CrawlFrontier] = None) -> List[Event]:
+        """Public method for 'crawl' mode.
+
+        With a ``frontier`` the crawl is checkpointed as it goes (the calendar
+        page to continue from, each event scraped), so a resumed run skips
+        finished calendar pages and events and returns them from the checkpoint.
+        """
         start_url = f"{BASE_URL}/night/events/{year}/{month:02d}"
         print(f"[MODE: CRAWL] Starting crawl for {month:02d}/{year} from URL: {start_url}")
         
         all_events: Dict[str, Event] = {} # Use dict to store unique events by URL
         processed_calendar_pages = set() # To avoid re-processing same calendar page if pagination loops
+        current_calendar_url = start_url
+
+        if frontier is not None:
+            all_events = {url: Event.from_dict(data) for url, data in frontier.results()}
+            processed_calendar_pages = set(frontier.get_meta("calendar_pages_done", []))
+            current_calendar_url = frontier.get_meta("calendar_url", start_url)
+            if frontier.get_meta("calendar_complete"):
+                print(f"[INFO] Calendar crawl already complete ({frontier.report()}); retrying unfinished events only.")
+                self._scrape_calendar_links(frontier.urls(), all_events, frontier)
+                return list(all_events.values())
+            if all_events or processed_calendar_pages:
+                print(f"[INFO] Resuming crawl at {current_calendar_url} with {len(all_events)} events already scraped.")
 
         self._ensure_browser()
         page: Optional[Page] = None
@@ -486,8 +523,6 @@ class IbizaSpotlightUnifiedScraper:
             print("[INFO] Applying stealth modifications for crawl session...")
             stealth_sync(page)
             
-            current_calendar_url = start_url
-            
             for _ in range(10): # Max 10 pages of pagination (e.g., 5 weeks + buffer)
                 if current_calendar_url in processed_calendar_pages:
                     print(f"[INFO] Already processed calendar page: {current_calendar_url}. Stopping pagination for this branch.")
@@ -509,19 +544,21 @@ class IbizaSpotlightUnifiedScraper:
                 processed_calendar_pages.add(current_calendar_url)
 
                 event_detail_links = self._extract_event_links_from_calendar(calendar_html, BASE_URL)
-                
-                for link in event_detail_links:
-                    if link not in all_events: # Scrape only if not already processed
-                        event_data = self.scrape_single_event(link) # This uses its own page fetching
-                        if event_data:
-                            all_events[link] = event_data
-                        self._get_random_delay() # Delay between scraping individual event pages
+                if frontier is not None:
+                    frontier.add(event_detail_links)
+                self._scrape_calendar_links(event_detail_links, all_events, frontier)
+                if frontier is not None:
+                    frontier.set_meta("calendar_pages_done", sorted(processed_calendar_pages))
                 
                 if not self._handle_calendar_pagination(page): # page object is passed here
                     print("[INFO] No more calendar pages to paginate or pagination failed.")
+                    if frontier is not None:
+                        frontier.set_meta("calendar_complete", True)
                     break 
                 
                 current_calendar_url = page.url # Update to the new paginated URL
+                if frontier is not None:
+                    frontier.set_meta("calendar_url", current_calendar_url)
                 print(f"[INFO] Paginated to new calendar URL: {current_calendar_url}")
                 self._get_random_delay()
 
@@ -534,6 +571,23 @@ class IbizaSpotlightUnifiedScraper:
                 
         return list(all_events.values())
 
+    def _scrape_calendar_links(self, links: List[str], all_events: Dict[str, Event],
+                               frontier: Optional[CrawlFrontier] = None) -> None:
+        """Scrapes event links not yet in ``all_events``, checkpointing each in ``frontier``."""
+        for link in links:
+            if link in all_events: # Scrape only if not already processed
+                continue
+            if frontier is not None and not frontier.begin(link):
+                continue # Finished, given up on, or backing off after a failure
+            event_data = self.scrape_single_event(link) # This uses its own page fetching
+            if event_data:
+                all_events[link] = event_data
+                if frontier is not None:
+                    frontier.mark_done(link, event_data.to_dict())
+            elif frontier is not None:
+                frontier.mark_failed(link, "no event data")
+            self._get_random_delay() # Delay between scraping individual event pages
+
     def close(self):
         """Cleans up scraper resources."""
         if self.browser:
@@ -594,6 +648,7 @@ def main():
     parser.add_argument("--format", nargs='+', choices=["json", "csv"], default=["json", "csv"], help="Output format(s).")
     parser.add_argument("--min-delay", type=float, default=2.0, help="Minimum random delay (seconds) between requests.")
     parser.add_argument("--max-delay", type=float, default=5.0, help="Maximum random delay (seconds) between requests.")
+    parser.add_argument("--resume", action="store_true", help="Resume an interrupted crawl of the same month from its checkpoint (for 'crawl' mode).")
 
     args = parser.parse_args()
 
@@ -628,7 +683,10 @@ def main():
             if event:
                 all_events_data.append(event)
         elif args.action == "crawl":
-            all_events_data = scraper.crawl_calendar(args.year, args.month)
+            job_key = f"ibiza-spotlight-calendar:{args.year}-{args.month:02d}"
+            with open_frontier(job_key, resume=args.resume) as frontier:
+                all_events_data = scraper.crawl_calendar(args.year, args.month, frontier=frontier)
+                print(f"[INFO] {frontier.report()}")
             
         if not all_events_data:
             print("[INFO] No events were successfully scraped.")
@@ -12,7 +12,6 @@ Incorporates insights from user-provided XPaths for better targeting.
 """
 import argparse
 import csv
-import json
 import random
 import re
 import time
@@ -20,13 +19,16 @@ import traceback
 from dataclasses import dataclass, asdict, fields
 from datetime import datetime, date, time as dt_time
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Iterable, List, Dict, Optional, Any
 from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup, Tag
 import mistune
 from utils.cleanup_html import cleanup_html
 from config import settings
+from parse_components.site_specs import get_site_extractor
+from scraping_components.fetch_profiles import apply_profile, profile_for, wait_until_ready
+from scraping_components.ndjson_sink import NDJSONSink
 
 try:
     from playwright.sync_api import sync_playwright, Browser, Locator, TimeoutError as PlaywrightTimeoutError
@@ -119,6 +121,12 @@ class IbizaSpotlightUnifiedScraper:
             self.browser = self.playwright_context.chromium.launch(headless=self.headless)
             print("[INFO] Playwright browser started.")
 
+    def _new_page(self, url: str) -> Any:
+        """Opens a page in its own context, set up with the fetch profile for ``url``."""
+        profile = profile_for(url)
+        page = self.browser.new_page(user_agent=random.choice(MODERN_USER_AGENTS), **profile.context_options())
+        apply_profile(page.context, profile)
+        return page
 
     def _human_click(self, page: Any, locator: Any, timeout: int = 10000):
         try:
@@ -205,15 +213,16 @@ class IbizaSpotlightUnifiedScraper:
         self._ensure_browser()
         page: Any = None  # Changed type to `Any` to avoid type expression error
         try:
-            page = self.browser.new_page(user_agent=random.choice(MODERN_USER_AGENTS))
+            profile = profile_for(url)
+            page = self._new_page(url)
             print("[INFO] Navigating to:", url)
-            page.goto(url, wait_until="domcontentloaded", timeout=75000)  # Increased timeout
+            page.goto(url, wait_until=profile.wait_until, timeout=profile.navigation_timeout)
             
             self._handle_overlays(page)
             
-            content_ready_selector = wait_for_content_selector if wait_for_content_selector else "body"
-            print(f"[INFO] Waiting for main content ('{content_ready_selector}')...")
-            page.wait_for_selector(content_ready_selector, timeout=45000, state="visible")
+            print(f"[INFO] Waiting for main content ('{wait_for_content_selector or profile.ready_selector or profile.ready_state}')...")
+            if not wait_until_ready(page, profile, wait_for_content_selector):
+                print(f"[WARNING] Content not ready within {profile.ready_timeout}ms; using the page as loaded.")
             return page.content()
         except Exception as e:
             print(f"[ERROR] Playwright fetch failed for {url}: {e}")
@@ -224,106 +233,47 @@ class IbizaSpotlightUnifiedScraper:
 
     def _parse_event_detail_page_content(self, html_content: str, url: str) -> Optional[Event]:
         print(f"[INFO] Parsing event detail page: {url}")
-        soup = BeautifulSoup(html_content, "lxml")
+        # Selectors and value clean-up live in parse_components/specs/ibiza-spotlight-event.yaml;
+        # refine them there against live pages.
+        fields = get_site_extractor("ibiza-spotlight-event").extract(html_content) or {}
         event_data = Event(url=url)
+        for name in ("title", "venue", "date_text", "start_time", "end_time", "price_text",
+                     "price_value", "currency", "lineup", "description", "promoter", "categories"):
+            if name in fields:
+                setattr(event_data, name, fields[name])
 
-        # --- SELECTORS FOR IBIZA SPOTLIGHT EVENT DETAIL PAGE ---
-        # !!! IMPORTANT: YOU MUST INSPECT LIVE IBIZA SPOTLIGHT EVENT DETAIL PAGES !!!
-        # !!! AND REFINE THESE SELECTORS FOR ACCURATE DATA EXTRACTION.       !!!
-        # The selectors below are EDUCATED GUESSES based on common patterns.
-        selectors = {
-            "title": "h1.eventTitle, h1.article-title, main h1, article header h1", 
-            "venue": "a[href*='/club/'], .promoter-info a[href*='/night/clubs/'], .venue-name-class", # Look for links to club pages
-            "date_text": ".event-date-time-class, .event-info .date, time[datetime]", 
-            "time_text": ".event-date-time-class, .event-info .time", # Often date and time are together
-            "price_text": ".price-info-class, .ticket-price-class, .buy-tickets .price",
-            "lineup_container": ".lineup-section, .dj-list-container, #lineup", 
-            "dj_item": "li, .artist-name, .dj-name", 
-            "description": "div.event-description-text, article div.article-content, section#description",
-            "promoter": ".promoter-link a, .event-by-promoter",
-            "categories_container": ".event-tags, .category-list",
-            "category_item": "a, .tag-item"
-        }
-        # --- END OF SELECTOR REFINEMENT NOTE ---
-
-        title_elem = soup.select_one(selectors["title"])
-        if title_elem: event_data.title = title_elem.get_text(strip=True)
-        else: print(f"[WARNING] No title found on detail page: {url}. This event might be skipped if title is critical."); # Not returning None yet, other fields might exist
-
-        venue_elem = soup.select_one(selectors["venue"])
-        if venue_elem: event_data.venue = venue_elem.get_text(strip=True)
-        
-        date_text_elem = soup.select_one(selectors["date_text"])
-        if date_text_elem:
-            event_data.date_text = date_text_elem.get('datetime') or date_text_elem.get_text(strip=True)
-            # Attempt to parse start_date and start_time (basic example)
+        if not event_data.title:
+            print(f"[WARNING] No title found on detail page: {url}. This event might be skipped if title is critical.")
+
+        if event_data.date_text:
+            # Attempt to parse start_date (basic example)
             try:
-                if event_data.date_text:
-                    # More robust parsing needed here for various date formats
-                    # Example: "Thursday 01 May 2025" or "01/05/2025"
-                    # This is a placeholder - real parsing needs to handle Ibiza Spotlight's specific format
-                    parsed_dt = None
-                    # Try ISO format first
-                    try: parsed_dt = datetime.fromisoformat(event_data.date_text.replace('Z', '+00:00'))
-                    except ValueError:
-                        # Try common European format "DD MMM YYYY" or "DD Month YYYY"
-                        for fmt in ("%d %b %Y", "%d %B %Y", "%A %d %B %Y"):
-                            try:
-                                # Extract year from URL if not in text
-                                year_in_url_match = re.search(r'/(\d{4})/', url)
-                                year_context = year_in_url_match.group(1) if year_in_url_match else str(datetime.now().year)
-                                # Append year if not present
-                                date_to_parse = event_data.date_text
-                                if not re.search(r'\d{4}', date_to_parse): # If year is not in text
-                                    date_to_parse += f" {year_context}"
-                                parsed_dt = datetime.strptime(date_to_parse, fmt)
-                                break
-                            except ValueError:
-                                continue
-                    if parsed_dt:
-                        event_data.start_date = parsed_dt.date()
-                        # Time might be separate or part of a longer string
+                # More robust parsing needed here for various date formats
+                # Example: "Thursday 01 May 2025" or "01/05/2025"
+                # This is a placeholder - real parsing needs to handle Ibiza Spotlight's specific format
+                parsed_dt = None
+                # Try ISO format first
+                try: parsed_dt = datetime.fromisoformat(event_data.date_text.replace('Z', '+00:00'))
+                except ValueError:
+                    # Try common European format "DD MMM YYYY" or "DD Month YYYY"
+                    for fmt in ("%d %b %Y", "%d %B %Y", "%A %d %B %Y"):
+                        try:
+                            # Extract year from URL if not in text
+                            year_in_url_match = re.search(r'/(\d{4})/', url)
+                            year_context = year_in_url_match.group(1) if year_in_url_match else str(datetime.now().year)
+                            # Append year if not present
+                            date_to_parse = event_data.date_text
+                            if not re.search(r'\d{4}', date_to_parse): # If year is not in text
+                                date_to_parse += f" {year_context}"
+                            parsed_dt = datetime.strptime(date_to_parse, fmt)
+                            break
+                        except ValueError:
+                            continue
+                if parsed_dt:
+                    event_data.start_date = parsed_dt.date()
             except Exception as e_date:
                 print(f"[DEBUG] Could not parse date from text '{event_data.date_text}': {e_date}")
 
-        time_text_elem = soup.select_one(selectors["time_text"])
-        if time_text_elem:
-            time_full_text = time_text_elem.get_text(strip=True)
-            time_matches = re.findall(r'(\d{1,2}:\d{2})', time_full_text) # Finds HH:MM
-            if time_matches:
-                try:
-                    event_data.start_time = dt_time.fromisoformat(time_matches[0])
-                    if len(time_matches) > 1:
-                        event_data.end_time = dt_time.fromisoformat(time_matches[1])
-                except ValueError: print(f"[WARNING] Could not parse time(s) from: {time_full_text}")
-
-        price_elem = soup.select_one(selectors["price_text"])
-        if price_elem: 
-            event_data.price_text = price_elem.get_text(strip=True)
-            price_match = re.search(r'(\d[\d,.]*\d)', event_data.price_text.replace(',', '.')) # Normalize comma to dot for float
-            if price_match:
-                try: event_data.price_value = float(price_match.group(1))
-                except ValueError: print(f"[WARNING] Could not parse price from: {event_data.price_text}")
-            if "€" in event_data.price_text or "eur" in event_data.price_text.lower(): event_data.currency = "EUR"
-            elif "$" in event_data.price_text or "usd" in event_data.price_text.lower(): event_data.currency = "USD"
-            elif "£" in event_data.price_text or "gbp" in event_data.price_text.lower(): event_data.currency = "GBP"
-            
-        lineup_container = soup.select_one(selectors["lineup_container"])
-        if lineup_container:
-            dj_elements = lineup_container.select(selectors["dj_item"])
-            event_data.lineup = [dj.get_text(strip=True) for dj in dj_elements if dj.get_text(strip=True)]
-        
-        desc_elem = soup.select_one(selectors["description"])
-        if desc_elem: event_data.description = desc_elem.get_text(strip=True, separator="\n")
-
-        promoter_elem = soup.select_one(selectors["promoter"])
-        if promoter_elem: event_data.promoter = promoter_elem.get_text(strip=True)
-
-        categories_container = soup.select_one(selectors["categories_container"])
-        if categories_container:
-            cat_elements = categories_container.select(selectors["category_item"])
-            event_data.categories = [cat.get_text(strip=True) for cat in cat_elements if cat.get_text(strip=True)]
-            
         if not event_data.title and not event_data.venue and not event_data.date_text:
              print(f"[WARNING] Very little data found for {url}, likely not a valid event detail page or selectors need major update.")
              return None
@@ -400,6 +350,12 @@ class IbizaSpotlightUnifiedScraper:
             print(f"[INFO] Extracted {len(links)} potential event detail links from {calendar_page_url}.")
         return list(links)
 
+    def _wait_after_navigation(self, page: Any) -> None:
+        """Waits for a click-triggered navigation under the site's fetch profile."""
+        profile = profile_for(page.url)
+        page.wait_for_load_state(profile.wait_until, timeout=profile.navigation_timeout)
+        wait_until_ready(page, profile)
+
     def _handle_calendar_pagination(self, page: Page) -> bool:
         print("[INFO] Checking for calendar weekly pagination...")
         try:
@@ -408,7 +364,7 @@ class IbizaSpotlightUnifiedScraper:
             if mobile_next_button_locator.is_visible(timeout=3000):
                 print("[INFO] Found mobile 'Next week' link. Clicking...")
                 self._human_click(page, mobile_next_button_locator)
-                page.wait_for_load_state("networkidle", timeout=30000) # Increased wait
+                self._wait_after_navigation(page)
                 print(f"[INFO] Paginated (mobile) to: {page.url}")
                 return True
 
@@ -442,7 +398,7 @@ class IbizaSpotlightUnifiedScraper:
                 next_week_link_locator = all_week_nav_links[active_link_index + 1]
                 print(f"[INFO] Found desktop 'Next week' link (index {active_link_index + 1}). Text: '{next_week_link_locator.text_content(timeout=1000)}'. Clicking...")
                 self._human_click(page, next_week_link_locator)
-                page.wait_for_load_state("networkidle", timeout=30000) # Increased wait
+                self._wait_after_navigation(page)
                 print(f"[INFO] Paginated (desktop) to: {page.url}")
                 return True
             else:
@@ -491,9 +447,11 @@ class IbizaSpotlightUnifiedScraper:
         self._ensure_browser()
         page: Any = None  # Changed type to `Any` to avoid type expression error
         try:
-            page = self.browser.new_page(user_agent=random.choice(MODERN_USER_AGENTS))
+            calendar_url = f"{BASE_URL}/night/events/{year}/{month:02d}"
+            profile = profile_for(calendar_url)
+            page = self._new_page(calendar_url)
             print("[INFO] Starting crawl session...")
-            page.goto(f"{BASE_URL}/night/events/{year}/{month:02d}", wait_until="domcontentloaded", timeout=75000)
+            page.goto(calendar_url, wait_until=profile.wait_until, timeout=profile.navigation_timeout)
             # ...existing code...
         finally:
             if page:
@@ -509,49 +467,49 @@ class IbizaSpotlightUnifiedScraper:
             except Exception as e: print(f"[DEBUG] Error stopping Playwright context: {e}")
         print("[INFO] Scraper resources closed.")
 
-def save_events_to_file(events: List[Event], filepath_base: Path, formats: List[str]):
-    if not events: print("[INFO] No events to save."); return
-    
-    for event in events:
-        if event.extraction_method == "markdown_fallback" and "md" in formats:
-            # Use the specific path provided by the user for markdown fallback output
-            md_path = Path("/home/creekz/Projects/skrrraped_graph/single_event_test_output/scraped_event_www_ibizaspotlight_com_001.md")
-            md_path.parent.mkdir(parents=True, exist_ok=True) # Ensure directory exists
-            with md_path.open("w", encoding="utf-8") as f:
-                f.write(event.description if event.description else "")
-            print(f"[INFO] Saved markdown fallback content to {md_path}")
-            # Do not save this event as JSON/CSV if it's a markdown fallback, as it's not structured data
-            continue 
-
-    if "json" in formats:
-        json_path = filepath_base.with_suffix(".json")
-        # Filter out markdown fallback events from JSON/CSV output
-        json_events = [e for e in events if e.extraction_method != "markdown_fallback"]
-        if json_events:
-            with json_path.open("w", encoding="utf-8") as f:
-                json.dump([e.to_dict() for e in json_events], f, indent=2, ensure_ascii=False)
-            print(f"[INFO] Saved {len(json_events)} structured events to {json_path}")
-        else:
-            print("[INFO] No structured events to save to JSON.")
-
-    if "csv" in formats and events:
-        csv_path = filepath_base.with_suffix(".csv")
-        # Filter out markdown fallback events from JSON/CSV output
-        csv_events = [e for e in events if e.extraction_method != "markdown_fallback"]
-        if csv_events:
-            # Ensure all possible keys are included in header, even if some events don't have them
-            all_keys = set()
-            for event in csv_events:
-                all_keys.update(event.to_dict().keys())
-            fieldnames = sorted(list(all_keys))
-
-            with csv_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-                writer.writeheader()
-                for event in csv_events: writer.writerow(event.to_dict())
-            print(f"[INFO] Saved {len(csv_events)} structured events to {csv_path}")
+def save_events_to_file(events: Iterable[Event], filepath_base: Path, formats: List[str]):
+    """Write events in one pass: JSON as streamed NDJSON, CSV row by row.
+
+    ``events`` may be a generator, so a crawl can be written as it runs
+    rather than held in memory until the end.
+    """
+    sink = NDJSONSink(f"{filepath_base}.ndjson") if "json" in formats else None
+    csv_path = filepath_base.with_suffix(".csv")
+    csv_file = csv_path.open("w", newline="", encoding="utf-8") if "csv" in formats else None
+    # Every Event serializes the same dataclass fields, so the header is known up front
+    csv_writer = csv.DictWriter(csv_file, fieldnames=sorted(f.name for f in fields(Event)), extrasaction='ignore') if csv_file else None
+    seen = structured = 0
+    try:
+        if csv_writer: csv_writer.writeheader()
+        for event in events:
+            seen += 1
+            if event.extraction_method == "markdown_fallback":
+                if "md" in formats:
+                    # Use the specific path provided by the user for markdown fallback output
+                    md_path = Path("/home/creekz/Projects/skrrraped_graph/single_event_test_output/scraped_event_www_ibizaspotlight_com_001.md")
+                    md_path.parent.mkdir(parents=True, exist_ok=True) # Ensure directory exists
+                    with md_path.open("w", encoding="utf-8") as f:
+                        f.write(event.description if event.description else "")
+                    print(f"[INFO] Saved markdown fallback content to {md_path}")
+                # Do not save this event as JSON/CSV if it's a markdown fallback, as it's not structured data
+                continue
+            structured += 1
+            event_dict = event.to_dict()
+            if sink: sink.write(event_dict)
+            if csv_writer: csv_writer.writerow(event_dict)
+    finally:
+        if sink: sink.close()
+        if csv_file: csv_file.close()
+
+    if not seen: print("[INFO] No events to save.")
+    for label, paths in (("JSON", sink.paths if sink else []), ("CSV", [csv_path] if csv_file else [])):
+        if not paths:
+            continue
+        if structured:
+            print(f"[INFO] Saved {structured} structured events to {', '.join(str(p) for p in paths)}")
         else:
-            print("[INFO] No structured events to save to CSV.")
+            for path in paths: path.unlink(missing_ok=True)
+            if seen: print(f"[INFO] No structured events to save to {label}.")
 
 def main():
     parser = argparse.ArgumentParser(description="Unified Ibiza Spotlight Scraper v1.2 - Refined")
@@ -0,0 +1,92 @@
+"""
+Normalized content fingerprints for change detection.
+
+Two fetches of an unchanged event page are rarely byte-identical: caching
+plugins stamp generation times into comments, WordPress rotates nonces in
+inline scripts and forms, and asset URLs carry cache-busting query strings.
+``content_fingerprint`` strips those volatile parts before hashing, so the
+fingerprint only changes when content a parser could extract has changed.
+
+Event data itself is never stripped: JSON-LD blocks are kept (minus their
+``dateModified``), and dates in the page body are left alone.
+
+``extraction_fingerprint`` is the same idea one step later: a hash of what
+the parsers and scorer produced from a page, without run timestamps, so a
+replay of stored pages can tell which events actually came out different.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict
+
+# Bump when normalization changes so stored fingerprints stop matching
+FINGERPRINT_VERSION = 1
+
+_COMMENTS = re.compile(r"<!--.*?-->", re.DOTALL)
+# Inline/external scripts other than JSON-LD carry nonces, timestamps and tracking ids
+_NON_JSONLD_SCRIPTS = re.compile(
+    r"<script\b(?![^>]*application/ld\+json)[^>]*>.*?</script\s*>", re.DOTALL | re.IGNORECASE
+)
+_STYLES = re.compile(r"<style\b[^>]*>.*?</style\s*>", re.DOTALL | re.IGNORECASE)
+_VOLATILE_ATTRIBUTES = re.compile(
+    r"""\s(?:nonce|data-nonce|data-csrf|data-timestamp|data-time|data-cache-buster|data-request-id)\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+)""",
+    re.IGNORECASE,
+)
+_INPUTS = re.compile(r"<input\b[^>]*>", re.IGNORECASE)
+_HIDDEN = re.compile(r"""type\s*=\s*["']?hidden""", re.IGNORECASE)
+_TOKEN_NAMES = re.compile(r"""name\s*=\s*["']?[^"'\s>]*(?:csrf|token|nonce|authenticity|_wp_http_referer)""", re.IGNORECASE)
+_VOLATILE_META = re.compile(
+    r"<meta\b[^>]*(?:csrf|nonce|modified_time|updated_time|generator)[^>]*>", re.IGNORECASE
+)
+_CACHE_BUSTERS = re.compile(r"""([?&](?:ver|v|_|t|ts|cb|nocache|timestamp)=)[^&"'\s>]*""", re.IGNORECASE)
+_JSONLD_MODIFIED = re.compile(r""""dateModified"\s*:\s*"[^"]*",?""")
+_WHITESPACE = re.compile(r"\s+")
+
+# Set per run or per write rather than extracted from the page
+EXTRACTION_VOLATILE_FIELDS = frozenset({
+    "_id", "html", "htmlSnapshot", "contentFingerprint", "extractionFingerprint",
+    "scrapedAt", "updatedAt", "lastUpdated", "lastCheckedAt", "firstScraped", "reextractedAt",
+})
+_VOLATILE_NESTED_FIELDS = frozenset({"lastCalculated", "lastChecked"})
+
+
+def _strip_token_input(match: "re.Match") -> str:
+    tag = match.group(0)
+    if _HIDDEN.search(tag) and _TOKEN_NAMES.search(tag):
+        return ""
+    return tag
+
+
+def normalize_html_for_fingerprint(html: str) -> str:
+    """Return ``html`` with volatile markup removed and whitespace collapsed."""
+    text = _COMMENTS.sub("", html)
+    text = _NON_JSONLD_SCRIPTS.sub("", text)
+    text = _STYLES.sub("", text)
+    text = _VOLATILE_META.sub("", text)
+    text = _INPUTS.sub(_strip_token_input, text)
+    text = _VOLATILE_ATTRIBUTES.sub("", text)
+    text = _CACHE_BUSTERS.sub(r"\1", text)
+    text = _JSONLD_MODIFIED.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def content_fingerprint(html: str) -> str:
+    """Versioned SHA-256 of the normalized page, e.g. ``"v1:9f86d0..."``."""
+    digest = hashlib.sha256(normalize_html_for_fingerprint(html).encode("utf-8")).hexdigest()
+    return f"v{FINGERPRINT_VERSION}:{digest}"
+
+
+def _stable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _stable(v) for k, v in value.items() if k not in _VOLATILE_NESTED_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_stable(v) for v in value]
+    return value
+
+
+def extraction_fingerprint(event_data: Dict[str, Any]) -> str:
+    """Versioned SHA-256 of an extracted, scored event without its timestamps."""
+    stable = {k: _stable(v) for k, v in event_data.items() if k not in EXTRACTION_VOLATILE_FIELDS}
+    encoded = json.dumps(stable, sort_keys=True, default=str, ensure_ascii=False)
+    return f"v{FINGERPRINT_VERSION}:{hashlib.sha256(encoded.encode('utf-8')).hexdigest()}"
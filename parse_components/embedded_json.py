@@ -0,0 +1,106 @@
+"""
+Event data from JSON embedded in a page's scripts.
+
+Pages rendered client-side often ship the event they are about to render as
+JSON in the plain HTTP response: ``<script type="application/json">`` blobs
+(``__NEXT_DATA__`` and friends) or ``window.__STATE__ = {...}`` assignments.
+Reading that JSON gets the same data a browser render would, for the price
+of an HTTP fetch.
+
+``find_embedded_event`` walks every embedded blob for the first object that
+looks like an event (a name or title plus a start date) and returns it in
+JSON-LD shape, so scrapers can map it with their existing JSON-LD mapping.
+JSON-LD scripts themselves are left to the regular extraction layers.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, Optional
+
+_JSON_SCRIPTS = re.compile(
+    r"<script\b[^>]*type=[\"']application/json[\"'][^>]*>(.*?)</script\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_STATE_ASSIGNMENTS = re.compile(
+    r"window\.__[A-Za-z0-9_]+__\s*=\s*(\{.*?\})\s*;?\s*(?:</script|\n)",
+    re.DOTALL,
+)
+
+# Keys that carry each JSON-LD field in app-state payloads, in preference order
+_FIELD_KEYS = {
+    "name": ("name", "title", "eventName"),
+    "startDate": ("startDate", "start_date", "startTime", "start", "date"),
+    "endDate": ("endDate", "end_date", "endTime", "end"),
+    "location": ("location", "venue"),
+    "offers": ("offers", "tickets", "ticketInfo"),
+    "performer": ("performer", "performers", "lineup", "artists"),
+    "description": ("description", "summary"),
+    "image": ("image", "images", "imageUrl"),
+}
+
+MAX_NODES = 20000
+
+
+def iter_embedded_json(html: str) -> Iterator[Any]:
+    """Parsed JSON payloads embedded in ``html``; unparsable blobs are skipped"""
+    for pattern in (_JSON_SCRIPTS, _STATE_ASSIGNMENTS):
+        for match in pattern.finditer(html or ""):
+            try:
+                yield json.loads(match.group(1).strip())
+            except ValueError:
+                continue
+
+
+def _first(node: Dict[str, Any], keys) -> Any:
+    for key in keys:
+        value = node.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _looks_like_event(node: Dict[str, Any]) -> bool:
+    node_type = node.get("@type") or node.get("__typename") or node.get("type")
+    if isinstance(node_type, str) and "event" in node_type.lower():
+        return _first(node, _FIELD_KEYS["name"]) is not None
+    return (_first(node, _FIELD_KEYS["name"]) is not None
+            and isinstance(_first(node, _FIELD_KEYS["startDate"]), str))
+
+
+def _find_event_node(data: Any) -> Optional[Dict[str, Any]]:
+    stack, seen = [data], 0
+    while stack and seen < MAX_NODES:
+        node = stack.pop()
+        seen += 1
+        if isinstance(node, dict):
+            if _looks_like_event(node):
+                return node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def find_embedded_event(html: str) -> Optional[Dict[str, Any]]:
+    """The first event-like object embedded in ``html``, in JSON-LD shape"""
+    for payload in iter_embedded_json(html):
+        node = _find_event_node(payload)
+        if node is None:
+            continue
+        event: Dict[str, Any] = {"@type": "MusicEvent"}
+        for field, keys in _FIELD_KEYS.items():
+            value = _first(node, keys)
+            if value is not None:
+                event[field] = value
+        location = event.get("location")
+        if isinstance(location, str):
+            event["location"] = {"@type": "Place", "name": location}
+        elif isinstance(location, dict) and isinstance(location.get("address"), str):
+            event["location"] = {**location, "address": {"streetAddress": location["address"]}}
+        performers = event.get("performer")
+        if isinstance(performers, (str, dict)):
+            performers = [performers]
+        if isinstance(performers, list):
+            event["performer"] = [{"name": p} if isinstance(p, str) else p for p in performers]
+        return event
+    return None
@@ -0,0 +1,371 @@
+"""
+Single-pass lxml extraction engine.
+
+The BeautifulSoup extractors in ``mono_ticketmaster`` walk the whole tree once
+per selector: up to 23 ``select_one`` calls for the WordPress fields, plus
+separate scans for meta tags, JSON-LD scripts, lineup headers and ticket
+links, all on top of the pure-Python ``html.parser``. ``ExtractionEngine``
+parses once with lxml and resolves everything in one document-order
+traversal:
+
+* field selectors are compiled up front into tag/class/attribute predicates,
+  and each field keeps the match of its highest-priority selector (the same
+  "first selector that matches anything wins" rule as the ``select_one``
+  loops);
+* Open Graph / named meta tags, ``application/ld+json`` scripts, lineup
+  headers and "Buy Tickets" links are collected in the same pass.
+
+Text is extracted with BeautifulSoup's ``get_text`` semantics (comments,
+``<script>``, ``<style>`` and ``<template>`` content skipped), so results match
+the legacy extractors. Only simple compound selectors are supported
+(``tag.class[attr*="value"]#id``); combinators raise ``ValueError`` at compile
+time rather than silently matching differently.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+import lxml.html
+from lxml import etree
+
+_SKIP_TEXT_TAGS = {"script", "style", "template"}
+
+_SELECTOR_RE = re.compile(
+    r"""^(?P<tag>[a-zA-Z][a-zA-Z0-9-]*|\*)?(?P<rest>(?:\.[\w-]+|\#[\w-]+|\[[^\]]+\])*)$"""
+)
+_PART_RE = re.compile(r"""\.([\w-]+)|\#([\w-]+)|\[\s*([\w-]+)\s*(?:([*^$~|]?=)\s*["']?([^"'\]]*)["']?\s*)?\]""")
+
+
+@dataclass(frozen=True)
+class CompiledSelector:
+    """A simple compound CSS selector compiled to a predicate."""
+    source: str
+    tag: Optional[str] = None
+    classes: FrozenSet[str] = frozenset()
+    element_id: Optional[str] = None
+    attributes: Tuple[Tuple[str, Optional[str], Optional[str]], ...] = ()
+
+    def matches(self, el, class_tokens: FrozenSet[str]) -> bool:
+        if self.tag is not None and el.tag != self.tag:
+            return False
+        if self.classes and not self.classes <= class_tokens:
+            return False
+        if self.element_id is not None and el.get("id") != self.element_id:
+            return False
+        for name, op, value in self.attributes:
+            actual = el.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == "=" and actual != value:
+                return False
+            if op == "*=" and (not value or value not in actual):
+                return False
+            if op == "^=" and (not value or not actual.startswith(value)):
+                return False
+            if op == "$=" and (not value or not actual.endswith(value)):
+                return False
+            if op == "~=" and value not in actual.split():
+                return False
+            if op == "|=" and actual != value and not actual.startswith(value + "-"):
+                return False
+        return True
+
+    def xpath_step(self) -> str:
+        """The same predicate as an XPath 1.0 step, e.g. ``a[@href and contains(@href, 'ticket')]``."""
+        predicates = []
+        for cls in sorted(self.classes):
+            predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), {xpath_literal(' ' + cls + ' ')})")
+        if self.element_id is not None:
+            predicates.append(f"@id={xpath_literal(self.element_id)}")
+        for name, op, value in self.attributes:
+            attr = f"@{name}"
+            literal = xpath_literal(value or "")
+            if op is None:
+                predicates.append(attr)
+            elif op == "=":
+                predicates.append(f"{attr}={literal}")
+            elif op in ("*=", "^=", "$=") and not value:
+                predicates.append("false()")
+            elif op == "*=":
+                predicates.append(f"contains({attr}, {literal})")
+            elif op == "^=":
+                predicates.append(f"starts-with({attr}, {literal})")
+            elif op == "$=":
+                predicates.append(
+                    f"substring({attr}, string-length({attr}) - {len(value) - 1})={literal}"
+                )
+            elif op == "~=":
+                predicates.append(
+                    f"contains(concat(' ', normalize-space({attr}), ' '), {xpath_literal(' ' + (value or '') + ' ')})"
+                )
+            elif op == "|=":
+                predicates.append(f"({attr}={literal} or starts-with({attr}, {xpath_literal((value or '') + '-')}))")
+        return (self.tag or "*") + "".join(f"[{p}]" for p in predicates)
+
+
+def xpath_literal(value: str) -> str:
+    """Quote ``value`` as an XPath 1.0 string literal."""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def compile_selector(selector: str) -> CompiledSelector:
+    """Compile a simple compound CSS selector; raises ValueError for anything else."""
+    match = _SELECTOR_RE.match(selector.strip())
+    if not match:
+        raise ValueError(f"Unsupported selector for single-pass extraction: {selector!r}")
+    tag = match.group("tag")
+    classes = set()
+    element_id = None
+    attributes = []
+    rest = match.group("rest") or ""
+    pos = 0
+    while pos < len(rest):
+        part = _PART_RE.match(rest, pos)
+        if not part:
+            raise ValueError(f"Unsupported selector for single-pass extraction: {selector!r}")
+        cls, ident, attr, op, value = part.groups()
+        if cls:
+            classes.add(cls)
+        elif ident:
+            element_id = ident
+        else:
+            attributes.append((attr.lower(), op, value))
+        pos = part.end()
+    return CompiledSelector(
+        source=selector,
+        tag=None if tag in (None, "*") else tag.lower(),
+        classes=frozenset(classes),
+        element_id=element_id,
+        attributes=tuple(attributes),
+    )
+
+
+def _text_strings(el) -> Iterator[str]:
+    """Text nodes under ``el`` as BeautifulSoup's get_text sees them."""
+    if isinstance(el.tag, str) and el.tag in _SKIP_TEXT_TAGS:
+        return
+    if el.text and isinstance(el.tag, str):
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str):
+            yield from _text_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def get_text(el, separator: str = "") -> str:
+    """Equivalent of BeautifulSoup's ``get_text(separator, strip=True)``."""
+    return separator.join(s.strip() for s in _text_strings(el) if s.strip())
+
+
+def element_string(el) -> Optional[str]:
+    """Equivalent of BeautifulSoup's ``Tag.string``: the text of a single-child chain."""
+    children = [child for child in el]
+    if not children:
+        return el.text or None
+    if len(children) == 1 and not (el.text or "") and not (children[0].tail or ""):
+        child = children[0]
+        if not isinstance(child.tag, str):  # a lone comment
+            return child.text
+        return element_string(child)
+    return None
+
+
+def parse_document(html: str):
+    """Parse HTML with lxml, returning None for empty or unparseable input."""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Unicode strings with an XML encoding declaration
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return None
+
+
+def _next_sibling_tag(el):
+    sibling = el.getnext()
+    while sibling is not None and not isinstance(sibling.tag, str):
+        sibling = sibling.getnext()
+    return sibling
+
+
+@dataclass
+class PageExtraction:
+    """Everything an ``ExtractionEngine`` pulled out of one page."""
+    fields: Dict[str, str] = field(default_factory=dict)
+    meta: Dict[str, str] = field(default_factory=dict)
+    jsonld: Optional[Dict] = None
+    lineup: List[str] = field(default_factory=list)
+    ticket_url: Optional[str] = None
+
+
+class ExtractionEngine:
+    """Resolves a site's field selectors, meta tags, JSON-LD, lineup and ticket link in one pass."""
+
+    def __init__(
+        self,
+        fields: Dict[str, Sequence[str]],
+        *,
+        max_lengths: Optional[Dict[str, int]] = None,
+        og_properties: Optional[Dict[str, str]] = None,
+        meta_names: Optional[Dict[str, str]] = None,
+        jsonld_types: Sequence[str] = ("MusicEvent",),
+        lineup_pattern: str = r"Line\s*Up",
+        lineup_header_tags: Sequence[str] = ("h3", "h4", "h5"),
+        lineup_stop_tags: Sequence[str] = ("h3", "h4", "h5", "div"),
+        ticket_text_pattern: str = r"Buy\s*Tickets",
+        ticket_href_keywords: Sequence[str] = ("fourvenues", "ticket"),
+        ticket_class: Optional[str] = "wcs-btn--action",
+    ):
+        self.field_names = list(fields)
+        self.max_lengths = max_lengths or {}
+        self.og_properties = og_properties or {}
+        self.meta_names = meta_names or {}
+        self.jsonld_types = set(jsonld_types)
+        self.lineup_pattern = re.compile(lineup_pattern, re.IGNORECASE)
+        self.lineup_header_tags = set(lineup_header_tags)
+        self.lineup_stop_tags = set(lineup_stop_tags)
+        self.ticket_text_pattern = re.compile(ticket_text_pattern, re.IGNORECASE)
+        self.ticket_href_keywords = tuple(ticket_href_keywords)
+        self.ticket_class = ticket_class
+
+        # (field, priority, selector), bucketed by tag so most elements test few predicates
+        self._by_tag: Dict[str, List[Tuple[str, int, CompiledSelector]]] = {}
+        self._any_tag: List[Tuple[str, int, CompiledSelector]] = []
+        for name, selectors in fields.items():
+            for priority, selector in enumerate(selectors):
+                compiled = compile_selector(selector)
+                entry = (name, priority, compiled)
+                if compiled.tag is None:
+                    self._any_tag.append(entry)
+                else:
+                    self._by_tag.setdefault(compiled.tag, []).append(entry)
+
+    def parse(self, html: str):
+        return parse_document(html)
+
+    def extract(self, html: str) -> PageExtraction:
+        root = self.parse(html)
+        if root is None:
+            return PageExtraction()
+        return self.extract_tree(root)
+
+    def extract_tree(self, root) -> PageExtraction:
+        result = PageExtraction()
+        best: Dict[str, Tuple[int, object]] = {}
+        og_seen: Dict[str, object] = {}
+        names_seen: Dict[str, object] = {}
+        jsonld_scripts = []
+        lineup_headers = []
+        ticket_candidates = []
+        ticket_class_link = None
+
+        for el in root.iter():
+            tag = el.tag
+            if not isinstance(tag, str):
+                continue  # comments and processing instructions
+
+            class_attr = el.get("class")
+            class_tokens = frozenset(class_attr.split()) if class_attr else frozenset()
+
+            for bucket in (self._by_tag.get(tag, ()), self._any_tag):
+                for name, priority, selector in bucket:
+                    current = best.get(name)
+                    if current is not None and current[0] <= priority:
+                        continue
+                    if selector.matches(el, class_tokens):
+                        best[name] = (priority, el)
+
+            if tag == "meta":
+                prop = el.get("property")
+                if prop in self.og_properties and prop not in og_seen:
+                    og_seen[prop] = el
+                meta_name = el.get("name")
+                if meta_name in self.meta_names and meta_name not in names_seen:
+                    names_seen[meta_name] = el
+            elif tag == "script":
+                if el.get("type") == "application/ld+json":
+                    jsonld_scripts.append(el)
+            elif tag == "a":
+                string = element_string(el)
+                if string is not None and self.ticket_text_pattern.search(string):
+                    ticket_candidates.append(el)
+                if ticket_class_link is None and self.ticket_class and self.ticket_class in class_tokens:
+                    ticket_class_link = el
+            if tag in self.lineup_header_tags:
+                string = element_string(el)
+                if string is not None and self.lineup_pattern.search(string):
+                    lineup_headers.append(el)
+
+        for name in self.field_names:
+            if name in best:
+                text = get_text(best[name][1])
+                limit = self.max_lengths.get(name)
+                result.fields[name] = text[:limit] if limit else text
+
+        for prop, key in self.og_properties.items():
+            el = og_seen.get(prop)
+            if el is not None and el.get("content"):
+                result.meta[key] = el.get("content")
+        for meta_name, key in self.meta_names.items():
+            el = names_seen.get(meta_name)
+            if el is not None and el.get("content"):
+                result.meta[key] = el.get("content")
+
+        result.jsonld = self._first_jsonld_event(jsonld_scripts)
+        result.lineup = self._lineup(lineup_headers)
+        result.ticket_url = self._ticket_url(ticket_candidates, ticket_class_link)
+        return result
+
+    def _first_jsonld_event(self, scripts) -> Optional[Dict]:
+        for script in scripts:
+            try:
+                data = json.loads(script.text or "")
+            except (ValueError, TypeError):
+                continue
+            if not isinstance(data, dict):
+                continue
+            for node in data.get("@graph", []) or []:
+                if isinstance(node, dict) and node.get("@type") in self.jsonld_types:
+                    return node
+            if data.get("@type") in self.jsonld_types:
+                return data
+        return None
+
+    def _lineup(self, headers) -> List[str]:
+        artists: List[str] = []
+        for header in headers:
+            sibling = _next_sibling_tag(header)
+            while sibling is not None and sibling.tag not in self.lineup_stop_tags:
+                if sibling.tag == "p":
+                    text = get_text(sibling, separator="\n")
+                    artists.extend(line.strip() for line in text.split("\n") if line.strip())
+                    break
+                if sibling.tag == "ul":
+                    for li in sibling.iterdescendants("li"):
+                        artist = get_text(li)
+                        if artist:
+                            artists.append(artist)
+                    break
+                sibling = _next_sibling_tag(sibling)
+        return list(dict.fromkeys(a for a in artists if a))
+
+    def _ticket_url(self, candidates, class_link) -> Optional[str]:
+        for link in candidates:
+            href = link.get("href")
+            if href and any(keyword in href.lower() for keyword in self.ticket_href_keywords):
+                return href
+        if class_link is not None:
+            return class_link.get("href")
+        return None
@@ -0,0 +1,425 @@
+"""
+Declarative per-site extraction specs.
+
+A spec describes what to pull out of a site's pages without code: named
+fields, each with an ordered list of fallback selectors and an optional chain
+of post-processors. Specs live as YAML or JSON files in
+``parse_components/specs/`` (or any path) and look like::
+
+    site: ibiza-spotlight-event
+    required: [title]
+    fields:
+      title: ["h1.eventTitle", "h1"]
+      date_text:
+        selectors: ["time[datetime]", ".event-info .date"]
+        attr: datetime
+        text_fallback: true
+      lineup:
+        scope: [".lineup-section, #lineup"]
+        selectors: ["li, .artist-name"]
+        many: true
+      currency:
+        from: price_text
+        post: [currency]
+
+Field options:
+
+* ``selectors`` - fallbacks tried in order; the first one matching anything
+  wins (``select_one`` semantics). Entries are CSS strings (compound
+  selectors joined by descendant/child combinators, comma groups allowed) or
+  ``{xpath: "..."}`` for anything CSS cannot express.
+* ``scope`` - selectors for a container; ``selectors`` are then matched
+  inside the first container found.
+* ``attr`` / ``text_fallback`` / ``default`` - read an attribute instead of
+  the text, optionally falling back to the text or a default.
+* ``separator``, ``max_length``, ``many`` - text joining, truncation, and
+  "all matches as a list" instead of the first.
+* ``from`` - derive the field from another field's value instead of the page.
+* ``post`` - post-processors, see ``POST_PROCESSORS``.
+
+``compile_spec`` turns a spec into a ``SiteExtractor`` once: CSS is translated
+to XPath and compiled with ``lxml.etree.XPath``, regexes are compiled, and the
+result is cached by the spec's SHA-256, so pages only pay for evaluation.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urljoin
+
+from lxml import etree
+
+from parse_components.extraction_engine import compile_selector, get_text, parse_document
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:  # pragma: no cover - JSON specs still work without PyYAML
+    yaml = None
+    HAS_YAML = False
+
+SPEC_DIR = Path(__file__).resolve().parent / "specs"
+
+_COMBINATOR_RE = re.compile(r"\s*>\s*|\s+")
+
+
+# --- CSS to XPath ---
+
+def _split_outside_brackets(selector: str, separator: str) -> List[str]:
+    parts, depth, current = [], 0, []
+    for char in selector:
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _compound_steps(selector: str) -> List[Tuple[str, str]]:
+    """Split ``"div.a > p span"`` into ``[(" ", "div.a"), (">", "p"), (" ", "span")]``."""
+    steps: List[Tuple[str, str]] = []
+    combinator = " "
+    pos, depth, start = 0, 0, 0
+    selector = selector.strip()
+    while pos < len(selector):
+        char = selector[pos]
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif depth == 0 and (char.isspace() or char == ">"):
+            match = _COMBINATOR_RE.match(selector, pos)
+            steps.append((combinator, selector[start:pos]))
+            combinator = ">" if ">" in match.group(0) else " "
+            pos = start = match.end()
+            continue
+        pos += 1
+    steps.append((combinator, selector[start:]))
+    if any(not compound for _, compound in steps):
+        raise ValueError(f"Dangling combinator in selector: {selector!r}")
+    return steps
+
+
+def css_to_xpath(selector: str) -> str:
+    """Translate a CSS selector group into an XPath relative to the context node."""
+    paths = []
+    for group in _split_outside_brackets(selector, ","):
+        if not group.strip():
+            raise ValueError(f"Empty selector in group: {selector!r}")
+        path = "."
+        for combinator, compound in _compound_steps(group):
+            step = compile_selector(compound).xpath_step()
+            path += f"/descendant::{step}" if combinator == " " else f"/{step}"
+        paths.append(path)
+    return " | ".join(paths)
+
+
+def _compile_selector_entry(entry: Union[str, Dict[str, str]]) -> etree.XPath:
+    if isinstance(entry, str):
+        expression = css_to_xpath(entry)
+    elif isinstance(entry, dict) and set(entry) == {"css"}:
+        expression = css_to_xpath(entry["css"])
+    elif isinstance(entry, dict) and set(entry) == {"xpath"}:
+        expression = entry["xpath"]
+    else:
+        raise ValueError(f"Selector must be a CSS string, {{css: ...}} or {{xpath: ...}}: {entry!r}")
+    try:
+        return etree.XPath(expression)
+    except etree.XPathSyntaxError as e:
+        raise ValueError(f"Invalid XPath {expression!r}: {e}") from e
+
+
+# --- Post-processors ---
+# Each factory takes the spec's argument and returns fn(value, base_url).
+# Element-wise processors are mapped over list values; the rest see the list.
+
+def _regex(arg):
+    if isinstance(arg, dict):
+        pattern, group = re.compile(arg["pattern"], re.IGNORECASE if arg.get("ignore_case") else 0), arg.get("group")
+    else:
+        pattern, group = re.compile(arg), None
+    if group is None:
+        group = 1 if pattern.groups else 0
+
+    def run(value, base_url):
+        match = pattern.search(value)
+        return match.group(group) if match else None
+    return run
+
+
+def _findall(arg):
+    pattern = re.compile(arg)
+    return lambda value, base_url: pattern.findall(value)
+
+
+def _replace(arg):
+    pattern, replacement = re.compile(arg[0]), arg[1]
+    return lambda value, base_url: pattern.sub(replacement, value)
+
+
+def _index(arg):
+    def run(value, base_url):
+        try:
+            return value[arg]
+        except (IndexError, TypeError):
+            return None
+    return run
+
+
+def _number(kind):
+    def factory(arg):
+        def run(value, base_url):
+            try:
+                return kind(value)
+            except (TypeError, ValueError):
+                return None
+        return run
+    return factory
+
+
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+def _time(arg):
+    def run(value, base_url):
+        match = _TIME_RE.search(value)
+        if not match:
+            return None
+        try:
+            return dt_time(hour=int(match.group(1)), minute=int(match.group(2)))
+        except ValueError:
+            return None
+    return run
+
+
+_CURRENCY_MARKERS = (("EUR", ("€", "eur")), ("USD", ("$", "usd")), ("GBP", ("£", "gbp")))
+
+
+def _currency(arg):
+    def run(value, base_url):
+        lowered = value.lower()
+        for code, markers in _CURRENCY_MARKERS:
+            if any(marker in lowered for marker in markers):
+                return code
+        return None
+    return run
+
+
+POST_PROCESSORS: Dict[str, Tuple[Callable[[Any], Callable], bool]] = {
+    "strip": (lambda arg: lambda value, base_url: value.strip(), True),
+    "lower": (lambda arg: lambda value, base_url: value.lower(), True),
+    "regex": (_regex, True),
+    "findall": (_findall, True),
+    "replace": (_replace, True),
+    "float": (_number(float), True),
+    "int": (_number(int), True),
+    "time": (_time, True),
+    "currency": (_currency, True),
+    "urljoin": (lambda arg: lambda value, base_url: urljoin(base_url, value) if base_url else value, True),
+    "index": (_index, False),
+    "first": (lambda arg: _index(0), False),
+}
+
+
+def _compile_post(steps: Sequence[Union[str, Dict[str, Any]]]) -> List[Tuple[Callable, bool]]:
+    compiled = []
+    for step in steps:
+        if isinstance(step, str):
+            name, arg = step, None
+        elif isinstance(step, dict) and len(step) == 1:
+            name, arg = next(iter(step.items()))
+        else:
+            raise ValueError(f"Post-processor must be a name or a single-key mapping: {step!r}")
+        if name not in POST_PROCESSORS:
+            raise ValueError(f"Unknown post-processor {name!r}; known: {sorted(POST_PROCESSORS)}")
+        factory, elementwise = POST_PROCESSORS[name]
+        try:
+            compiled.append((factory(arg), elementwise))
+        except (re.error, KeyError, TypeError, IndexError) as e:
+            raise ValueError(f"Bad argument for post-processor {name!r}: {arg!r} ({e})") from e
+    return compiled
+
+
+# --- Compiled extractors ---
+
+_FIELD_KEYS = {"selectors", "scope", "attr", "text_fallback", "default", "separator",
+               "max_length", "many", "from", "post"}
+
+
+class CompiledField:
+    """One spec field with its selectors, scope and post-processors compiled."""
+
+    def __init__(self, name: str, spec: Union[Sequence, Dict[str, Any]]):
+        if not isinstance(spec, dict):
+            spec = {"selectors": spec}
+        unknown = set(spec) - _FIELD_KEYS
+        if unknown:
+            raise ValueError(f"Field {name!r} has unknown options: {sorted(unknown)}")
+        self.name = name
+        self.source = spec.get("from")
+        selectors = spec.get("selectors") or []
+        if isinstance(selectors, (str, dict)):
+            selectors = [selectors]
+        if bool(self.source) == bool(selectors):
+            raise ValueError(f"Field {name!r} needs exactly one of 'selectors' or 'from'")
+        self.selectors = [_compile_selector_entry(entry) for entry in selectors]
+        scope = spec.get("scope") or []
+        self.scope = [_compile_selector_entry(entry) for entry in ([scope] if isinstance(scope, (str, dict)) else scope)]
+        self.attr = spec.get("attr")
+        self.text_fallback = bool(spec.get("text_fallback"))
+        self.default = spec.get("default")
+        self.separator = spec.get("separator", "")
+        self.max_length = spec.get("max_length")
+        self.many = bool(spec.get("many"))
+        self.post = _compile_post(spec.get("post") or [])
+
+    def _value(self, el) -> Optional[str]:
+        if self.attr:
+            value = el.get(self.attr)
+            if value:
+                return value
+            if not self.text_fallback:
+                return self.default
+        text = get_text(el, self.separator)
+        return text[:self.max_length] if self.max_length else text
+
+    def _context(self, root):
+        if not self.scope:
+            return root
+        for xpath in self.scope:
+            matches = xpath(root)
+            if matches:
+                return matches[0]
+        return None
+
+    def select(self, root) -> Any:
+        context = self._context(root)
+        if context is None:
+            return None
+        for xpath in self.selectors:
+            matches = [el for el in xpath(context) if isinstance(el.tag, str)]
+            if not matches:
+                continue
+            if self.many:
+                values = (self._value(el) for el in matches)
+                return [value for value in values if value]
+            return self._value(matches[0])
+        return None
+
+    def process(self, value: Any, base_url: Optional[str]) -> Any:
+        for fn, elementwise in self.post:
+            if value is None:
+                return None
+            if elementwise and isinstance(value, list):
+                value = [result for result in (fn(item, base_url) for item in value if item is not None)
+                         if result is not None]
+            else:
+                value = fn(value, base_url)
+        return value
+
+
+class SiteExtractor:
+    """A compiled spec: evaluates every field against a parsed page."""
+
+    def __init__(self, spec: Dict[str, Any], spec_hash: str):
+        if not isinstance(spec, dict) or not isinstance(spec.get("fields"), dict) or not spec["fields"]:
+            raise ValueError("Extraction spec must be a mapping with a non-empty 'fields' mapping")
+        self.site = spec.get("site", "unnamed")
+        self.spec_hash = spec_hash
+        self.required = list(spec.get("required") or [])
+        self.fields = [CompiledField(name, field_spec) for name, field_spec in spec["fields"].items()]
+        names = {f.name for f in self.fields}
+        for f in self.fields:
+            if f.source and f.source not in names:
+                raise ValueError(f"Field {f.name!r} derives from unknown field {f.source!r}")
+        missing = [name for name in self.required if name not in names]
+        if missing:
+            raise ValueError(f"Required fields not defined in spec: {missing}")
+
+    def extract(self, html, base_url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Extract fields from an HTML string or an lxml element.
+
+        Returns None when a required field is missing; otherwise only fields
+        that produced a value are included.
+        """
+        root = parse_document(html) if isinstance(html, str) else html
+        if root is None:
+            return None
+        raw: Dict[str, Any] = {}
+        result: Dict[str, Any] = {}
+        for f in self.fields:
+            raw[f.name] = raw.get(f.source) if f.source else f.select(root)
+            value = f.process(raw[f.name], base_url)
+            if value is not None:
+                result[f.name] = value
+        if any(name not in result for name in self.required):
+            return None
+        return result
+
+    def __repr__(self) -> str:
+        return f"SiteExtractor(site={self.site!r}, fields={len(self.fields)}, hash={self.spec_hash[:12]})"
+
+
+_EXTRACTORS: Dict[str, SiteExtractor] = {}
+_SPEC_FILES: Dict[Path, Tuple[float, Dict[str, Any]]] = {}
+_lock = threading.Lock()
+
+
+def spec_hash(spec: Dict[str, Any]) -> str:
+    """SHA-256 of the spec's canonical JSON form."""
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def compile_spec(spec: Dict[str, Any]) -> SiteExtractor:
+    """Compile ``spec`` into a ``SiteExtractor``, reusing one already built from an identical spec."""
+    key = spec_hash(spec)
+    with _lock:
+        extractor = _EXTRACTORS.get(key)
+        if extractor is None:
+            extractor = _EXTRACTORS[key] = SiteExtractor(spec, key)
+        return extractor
+
+
+def _resolve_spec_path(name_or_path: Union[str, Path]) -> Path:
+    path = Path(name_or_path)
+    if path.suffix in (".yaml", ".yml", ".json") and path.exists():
+        return path.resolve()
+    for suffix in (".yaml", ".yml", ".json"):
+        candidate = SPEC_DIR / f"{name_or_path}{suffix}"
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"No extraction spec named {name_or_path!r} in {SPEC_DIR}")
+
+
+def load_spec(name_or_path: Union[str, Path]) -> Dict[str, Any]:
+    """Load a spec by built-in name (``"ticketsibiza-event"``) or file path; re-read only when modified."""
+    path = _resolve_spec_path(name_or_path)
+    mtime = path.stat().st_mtime
+    cached = _SPEC_FILES.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        spec = json.loads(text)
+    elif HAS_YAML:
+        spec = yaml.safe_load(text)
+    else:
+        raise ImportError(f"PyYAML is required to load {path.name}; install it or use a JSON spec")
+    _SPEC_FILES[path] = (mtime, spec)
+    return spec
+
+
+def get_site_extractor(name_or_path: Union[str, Path]) -> SiteExtractor:
+    """Load and compile a spec; repeated calls return the cached extractor."""
+    return compile_spec(load_spec(name_or_path))
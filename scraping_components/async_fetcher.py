@@ -0,0 +1,327 @@
+"""
+Connection-pooled async HTTP fetcher for static pages.
+
+The requests-based fetchers each sit on a default ``HTTPAdapter`` pool, and
+``rotate_user_agent`` in the mono scrapers used to replace the whole
+``Session`` every few pages, so warm TLS connections were thrown away.
+``AsyncFetcher`` keeps one client for its lifetime:
+
+* with ``httpx`` and ``h2`` installed it speaks HTTP/2, multiplexing every
+  request to a host over one connection; otherwise it falls back to an
+  aiohttp pool of keep-alive HTTP/1.1 connections, capped per host;
+* headers are sent per request, so rotation never touches the pool. With
+  ``rotate_after`` each host gets a new User-Agent every N requests (or a
+  random N from a ``(low, high)`` range, as the mono scrapers' 6-12 pages),
+  while its pooled connection stays open;
+* bodies are streamed and decompressed chunk by chunk (gzip/deflate, and
+  br when ``brotli`` is installed), stopping at ``max_bytes``;
+* request spacing comes from the shared adaptive ``RateLimiter``, which also
+  gets every response status.
+
+``stats`` counts requests, connections opened and protocol versions, so a
+run can show how few connections it needed. The crawl engine drives
+``request`` inside its own host budgets; ``fetch``/``fetch_many`` are for
+standalone use.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp may not be installed
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx is optional
+    httpx = None
+
+# Only their presence matters: httpx negotiates HTTP/2 when h2 is importable,
+# and aiohttp and httpx decode br when brotli or brotlicffi is
+HAS_H2 = importlib.util.find_spec("h2") is not None
+HAS_BROTLI = any(importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi"))
+
+from scraping_components.rate_limiter import RateLimiter, shared_limiter
+
+logger = logging.getLogger(__name__)
+
+# Only advertise encodings the client can actually decode
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+DEFAULT_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
+]
+
+
+class BodyTooLarge(Exception):
+    """A response body went past the fetcher's ``max_bytes``."""
+
+
+# Exceptions ``request`` raises for a failed fetch, whichever backend is in use
+FETCH_ERRORS: tuple = (asyncio.TimeoutError, BodyTooLarge)
+if aiohttp is not None:
+    FETCH_ERRORS += (aiohttp.ClientError,)
+if httpx is not None:
+    FETCH_ERRORS += (httpx.HTTPError,)
+
+
+@dataclass
+class FetchResult:
+    """A fully read response."""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    text: str
+    http_version: str
+    elapsed: float = 0.0
+
+
+@dataclass
+class FetcherStats:
+    requests: int = 0
+    failures: int = 0
+    connections_opened: int = 0
+    bytes_received: int = 0
+    versions: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "connections_opened": self.connections_opened,
+            "bytes_received": self.bytes_received,
+            "versions": dict(self.versions),
+        }
+
+
+class AsyncFetcher:
+    """One pooled HTTP client with per-request header rotation."""
+
+    def __init__(
+        self,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        user_agents: Optional[Sequence[str]] = None,
+        rotate_after: Union[int, Tuple[int, int], None] = None,
+        max_connections: int = 16,
+        per_host_connections: int = 4,
+        timeout: float = 20.0,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        retries: int = 2,
+        http2: bool = True,
+        backend: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        if backend is None:
+            backend = "httpx" if http2 and httpx is not None and HAS_H2 else "aiohttp"
+        if backend == "httpx" and httpx is None:
+            raise ImportError("httpx is not installed. Please run 'pip install httpx[http2]'.")
+        if backend == "aiohttp" and aiohttp is None:
+            raise ImportError("aiohttp is not installed. Please run 'pip install aiohttp'.")
+        if backend not in ("httpx", "aiohttp"):
+            raise ValueError(f"backend must be 'httpx' or 'aiohttp', got {backend!r}")
+        self.backend = backend
+        self.http2 = http2 and backend == "httpx" and HAS_H2
+        self.headers = {**(headers or {}), "Accept-Encoding": ACCEPT_ENCODING}
+        self.user_agents = list(user_agents or [])
+        self.user_agent = self.headers.get("User-Agent") or random.choice(self.user_agents or DEFAULT_USER_AGENTS)
+        self.rotate_after = rotate_after
+        self.max_connections = max_connections
+        self.per_host_connections = per_host_connections
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.rate_limiter = rate_limiter or shared_limiter()
+        self.stats = FetcherStats()
+        self._client = None
+        self._since_rotation = 0
+        self._rotation_due = self._next_rotation()
+        self._host_agents: Dict[str, List[Any]] = {}  # host -> [user agent, requests sent, rotation due]
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            if self.backend == "httpx":
+                await self._client.aclose()
+            else:
+                await self._client.close()
+            self._client = None
+
+    # --- Headers ---
+
+    def _next_rotation(self) -> Optional[int]:
+        if isinstance(self.rotate_after, tuple):
+            return random.randint(*self.rotate_after)
+        return self.rotate_after
+
+    def _pick_user_agent(self, current: str) -> str:
+        choices = [ua for ua in self.user_agents or DEFAULT_USER_AGENTS if ua != current]
+        return random.choice(choices) if choices else current
+
+    def rotate_user_agent(self) -> str:
+        """Switch User-Agent for subsequent requests; pooled connections stay open."""
+        self.user_agent = self._pick_user_agent(self.user_agent)
+        self._since_rotation = 0
+        self._rotation_due = self._next_rotation()
+        self._host_agents.clear()
+        return self.user_agent
+
+    def request_headers(self, url: Optional[str] = None) -> Dict[str, str]:
+        """Headers for the next request; with ``url`` the User-Agent rotates per host"""
+        if url is None:
+            if self._rotation_due and self._since_rotation >= self._rotation_due:
+                self.rotate_user_agent()
+            self._since_rotation += 1
+            return {**self.headers, "User-Agent": self.user_agent}
+        host = urlparse(url).netloc.lower()
+        state = self._host_agents.get(host)
+        if state is None:
+            state = self._host_agents[host] = [self.user_agent, 0, self._next_rotation()]
+        elif state[2] and state[1] >= state[2]:
+            state[:] = [self._pick_user_agent(state[0]), 0, self._next_rotation()]
+        state[1] += 1
+        return {**self.headers, "User-Agent": state[0]}
+
+    # --- Client ---
+
+    async def _count_connection(self, *args: Any) -> None:
+        self.stats.connections_opened += 1
+
+    def _get_client(self):
+        if self._client is not None:
+            return self._client
+        if self.backend == "httpx":
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60,
+                ),
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+        else:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._count_connection)
+            self._client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.per_host_connections,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[trace],
+            )
+        return self._client
+
+    async def _httpx_trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.connections_opened += 1
+
+    # --- Fetching ---
+
+    def _check_size(self, received: int) -> None:
+        if received > self.max_bytes:
+            raise BodyTooLarge(f"Response body exceeds {self.max_bytes} bytes")
+
+    async def request(self, url: str) -> FetchResult:
+        """
+        One GET, body streamed and decompressed into text
+
+        No spacing, retries or status handling: callers that manage their own
+        host budgets (the crawl engine) use this directly. Raises one of
+        ``FETCH_ERRORS`` on network failure.
+        """
+        client = self._get_client()
+        headers = self.request_headers(url)
+        started = time.monotonic()
+        chunks: List[bytes] = []
+        received = 0
+        if self.backend == "httpx":
+            async with client.stream("GET", url, headers=headers,
+                                     extensions={"trace": self._httpx_trace}) as response:
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    received += len(chunk)
+                    self._check_size(received)
+                    chunks.append(chunk)
+                status, final_url = response.status_code, str(response.url)
+                response_headers = dict(response.headers)
+                version = response.http_version
+                encoding = response.encoding or "utf-8"
+        else:
+            async with client.get(url, headers=headers) as response:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    received += len(chunk)
+                    self._check_size(received)
+                    chunks.append(chunk)
+                status, final_url = response.status, str(response.url)
+                response_headers = dict(response.headers)
+                version = f"HTTP/{response.version.major}.{response.version.minor}"
+                encoding = response.charset or "utf-8"
+        self.stats.requests += 1
+        self.stats.bytes_received += received
+        self.stats.versions[version] = self.stats.versions.get(version, 0) + 1
+        body = b"".join(chunks)
+        try:
+            text = body.decode(encoding, errors="replace")
+        except LookupError:
+            text = body.decode("utf-8", errors="replace")
+        return FetchResult(final_url, status, response_headers, text, version,
+                           time.monotonic() - started)
+
+    async def fetch(self, url: str) -> Optional[FetchResult]:
+        """GET within the host's rate budget, retrying throttled and failed requests."""
+        for attempt in range(self.retries + 1):
+            await self.rate_limiter.acquire(url)
+            try:
+                result = await self.request(url)
+            except FETCH_ERRORS as e:
+                self.rate_limiter.record(url, None)
+                if attempt >= self.retries:
+                    logger.warning("Fetch failed for %s: %s", url, e)
+                    break
+                continue
+            self.rate_limiter.record(url, result.status, result.headers)
+            if result.status in RETRY_STATUSES and attempt < self.retries:
+                logger.debug("HTTP %s for %s, retrying", result.status, url)
+                continue
+            if result.status >= 400:
+                logger.warning("HTTP %s for %s", result.status, url)
+                break
+            return result
+        self.stats.failures += 1
+        return None
+
+    async def fetch_text(self, url: str) -> Optional[str]:
+        result = await self.fetch(url)
+        return result.text if result else None
+
+    async def fetch_many(self, urls: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Fetch URLs concurrently over the shared pool; page text (or None) by URL."""
+        texts = await asyncio.gather(*(self.fetch_text(url) for url in urls))
+        return dict(zip(urls, texts))
+
+    def report(self) -> str:
+        versions = ", ".join(f"{v} x{n}" for v, n in sorted(self.stats.versions.items())) or "none"
+        return (f"Fetcher ({self.backend}): {self.stats.requests} requests over "
+                f"{self.stats.connections_opened} connections ({versions}), "
+                f"{self.stats.bytes_received / 1024:.0f} KiB, {self.stats.failures} failed")
@@ -0,0 +1,376 @@
+"""
+Shared Playwright browser pool.
+
+Launching Chromium costs seconds and hundreds of MB, so fetchers should not
+start a browser per page. ``BrowserPool`` keeps one long-lived browser per
+launch configuration and hands out reusable browser contexts through a
+lease/release API. Contexts keep their cookies between leases (so consent
+banners only have to be dismissed once per context) and are recycled after a
+configurable number of pages. The browser itself is health-checked on every
+lease and relaunched when it has disconnected, served too many pages, or its
+process tree grows past a memory limit.
+
+Playwright's sync API objects are bound to the thread that created them, so
+shared pools are keyed per thread. Typical use::
+
+    pool = acquire_shared_pool(headless=True)
+    try:
+        profile = profile_for(url)
+        with pool.page(user_agent=ua, profile=profile) as page:
+            navigate(page, url, profile)
+            html = page.content()
+    finally:
+        release_shared_pool(pool)
+"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:  # pragma: no cover - playwright may not be installed
+    sync_playwright = None
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    psutil = None
+    HAS_PSUTIL = False
+
+from scraping_components.fetch_profiles import FetchProfile, apply_profile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONTEXTS = 4
+DEFAULT_MAX_PAGES_PER_CONTEXT = 50
+DEFAULT_MAX_PAGES_PER_BROWSER = 500
+DEFAULT_MAX_MEMORY_MB = 1536
+
+
+@dataclass
+class BrowserLease:
+    """A browser context checked out of a ``BrowserPool``."""
+    context: Any
+    signature: Tuple
+    generation: int
+    pages_served: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class BrowserPool:
+    """Pool of reusable contexts on a single long-lived Playwright browser."""
+
+    def __init__(
+        self,
+        headless: bool = True,
+        slow_mo: int = 0,
+        browser_type: str = "chromium",
+        max_contexts: int = DEFAULT_MAX_CONTEXTS,
+        max_pages_per_context: int = DEFAULT_MAX_PAGES_PER_CONTEXT,
+        max_pages_per_browser: int = DEFAULT_MAX_PAGES_PER_BROWSER,
+        max_memory_mb: Optional[float] = DEFAULT_MAX_MEMORY_MB,
+        launch_options: Optional[Dict[str, Any]] = None,
+    ):
+        if max_contexts < 1:
+            raise ValueError("max_contexts must be at least 1")
+        self.headless = headless
+        self.slow_mo = slow_mo
+        self.browser_type = browser_type
+        self.max_contexts = max_contexts
+        self.max_pages_per_context = max_pages_per_context
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_memory_mb = max_memory_mb
+        self.launch_options = launch_options or {}
+
+        self._playwright = None
+        self._browser = None
+        self._generation = 0
+        self._pages_this_browser = 0
+        self._idle: List[BrowserLease] = []
+        self._leased: List[BrowserLease] = []
+        self._closed = False
+        self.stats = {
+            "browser_launches": 0,
+            "contexts_created": 0,
+            "contexts_reused": 0,
+            "contexts_recycled": 0,
+            "pages_served": 0,
+            "requests_blocked": 0,
+        }
+
+    # --- Browser lifecycle ---
+
+    def start(self) -> "BrowserPool":
+        """Launch the browser if it is not running yet."""
+        if self._closed:
+            raise RuntimeError("BrowserPool has been closed")
+        if self._browser is not None:
+            return self
+        if sync_playwright is None:
+            raise ImportError("Playwright is not installed. Please run 'pip install playwright' and 'playwright install'.")
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        launcher = getattr(self._playwright, self.browser_type)
+        self._browser = launcher.launch(
+            headless=self.headless, slow_mo=self.slow_mo, **self.launch_options
+        )
+        self._generation += 1
+        self._pages_this_browser = 0
+        self.stats["browser_launches"] += 1
+        logger.info("Launched pooled %s browser (generation %d)", self.browser_type, self._generation)
+        return self
+
+    def is_healthy(self) -> bool:
+        """True when the browser is connected and within its page/memory budget."""
+        if self._browser is None:
+            return False
+        try:
+            if not self._browser.is_connected():
+                return False
+        except Exception:
+            return False
+        if self.max_pages_per_browser and self._pages_this_browser >= self.max_pages_per_browser:
+            return False
+        if self.max_memory_mb:
+            memory_mb = self.memory_usage_mb()
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                logger.info("Browser memory %.0fMB exceeds limit of %.0fMB", memory_mb, self.max_memory_mb)
+                return False
+        return True
+
+    def memory_usage_mb(self) -> Optional[float]:
+        """Approximate RSS of the Playwright driver and browser processes, in MB.
+
+        Returns None when psutil is unavailable.
+        """
+        if not HAS_PSUTIL:
+            return None
+        total = 0
+        try:
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except Exception:
+            return None
+        return total / (1024 * 1024)
+
+    def _ensure_browser(self) -> None:
+        if self._browser is not None and self.is_healthy():
+            return
+        if self._leased:
+            # Contexts are still out; keep serving until they come back so we
+            # never pull a browser out from under an in-flight page.
+            if self._browser is not None and self._browser.is_connected():
+                return
+        self._shutdown_browser()
+        self.start()
+
+    def _shutdown_browser(self) -> None:
+        for lease in self._idle + self._leased:
+            self._close_context(lease)
+        self._idle.clear()
+        self._leased.clear()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception as e:
+                logger.debug("Error closing pooled browser: %s", e)
+            self._browser = None
+
+    def _close_context(self, lease: BrowserLease) -> None:
+        try:
+            lease.context.close()
+        except Exception as e:
+            logger.debug("Error closing pooled context: %s", e)
+
+    # --- Lease / release ---
+
+    @staticmethod
+    def _signature(user_agent: Optional[str], profile: Optional[FetchProfile],
+                   context_options: Dict[str, Any]) -> Tuple:
+        return (user_agent, profile, tuple(sorted((k, repr(v)) for k, v in context_options.items())))
+
+    def lease(self, user_agent: Optional[str] = None, profile: Optional[FetchProfile] = None,
+              **context_options: Any) -> BrowserLease:
+        """Check out a browser context.
+
+        An idle context created with the same user agent, profile and options
+        is reused when available; otherwise a new one is created, evicting the
+        least recently used idle context if the pool is full.
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool has been closed")
+        self._ensure_browser()
+        signature = self._signature(user_agent, profile, context_options)
+
+        for lease in self._idle:
+            if lease.signature == signature and lease.generation == self._generation:
+                self._idle.remove(lease)
+                self._leased.append(lease)
+                self.stats["contexts_reused"] += 1
+                return lease
+
+        if len(self._idle) + len(self._leased) >= self.max_contexts:
+            if not self._idle:
+                raise RuntimeError(
+                    f"Browser pool exhausted: all {self.max_contexts} contexts are leased"
+                )
+            oldest = min(self._idle, key=lambda l: l.last_used)
+            self._idle.remove(oldest)
+            self._close_context(oldest)
+            self.stats["contexts_recycled"] += 1
+
+        options = {**(profile.context_options() if profile else {}), **context_options}
+        if user_agent:
+            options["user_agent"] = user_agent
+        context = self._browser.new_context(**options)
+        if profile is not None:
+            apply_profile(context, profile, self._count_blocked)
+        lease = BrowserLease(context=context, signature=signature, generation=self._generation)
+        self._leased.append(lease)
+        self.stats["contexts_created"] += 1
+        return lease
+
+    def _count_blocked(self) -> None:
+        self.stats["requests_blocked"] += 1
+
+    def release(self, lease: BrowserLease, discard: bool = False) -> None:
+        """Return a leased context to the pool.
+
+        The context is closed instead of kept when ``discard`` is set, when it
+        has served ``max_pages_per_context`` pages, or when it belongs to a
+        browser that has since been replaced.
+        """
+        if lease in self._leased:
+            self._leased.remove(lease)
+        lease.last_used = time.monotonic()
+        worn_out = (
+            self.max_pages_per_context
+            and lease.pages_served >= self.max_pages_per_context
+        )
+        if discard or worn_out or self._closed or lease.generation != self._generation:
+            self._close_context(lease)
+            if worn_out:
+                self.stats["contexts_recycled"] += 1
+            return
+        self._idle.append(lease)
+
+    @contextmanager
+    def page(self, user_agent: Optional[str] = None, profile: Optional[FetchProfile] = None,
+             **context_options: Any) -> Iterator[Any]:
+        """Lease a context, open a page in it and clean both up afterwards.
+
+        A context whose page raised is discarded rather than reused, since it
+        may be left in an unknown state.
+        """
+        lease = self.lease(user_agent=user_agent, profile=profile, **context_options)
+        page = None
+        failed = False
+        try:
+            page = lease.context.new_page()
+            lease.pages_served += 1
+            self._pages_this_browser += 1
+            self.stats["pages_served"] += 1
+            yield page
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            if page is not None:
+                try:
+                    page.close()
+                except Exception as e:
+                    logger.debug("Error closing pooled page: %s", e)
+            self.release(lease, discard=failed)
+
+    def close(self) -> None:
+        """Close all contexts, the browser and the Playwright driver."""
+        if self._closed:
+            return
+        self._closed = True
+        self._shutdown_browser()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception as e:
+                logger.debug("Error stopping Playwright: %s", e)
+            self._playwright = None
+
+
+# --- Shared pools ---
+
+_shared_pools: Dict[Tuple, BrowserPool] = {}
+_shared_refcounts: Dict[Tuple, int] = {}
+_shared_lock = threading.Lock()
+
+
+def _pool_key(headless: bool, slow_mo: int, browser_type: str) -> Tuple:
+    return (threading.get_ident(), browser_type, bool(headless), int(slow_mo or 0))
+
+
+def acquire_shared_pool(
+    headless: bool = True,
+    slow_mo: int = 0,
+    browser_type: str = "chromium",
+    **pool_options: Any,
+) -> BrowserPool:
+    """Return the shared pool for this thread and launch configuration.
+
+    Every call must be matched by ``release_shared_pool``; the pool is closed
+    when its last holder releases it. ``pool_options`` only apply when the
+    pool is first created.
+    """
+    key = _pool_key(headless, slow_mo, browser_type)
+    with _shared_lock:
+        pool = _shared_pools.get(key)
+        if pool is None or pool._closed:
+            pool = BrowserPool(
+                headless=headless, slow_mo=slow_mo, browser_type=browser_type, **pool_options
+            )
+            _shared_pools[key] = pool
+            _shared_refcounts[key] = 0
+        _shared_refcounts[key] += 1
+        return pool
+
+
+def release_shared_pool(pool: BrowserPool) -> None:
+    """Drop one reference to a shared pool, closing it when none remain."""
+    with _shared_lock:
+        for key, shared in list(_shared_pools.items()):
+            if shared is not pool:
+                continue
+            _shared_refcounts[key] -= 1
+            if _shared_refcounts[key] > 0:
+                return
+            del _shared_pools[key]
+            del _shared_refcounts[key]
+            break
+    pool.close()
+
+
+def close_shared_pools() -> None:
+    """Close every shared pool that can still be closed from this thread."""
+    with _shared_lock:
+        pools = list(_shared_pools.items())
+        _shared_pools.clear()
+        _shared_refcounts.clear()
+    current = threading.get_ident()
+    for key, pool in pools:
+        if key[0] != current:
+            continue
+        try:
+            pool.close()
+        except Exception as e:
+            logger.debug("Error closing shared browser pool: %s", e)
+
+
+atexit.register(close_shared_pools)
@@ -0,0 +1,596 @@
+"""
+Asyncio crawl engine with per-host concurrency and politeness budgets.
+
+The scrapers' serial ``for url in event_urls`` loops spend almost all of
+their time waiting on the network and on ``time.sleep``. ``AsyncCrawlEngine``
+overlaps that waiting: pages are fetched concurrently with ``AsyncFetcher``
+(a pooled aiohttp or HTTP/2 client) or ``playwright.async_api`` while each
+host keeps its own budget:
+
+* at most ``per_host_concurrency`` requests in flight (one by default, as
+  the serial scrapers did; raise it only for hosts known to tolerate more), and
+* request *starts* spaced by the host's adaptive rate controller (see
+  ``rate_limiter``): it starts at the mean of ``[min_delay, max_delay]``,
+  never goes faster than ``min_delay`` allows, slows down on 429/503 and
+  ``Retry-After`` and speeds back up while responses stay healthy.
+
+Controllers come from the shared ``RateLimiter``, so the sync scrapers'
+own fetches to a host draw on the same budget as the engine's.
+
+Site-specific parsing stays in the scrapers and is plugged in as callbacks:
+
+* ``parse_event(url, html) -> Optional[dict]`` turns a fetched page into an
+  event record (run in a worker thread so BeautifulSoup does not block the
+  event loop), and
+* ``extract_links(html, url) -> List[str]`` turns a listing page into event
+  URLs for ``crawl``.
+
+With ``fetch_mode="auto"`` a ``FetchRouter`` picks, per host and URL
+pattern, the cheapest tier that has been producing sufficient data: plain
+HTTP, the HTTP response read through ``parse_embedded`` (embedded JSON), or
+the browser, escalating only when a tier falls short.
+
+Browser fetches load pages under the URL's ``FetchProfile`` (see
+``fetch_profiles``): each profile gets its own browser context with the
+profile's resource blocking, and pages are returned once the profile's
+readiness signal arrives instead of after ``networkidle``.
+
+HTTP fetches keep the scrapers' User-Agent rotation: with ``user_agents``
+and ``rotate_after`` each host switches agent every N requests (or a random
+N from a range), sent per request so its pooled connection stays open.
+
+``scrape_frontier`` drains a ``CrawlFrontier`` instead of a URL list, marking
+each page done or failed as it finishes so an interrupted run can resume.
+
+``run_scrape``/``run_crawl`` drive the engine from synchronous code. They run
+the event loop in a dedicated thread, so they are safe to call from a thread
+that already has a sync Playwright session or a running loop.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # pragma: no cover - playwright may not be installed
+    async_playwright = None
+
+from scraping_components.async_fetcher import FETCH_ERRORS, AsyncFetcher
+from scraping_components.fetch_profiles import (
+    FetchProfile,
+    apply_profile_async,
+    profile_for,
+    wait_until_ready_async,
+)
+from scraping_components.fetch_router import BROWSER, HTTP, HTTP_JSON, FetchRouter
+from scraping_components.rate_limiter import (
+    THROTTLE_STATUSES,
+    HostRateController,
+    RateLimiter,
+    delay_options,
+    shared_limiter,
+)
+from scraping_components.readiness import readiness_report
+
+if TYPE_CHECKING:  # pragma: no cover
+    from scraping_components.crawl_frontier import CrawlFrontier
+
+logger = logging.getLogger(__name__)
+
+FETCH_MODES = ("http", "browser", "http_first", "browser_first", "auto")
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+ParseCallback = Callable[[str, str], Optional[Dict[str, Any]]]
+LinksCallback = Callable[[str, str], List[str]]
+PageHook = Callable[[Any], Awaitable[None]]
+
+
+@dataclass
+class CrawlStats:
+    """Counters collected over an engine's lifetime."""
+    http_fetches: int = 0
+    browser_fetches: int = 0
+    fetch_failures: int = 0
+    parse_failures: int = 0
+    events: int = 0
+    requests_blocked: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def count_blocked(self) -> None:
+        self.requests_blocked += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "http_fetches": self.http_fetches,
+            "browser_fetches": self.browser_fetches,
+            "fetch_failures": self.fetch_failures,
+            "parse_failures": self.parse_failures,
+            "events": self.events,
+            "requests_blocked": self.requests_blocked,
+            "elapsed_seconds": round(time.monotonic() - self.started_at, 2),
+        }
+
+
+class HostBudget:
+    """Concurrency cap plus rate-controlled spacing between request starts for one host."""
+
+    def __init__(self, concurrency: int, min_delay: float = 0.0, max_delay: float = 0.0,
+                 controller: Optional[HostRateController] = None):
+        self.controller = controller or HostRateController(**delay_options(min_delay, max_delay))
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> "HostBudget":
+        await self._semaphore.acquire()
+        try:
+            wait = self.controller.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._semaphore.release()
+
+
+class AsyncCrawlEngine:
+    """Concurrent fetch-and-parse engine driving site-specific callbacks."""
+
+    def __init__(
+        self,
+        parse_event: ParseCallback,
+        *,
+        extract_links: Optional[LinksCallback] = None,
+        is_sufficient: Optional[Callable[[Optional[Dict[str, Any]]], bool]] = None,
+        fetch_mode: str = "http",
+        per_host_concurrency: int = 1,
+        max_concurrency: int = 16,
+        max_browser_pages: int = 4,
+        min_delay: float = 0.5,
+        max_delay: float = 1.5,
+        request_timeout: float = 20.0,
+        retries: int = 2,
+        headers: Optional[Dict[str, str]] = None,
+        user_agent: Optional[str] = None,
+        user_agents: Optional[Sequence[str]] = None,
+        rotate_after: Union[int, Tuple[int, int], None] = None,
+        headless: bool = True,
+        browser_timeout: Optional[int] = None,
+        wait_until: Optional[str] = None,
+        fetch_profile: Optional[FetchProfile] = None,
+        context_options: Optional[Dict[str, Any]] = None,
+        page_hook: Optional[PageHook] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        fetch_router: Optional[FetchRouter] = None,
+        parse_embedded: Optional[ParseCallback] = None,
+    ):
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"fetch_mode must be one of {FETCH_MODES}, got {fetch_mode!r}")
+        self.parse_event = parse_event
+        self.extract_links = extract_links
+        self.is_sufficient = is_sufficient or (lambda data: bool(data))
+        self.fetch_mode = fetch_mode
+        self.per_host_concurrency = per_host_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_browser_pages = max_browser_pages
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.request_timeout = request_timeout
+        self.retries = retries
+        self.headers = dict(headers or {})
+        self.user_agent = user_agent or self.headers.get("User-Agent")
+        if self.user_agent:
+            self.headers["User-Agent"] = self.user_agent
+        self.user_agents = list(user_agents or [])
+        self.rotate_after = rotate_after
+        self.headless = headless
+        self.browser_timeout = browser_timeout
+        self.wait_until = wait_until  # Overrides the fetch profile's when set
+        self.fetch_profile = fetch_profile
+        self.context_options = context_options or {}
+        self.page_hook = page_hook
+        self.rate_limiter = rate_limiter or shared_limiter()
+        self.parse_embedded = parse_embedded
+        self._owns_router = fetch_router is None and fetch_mode == "auto"
+        self.fetch_router = FetchRouter() if self._owns_router else fetch_router
+        self.stats = CrawlStats()
+
+        self._budgets: Dict[str, HostBudget] = {}
+        self._global: Optional[asyncio.Semaphore] = None
+        self._browser_pages: Optional[asyncio.Semaphore] = None
+        self._http = None
+        self._playwright = None
+        self._browser = None
+        self._contexts: Dict[str, Any] = {}
+        self._browser_lock: Optional[asyncio.Lock] = None
+
+    # --- Lifecycle ---
+
+    async def __aenter__(self) -> "AsyncCrawlEngine":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def _ensure_primitives(self) -> None:
+        # asyncio primitives must be created inside the running loop
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_concurrency)
+            self._browser_pages = asyncio.Semaphore(self.max_browser_pages)
+            self._browser_lock = asyncio.Lock()
+
+    def budget_for(self, url: str) -> HostBudget:
+        host = urlparse(url).netloc.lower()
+        budget = self._budgets.get(host)
+        if budget is None:
+            controller = self.rate_limiter.controller(url, **delay_options(self.min_delay, self.max_delay))
+            budget = HostBudget(self.per_host_concurrency, controller=controller)
+            self._budgets[host] = budget
+        return budget
+
+    async def _get_http(self) -> AsyncFetcher:
+        if self._http is None:
+            # Spacing and retries stay with the engine's host budgets
+            self._http = AsyncFetcher(
+                headers=self.headers,
+                user_agents=self.user_agents,
+                rotate_after=self.rotate_after,
+                max_connections=self.max_concurrency,
+                per_host_connections=self.per_host_concurrency,
+                timeout=self.request_timeout,
+                rate_limiter=self.rate_limiter,
+            )
+        return self._http
+
+    def profile_for(self, url: str) -> FetchProfile:
+        return self.fetch_profile or profile_for(url)
+
+    async def _get_browser_context(self, profile: FetchProfile):
+        if async_playwright is None:
+            raise ImportError("Playwright is not installed. Please run 'pip install playwright' and 'playwright install'.")
+        async with self._browser_lock:
+            if self._browser is not None and not self._browser.is_connected():
+                logger.warning("Crawl browser disconnected; relaunching")
+                self._browser = None
+                self._contexts.clear()
+            if self._browser is None:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            context = self._contexts.get(profile.name)
+            if context is None:
+                options = {**profile.context_options(), **self.context_options}
+                if self.user_agent:
+                    options.setdefault("user_agent", self.user_agent)
+                context = await self._browser.new_context(**options)
+                await apply_profile_async(context, profile, self.stats.count_blocked)
+                self._contexts[profile.name] = context
+        return context
+
+    async def close(self) -> None:
+        """Close the HTTP client, browser and Playwright driver."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        for context in self._contexts.values():
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug("Error closing crawl browser context: %s", e)
+        self._contexts.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.debug("Error closing crawl browser: %s", e)
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        if self._owns_router:
+            self.fetch_router.close()
+
+    # --- Fetching ---
+
+    async def fetch_http(self, url: str) -> Optional[str]:
+        """Fetch a page over the pooled HTTP client inside the host's politeness budget."""
+        self._ensure_primitives()
+        fetcher = await self._get_http()
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._global, self.budget_for(url):
+                    response = await fetcher.request(url)
+                self.rate_limiter.record(url, response.status, response.headers)
+                if response.status in RETRY_STATUSES and attempt < self.retries:
+                    logger.debug("HTTP %s for %s, retrying", response.status, url)
+                    if response.status in THROTTLE_STATUSES:
+                        continue  # the host's controller has already slowed down
+                elif response.status >= 400:
+                    logger.warning("HTTP %s for %s", response.status, url)
+                    break
+                else:
+                    self.stats.http_fetches += 1
+                    return response.text
+            except FETCH_ERRORS as e:
+                self.rate_limiter.record(url, None)
+                if attempt >= self.retries:
+                    logger.warning("HTTP fetch failed for %s: %s", url, e)
+                    break
+                continue
+            await asyncio.sleep(2 ** attempt)
+        self.stats.fetch_failures += 1
+        return None
+
+    async def fetch_browser(self, url: str) -> Optional[str]:
+        """Render a page with async Playwright inside the host's politeness budget."""
+        self._ensure_primitives()
+        profile = self.profile_for(url)
+        try:
+            context = await self._get_browser_context(profile)
+        except Exception as e:
+            logger.error("Could not start crawl browser: %s", e)
+            self.stats.fetch_failures += 1
+            return None
+        async with self._global, self._browser_pages, self.budget_for(url):
+            page = None
+            try:
+                page = await context.new_page()
+                response = await page.goto(url, wait_until=self.wait_until or profile.wait_until,
+                                           timeout=self.browser_timeout or profile.navigation_timeout)
+                if response is not None:
+                    self.rate_limiter.record(url, response.status, response.headers)
+                if self.page_hook is not None:
+                    await self.page_hook(page)
+                # Released as soon as the data is present, not when the network goes idle
+                await wait_until_ready_async(page, profile)
+                self.stats.browser_fetches += 1
+                return await page.content()
+            except Exception as e:
+                logger.warning("Browser fetch failed for %s: %s", url, e)
+                self.stats.fetch_failures += 1
+                return None
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+
+    async def fetch(self, url: str, use_browser: bool = False) -> Optional[str]:
+        return await (self.fetch_browser(url) if use_browser else self.fetch_http(url))
+
+    # --- Parsing ---
+
+    async def _parse(self, url: str, html: Optional[str],
+                     parser: Optional[ParseCallback] = None) -> Optional[Dict[str, Any]]:
+        if not html:
+            return None
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, parser or self.parse_event, url, html)
+        except Exception as e:
+            logger.error("Parser failed for %s: %s", url, e)
+            self.stats.parse_failures += 1
+            return None
+
+    async def scrape(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch and parse one event page according to ``fetch_mode``."""
+        if self.fetch_mode == "auto":
+            return await self._scrape_routed(url)
+        if self.fetch_mode in ("http", "browser"):
+            return await self._parse(url, await self.fetch(url, use_browser=self.fetch_mode == "browser"))
+
+        browser_first = self.fetch_mode == "browser_first"
+        data = await self._parse(url, await self.fetch(url, use_browser=browser_first))
+        if self.is_sufficient(data):
+            return data
+        logger.info("First %s attempt insufficient for %s; falling back",
+                    "browser" if browser_first else "HTTP", url)
+        fallback = await self._parse(url, await self.fetch(url, use_browser=not browser_first))
+        return fallback if fallback else data
+
+    async def _scrape_routed(self, url: str) -> Optional[Dict[str, Any]]:
+        """Try the router's tiers in order, recording which ones were sufficient."""
+        available = [HTTP, BROWSER] if self.parse_embedded is None else [HTTP, HTTP_JSON, BROWSER]
+        html: Optional[str] = None
+        best = None
+        for tier in self.fetch_router.plan(url, available):
+            if tier == BROWSER:
+                page = await self.fetch(url, use_browser=True)
+                data = await self._parse(url, page)
+            else:
+                if html is None:
+                    html = await self.fetch(url) or ""  # both HTTP tiers share one fetch
+                page = html
+                data = await self._parse(url, html, self.parse_event if tier == HTTP else self.parse_embedded)
+            sufficient = self.is_sufficient(data)
+            if page:  # A failed fetch says nothing about what the tier can extract
+                self.fetch_router.record(url, tier, sufficient)
+            if sufficient:
+                return data
+            best = best or data
+        return best
+
+    async def scrape_many(
+        self,
+        urls: List[str],
+        on_result: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+        collect: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Scrape URLs concurrently, returning non-empty results in input order.
+
+        With ``collect=False`` results are only handed to ``on_result`` (e.g. a
+        streaming sink) and an empty list is returned, so memory stays flat.
+        """
+        total = len(urls)
+        done = 0
+
+        async def run_one(url: str) -> Optional[Dict[str, Any]]:
+            nonlocal done
+            data = await self.scrape(url)
+            done += 1
+            if data:
+                self.stats.events += 1
+            logger.info("[%d/%d] %s %s", done, total, "✓" if data else "✗", url)
+            if on_result is not None:
+                on_result(url, data)
+            return data if collect else None
+
+        results = await asyncio.gather(*(run_one(url) for url in urls))
+        return [data for data in results if data]
+
+    async def scrape_frontier(
+        self,
+        frontier: "CrawlFrontier",
+        on_result: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+        collect: bool = True,
+        batch_size: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Scrape queued frontier URLs until none are left, checkpointing each one.
+
+        URLs are claimed in batches (default: four per host slot) so a crash
+        leaves at most one batch in flight; failures are re-queued with the
+        frontier's backoff and retried once eligible. ``on_result`` runs before
+        a URL is checkpointed, so it must have persisted the result (written
+        and flushed it) by the time it returns; if it raises, the URL stays in
+        flight and is scraped again on resume.
+        """
+        batch_size = batch_size or max(1, self.per_host_concurrency * 4)
+        results: List[Dict[str, Any]] = []
+
+        async def run_one(url: str) -> Optional[Dict[str, Any]]:
+            data = await self.scrape(url)
+            # Output first: a URL marked done before its event is on disk would
+            # be skipped by --resume and lost for good
+            if on_result is not None:
+                on_result(url, data)
+            if data:
+                self.stats.events += 1
+                frontier.mark_done(url)
+            else:
+                state = frontier.mark_failed(url, "no event data")
+                logger.info("✗ %s (%s)", url, "will retry" if state == "queued" else "giving up")
+            return data if collect else None
+
+        while True:
+            urls = frontier.claim(batch_size)
+            if not urls:
+                wait = frontier.seconds_until_next_eligible()
+                if wait is None:
+                    break
+                logger.info("Waiting %.0fs for URLs to become eligible for retry", wait)
+                await asyncio.sleep(wait)
+                continue
+            batch = await asyncio.gather(*(run_one(url) for url in urls))
+            results.extend(data for data in batch if data)
+            logger.info(frontier.report())
+        return results
+
+    async def discover(self, listing_url: str, use_browser: bool = False) -> List[str]:
+        """Fetch a listing page and extract event links with ``extract_links``."""
+        if self.extract_links is None:
+            raise ValueError("AsyncCrawlEngine.discover requires an extract_links callback")
+        html = await self.fetch(listing_url, use_browser=use_browser)
+        if not html:
+            return []
+        links = self.extract_links(html, listing_url)
+        return list(dict.fromkeys(links))
+
+    async def crawl(
+        self,
+        listing_url: str,
+        max_events: int = 0,
+        listing_with_browser: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Discover event links on a listing page, then scrape them concurrently."""
+        links = await self.discover(listing_url, use_browser=listing_with_browser)
+        if max_events > 0:
+            links = links[:max_events]
+        logger.info("Found %d event links on %s", len(links), listing_url)
+        return await self.scrape_many(links)
+
+
+def _run_in_thread(coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Run a coroutine to completion on a fresh event loop in its own thread."""
+    outcome: Dict[str, Any] = {}
+
+    def runner() -> None:
+        try:
+            outcome["result"] = asyncio.run(coro_factory())
+        except BaseException as e:  # re-raised in the calling thread
+            outcome["error"] = e
+
+    thread = threading.Thread(target=runner, name="crawl-engine", daemon=True)
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def run_scrape(
+    urls: List[str],
+    parse_event: ParseCallback,
+    on_result: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+    collect: bool = True,
+    frontier: Optional["CrawlFrontier"] = None,
+    **engine_options: Any,
+) -> List[Dict[str, Any]]:
+    """Synchronous entry point: scrape ``urls`` concurrently and return the events.
+
+    With a ``frontier``, ``urls`` are queued into it and only those not
+    already done (or given up on) in an earlier run are scraped.
+    """
+
+    async def scrape() -> List[Dict[str, Any]]:
+        async with AsyncCrawlEngine(parse_event, **engine_options) as engine:
+            if frontier is not None:
+                frontier.add(urls)
+                results = await engine.scrape_frontier(frontier, on_result=on_result, collect=collect)
+            else:
+                results = await engine.scrape_many(urls, on_result=on_result, collect=collect)
+            logger.info("Crawl engine stats: %s", engine.stats.as_dict())
+            logger.info(engine.rate_limiter.report())
+            if engine._http is not None:
+                logger.info(engine._http.report())
+            if engine.fetch_router is not None:
+                logger.info(engine.fetch_router.report())
+            if readiness := readiness_report():
+                logger.info(readiness)
+            return results
+
+    return _run_in_thread(scrape)
+
+
+def run_crawl(
+    listing_url: str,
+    parse_event: ParseCallback,
+    extract_links: LinksCallback,
+    max_events: int = 0,
+    listing_with_browser: bool = False,
+    **engine_options: Any,
+) -> List[Dict[str, Any]]:
+    """Synchronous entry point: crawl a listing page and scrape its events."""
+
+    async def crawl() -> List[Dict[str, Any]]:
+        async with AsyncCrawlEngine(parse_event, extract_links=extract_links, **engine_options) as engine:
+            results = await engine.crawl(
+                listing_url, max_events=max_events, listing_with_browser=listing_with_browser
+            )
+            logger.info("Crawl engine stats: %s", engine.stats.as_dict())
+            logger.info(engine.rate_limiter.report())
+            if engine._http is not None:
+                logger.info(engine._http.report())
+            if engine.fetch_router is not None:
+                logger.info(engine.fetch_router.report())
+            if readiness := readiness_report():
+                logger.info(readiness)
+            return results
+
+    return _run_in_thread(crawl)
@@ -0,0 +1,268 @@
+"""
+Resumable crawl frontier.
+
+A crash or a hung Playwright page used to mean re-walking the calendar and
+re-scraping every event. ``CrawlFrontier`` keeps the crawl's URL set in a
+SQLite file so a later run can pick up where the last one stopped:
+
+* each URL is ``queued``, ``in_flight``, ``done`` or ``failed``, with its
+  attempt count, last error and the time it next becomes eligible (failed
+  attempts back off exponentially until ``max_attempts`` is reached);
+* every state change is its own transaction (WAL journal), so the file on
+  disk is always a consistent checkpoint;
+* a small key/value ``meta`` table checkpoints crawl-level progress, e.g.
+  "listing already walked" or the calendar page to continue from;
+* scrapers that only write their output at the end can store each finished
+  record with ``mark_done(url, result)`` and read them back with ``results()``.
+
+On resume, URLs left ``in_flight`` by the crashed run go back to ``queued``.
+Frontiers live under ``cache/frontier/``, one file per job key (for example
+the CLI action and start URL); ``open_frontier(job_key, resume=False)`` starts
+the job over, ``resume=True`` continues it.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRONTIER_DIR = Path(__file__).resolve().parent.parent / "cache" / "frontier"
+
+QUEUED = "queued"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+STATES = (QUEUED, IN_FLIGHT, DONE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    url TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_eligible_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    result TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_frontier_ready ON frontier (state, next_eligible_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class CrawlFrontier:
+    """SQLite-backed URL states, attempt counts and retry times for one crawl job."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_attempts: int = 3,
+        retry_backoff: float = 30.0,
+        max_backoff: float = 15 * 60,
+    ):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # --- URL states ---
+
+    def add(self, urls: Iterable[str]) -> int:
+        """Queue URLs not seen before (in order); returns how many were new."""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO frontier (url, updated_at) VALUES (?, ?)",
+                ((url, now) for url in dict.fromkeys(urls) if url),
+            )
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def claim(self, limit: int = 1, now: Optional[float] = None) -> List[str]:
+        """Atomically move up to ``limit`` eligible queued URLs to in-flight, oldest first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT url FROM frontier WHERE state = ? AND next_eligible_at <= ? ORDER BY rowid LIMIT ?",
+                (QUEUED, now, limit),
+            ).fetchall()
+            urls = [row[0] for row in rows]
+            self._conn.executemany(
+                "UPDATE frontier SET state = ?, attempts = attempts + 1, updated_at = ? WHERE url = ?",
+                ((IN_FLIGHT, now, url) for url in urls),
+            )
+            self._conn.execute("COMMIT")
+        return urls
+
+    def begin(self, url: str) -> bool:
+        """Claim one specific URL (queuing it if new); False if it is done, failed or not yet eligible."""
+        self.add([url])
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE frontier SET state = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE url = ? AND state = ? AND next_eligible_at <= ?",
+                (IN_FLIGHT, now, url, QUEUED, now),
+            )
+            return cursor.rowcount == 1
+
+    def mark_done(self, url: str, result: Any = None) -> None:
+        """Mark ``url`` finished, optionally keeping its (JSON-serializable) result."""
+        self._set_state(url, DONE, error=None, next_eligible_at=0,
+                        result=None if result is None else json.dumps(result, default=str))
+
+    def mark_failed(self, url: str, error: str = "", retry: bool = True) -> str:
+        """Record a failed attempt; re-queues with backoff until ``max_attempts``. Returns the new state."""
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM frontier WHERE url = ?", (url,)).fetchone()
+        attempts = row[0] if row else 1
+        if retry and attempts < self.max_attempts:
+            delay = min(self.retry_backoff * 2 ** (attempts - 1), self.max_backoff)
+            self._set_state(url, QUEUED, error=error, next_eligible_at=time.time() + delay)
+            return QUEUED
+        self._set_state(url, FAILED, error=error, next_eligible_at=0)
+        return FAILED
+
+    def _set_state(
+        self,
+        url: str,
+        state: str,
+        error: Optional[str],
+        next_eligible_at: float,
+        result: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO frontier (url, state, last_error, next_eligible_at, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET state = excluded.state, "
+                "last_error = excluded.last_error, next_eligible_at = excluded.next_eligible_at, "
+                "result = excluded.result, updated_at = excluded.updated_at",
+                (url, state, error, next_eligible_at, result, time.time()),
+            )
+
+    def recover_in_flight(self) -> int:
+        """Re-queue URLs a previous (crashed) run left in flight; returns how many."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE frontier SET state = ?, next_eligible_at = 0, updated_at = ? WHERE state = ?",
+                (QUEUED, time.time(), IN_FLIGHT),
+            )
+            return cursor.rowcount
+
+    def state(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM frontier WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def urls(self, state: Optional[str] = None) -> List[str]:
+        """All URLs (or those in ``state``) in the order they were first queued."""
+        query, params = "SELECT url FROM frontier", ()
+        if state is not None:
+            query, params = query + " WHERE state = ?", (state,)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query + " ORDER BY rowid", params)]
+
+    def results(self) -> Iterator[Tuple[str, Any]]:
+        """``(url, result)`` for done URLs that stored a result, in queue order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, result FROM frontier WHERE state = ? AND result IS NOT NULL ORDER BY rowid",
+                (DONE,),
+            ).fetchall()
+        for url, result in rows:
+            yield url, json.loads(result)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(dict(rows))
+        return counts
+
+    def seconds_until_next_eligible(self) -> Optional[float]:
+        """Wait until the next queued URL may be claimed; None when nothing is queued."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_eligible_at) FROM frontier WHERE state = ?", (QUEUED,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    # --- Crawl-level checkpoints ---
+
+    def set_meta(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def reset(self) -> None:
+        """Forget every URL and checkpoint, starting the job over."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM frontier")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.execute("COMMIT")
+
+    def report(self) -> str:
+        counts = self.counts()
+        return "Frontier: " + ", ".join(f"{counts[state]} {state.replace('_', '-')}" for state in STATES)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "CrawlFrontier":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def frontier_path(job_key: str, frontier_dir: Union[str, Path] = DEFAULT_FRONTIER_DIR) -> Path:
+    """A stable, filesystem-safe file name for a job key such as ``"crawl:https://..."``."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", job_key).strip("_")[:60]
+    digest = hashlib.sha256(job_key.encode("utf-8")).hexdigest()[:12]
+    return Path(frontier_dir) / f"{slug}_{digest}.sqlite3"
+
+
+def open_frontier(
+    job_key: str,
+    resume: bool = False,
+    frontier_dir: Union[str, Path] = DEFAULT_FRONTIER_DIR,
+    **options: Any,
+) -> CrawlFrontier:
+    """Open the frontier for ``job_key``: continued when ``resume``, otherwise started over."""
+    frontier = CrawlFrontier(frontier_path(job_key, frontier_dir), **options)
+    if resume:
+        recovered = frontier.recover_in_flight()
+        logger.info("Resuming %s (%s; %d interrupted URL(s) re-queued)", job_key, frontier.report(), recovered)
+    else:
+        frontier.reset()
+    return frontier
@@ -0,0 +1,213 @@
+"""
+Per-site browser fetch profiles.
+
+Every Playwright fetch used to load the full page (images, fonts, video,
+analytics) and then wait for ``networkidle``, which on sites with trackers
+and live widgets means waiting for the timeout. None of that is needed to
+read the event markup. A ``FetchProfile`` describes what one site's pages
+actually need:
+
+* ``blocked_resource_types`` and ``blocked_urls`` are aborted by a route
+  handler installed once per browser context, so every page in a pooled
+  context inherits it;
+* ``wait_until`` is the navigation event ``goto`` waits for, and the page
+  counts as ready once its content predicates hold: ``ready_selector``,
+  ``ready_jsonld`` and ``quiet_ms``, checked in-page by ``readiness`` (or,
+  without any, once ``ready_state`` is reached);
+* ``navigation_timeout`` and ``ready_timeout`` bound the two waits. A page
+  that misses its readiness signal is still returned, since whatever has
+  loaded by then is usually enough for the extraction layers.
+
+``profile_for(url)`` picks the profile registered for the URL's host (or a
+parent domain) and falls back to ``DEFAULT_PROFILE``. Typical use with the
+browser pool::
+
+    profile = profile_for(url)
+    with pool.page(user_agent=ua, profile=profile) as page:
+        navigate(page, url, profile)
+        html = page.content()
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Optional, Pattern, Tuple
+from urllib.parse import urlparse
+
+from scraping_components.readiness import wait_for_ready, wait_for_ready_async
+
+LOAD_STATES = ("commit", "domcontentloaded", "load", "networkidle")
+
+DEFAULT_BLOCKED_TYPES = frozenset({"image", "media", "font"})
+
+# Analytics, ad and session-recording hosts; none of them carry event data
+TRACKER_PATTERNS = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"googlesyndication\.com",
+    r"doubleclick\.net",
+    r"adservice\.google\.",
+    r"connect\.facebook\.net",
+    r"facebook\.com/tr",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"api\.segment\.io",
+    r"cdn\.segment\.com",
+    r"criteo\.(?:com|net)",
+    r"analytics\.tiktok\.com",
+)
+
+
+@dataclass(frozen=True)
+class FetchProfile:
+    """What a browser fetch loads and waits for on one site's pages."""
+    name: str
+    blocked_resource_types: FrozenSet[str] = DEFAULT_BLOCKED_TYPES
+    blocked_urls: Tuple[str, ...] = TRACKER_PATTERNS
+    wait_until: str = "domcontentloaded"
+    ready_selector: Optional[str] = None
+    ready_jsonld: Tuple[str, ...] = ()  # JSON-LD @type suffixes that mark the data as present
+    quiet_ms: int = 0  # DOM mutation quiescence window
+    ready_state: Optional[str] = "load"  # Used when there are no in-page predicates
+    navigation_timeout: int = 30000  # ms
+    ready_timeout: int = 10000  # ms
+    _blocked_re: Optional[Pattern] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for state in (self.wait_until, self.ready_state):
+            if state is not None and state not in LOAD_STATES:
+                raise ValueError(f"load state must be one of {LOAD_STATES}, got {state!r}")
+        if "document" in self.blocked_resource_types:
+            raise ValueError("a profile cannot block the page's own document")
+        object.__setattr__(self, "blocked_resource_types", frozenset(self.blocked_resource_types))
+        object.__setattr__(self, "blocked_urls", tuple(self.blocked_urls))
+        object.__setattr__(self, "ready_jsonld", tuple(self.ready_jsonld))
+        if self.blocked_urls:
+            object.__setattr__(self, "_blocked_re", re.compile("|".join(self.blocked_urls), re.IGNORECASE))
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_urls)
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        """True when a request of this type to ``url`` should be aborted"""
+        if resource_type == "document":
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return self._blocked_re is not None and self._blocked_re.search(url) is not None
+
+    def context_options(self) -> Dict[str, Any]:
+        """``new_context`` options the profile needs"""
+        # Requests served by a service worker bypass context routes
+        return {"service_workers": "block"} if self.blocks_anything else {}
+
+
+DEFAULT_PROFILE = FetchProfile("default")
+
+_PROFILES: Dict[str, FetchProfile] = {}
+
+
+def register_profile(host: str, profile: FetchProfile) -> None:
+    """Use ``profile`` for ``host`` and its subdomains"""
+    host = host.lower()
+    _PROFILES[host[4:] if host.startswith("www.") else host] = profile
+
+
+def profile_for(url: str) -> FetchProfile:
+    """The profile registered for ``url``'s host or closest parent domain"""
+    host = (urlparse(url).hostname or "").lower()
+    while host:
+        if host in _PROFILES:
+            return _PROFILES[host]
+        host = host.partition(".")[2]
+    return DEFAULT_PROFILE
+
+
+# Event pages are server-rendered with JSON-LD; nothing on them needs styling
+register_profile("ticketsibiza.com", FetchProfile(
+    "ticketsibiza",
+    blocked_resource_types=DEFAULT_BLOCKED_TYPES | {"stylesheet"},
+    ready_selector="h1.entry-title",
+    ready_jsonld=("Event",),
+    ready_state=None,
+))
+# Stylesheets stay: the cookie banner and pagination are only clickable when laid out.
+# Content renders in after the first paint, so it has to settle before it is read.
+register_profile("ibiza-spotlight.com", FetchProfile(
+    "ibiza-spotlight",
+    ready_selector="main article, #main-content article, li.partyCal-day, .card-ticket",
+    quiet_ms=300,
+    ready_state=None,
+    navigation_timeout=45000,
+    ready_timeout=15000,
+))
+
+
+# --- Applying profiles ---
+
+def apply_profile(context: Any, profile: FetchProfile,
+                  on_blocked: Optional[Callable[[], None]] = None) -> None:
+    """Install ``profile``'s request blocking and timeouts on a sync browser context.
+
+    ``on_blocked`` is called for every aborted request, for counting.
+    """
+    context.set_default_navigation_timeout(profile.navigation_timeout)
+    if not profile.blocks_anything:
+        return
+
+    def handle(route):
+        request = route.request
+        if profile.blocks(request.resource_type, request.url):
+            if on_blocked is not None:
+                on_blocked()
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    context.route("**/*", handle)
+
+
+async def apply_profile_async(context: Any, profile: FetchProfile,
+                              on_blocked: Optional[Callable[[], None]] = None) -> None:
+    """``apply_profile`` for an async browser context"""
+    context.set_default_navigation_timeout(profile.navigation_timeout)
+    if not profile.blocks_anything:
+        return
+
+    async def handle(route):
+        request = route.request
+        if profile.blocks(request.resource_type, request.url):
+            if on_blocked is not None:
+                on_blocked()
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+
+
+def wait_until_ready(page: Any, profile: FetchProfile, selector: Optional[str] = None) -> bool:
+    """Wait for the profile's readiness signal; False if it did not arrive in time.
+
+    ``selector`` overrides the profile's ``ready_selector`` for this page.
+    """
+    return wait_for_ready(page, profile, selector).ready
+
+
+async def wait_until_ready_async(page: Any, profile: FetchProfile, selector: Optional[str] = None) -> bool:
+    """``wait_until_ready`` for an async page"""
+    return (await wait_for_ready_async(page, profile, selector)).ready
+
+
+def navigate(page: Any, url: str, profile: FetchProfile, selector: Optional[str] = None) -> Any:
+    """``goto`` plus readiness wait under ``profile``; returns the navigation response"""
+    response = page.goto(url, wait_until=profile.wait_until, timeout=profile.navigation_timeout)
+    wait_until_ready(page, profile, selector)
+    return response
+
+
+async def navigate_async(page: Any, url: str, profile: FetchProfile, selector: Optional[str] = None) -> Any:
+    """``navigate`` for an async page"""
+    response = await page.goto(url, wait_until=profile.wait_until, timeout=profile.navigation_timeout)
+    await wait_until_ready_async(page, profile, selector)
+    return response
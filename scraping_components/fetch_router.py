@@ -0,0 +1,213 @@
+"""
+Learned fetch tiers per host and URL pattern.
+
+``scrape_event_strategically`` and the engine's ``http_first`` mode always
+fetched over HTTP first and only then rendered in a browser, so a page that
+needs the browser paid for two fetches every time; other entry points
+started a browser whether or not the site needed one. ``FetchRouter``
+remembers which tier produced sufficient data for each host and URL
+pattern, cheapest first:
+
+* ``http``       plain HTTP fetch, regular extraction layers;
+* ``http_json``  the same HTTP response, read through the JSON the page
+                 embeds for its own client-side rendering;
+* ``browser``    full Playwright render.
+
+A tier with fewer than ``min_samples`` attempts is still being learned and is
+tried; one whose success rate is below ``success_threshold`` is skipped.
+Every ``reprobe_every``-th page of a pattern starts from the cheapest tier
+again, so a site that stops needing the browser is noticed. Counts decay
+once a tier has ``window`` attempts, so old behaviour fades out.
+
+Statistics persist in ``cache/fetch_router.sqlite3`` across runs. Counts are
+updated in memory and written out in batches (every ``flush_every`` records
+or ``flush_interval`` seconds, and on ``close``), so recording an attempt
+never puts a disk commit on the event loop's path.
+
+URL patterns keep the leading static path segments (``/event/*``), so the
+router learns per page type rather than per page.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUTER_PATH = Path(__file__).resolve().parent.parent / "cache" / "fetch_router.sqlite3"
+
+HTTP, HTTP_JSON, BROWSER = "http", "http_json", "browser"
+TIERS = (HTTP, HTTP_JSON, BROWSER)
+
+_STATIC_SEGMENT = re.compile(r"^[a-z][a-z_-]{0,23}$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tier_stats (
+    host TEXT NOT NULL,
+    pattern TEXT NOT NULL,
+    tier TEXT NOT NULL,
+    attempts REAL NOT NULL,
+    successes REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (host, pattern, tier)
+);
+"""
+
+
+def url_pattern(url: str, max_segments: int = 2) -> Tuple[str, str]:
+    """
+    (host, path pattern) of a URL
+
+    Leading static segments are kept and the rest collapses to ``*``. The
+    last segment of a deeper path is the page's own slug, so it never counts
+    as static: ``/event/opening/`` and ``/event/closing-2025/`` share
+    ``/event/*``.
+    """
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    segments = [s.lower() for s in parsed.path.split("/") if s]
+    kept = []
+    for i, segment in enumerate(segments):
+        is_slug = i == len(segments) - 1 and i > 0
+        if len(kept) >= max_segments or is_slug or not _STATIC_SEGMENT.match(segment):
+            kept.append("*")
+            break
+        kept.append(segment)
+    return host, "/" + "/".join(kept)
+
+
+class FetchRouter:
+    """Per-pattern tier success counts, kept in SQLite across runs."""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_ROUTER_PATH,
+        min_samples: int = 3,
+        success_threshold: float = 0.8,
+        reprobe_every: int = 25,
+        window: int = 50,
+        flush_every: int = 50,
+        flush_interval: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.min_samples = min_samples
+        self.success_threshold = success_threshold
+        self.reprobe_every = reprobe_every
+        self.window = window
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats: Optional[Dict[Tuple[str, str], Dict[str, List[float]]]] = None
+        self._plans: Dict[Tuple[str, str], int] = {}
+        self._dirty: Set[Tuple[str, str, str]] = set()
+        self._pending = 0  # Records since the last flush
+        self._last_flush = time.monotonic()
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened lazily so constructing a scraper never touches disk
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _all_stats(self) -> Dict[Tuple[str, str], Dict[str, List[float]]]:
+        if self._stats is None:
+            self._stats = {}
+            for host, pattern, tier, attempts, successes in self._db().execute(
+                "SELECT host, pattern, tier, attempts, successes FROM tier_stats"
+            ):
+                self._stats.setdefault((host, pattern), {})[tier] = [attempts, successes]
+        return self._stats
+
+    def stats_for(self, url: str) -> Dict[str, Tuple[float, float]]:
+        """{tier: (attempts, successes)} learned for the URL's pattern"""
+        with self._lock:
+            return {tier: tuple(counts) for tier, counts in self._all_stats().get(url_pattern(url), {}).items()}
+
+    def _proven(self, counts: Optional[List[float]]) -> Optional[bool]:
+        """True/False once a tier has enough attempts to judge; None while learning"""
+        if not counts or counts[0] < self.min_samples:
+            return None
+        return counts[1] / counts[0] >= self.success_threshold
+
+    def plan(self, url: str, available: Sequence[str] = TIERS) -> List[str]:
+        """Tiers to try for ``url``, starting from the cheapest one expected to work"""
+        key = url_pattern(url)
+        tiers = [tier for tier in TIERS if tier in available]
+        with self._lock:
+            stats = self._all_stats().get(key, {})
+            count = self._plans[key] = self._plans.get(key, 0) + 1
+        if self.reprobe_every and count % self.reprobe_every == 0:
+            return tiers
+        for i, tier in enumerate(tiers):
+            if self._proven(stats.get(tier)) is not False:
+                return tiers[i:]
+        # Nothing has worked lately; the most capable tier has the best odds
+        return tiers[-1:]
+
+    def record(self, url: str, tier: str, success: bool) -> None:
+        """Count one attempt of ``tier`` on ``url``'s pattern"""
+        if tier not in TIERS:
+            raise ValueError(f"tier must be one of {TIERS}, got {tier!r}")
+        host, pattern = url_pattern(url)
+        with self._lock:
+            counts = self._all_stats().setdefault((host, pattern), {}).setdefault(tier, [0.0, 0.0])
+            if counts[0] >= self.window:
+                counts[0] /= 2
+                counts[1] /= 2
+            counts[0] += 1
+            counts[1] += 1 if success else 0
+            self._dirty.add((host, pattern, tier))
+            self._pending += 1
+            if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self) -> None:
+        # Caller holds the lock
+        self._last_flush = time.monotonic()
+        self._pending = 0
+        if not self._dirty:
+            return
+        now = time.time()
+        rows = [(host, pattern, tier, *self._stats[(host, pattern)][tier], now)
+                for host, pattern, tier in self._dirty]
+        self._db().executemany(
+            "INSERT INTO tier_stats (host, pattern, tier, attempts, successes, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (host, pattern, tier) DO UPDATE SET "
+            "attempts = excluded.attempts, successes = excluded.successes, updated_at = excluded.updated_at",
+            rows,
+        )
+        self._db().commit()
+        self._dirty.clear()
+
+    def flush(self) -> None:
+        """Write counts recorded since the last flush to disk"""
+        with self._lock:
+            self._flush()
+
+    def report(self) -> str:
+        with self._lock:
+            stats = dict(self._all_stats()) if self._conn is not None or self._stats is not None else {}
+        parts = []
+        for (host, pattern), tiers in sorted(stats.items()):
+            rates = ", ".join(f"{tier} {s:.0f}/{a:.0f}" for tier in TIERS
+                              for a, s in [tiers.get(tier, (0, 0))] if a)
+            parts.append(f"{host}{pattern} [{rates}]")
+        return "Fetch tiers (successes/attempts): " + ("; ".join(parts) or "none")
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._stats = None
@@ -0,0 +1,322 @@
+"""
+On-disk conditional-GET cache for requests sessions.
+
+``CachingHTTPAdapter`` is a drop-in replacement for the ``HTTPAdapter`` the
+scrapers mount on their sessions. GET responses are stored zlib-compressed in
+a SQLite file keyed by URL, together with their ``ETag`` and
+``Last-Modified`` validators:
+
+* by default every request is revalidated: ``DEFAULT_TTL_SECONDS`` is 0, so
+  listings and ticket pages are never served stale. Hosts whose pages can
+  safely be reused unchecked opt in through ``host_ttls``; while an entry is
+  within its host's TTL it is served without touching the network;
+* otherwise it is revalidated with ``If-None-Match``/``If-Modified-Since``,
+  and a ``304 Not Modified`` is answered from the stored body;
+* the store is capped in bytes and evicts least recently used entries.
+
+Hit, revalidation and miss counters are kept per cache so runs can report how
+much traffic the cache saved. ``install_http_cache(session)`` swaps the
+adapters of an existing session for caching ones, keeping their retry
+configuration.
+"""
+
+import io
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3 import HTTPResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "http"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 0  # Serving without revalidation is opt-in per host
+MAX_ENTRY_BYTES = 10 * 1024 * 1024
+
+# Headers describing the wire encoding of the original response; the cache
+# stores decoded bodies, so these would be wrong on a replayed response.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+
+class HTTPCache:
+    """SQLite-backed store of compressed GET responses with per-host TTLs."""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+        host_ttls: Optional[Dict[str, float]] = None,
+        compression_level: int = 6,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.host_ttls = {host.lower(): ttl for host, ttl in (host_ttls or {}).items()}
+        self.compression_level = compression_level
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stored": 0,
+            "evicted": 0,
+            "bytes_saved": 0,
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened lazily so merely constructing a scraper never touches disk
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.cache_dir / "responses.sqlite3"), check_same_thread=False
+            )
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def ttl_for(self, host: str) -> float:
+        """TTL for a host; policies match the host itself or any parent domain."""
+        host = (host or "").lower()
+        while host:
+            if host in self.host_ttls:
+                return self.host_ttls[host]
+            if "." not in host:
+                break
+            host = host.split(".", 1)[1]
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for ``url`` (body decompressed), or None."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db().execute(
+                "UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url)
+            )
+            self._db().commit()
+        status, headers, body, etag, last_modified, stored_at = row
+        return {
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers),
+            "body": zlib.decompress(body),
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at,
+        }
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """Store a response body and its validators, then enforce the size cap."""
+        stored_headers = {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS}
+        compressed = zlib.compress(body, self.compression_level)
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, status, headers, body, size, etag, last_modified, stored_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    status,
+                    json.dumps(stored_headers),
+                    compressed,
+                    len(compressed),
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    now,
+                    now,
+                ),
+            )
+            self._db().commit()
+            self.stats["stored"] += 1
+            self._evict()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry fresh again after a successful revalidation."""
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                "UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?", (now, now, url)
+            )
+            self._db().commit()
+
+    def delete(self, url: str) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._db().commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store is under 90% of the cap."""
+        db = self._db()
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        for url, size in db.execute(
+            "SELECT url, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= target:
+                break
+            db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            self.stats["evicted"] += 1
+        db.commit()
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def lookups(self) -> int:
+        return self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"]
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered without downloading a body (fresh hits + 304s)."""
+        lookups = self.lookups()
+        if not lookups:
+            return 0.0
+        return (self.stats["hits"] + self.stats["revalidated"]) / lookups
+
+    def report(self) -> str:
+        s = self.stats
+        return (
+            f"HTTP cache: {s['hits']} fresh hits, {s['revalidated']} revalidated (304), "
+            f"{s['misses']} misses, hit rate {self.hit_rate():.1%}, "
+            f"{s['bytes_saved'] / 1024:.0f} KiB not downloaded"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that answers GETs from an ``HTTPCache`` and revalidates stale entries."""
+
+    def __init__(self, cache: HTTPCache, *args: Any, **kwargs: Any):
+        self.cache = cache
+        super().__init__(*args, **kwargs)
+
+    def _cached_response(self, request: requests.PreparedRequest, entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response._content_consumed = True
+        response.raw = HTTPResponse(
+            body=io.BytesIO(entry["body"]),
+            headers=entry["headers"],
+            status=entry["status"],
+            preload_content=False,
+            decode_content=False,
+        )
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs: Any) -> requests.Response:
+        if request.method != "GET" or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        url = request.url
+        entry = self.cache.get(url)
+        if entry is not None:
+            host = urlparse(url).hostname or ""
+            age = time.time() - entry["stored_at"]
+            if age < self.cache.ttl_for(host):
+                self.cache.stats["hits"] += 1
+                self.cache.stats["bytes_saved"] += len(entry["body"])
+                return self._cached_response(request, entry)
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            self.cache.touch(url)
+            self.cache.stats["revalidated"] += 1
+            self.cache.stats["bytes_saved"] += len(entry["body"])
+            response.close()
+            return self._cached_response(request, entry)
+
+        self.cache.stats["misses"] += 1
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if response.status_code == 200 and "no-store" not in cache_control:
+            body = response.content
+            if len(body) <= MAX_ENTRY_BYTES:
+                try:
+                    self.cache.put(url, response.status_code, dict(response.headers), body)
+                except sqlite3.Error as e:
+                    logger.warning("Could not cache %s: %s", url, e)
+        elif entry is not None and response.status_code in (404, 410):
+            self.cache.delete(url)
+        return response
+
+
+_shared_cache: Optional[HTTPCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> HTTPCache:
+    """Process-wide cache used by the scrapers' sessions."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPCache()
+        return _shared_cache
+
+
+def session_cache_report(session: requests.Session) -> Optional[str]:
+    """Hit-rate summary for a session's cache, or None if it saw no GETs."""
+    cache = getattr(session.get_adapter("https://"), "cache", None)
+    if cache is None or not cache.lookups():
+        return None
+    return cache.report()
+
+
+def install_http_cache(session: requests.Session, cache: Optional[HTTPCache] = None) -> requests.Session:
+    """Mount caching adapters on ``session``, preserving the existing retry settings."""
+    cache = cache or get_shared_cache()
+    for prefix in ("http://", "https://"):
+        current = session.adapters.get(prefix)
+        max_retries = current.max_retries if isinstance(current, HTTPAdapter) else 0
+        session.mount(prefix, CachingHTTPAdapter(cache, max_retries=max_retries))
+    return session
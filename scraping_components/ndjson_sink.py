@@ -0,0 +1,251 @@
+"""
+Streaming NDJSON output for scraped events.
+
+The scrapers used to collect every event in a list and ``json.dump`` it once
+the run finished, so a crash lost the whole run and memory grew with crawl
+size. ``NDJSONSink`` writes one JSON object per line as events arrive:
+
+* output can be plain, gzip (``.gz``) or zstd (``.zst``, needs the optional
+  ``zstandard`` package), inferred from the file name;
+* buffers are flushed and fsynced every ``fsync_every`` records or
+  ``fsync_interval`` seconds, whichever comes first, so at most that much is
+  lost on a crash;
+* once a segment reaches ``rotate_bytes`` (on-disk size), writing continues
+  in ``<name>.1.ndjson``, ``<name>.2.ndjson``, ...;
+* ``append=True`` continues the newest existing segment instead of
+  truncating, for runs resumed after an interruption. A partial last line
+  left by a crash is cut off first, so the next record does not merge with
+  it; a compressed segment cannot be repaired in place, so appending to one
+  starts the next segment.
+
+``iter_ndjson`` is the companion reader: it walks a file and its rotated
+segments lazily, tolerating the truncated tail a crash can leave behind.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover - zstd output is optional
+    zstandard = None
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+# What a compressed stream cut off by a crash raises when read
+_TRUNCATION_ERRORS = (EOFError,) + ((zstandard.ZstdError,) if HAS_ZSTD else ())
+
+
+def _compression_for(path: Path) -> Optional[str]:
+    return _COMPRESSION_SUFFIXES.get(path.suffix)
+
+
+def _split_name(path: Path):
+    """``events.ndjson.gz`` -> (``events``, ``.ndjson.gz``)."""
+    suffixes = "".join(path.suffixes[-2:]) if path.suffix in _COMPRESSION_SUFFIXES else path.suffix
+    return path.name[: len(path.name) - len(suffixes)], suffixes
+
+
+def segment_paths(path: PathLike) -> List[Path]:
+    """The file written first followed by its rotated segments, in write order."""
+    path = Path(path)
+    stem, suffixes = _split_name(path)
+    pattern = re.compile(re.escape(stem) + r"\.(\d+)" + re.escape(suffixes) + "$")
+    rotated = []
+    if path.parent.exists():
+        for candidate in path.parent.iterdir():
+            match = pattern.match(candidate.name)
+            if match:
+                rotated.append((int(match.group(1)), candidate))
+    segments = [path] if path.exists() else []
+    return segments + [candidate for _, candidate in sorted(rotated)]
+
+
+def _drop_partial_line(path: Path, chunk_size: int = 64 * 1024) -> None:
+    """Truncate a plain NDJSON file to its last complete line."""
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk_size)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline != -1:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            logger.warning("Dropping %d bytes of incomplete last line in %s", end - pos, path)
+            f.truncate(pos)
+
+
+def _open_binary_writer(raw, compression: Optional[str], compresslevel: int):
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=compresslevel)
+    if compression == "zstd":
+        if not HAS_ZSTD:
+            raise ImportError("zstd output requires the 'zstandard' package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=compresslevel).stream_writer(raw, closefd=False)
+    return raw
+
+
+class NDJSONSink:
+    """Appends records to NDJSON files with periodic fsync and size-based rotation."""
+
+    def __init__(
+        self,
+        path: PathLike,
+        *,
+        rotate_bytes: int = 256 * 1024 * 1024,
+        fsync_every: int = 50,
+        fsync_interval: float = 5.0,
+        compresslevel: int = 6,
+        default: Optional[Callable[[Any], Any]] = str,
+        append: bool = False,
+    ):
+        self.path = Path(path)
+        self.compression = _compression_for(self.path)
+        self.rotate_bytes = rotate_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compresslevel = compresslevel
+        self.default = default
+        self.count = 0
+        self.paths: List[Path] = []
+
+        self._stem, self._suffixes = _split_name(self.path)
+        self._raw = None
+        self._writer = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "wb"
+        if append:
+            existing = segment_paths(self.path)
+            if self.compression or not existing:
+                # A crash may have cut the last compressed stream short
+                self.paths = existing
+            else:
+                # Reopen the last segment written; earlier ones are already full
+                self.paths = existing[:-1]
+                _drop_partial_line(existing[-1])
+                mode = "ab"
+        self._open_segment(mode=mode)
+
+    def _open_segment(self, mode: str = "wb") -> None:
+        index = len(self.paths)
+        path = self.path if index == 0 else self.path.with_name(f"{self._stem}.{index}{self._suffixes}")
+        self._raw = open(path, mode)
+        self._writer = _open_binary_writer(self._raw, self.compression, self.compresslevel)
+        self.paths.append(path)
+
+    def _close_segment(self) -> None:
+        self._sync()
+        if self._writer is not self._raw:
+            self._writer.close()
+        self._raw.close()
+        self._writer = self._raw = None
+
+    def _sync(self) -> None:
+        if self._writer is not self._raw:
+            if self.compression == "zstd":
+                self._writer.flush(zstandard.FLUSH_FRAME)
+            else:
+                self._writer.flush()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Serialize ``record`` as one line; fsyncs and rotates as configured."""
+        line = json.dumps(record, ensure_ascii=False, default=self.default).encode("utf-8") + b"\n"
+        with self._lock:
+            if self._writer is None:
+                raise ValueError(f"NDJSONSink for {self.path} is closed")
+            self._writer.write(line)
+            self.count += 1
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+            if self.rotate_bytes and self._raw.tell() >= self.rotate_bytes:
+                self._close_segment()
+                self._open_segment()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Flush buffered records to disk now."""
+        with self._lock:
+            if self._writer is not None:
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._close_segment()
+
+    @property
+    def closed(self) -> bool:
+        return self._writer is None
+
+    def __enter__(self) -> "NDJSONSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _open_text_reader(path: Path):
+    compression = _compression_for(path)
+    if compression == "gzip":
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8")
+    if compression == "zstd":
+        if not HAS_ZSTD:
+            raise ImportError("Reading .zst files requires the 'zstandard' package (pip install zstandard)")
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_ndjson(path: PathLike, include_segments: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield records from an NDJSON file (and its rotated segments) one at a time.
+
+    Blank lines are skipped. A line that is not valid JSON, or a compressed
+    stream that ends early, is logged and skipped: that is what a crash
+    mid-write leaves behind.
+    """
+    paths = segment_paths(path) if include_segments else [Path(path)]
+    if not paths:
+        raise FileNotFoundError(f"No NDJSON file at {path}")
+    for segment in paths:
+        with _open_text_reader(segment) as f:
+            line_no = 0
+            try:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.warning("Skipping malformed line %d in %s: %s", line_no, segment, e)
+            except _TRUNCATION_ERRORS as e:
+                logger.warning("%s ends early after line %d (incomplete write?): %s", segment, line_no, e)
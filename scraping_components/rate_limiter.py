@@ -0,0 +1,247 @@
+"""
+Adaptive per-host rate limiting.
+
+Politeness used to be a fixed ``time.sleep(random.uniform(...))`` in every
+fetch path, and the sleeps stacked: ``BaseEventScraper.fetch_page`` slept
+1-3 s on top of the crawl loop's own delay, whatever the site could take.
+Requests now go through one ``HostRateController`` per host instead:
+
+* request starts are spaced by a token bucket (kept in GCRA form: one
+  "theoretical arrival time" per host), with an optional ``burst``;
+* the bucket's rate follows AIMD: ``record`` halves it on 429/503 or a
+  timeout and adds ``increase`` req/s after every ``healthy_after``
+  healthy responses, between ``min_rate`` and ``max_rate``;
+* a ``Retry-After`` header (seconds or HTTP date) blocks the host until then.
+
+Controllers are guarded by a ``threading.Lock`` and only ever compute a
+wait, so one controller serves threads (``RateLimiter.wait``) and asyncio
+tasks on any loop (``RateLimiter.acquire``) alike. ``shared_limiter()`` is
+the process-wide registry that the sync scrapers and the crawl engine share;
+``RateLimiter.metrics()`` reports each host's current and measured rate.
+"""
+
+import asyncio
+import collections
+import logging
+import math
+import random
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down"; a missing status (timeout, reset) counts too
+THROTTLE_STATUSES = {429, 503}
+
+DEFAULT_RATE = 0.5      # req/s a new host starts at (one request per 2 s)
+DEFAULT_MIN_RATE = 1 / 60
+DEFAULT_MAX_RATE = 2.0
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` value (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        until = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, until.timestamp() - now)
+
+
+def delay_options(min_delay: float, max_delay: float) -> Dict[str, float]:
+    """
+    Controller options matching an old ``[min_delay, max_delay]`` sleep range
+
+    The host starts at the range's mean spacing and is never driven closer
+    than ``min_delay``; zero delays mean no spacing at all.
+    """
+    max_delay = max(max_delay, min_delay)
+    mean = (min_delay + max_delay) / 2
+    return {
+        "rate": 1 / mean if mean > 0 else math.inf,
+        "max_rate": 1 / min_delay if min_delay > 0 else math.inf,
+    }
+
+
+class HostRateController:
+    """Token bucket for one host whose refill rate adapts to its responses"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, min_rate: float = DEFAULT_MIN_RATE,
+                 max_rate: float = DEFAULT_MAX_RATE, burst: int = 1,
+                 increase: float = 0.1, decrease: float = 0.5, healthy_after: int = 5,
+                 jitter: float = 0.25, clock: Callable[[], float] = time.monotonic):
+        self.min_rate = min(min_rate, max_rate)
+        self.max_rate = max_rate
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.burst = max(1, burst)
+        self.increase = increase
+        self.decrease = decrease
+        self.healthy_after = healthy_after
+        self.jitter = jitter
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tat = 0.0
+        self._blocked_until = 0.0
+        self._last_decrease = -math.inf
+        self._healthy_streak = 0
+        self._starts: collections.deque = collections.deque(maxlen=50)
+        self.stats = {"requests": 0, "throttled": 0, "failures": 0, "waited_seconds": 0.0}
+
+    @property
+    def interval(self) -> float:
+        return 1 / self.rate if self.rate > 0 else math.inf
+
+    def reserve(self) -> float:
+        """Claim the next request slot; returns how long to wait before using it"""
+        with self._lock:
+            now = self._clock()
+            interval = self.interval
+            tat = max(self._tat, now)
+            start = max(now, tat - (self.burst - 1) * interval, self._blocked_until)
+            if self.jitter and interval < math.inf and interval > 0:
+                start += random.uniform(0, self.jitter * interval)
+            self._tat = max(tat, start) + interval
+            wait = start - now
+            self._starts.append(start)
+            self.stats["requests"] += 1
+            self.stats["waited_seconds"] += wait
+            return wait
+
+    def record(self, status: Optional[int], retry_after: Optional[float] = None) -> None:
+        """Adapt the rate to a response status (None for a timeout or connection error)"""
+        with self._lock:
+            now = self._clock()
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            if status is None or status in THROTTLE_STATUSES:
+                self.stats["throttled" if status else "failures"] += 1
+                self._healthy_streak = 0
+                # Requests already in flight report the same overload; back off once per interval
+                if now - self._last_decrease >= min(self.interval, 60.0):
+                    # Back off from what the host was actually getting, which matters while unbounded
+                    base = min(self.rate, self._measured_rate() or self.rate)
+                    if base == math.inf:
+                        base = DEFAULT_RATE
+                    self.rate = max(self.min_rate, base * self.decrease)
+                    self._last_decrease = now
+                    logger.info("Throttled (%s); rate now %.3f req/s", status or "no response", self.rate)
+            elif status >= 500:
+                self._healthy_streak = 0
+            else:
+                self._healthy_streak += 1
+                if self._healthy_streak >= self.healthy_after and self.rate < self.max_rate:
+                    self.rate = min(self.max_rate, self.rate + self.increase)
+                    self._healthy_streak = 0
+
+    def _measured_rate(self) -> float:
+        if len(self._starts) < 2:
+            return 0.0
+        span = self._starts[-1] - self._starts[0]
+        return (len(self._starts) - 1) / span if span > 0 else math.inf
+
+    def effective_rate(self) -> float:
+        """Request starts per second over the recent window"""
+        with self._lock:
+            return self._measured_rate()
+
+    def snapshot(self) -> Dict[str, Any]:
+        effective = self.effective_rate()
+        with self._lock:
+            return {
+                "rate": round(self.rate, 4),
+                "effective_rate": round(effective, 4),
+                "min_rate": self.min_rate,
+                "max_rate": self.max_rate,
+                "blocked_for": round(max(0.0, self._blocked_until - self._clock()), 2),
+                **self.stats,
+            }
+
+
+class RateLimiter:
+    """Registry of per-host controllers, usable from threads and asyncio tasks"""
+
+    def __init__(self, **defaults: Any):
+        self.defaults = defaults
+        self._controllers: Dict[str, HostRateController] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc.lower() or url.lower()
+
+    def controller(self, url: str, **options: Any) -> HostRateController:
+        """The host's controller, created from ``options`` if it has none yet"""
+        host = self.host(url)
+        with self._lock:
+            controller = self._controllers.get(host)
+            if controller is None:
+                controller = HostRateController(**{**self.defaults, **options})
+                self._controllers[host] = controller
+            return controller
+
+    def wait(self, url: str, **options: Any) -> float:
+        """Block the calling thread until the host's next slot; returns seconds waited"""
+        wait = self.controller(url, **options).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire(self, url: str, **options: Any) -> float:
+        """``wait`` for asyncio tasks"""
+        wait = self.controller(url, **options).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record(self, url: str, status: Optional[int],
+               headers: Optional[Mapping[str, str]] = None) -> None:
+        """Feed a response (or None for no response) back to the host's controller"""
+        # Playwright lowercases header names; requests and aiohttp look them up case-insensitively
+        retry_after = (parse_retry_after(headers.get("Retry-After") or headers.get("retry-after"))
+                       if headers else None)
+        self.controller(url).record(status, retry_after)
+
+    def record_exception(self, url: str, error: BaseException) -> None:
+        """Feed back a failed ``requests`` call, using its response when it has one"""
+        response = getattr(error, "response", None)
+        if response is not None:
+            self.record(url, response.status_code, response.headers)
+        else:
+            self.record(url, None)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host rate, measured rate and counters"""
+        with self._lock:
+            controllers = dict(self._controllers)
+        return {host: controller.snapshot() for host, controller in sorted(controllers.items())}
+
+    def report(self) -> str:
+        parts = [f"{host} {m['effective_rate']:.2f}/{m['rate']:.2f} req/s ({m['throttled']} throttled)"
+                 for host, m in self.metrics().items()]
+        return "Host rates (measured/allowed): " + (", ".join(parts) or "none")
+
+
+_shared: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> RateLimiter:
+    """The process-wide limiter shared by the scrapers and the crawl engine"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter()
+        return _shared
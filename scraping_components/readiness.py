@@ -0,0 +1,226 @@
+"""
+In-page readiness checks and time-to-ready telemetry.
+
+``networkidle`` waits for the network rather than for the data: ad-heavy
+pages such as ibiza-spotlight.com keep polling and rarely go idle, so pages
+sat open for 10+ seconds (or until the timeout) after their event markup had
+arrived. ``wait_for_ready`` instead evaluates a fetch profile's "content
+ready" predicates inside the page and returns the moment they hold:
+
+* ``ready_selector``  any element matching the CSS selector is attached;
+* ``ready_jsonld``    a JSON-LD block parses and contains a node whose
+                      ``@type`` ends with one of these names (``Event``
+                      matches ``MusicEvent``);
+* ``quiet_ms``        the DOM has seen no mutations for this long. With a
+                      selector it only watches the matched element's
+                      subtree, so ads elsewhere on the page do not hold it
+                      open; without content predicates it is the signal.
+
+The check is one ``page.evaluate`` call: it answers straight away when the
+content is already there, otherwise a ``MutationObserver`` re-checks as the
+DOM changes, bounded by the profile's ``ready_timeout``. Content that shows
+up but never goes quiet still counts as ready at the deadline. Profiles
+without in-page predicates fall back to waiting for ``ready_state``.
+
+Every check is recorded in the shared ``ReadinessTelemetry``: the time from
+navigation start to ready (``performance.now()`` in the page), per profile,
+and which signal fired.
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_SAMPLES = 1000
+
+READY_SCRIPT = """
+({selector, jsonldTypes, quietMs, timeoutMs}) => new Promise((resolve) => {
+  const hasJsonLd = () => {
+    for (const script of document.querySelectorAll('script[type="application/ld+json"]')) {
+      let data;
+      try { data = JSON.parse(script.textContent); } catch (e) { continue; }
+      const stack = [data];
+      while (stack.length) {
+        const node = stack.pop();
+        if (Array.isArray(node)) { stack.push(...node); continue; }
+        if (!node || typeof node !== "object") continue;
+        const types = [].concat(node["@type"] || []);
+        if (types.some(t => typeof t === "string" && jsonldTypes.some(name => t.endsWith(name)))) return true;
+        stack.push(...Object.values(node));
+      }
+    }
+    return false;
+  };
+  let root = null;
+  const findContent = () => {
+    if (selector) {
+      root = document.querySelector(selector);
+      if (root) return "selector";
+    }
+    if (jsonldTypes.length && hasJsonLd()) return "jsonld";
+    return null;
+  };
+  const needsContent = Boolean(selector) || jsonldTypes.length > 0;
+  let content = findContent();
+  let lastMutation = performance.now();
+  let observer = null, quietTimer = null, deadline = null;
+  const finish = (ready, signal) => {
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(deadline);
+    resolve({ready, signal, elapsed: performance.now()});
+  };
+  if (content && !quietMs) return finish(true, content);
+  const checkQuiet = () => {
+    const idle = performance.now() - lastMutation;
+    if ((content || !needsContent) && idle >= quietMs) return finish(true, content || "quiet");
+    quietTimer = setTimeout(checkQuiet, Math.max(quietMs - idle, 25));
+  };
+  observer = new MutationObserver((mutations) => {
+    if (!content) {
+      content = findContent();
+      if (content && !quietMs) return finish(true, content);
+    }
+    if (!root || mutations.some(m => root.contains(m.target))) lastMutation = performance.now();
+  });
+  observer.observe(document, {childList: true, subtree: true, characterData: true});
+  if (quietMs) checkQuiet();
+  deadline = setTimeout(() => finish(Boolean(content), content || "timeout"), timeoutMs);
+})
+"""
+
+
+@dataclass
+class ReadyResult:
+    """Outcome of one readiness check."""
+    ready: bool
+    signal: str  # selector, jsonld, quiet, a load state, timeout or error
+    elapsed_ms: Optional[float] = None  # since navigation start
+
+
+def has_page_predicate(profile: Any, selector: Optional[str] = None) -> bool:
+    return bool(selector or profile.ready_selector or profile.ready_jsonld or profile.quiet_ms)
+
+
+def _script_args(profile: Any, selector: Optional[str]) -> Dict[str, Any]:
+    return {
+        "selector": selector or profile.ready_selector,
+        "jsonldTypes": list(profile.ready_jsonld),
+        "quietMs": profile.quiet_ms,
+        "timeoutMs": profile.ready_timeout,
+    }
+
+
+def _from_script(value: Any) -> ReadyResult:
+    return ReadyResult(bool(value["ready"]), value["signal"], value["elapsed"])
+
+
+class ReadinessTelemetry:
+    """Time-to-ready samples and signal counts per fetch profile."""
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._signals: Dict[str, Dict[str, int]] = {}
+
+    def record(self, profile_name: str, result: ReadyResult) -> None:
+        with self._lock:
+            signals = self._signals.setdefault(profile_name, {})
+            signals[result.signal] = signals.get(result.signal, 0) + 1
+            if result.ready and result.elapsed_ms is not None:
+                self._samples.setdefault(profile_name, deque(maxlen=self.max_samples)).append(result.elapsed_ms)
+
+    def checks(self) -> int:
+        with self._lock:
+            return sum(sum(signals.values()) for signals in self._signals.values())
+
+    def summary(self, profile_name: str) -> Dict[str, Any]:
+        """Check count, ready count, time-to-ready percentiles (ms) and signal counts"""
+        with self._lock:
+            samples = sorted(self._samples.get(profile_name, ()))
+            signals = dict(self._signals.get(profile_name, {}))
+
+        def percentile(p: float) -> Optional[float]:
+            if not samples:
+                return None
+            return samples[max(0, math.ceil(p * len(samples)) - 1)]
+
+        return {
+            "checks": sum(signals.values()),
+            "ready": len(samples),
+            "p50_ms": percentile(0.5),
+            "p90_ms": percentile(0.9),
+            "max_ms": samples[-1] if samples else None,
+            "signals": signals,
+        }
+
+    def report(self) -> str:
+        with self._lock:
+            names = sorted(self._signals)
+        parts = []
+        for name in names:
+            s = self.summary(name)
+            timing = (f"p50 {s['p50_ms']:.0f}ms, p90 {s['p90_ms']:.0f}ms, max {s['max_ms']:.0f}ms"
+                      if s["ready"] else "no ready pages")
+            signals = ", ".join(f"{signal} x{n}" for signal, n in sorted(s["signals"].items()))
+            parts.append(f"{name}: {s['ready']}/{s['checks']} ready, {timing} ({signals})")
+        return "Time to ready: " + ("; ".join(parts) or "none")
+
+
+_shared_telemetry = ReadinessTelemetry()
+
+
+def readiness_telemetry() -> ReadinessTelemetry:
+    """The process-wide telemetry every readiness check records into."""
+    return _shared_telemetry
+
+
+def readiness_report() -> Optional[str]:
+    """Time-to-ready summary, or None if no page has been checked."""
+    return _shared_telemetry.report() if _shared_telemetry.checks() else None
+
+
+def wait_for_ready(page: Any, profile: Any, selector: Optional[str] = None,
+                   telemetry: Optional[ReadinessTelemetry] = None) -> ReadyResult:
+    """Wait until ``profile``'s content predicates hold on a sync page.
+
+    ``selector`` overrides the profile's ``ready_selector`` for this page.
+    """
+    try:
+        if has_page_predicate(profile, selector):
+            result = _from_script(page.evaluate(READY_SCRIPT, _script_args(profile, selector)))
+        elif profile.ready_state:
+            page.wait_for_load_state(profile.ready_state, timeout=profile.ready_timeout)
+            result = ReadyResult(True, profile.ready_state, page.evaluate("performance.now()"))
+        else:
+            result = ReadyResult(True, "navigation")
+    except Exception as e:
+        # Timeouts, or the page navigating away mid-check
+        logger.debug("Readiness check failed on %s under profile %s: %s", page.url, profile.name, e)
+        result = ReadyResult(False, "error")
+    (telemetry or _shared_telemetry).record(profile.name, result)
+    return result
+
+
+async def wait_for_ready_async(page: Any, profile: Any, selector: Optional[str] = None,
+                               telemetry: Optional[ReadinessTelemetry] = None) -> ReadyResult:
+    """``wait_for_ready`` for an async page"""
+    try:
+        if has_page_predicate(profile, selector):
+            result = _from_script(await page.evaluate(READY_SCRIPT, _script_args(profile, selector)))
+        elif profile.ready_state:
+            await page.wait_for_load_state(profile.ready_state, timeout=profile.ready_timeout)
+            result = ReadyResult(True, profile.ready_state, await page.evaluate("performance.now()"))
+        else:
+            result = ReadyResult(True, "navigation")
+    except Exception as e:
+        logger.debug("Readiness check failed on %s under profile %s: %s", page.url, profile.name, e)
+        result = ReadyResult(False, "error")
+    (telemetry or _shared_telemetry).record(profile.name, result)
+    return result
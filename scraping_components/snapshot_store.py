@@ -0,0 +1,311 @@
+"""
+Content-addressed store for raw HTML snapshots.
+
+Event documents used to carry a truncated copy of the page (``html[:5000]``)
+and failed fetches were dumped ad hoc into ``debug_snapshots/``. Pages now go
+to a local store keyed by the SHA-256 of their bytes, and events reference
+them by digest (``htmlSnapshot``), so the full page stays available for
+re-parsing while the events collection stops growing with markup:
+
+* identical pages are stored once (the digest is the file name);
+* pages are compressed with zstd when ``zstandard`` is installed, otherwise
+  with zlib; either way with a dictionary trained on stored pages once
+  ``train_after`` new pages have been written (pages of one site share most
+  of their markup, which a per-page compressor cannot exploit);
+* every object records its codec and dictionary id, so retraining never
+  breaks older objects;
+* ``manifest.ndjson`` appends one ``{"url", "digest", "storedAt"}`` line per
+  stored page, so snapshots can be found by URL without the database.
+
+Layout under ``cache/snapshots/``::
+
+    objects/ab/abcdef...   header + compressed page
+    dicts/<id>.<codec>     trained dictionaries; dicts/CURRENT names the active one
+    manifest.ndjson
+"""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover - zlib is used instead
+    zstandard = None
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / "cache" / "snapshots"
+
+MAGIC = b"HSN1"
+ZSTD, DEFLATE = b"z", b"d"
+NO_DICT = b"0" * 16
+# zlib only looks at the last 32 KiB of a preset dictionary
+ZLIB_DICT_SIZE = 32 * 1024
+ZSTD_DICT_SIZE = 112 * 1024
+
+
+def snapshot_digest(html: Union[str, bytes]) -> str:
+    """SHA-256 hex digest of a page's UTF-8 bytes (its key in the store)"""
+    data = html.encode("utf-8") if isinstance(html, str) else html
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_zlib_dictionary(samples: List[bytes], size: int = ZLIB_DICT_SIZE) -> bytes:
+    """
+    Preset dictionary for zlib from lines that recur across samples
+
+    The most common lines go last, where deflate's back-references are
+    cheapest to reach.
+    """
+    counts: collections.Counter = collections.Counter()
+    for sample in samples:
+        counts.update({line.strip() for line in sample.splitlines() if len(line.strip()) > 8})
+    threshold = max(2, len(samples) // 4)
+    common = [line for line, count in counts.most_common() if count >= threshold]
+    picked, total = [], 0
+    for line in common:
+        if total + len(line) + 1 > size:
+            break
+        picked.append(line)
+        total += len(line) + 1
+    return b"\n".join(reversed(picked))
+
+
+class SnapshotStore:
+    """Deduplicating, dictionary-compressed HTML snapshot store on local disk"""
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_SNAPSHOT_DIR,
+                 codec: Optional[bytes] = None, level: int = 9,
+                 train_after: Optional[int] = 200, train_samples: int = 500):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.dicts_dir = self.root / "dicts"
+        self.manifest_path = self.root / "manifest.ndjson"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.dicts_dir.mkdir(parents=True, exist_ok=True)
+        self.codec = codec or (ZSTD if HAS_ZSTD else DEFLATE)
+        if self.codec == ZSTD and not HAS_ZSTD:
+            raise RuntimeError("zstandard is not installed")
+        self.level = level
+        self.train_after = train_after
+        self.train_samples = train_samples
+        self._lock = threading.Lock()
+        self._dicts: Dict[Tuple[bytes, bytes], bytes] = {}
+        self._current_dict = self._read_current_dict()
+        self._new_objects = 0
+        self._training = False
+        self.stats = {"stored": 0, "deduplicated": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+    # -- paths and dictionaries -------------------------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _dict_path(self, codec: bytes, dict_id: bytes) -> Path:
+        return self.dicts_dir / f"{dict_id.decode()}.{codec.decode()}"
+
+    def _read_current_dict(self) -> Optional[bytes]:
+        current = self.dicts_dir / "CURRENT"
+        if not current.exists():
+            return None
+        codec, _, dict_id = current.read_text().strip().partition(":")
+        return dict_id.encode() if codec.encode() == self.codec else None
+
+    def _dictionary(self, codec: bytes, dict_id: bytes) -> Optional[bytes]:
+        if dict_id == NO_DICT:
+            return None
+        key = (codec, dict_id)
+        if key not in self._dicts:
+            self._dicts[key] = self._dict_path(codec, dict_id).read_bytes()
+        return self._dicts[key]
+
+    # -- compression --------------------------------------------------------
+
+    def _compress(self, data: bytes) -> bytes:
+        dict_id = self._current_dict or NO_DICT
+        dictionary = self._dictionary(self.codec, dict_id)
+        if self.codec == ZSTD:
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            payload = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data).compress(data)
+        else:
+            compressor = (zlib.compressobj(self.level, zdict=dictionary) if dictionary
+                          else zlib.compressobj(self.level))
+            payload = compressor.compress(data) + compressor.flush()
+        return MAGIC + self.codec + dict_id + payload
+
+    def _decompress(self, blob: bytes) -> bytes:
+        if blob[:4] != MAGIC:
+            raise ValueError("Not a snapshot object")
+        codec, dict_id, payload = blob[4:5], blob[5:21], blob[21:]
+        dictionary = self._dictionary(codec, dict_id)
+        if codec == ZSTD:
+            if not HAS_ZSTD:
+                raise RuntimeError("Snapshot was stored with zstd, which is not installed")
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(payload)
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(payload) + decompressor.flush()
+
+    # -- public API ----------------------------------------------------------
+
+    def put(self, html: Union[str, bytes], url: Optional[str] = None) -> str:
+        """Store a page (once per distinct content) and return its digest"""
+        data = html.encode("utf-8") if isinstance(html, str) else html
+        digest = snapshot_digest(data)
+        path = self._object_path(digest)
+        with self._lock:
+            if path.exists():
+                self.stats["deduplicated"] += 1
+            else:
+                blob = self._compress(data)
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(blob)
+                os.replace(tmp, path)
+                self.stats["stored"] += 1
+                self.stats["raw_bytes"] += len(data)
+                self.stats["stored_bytes"] += len(blob)
+                self._new_objects += 1
+            if url:
+                with open(self.manifest_path, "a", encoding="utf-8") as manifest:
+                    manifest.write(json.dumps({"url": url, "digest": digest, "storedAt": time.time()}) + "\n")
+            # Training reads every sampled page, so it runs outside the lock,
+            # claimed by the one put() that crossed the threshold
+            train = (bool(self.train_after) and self._current_dict is None and not self._training
+                     and self._new_objects >= self.train_after)
+            if train:
+                self._training = True
+        if train:
+            try:
+                self.train_dictionary()
+            finally:
+                with self._lock:
+                    self._training = False
+        return digest
+
+    def get(self, digest: str) -> str:
+        """The page stored under ``digest``; KeyError if there is none"""
+        path = self._object_path(digest)
+        try:
+            blob = path.read_bytes()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+        return self._decompress(blob).decode("utf-8")
+
+    def __contains__(self, digest: str) -> bool:
+        return self._object_path(digest).exists()
+
+    def digests(self) -> Iterator[str]:
+        for path in self.objects_dir.glob("*/*"):
+            if path.suffix != ".tmp":
+                yield path.name
+
+    def train_dictionary(self, size: Optional[int] = None) -> Optional[str]:
+        """
+        Train a dictionary on a sample of stored pages and make it current
+
+        Only pages stored afterwards use it. Returns the dictionary id, or
+        None when there are too few pages to train on.
+        """
+        digests = list(self.digests())
+        if len(digests) < 8:
+            return None
+        sample = random.sample(digests, min(len(digests), self.train_samples))
+        pages = [self.get(digest).encode("utf-8") for digest in sample]
+        if self.codec == ZSTD:
+            trained = zstandard.train_dictionary(size or ZSTD_DICT_SIZE, pages)
+            dictionary = trained.as_bytes()
+        else:
+            dictionary = build_zlib_dictionary(pages, size or ZLIB_DICT_SIZE)
+        if not dictionary:
+            return None
+        dict_id = hashlib.sha256(dictionary).hexdigest()[:16].encode()
+        with self._lock:
+            self._dict_path(self.codec, dict_id).write_bytes(dictionary)
+            (self.dicts_dir / "CURRENT").write_text(f"{self.codec.decode()}:{dict_id.decode()}")
+            self._current_dict = dict_id
+        logger.info(f"Trained {len(dictionary)}-byte snapshot dictionary {dict_id.decode()} "
+                    f"on {len(pages)} pages")
+        return dict_id.decode()
+
+    def iter_manifest(self) -> Iterator[Dict[str, object]]:
+        """Manifest entries in the order pages were stored"""
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, encoding="utf-8") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def latest_by_url(self) -> Dict[str, str]:
+        """Digest of the most recent snapshot of each URL"""
+        return {entry["url"]: entry["digest"] for entry in self.iter_manifest()}
+
+    def report(self) -> str:
+        saved = self.stats["raw_bytes"] - self.stats["stored_bytes"]
+        return (f"Snapshots: {self.stats['stored']} stored, {self.stats['deduplicated']} deduplicated, "
+                f"{saved / 1024:.0f} KiB saved by compression")
+
+
+_shared_store: Optional[SnapshotStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_store() -> SnapshotStore:
+    """Process-wide store for the default snapshot directory"""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = SnapshotStore()
+        return _shared_store
+
+
+def store_debug_snapshot(html: str, url: str, reason: str,
+                         store: Optional[SnapshotStore] = None) -> str:
+    """Keep a page that failed to fetch or parse; returns its digest for the log"""
+    store = store or get_shared_store()
+    digest = store.put(html, url=url)
+    logger.info(f"Saved {reason} snapshot of {url} as {digest[:12]}")
+    return digest
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """``show <digest|url>`` prints a stored page; ``train`` retrains the dictionary"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HTML snapshot store")
+    parser.add_argument("--root", default=str(DEFAULT_SNAPSHOT_DIR))
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show", help="print a snapshot by digest or by URL (latest)")
+    show.add_argument("key")
+    sub.add_parser("train", help="train a new compression dictionary")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.root, train_after=None)
+    if args.command == "train":
+        dict_id = store.train_dictionary()
+        print(dict_id or "Not enough snapshots to train on")
+        return 0 if dict_id else 1
+    digest = store.latest_by_url().get(args.key, args.key)
+    try:
+        print(store.get(digest))
+    except KeyError:
+        print(f"No snapshot for {args.key}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
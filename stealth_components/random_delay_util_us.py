@@ -1,10 +1,12 @@
 import random
 import time
+from typing import Optional
 
 def get_random_delay(
     min_delay_seconds: float,
     max_delay_seconds: float,
-    multiplier: float = 1.0
+    multiplier: float = 1.0,
+    url: Optional[str] = None,
     ) -> None:
     """
     Pauses execution for a random duration within a specified range,
@@ -17,6 +19,9 @@ def get_random_delay(
                     A multiplier of 0 would result in no delay if min_delay is 0,
                     or min_delay if min_delay > 0 after multiplication.
                     It's applied to both min and max before random.uniform.
+        url: When pausing before a request to ``url``, pass it to wait on the
+             host's shared adaptive rate limiter instead; the range then only
+             sets the host's starting rate (if it has none yet).
 
     Raises:
         ValueError: If min_delay_seconds is greater than max_delay_seconds after
@@ -40,6 +45,11 @@ def get_random_delay(
     if actual_max <= 0: # If max delay is zero or negative, no sleep.
         return
 
+    if url is not None:
+        from scraping_components.rate_limiter import delay_options, shared_limiter
+        shared_limiter().wait(url, **delay_options(max(actual_min, 0), actual_max))
+        return
+
     # Ensure actual_min is not negative if actual_max is positive, to avoid issues with random.uniform
     # if actual_max > 0 and actual_min < 0:
     #    actual_min = 0
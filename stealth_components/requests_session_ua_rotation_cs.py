@@ -3,6 +3,11 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    from scraping_components.http_cache import install_http_cache
+except ImportError:  # pragma: no cover - used standalone without the project root on sys.path
+    install_http_cache = None
+
 MODERN_USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
@@ -16,7 +21,7 @@ class RequestsSessionManagerCS:
     """
     Manages a requests.Session with User-Agent rotation capabilities.
     """
-    def __init__(self, user_agents: list[str] | None = None, default_retry_total: int = 3, default_backoff_factor: float = 1.0):
+    def __init__(self, user_agents: list[str] | None = None, default_retry_total: int = 3, default_backoff_factor: float = 1.0, use_http_cache: bool = True):
         self.user_agents = user_agents if user_agents else MODERN_USER_AGENTS
         if not self.user_agents: # Fallback if provided list was also empty
             self.user_agents = ["Mozilla/5.0 (compatible; DefaultScraper/1.0; +http://example.com/bot)"] # Absolute fallback
@@ -24,6 +29,7 @@ class RequestsSessionManagerCS:
         self.current_user_agent: str = random.choice(self.user_agents)
         self.retry_total = default_retry_total
         self.backoff_factor = default_backoff_factor
+        self.use_http_cache = use_http_cache and install_http_cache is not None
         self.session: requests.Session = self._create_session()
 
     def _create_session(self) -> requests.Session:
@@ -58,6 +64,9 @@ class RequestsSessionManagerCS:
             "Sec-Fetch-User": "?1",
             "DNT": "1", # Do Not Track
         })
+
+        if self.use_http_cache:
+            install_http_cache(session) # Revalidate with ETag/Last-Modified instead of refetching
         return session
 
     def rotate_user_agent(self) -> str:
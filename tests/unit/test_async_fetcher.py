@@ -0,0 +1,126 @@
+import pytest
+import asyncio
+import gzip
+import os
+import sys
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from aiohttp import web
+
+from scraping_components.async_fetcher import ACCEPT_ENCODING, AsyncFetcher, BodyTooLarge
+from scraping_components.rate_limiter import RateLimiter
+
+PAGE = "<html><body>" + "Closing party " * 500 + "</body></html>"
+
+
+async def serve(scenario):
+    """Run ``scenario(base_url, seen)`` against a local server recording request headers."""
+    seen = []
+    throttled = {"left": 1}
+
+    async def page(request):
+        seen.append(dict(request.headers))
+        body = gzip.compress(PAGE.encode())
+        return web.Response(body=body, headers={"Content-Encoding": "gzip", "Content-Type": "text/html"})
+
+    async def busy(request):
+        if throttled["left"]:
+            throttled["left"] -= 1
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/page/{n}", page)
+    app.router.add_get("/busy", busy)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await scenario(f"http://127.0.0.1:{port}", seen)
+    finally:
+        await runner.cleanup()
+
+
+def fetcher(**options):
+    limiter = RateLimiter(rate=1000.0, max_rate=1000.0, jitter=0)
+    return AsyncFetcher(backend="aiohttp", rate_limiter=limiter, **options)
+
+
+def test_pages_reuse_pooled_connections_across_ua_rotation():
+    async def scenario(base, seen):
+        async with fetcher(per_host_connections=1, rotate_after=2,
+                           user_agents=["UA-one", "UA-two"]) as client:
+            pages = await client.fetch_many([f"{base}/page/{n}" for n in range(6)])
+            return client, pages
+
+    client, pages = asyncio.run(serve(scenario))
+    assert all(text == PAGE for text in pages.values())
+    assert client.stats.requests == 6
+    assert client.stats.connections_opened == 1
+    assert client.stats.versions == {"HTTP/1.1": 6}
+    assert "6 requests over 1 connections" in client.report()
+
+
+def test_user_agent_rotates_per_request_headers():
+    async def scenario(base, seen):
+        async with fetcher(rotate_after=2, user_agents=["UA-one", "UA-two"],
+                           headers={"Accept-Encoding": "br"}) as client:
+            for n in range(4):
+                await client.fetch_text(f"{base}/page/{n}")
+        return seen
+
+    seen = asyncio.run(serve(scenario))
+    agents = [headers["User-Agent"] for headers in seen]
+    assert agents[0] == agents[1] and agents[2] == agents[3] and agents[1] != agents[2]
+    # Only encodings the client can decode are advertised
+    assert {headers["Accept-Encoding"] for headers in seen} == {ACCEPT_ENCODING}
+
+
+def test_user_agent_rotates_per_host():
+    client = fetcher(rotate_after=2, user_agents=["UA-one", "UA-two"], headers={"User-Agent": "UA-one"})
+    a = [client.request_headers(f"https://a.example/{n}")["User-Agent"] for n in range(3)]
+    b = [client.request_headers("https://b.example/1")["User-Agent"]]
+    a.append(client.request_headers("https://a.example/4")["User-Agent"])
+    assert a == ["UA-one", "UA-one", "UA-two", "UA-two"]
+    # Another host keeps its own count
+    assert b == ["UA-one"]
+
+
+def test_rotation_interval_can_be_a_range():
+    client = fetcher(rotate_after=(3, 5), user_agents=["UA-one", "UA-two"], headers={"User-Agent": "UA-one"})
+    agents = [client.request_headers("https://a.example/")["User-Agent"] for _ in range(6)]
+    first_switch = agents.index("UA-two")
+    assert 3 <= first_switch <= 5
+    assert agents[:first_switch] == ["UA-one"] * first_switch
+
+
+def test_body_limit_aborts_stream():
+    async def scenario(base, seen):
+        async with fetcher(max_bytes=1024) as client:
+            with pytest.raises(BodyTooLarge):
+                await client.request(f"{base}/page/1")
+            assert await client.fetch(f"{base}/page/1") is None
+            return client.stats.failures
+
+    assert asyncio.run(serve(scenario)) == 1
+
+
+def test_throttled_response_is_retried_and_recorded():
+    async def scenario(base, seen):
+        async with fetcher() as client:
+            result = await client.fetch(f"{base}/busy")
+            return result, client.rate_limiter.metrics()
+
+    result, metrics = asyncio.run(serve(scenario))
+    assert result.status == 200 and result.text == "ok"
+    [host_metrics] = metrics.values()
+    assert host_metrics["throttled"] == 1 and host_metrics["requests"] == 2
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        AsyncFetcher(backend="curl")
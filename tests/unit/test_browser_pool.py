@@ -0,0 +1,126 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components import browser_pool
+from scraping_components.browser_pool import (
+    BrowserPool,
+    acquire_shared_pool,
+    release_shared_pool,
+)
+
+
+@pytest.fixture
+def fake_playwright():
+    """Patches sync_playwright with a mock whose browsers hand out fresh contexts."""
+    playwright = MagicMock()
+
+    def launch(**kwargs):
+        browser = MagicMock()
+        browser.is_connected.return_value = True
+        browser.new_context.side_effect = lambda **opts: MagicMock(name="context")
+        return browser
+
+    playwright.chromium.launch.side_effect = launch
+    with patch.object(browser_pool, "sync_playwright") as mock_sync:
+        mock_sync.return_value.start.return_value = playwright
+        yield playwright
+
+
+@pytest.fixture
+def pool(fake_playwright):
+    pool = BrowserPool(max_contexts=2, max_pages_per_context=3, max_memory_mb=None)
+    yield pool
+    pool.close()
+
+
+def test_browser_launched_once_across_pages(pool, fake_playwright):
+    for _ in range(5):
+        with pool.page(user_agent="UA-1") as page:
+            page.goto("https://example.com")
+    assert fake_playwright.chromium.launch.call_count == 1
+    assert pool.stats["pages_served"] == 5
+
+
+def test_context_reused_for_same_user_agent(pool):
+    first = pool.lease(user_agent="UA-1")
+    pool.release(first)
+    second = pool.lease(user_agent="UA-1")
+    assert second is first
+    assert pool.stats["contexts_reused"] == 1
+
+
+def test_context_recycled_after_max_pages(pool):
+    for _ in range(4):
+        with pool.page(user_agent="UA-1"):
+            pass
+    lease = pool.lease(user_agent="UA-1")
+    # Three pages wear out the first context; the fourth page gets a new one
+    assert pool.stats["contexts_created"] == 2
+    assert pool.stats["contexts_recycled"] == 1
+    pool.release(lease)
+
+
+def test_lru_idle_context_evicted_when_full(pool):
+    a = pool.lease(user_agent="UA-A")
+    b = pool.lease(user_agent="UA-B")
+    pool.release(a)
+    pool.release(b)
+    c = pool.lease(user_agent="UA-C")
+    a.context.close.assert_called_once()
+    b.context.close.assert_not_called()
+    pool.release(c)
+
+
+def test_lease_raises_when_exhausted(pool):
+    pool.lease(user_agent="UA-A")
+    pool.lease(user_agent="UA-B")
+    with pytest.raises(RuntimeError, match="exhausted"):
+        pool.lease(user_agent="UA-C")
+
+
+def test_failed_page_discards_context(pool):
+    with pytest.raises(ValueError):
+        with pool.page(user_agent="UA-1"):
+            raise ValueError("navigation failed")
+    lease = pool.lease(user_agent="UA-1")
+    assert pool.stats["contexts_created"] == 2
+    pool.release(lease)
+
+
+def test_disconnected_browser_is_relaunched(pool, fake_playwright):
+    with pool.page():
+        pass
+    pool._browser.is_connected.return_value = False
+    with pool.page():
+        pass
+    assert fake_playwright.chromium.launch.call_count == 2
+
+
+def test_memory_limit_triggers_relaunch(fake_playwright):
+    pool = BrowserPool(max_memory_mb=100)
+    with pool.page():
+        pass
+    with patch.object(BrowserPool, "memory_usage_mb", return_value=250.0):
+        with pool.page():
+            pass
+    assert fake_playwright.chromium.launch.call_count == 2
+    pool.close()
+
+
+def test_shared_pool_is_refcounted(fake_playwright):
+    first = acquire_shared_pool(headless=True)
+    second = acquire_shared_pool(headless=True)
+    assert first is second
+    with first.page():
+        pass
+    release_shared_pool(first)
+    assert not first._closed
+    release_shared_pool(second)
+    assert first._closed
+    assert acquire_shared_pool(headless=True) is not first
+    browser_pool.close_shared_pools()
@@ -0,0 +1,102 @@
+import pytest
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from database.bulk_writer import BulkWriter
+
+
+class FakeCollection:
+    def __init__(self, failures=()):
+        self.calls = []
+        self.failures = list(failures)
+
+    def bulk_write(self, operations, ordered=True):
+        self.calls.append((list(operations), ordered))
+        if self.failures:
+            raise self.failures.pop(0)
+        return MagicMock(bulk_api_result={"nInserted": len(operations)})
+
+
+def test_batches_by_size_and_flushes_remainder_on_close():
+    events = FakeCollection()
+    with BulkWriter({"events": events}, batch_size=3, flush_interval=60) as writer:
+        for i in range(7):
+            writer.add("events", InsertOne({"n": i}))
+    assert [len(ops) for ops, _ in events.calls] == [3, 3, 1]
+    assert all(ordered is False for _, ordered in events.calls)
+    assert writer.stats["events"].inserted == 7
+
+
+def test_partial_batches_are_flushed_after_interval():
+    events = FakeCollection()
+    writer = BulkWriter({"events": events}, batch_size=100, flush_interval=0.05)
+    writer.add("events", InsertOne({"n": 1}))
+    deadline = time.monotonic() + 2
+    while not events.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(events.calls) == 1
+    writer.close()
+
+
+def test_only_retryable_write_errors_are_retried():
+    ops = [UpdateOne({"url": f"u{i}"}, {"$set": {"i": i}}, upsert=True) for i in range(3)]
+    partial = BulkWriteError({
+        "nUpserted": 1,
+        "writeErrors": [
+            {"index": 1, "code": 11000, "errmsg": "E11000 duplicate key"},
+            {"index": 2, "code": 121, "errmsg": "Document failed validation"},
+        ],
+    })
+    events = FakeCollection(failures=[partial])
+    with BulkWriter({"events": events}, retry_backoff=0) as writer:
+        for op in ops:
+            writer.add("events", op)
+    assert events.calls[1][0] == [ops[1]]
+    stats = writer.stats["events"]
+    assert (stats.upserted, stats.inserted, stats.errors, stats.retries) == (1, 1, 1, 1)
+
+
+def test_connection_failures_give_up_after_max_retries():
+    events = FakeCollection(failures=[AutoReconnect("down")] * 3)
+    with BulkWriter({"events": events}, max_retries=2, retry_backoff=0) as writer:
+        writer.add("events", InsertOne({"n": 1}))
+        writer.add("events", InsertOne({"n": 2}))
+    assert len(events.calls) == 3
+    assert writer.stats["events"].errors == 2
+    assert writer.stats["events"].retries == 4
+
+
+def test_add_blocks_when_writer_falls_behind():
+    release = threading.Event()
+
+    class SlowCollection(FakeCollection):
+        def bulk_write(self, operations, ordered=True):
+            release.wait(5)
+            return super().bulk_write(operations, ordered)
+
+    slow = SlowCollection()
+    writer = BulkWriter({"events": slow}, batch_size=1, max_pending_batches=1)
+    producer = threading.Thread(target=lambda: [writer.add("events", InsertOne({"n": i})) for i in range(3)])
+    producer.start()
+    producer.join(0.3)
+    assert producer.is_alive()  # one batch writing, one queued, the third add waits
+    release.set()
+    producer.join(5)
+    writer.close()
+    assert len(slow.calls) == 3
+
+
+def test_closed_writer_rejects_operations():
+    writer = BulkWriter({})
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.add("events", InsertOne({}))
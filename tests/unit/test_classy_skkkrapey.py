@@ -886,3 +886,59 @@ def test_format_event_to_markdown_various_na_cases():
     expected_md = "\n".join(expected_md_lines)
     result_md = format_event_to_markdown(event_data)
     assert result_md == expected_md
+
+
+# --- Tests for IbizaSpotlightScraper.parse_event_html ---
+
+def test_spotlight_parse_maps_spec_fields_into_schema(spotlight_scraper):
+    html = """<html><body><main><article>
+      <h1 class="eventTitle">Circoloco</h1>
+      <a href="/night/club/dc10">DC10</a>
+      <div class="event-info"><time datetime="2025-07-07">Mon 7 Jul</time><span class="time">23:00 - 06:00</span></div>
+      <div class="buy-tickets"><span class="price">€45,00</span></div>
+      <ul id="lineup"><li>Seth Troxler</li><li>Jamie Jones</li></ul>
+      <div class="event-description-text">Monday institution.</div>
+    </article></main></body></html>"""
+    event = spotlight_scraper.parse_event_html("https://www.ibiza-spotlight.com/night/events/circoloco", html)
+    assert event["title"] == "Circoloco"
+    assert event["location"] == {"venue": "DC10"}
+    assert event["dateTime"]["startDate"] == "2025-07-07"
+    assert event["dateTime"]["doorTime"] == "23:00"
+    assert event["lineUp"] == [{"name": "Seth Troxler", "headliner": True}, {"name": "Jamie Jones"}]
+    assert event["ticketInfo"] == {"startingPrice": 45.0, "currency": "EUR"}
+    assert event["description"] == "Monday institution."
+
+
+def test_spotlight_parse_omits_fields_the_page_lacks(spotlight_scraper):
+    event = spotlight_scraper.parse_event_html("https://www.ibiza-spotlight.com/night/events/x", "<h1>Only a title</h1>")
+    assert event["title"] == "Only a title"
+    assert not {"location", "dateTime", "lineUp", "ticketInfo"} & set(event)
+
+
+# --- Tests for BaseEventScraper.fetch_page ---
+
+def test_fetch_page_spaces_requests_by_the_configured_delay_range():
+    from my_scrapers import classy_skkkrapey
+    from scraping_components.rate_limiter import delay_options
+
+    scraper = TicketsIbizaScraper(min_delay=2.0, max_delay=4.0)
+    url = "https://www.ticketsibiza.com/event/x/"
+    with patch.object(classy_skkkrapey, "shared_limiter") as mock_limiter, \
+         patch.object(scraper.session, "get") as mock_get:
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.text = "<html></html>"
+        assert scraper.fetch_page(url) == "<html></html>"
+    mock_limiter.return_value.wait.assert_called_once_with(url, **delay_options(2.0, 4.0))
+
+
+# --- Tests for _stream_results ---
+
+def test_stream_results_raises_when_an_event_cannot_be_written(tmp_path):
+    # The crawl frontier must not checkpoint a URL whose event was never written
+    from my_scrapers.classy_skkkrapey import ScraperConfig, _stream_results
+
+    config = ScraperConfig(url="https://www.ticketsibiza.com/events/", action="crawl", headless=True,
+                           output_dir=tmp_path, min_delay=0, max_delay=0, verbose=False)
+    with _stream_results(config) as write_event:
+        with pytest.raises(TypeError):
+            write_event({"url": "https://www.ticketsibiza.com/event/x/", "title": object()})
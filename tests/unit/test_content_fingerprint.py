@@ -0,0 +1,159 @@
+import pytest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../my_scrapers")))
+
+from parse_components.content_fingerprint import content_fingerprint, normalize_html_for_fingerprint
+
+PAGE_TEMPLATE = """<html><head>
+<meta name="generator" content="WordPress 6.{minor}">
+<meta property="article:modified_time" content="2025-06-{day}T10:00:00+00:00">
+<link rel="stylesheet" href="/wp-content/style.css?ver={ver}">
+<script type="application/ld+json">{{"@type": "MusicEvent", "name": "Glitterbox", "startDate": "2025-07-01T23:00:00", "dateModified": "2025-06-{day}"}}</script>
+<script nonce="{nonce}">var wpNonce = "{nonce}"; var ts = {ts};</script>
+</head><body>
+<form><input type="hidden" name="_wpnonce" value="{nonce}"><input type="hidden" name="event_id" value="42"></form>
+<h1 class="entry-title">Glitterbox</h1>
+<p>Doors 23:00</p>
+<!-- Page generated by cache plugin at {ts} -->
+</body></html>"""
+
+
+def render(**overrides):
+    values = {"minor": 5, "day": 10, "ver": "1.0", "nonce": "abc123", "ts": 1719830000}
+    values.update(overrides)
+    return PAGE_TEMPLATE.format(**values)
+
+
+def test_volatile_markup_does_not_change_fingerprint():
+    first = render()
+    second = render(minor=6, day=11, ver="1.1", nonce="zzz999", ts=1719839999)
+    assert first != second
+    assert content_fingerprint(first) == content_fingerprint(second)
+
+
+def test_content_change_changes_fingerprint():
+    changed = render().replace("Doors 23:00", "Doors 22:00")
+    assert content_fingerprint(render()) != content_fingerprint(changed)
+
+
+def test_jsonld_event_data_is_kept():
+    changed = render().replace("2025-07-01T23:00:00", "2025-07-02T23:00:00")
+    assert content_fingerprint(render()) != content_fingerprint(changed)
+
+
+def test_non_token_hidden_inputs_are_kept():
+    normalized = normalize_html_for_fingerprint(render())
+    assert 'name="event_id"' in normalized
+    assert "_wpnonce" not in normalized
+
+
+def test_fingerprint_is_versioned():
+    assert content_fingerprint("<p>x</p>").startswith("v1:")
+
+
+@pytest.fixture
+def db_scraper(tmp_path):
+    with patch("mono_ticketmaster_with_db.MongoClient"):
+        from mono_ticketmaster_with_db import MongoIntegratedEventScraper
+        scraper = MongoIntegratedEventScraper(use_browser=False, snapshot_dir=tmp_path)
+    scraper.writer.close()
+    scraper.db = MagicMock()
+    scraper.writer = MagicMock()
+    return scraper
+
+
+def queued(scraper, collection):
+    return [op for name, op in (c[0] for c in scraper.writer.add.call_args_list) if name == collection]
+
+
+def test_unchanged_page_only_touches_last_checked(db_scraper):
+    html = render()
+    stored = {"_id": "abc", "url": "https://x/e", "title": "Glitterbox", "_quality": {"overall": 0.9},
+              "contentFingerprint": content_fingerprint(html)}
+    db_scraper.db.events.find_one.return_value = stored
+
+    with patch.object(db_scraper, "fetch_page", return_value=html), \
+         patch.object(db_scraper, "parse_event_html") as mock_parse:
+        result = db_scraper.scrape_and_save_event("https://x/e")
+
+    assert result is stored
+    mock_parse.assert_not_called()
+    db_scraper.db.events.find_one.assert_called_once_with({"url": "https://x/e"}, {"html": 0})
+    [update] = queued(db_scraper, "events")
+    assert list(update._doc["$set"]) == ["lastCheckedAt"]
+    assert queued(db_scraper, "quality_scores") == []
+    assert db_scraper.unchanged_count == 1
+
+
+def test_changed_page_is_parsed_and_fingerprint_stored(db_scraper):
+    db_scraper.db.events.find_one.return_value = None
+    with patch.object(db_scraper, "fetch_page", return_value=render()):
+        result = db_scraper.scrape_and_save_event("https://x/e")
+
+    assert result["contentFingerprint"] == content_fingerprint(render())
+    update = queued(db_scraper, "events")[0]._doc
+    saved = update["$set"]
+    assert saved["contentFingerprint"] == result["contentFingerprint"]
+    assert "lastCheckedAt" in saved
+    # The page goes to the snapshot store; the event only keeps its digest
+    assert "html" not in saved and update["$unset"] == {"html": ""}
+    assert db_scraper.snapshots.get(saved["htmlSnapshot"]) == render()
+
+
+def test_changed_page_sets_only_changed_quality_paths(db_scraper):
+    from database.quality_scorer import QualityScorer
+    event = db_scraper.parse_event_html("https://x/e", render())
+    previous, _ = QualityScorer().rescore_event(event)
+    previous.update(_id="abc", url="https://x/e", contentFingerprint="v1:older-page")
+    db_scraper.db.events.find_one.return_value = previous
+    with patch.object(db_scraper, "fetch_page", return_value=render(nonce="changed")):
+        result = db_scraper.scrape_and_save_event("https://x/e")
+
+    # The fingerprint check and the rescoring share one lookup
+    db_scraper.db.events.find_one.assert_called_once()
+
+    saved = queued(db_scraper, "events")[0]._doc["$set"]
+    assert "_quality" not in saved and "_validation" not in saved
+    assert not any(path.startswith(("_quality.", "_validation.")) for path in saved)
+    assert result["_quality"]["overall"] == previous["_quality"]["overall"]
+
+
+def test_only_rewritten_events_get_summaries_synced(db_scraper):
+    db_scraper.db.events.find_one.return_value = {"_id": "abc", "_quality": {"overall": 0.9},
+                                                  "contentFingerprint": content_fingerprint(render())}
+    with patch.object(db_scraper, "fetch_page", return_value=render()):
+        db_scraper.scrape_and_save_event("https://x/unchanged")
+    db_scraper.db.events.find_one.return_value = None
+    with patch.object(db_scraper, "fetch_page", return_value=render()):
+        db_scraper.scrape_and_save_event("https://x/changed")
+
+    with patch("mono_ticketmaster_with_db.sync_event_summaries") as sync:
+        db_scraper._sync_summaries()
+    sync.assert_called_once_with(db_scraper.db, {"https://x/changed"})
+    assert db_scraper.unsynced_urls == set()
+
+
+def test_real_pymongo_database_is_not_truth_tested(db_scraper):
+    # pymongo's Database raises NotImplementedError on bool(); MagicMock hides that
+    from pymongo import MongoClient
+    from pymongo.collection import Collection
+    client = MongoClient("mongodb://localhost:27017/", connect=False, serverSelectionTimeoutMS=1)
+    db_scraper.db = client["test_events"]
+    stored = {"_id": "abc", "url": "https://x/e", "title": "Glitterbox", "_quality": {"overall": 0.9},
+              "contentFingerprint": content_fingerprint(render())}
+    try:
+        with patch.object(Collection, "find_one", return_value=stored), \
+             patch.object(db_scraper, "fetch_page", return_value=render()):
+            assert db_scraper.scrape_and_save_event("https://x/e") is stored
+            assert db_scraper._get_stored_event("https://x/e") is stored
+        with patch.object(Collection, "find_one", return_value=None), \
+             patch.object(db_scraper, "fetch_page", return_value=render()):
+            assert db_scraper.scrape_and_save_event("https://x/new")["contentFingerprint"]
+        assert queued(db_scraper, "events")
+    finally:
+        client.close()
@@ -0,0 +1,136 @@
+import pytest
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components.crawl_engine import AsyncCrawlEngine, HostBudget, run_scrape
+
+
+def parse_title(url, html):
+    return {"url": url, "title": html} if html else None
+
+
+def test_host_budget_spaces_request_starts():
+    async def scenario():
+        budget = HostBudget(concurrency=4, min_delay=0.05, max_delay=0.05)
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def request():
+            async with budget:
+                starts.append(loop.time())
+
+        await asyncio.gather(*(request() for _ in range(3)))
+        return starts
+
+    starts = asyncio.run(scenario())
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
+
+def test_host_budget_caps_concurrency():
+    async def scenario():
+        budget = HostBudget(concurrency=2, min_delay=0, max_delay=0)
+        in_flight = 0
+        peak = 0
+
+        async def request():
+            nonlocal in_flight, peak
+            async with budget:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        return peak
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_hosts_get_one_request_in_flight_by_default():
+    engine = AsyncCrawlEngine(parse_title)
+    assert engine.per_host_concurrency == 1
+    assert engine.budget_for("https://example.com/e/1")._semaphore._value == 1
+
+
+def test_engine_fetcher_keeps_user_agent_rotation():
+    async def scenario():
+        engine = AsyncCrawlEngine(parse_title, headers={"User-Agent": "UA-one"},
+                                  user_agents=["UA-one", "UA-two"], rotate_after=2)
+        http = await engine._get_http()
+        agents = [http.request_headers("https://example.com/e/1")["User-Agent"] for _ in range(3)]
+        await engine.close()
+        return agents
+
+    assert asyncio.run(scenario()) == ["UA-one", "UA-one", "UA-two"]
+
+
+def test_invalid_fetch_mode_rejected():
+    with pytest.raises(ValueError):
+        AsyncCrawlEngine(parse_title, fetch_mode="carrier-pigeon")
+
+
+def test_http_first_falls_back_to_browser_when_insufficient():
+    async def fake_http(self, url):
+        return ""
+
+    async def fake_browser(self, url):
+        return "Rendered"
+
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http), \
+         patch.object(AsyncCrawlEngine, "fetch_browser", fake_browser):
+        engine = AsyncCrawlEngine(parse_title, fetch_mode="http_first")
+        result = asyncio.run(engine.scrape("https://example.com/e/1"))
+    assert result == {"url": "https://example.com/e/1", "title": "Rendered"}
+
+
+def test_parser_errors_are_counted_not_raised():
+    def broken_parser(url, html):
+        raise RuntimeError("bad markup")
+
+    async def fake_http(self, url):
+        return "<html></html>"
+
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http):
+        engine = AsyncCrawlEngine(broken_parser)
+        assert asyncio.run(engine.scrape("https://example.com/e/1")) is None
+    assert engine.stats.parse_failures == 1
+
+
+def test_run_scrape_keeps_input_order_and_drops_empty_results():
+    pages = {"https://a.com/1": "one", "https://b.com/2": "", "https://a.com/3": "three"}
+
+    async def fake_http(self, url):
+        await asyncio.sleep(0.02 if url.endswith("1") else 0)
+        return pages[url]
+
+    seen = []
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http):
+        results = run_scrape(
+            list(pages), parse_title, on_result=lambda url, data: seen.append(url)
+        )
+    assert [r["title"] for r in results] == ["one", "three"]
+    assert sorted(seen) == sorted(pages)
+
+
+def test_crawl_discovers_and_dedupes_links():
+    async def fake_http(self, url):
+        if url == "https://a.com/listing":
+            return "listing"
+        return url.rsplit("/", 1)[-1]
+
+    def extract_links(html, url):
+        return ["https://a.com/x", "https://a.com/y", "https://a.com/x"]
+
+    async def scenario():
+        async with AsyncCrawlEngine(parse_title, extract_links=extract_links, min_delay=0, max_delay=0) as engine:
+            return await engine.crawl("https://a.com/listing", max_events=5)
+
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http):
+        results = asyncio.run(scenario())
+    assert [r["title"] for r in results] == ["x", "y"]
@@ -0,0 +1,181 @@
+import pytest
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components.crawl_engine import AsyncCrawlEngine, run_scrape
+from scraping_components.crawl_frontier import CrawlFrontier, frontier_path, open_frontier
+from scraping_components.ndjson_sink import NDJSONSink, iter_ndjson
+
+URLS = [f"https://ticketsibiza.com/event/{i}/" for i in range(5)]
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    with CrawlFrontier(tmp_path / "frontier.sqlite3", max_attempts=2, retry_backoff=60) as f:
+        yield f
+
+
+def test_add_is_idempotent_and_keeps_order(frontier):
+    assert frontier.add(URLS + URLS[:2]) == 5
+    assert frontier.add(URLS) == 0
+    assert frontier.urls() == URLS
+    assert frontier.counts()["queued"] == 5
+
+
+def test_claim_moves_urls_in_flight_once(frontier):
+    frontier.add(URLS)
+    assert frontier.claim(2) == URLS[:2]
+    assert frontier.claim(10) == URLS[2:]
+    assert frontier.claim(10) == []
+    assert frontier.counts()["in_flight"] == 5
+
+
+def test_failures_back_off_then_give_up(frontier):
+    frontier.add(URLS[:1])
+    url = frontier.claim()[0]
+    assert frontier.mark_failed(url, "timeout") == "queued"
+    assert frontier.claim() == []  # not eligible until the backoff passes
+    assert 0 < frontier.seconds_until_next_eligible() <= 60
+    assert frontier.claim(now=time.time() + 61) == [url]
+    assert frontier.mark_failed(url, "timeout") == "failed"
+    assert frontier.seconds_until_next_eligible() is None
+    assert not frontier.begin(url)
+
+
+def test_state_survives_reopen_and_in_flight_is_recovered(tmp_path):
+    key = "crawl:https://ticketsibiza.com/events/"
+    first = open_frontier(key, frontier_dir=tmp_path)
+    first.add(URLS)
+    first.set_meta("listing_complete", True)
+    for url in first.claim(3)[:2]:
+        first.mark_done(url, {"url": url})
+    first.close()  # "crash" with URLS[2] still in flight
+
+    with open_frontier(key, resume=True, frontier_dir=tmp_path) as resumed:
+        assert resumed.get_meta("listing_complete") is True
+        assert resumed.urls("done") == URLS[:2]
+        assert resumed.claim(10) == URLS[2:]
+        assert dict(resumed.results()) == {url: {"url": url} for url in URLS[:2]}
+
+    with open_frontier(key, resume=False, frontier_dir=tmp_path) as fresh:
+        assert fresh.urls() == [] and fresh.get_meta("listing_complete") is None
+
+
+def test_frontier_path_is_stable_and_safe(tmp_path):
+    path = frontier_path("crawl:https://example.com/a?b=1", tmp_path)
+    assert path == frontier_path("crawl:https://example.com/a?b=1", tmp_path)
+    assert path != frontier_path("crawl:https://example.com/a?b=2", tmp_path)
+    assert "/" not in path.name and "?" not in path.name
+
+
+def test_run_scrape_with_frontier_skips_finished_urls(frontier):
+    fetched = []
+
+    async def fake_http(self, url):
+        fetched.append(url)
+        return "" if url == URLS[4] else url.rsplit("/", 2)[-2]
+
+    frontier.max_attempts = 1
+    frontier.add(URLS)
+    frontier.mark_done(URLS[0])
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http):
+        results = run_scrape(
+            URLS,
+            lambda url, html: {"url": url, "title": html} if html else None,
+            frontier=frontier,
+            min_delay=0,
+            max_delay=0,
+        )
+    assert sorted(fetched) == sorted(URLS[1:])
+    assert [r["title"] for r in results] == ["1", "2", "3"]
+    assert frontier.state(URLS[4]) == "failed"
+    assert frontier.counts()["done"] == 4
+
+
+def test_scrape_frontier_waits_for_retry(frontier):
+    frontier.retry_backoff = 0.05
+    attempts = []
+
+    async def fake_http(self, url):
+        attempts.append(url)
+        return "ok" if len(attempts) > 1 else ""
+
+    frontier.add(URLS[:1])
+
+    async def scenario():
+        async with AsyncCrawlEngine(lambda url, html: {"title": html} if html else None,
+                                    min_delay=0, max_delay=0) as engine:
+            return await engine.scrape_frontier(frontier)
+
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http):
+        assert asyncio.run(scenario()) == [{"title": "ok"}]
+    assert attempts == URLS[:1] * 2
+    assert frontier.state(URLS[0]) == "done"
+
+
+def test_ndjson_sink_append_continues_output(tmp_path):
+    path = tmp_path / "events.ndjson"
+    with NDJSONSink(path) as sink:
+        sink.write({"n": 1})
+    with NDJSONSink(path, append=True) as sink:
+        sink.write({"n": 2})
+    assert list(iter_ndjson(path)) == [{"n": 1}, {"n": 2}]
+
+
+def test_result_is_written_before_url_is_checkpointed(frontier, tmp_path):
+    order = []
+    sink = NDJSONSink(tmp_path / "events.ndjson", fsync_every=1000, fsync_interval=3600)
+
+    def on_result(url, data):
+        assert frontier.state(url) != "done"
+        sink.write(data)
+        sink.flush()
+        order.append(("written", url))
+
+    real_mark_done = frontier.mark_done
+
+    def mark_done(url, result=None):
+        order.append(("done", url))
+        real_mark_done(url, result)
+
+    async def fake_http(self, url):
+        return "ok"
+
+    frontier.add(URLS[:2])
+
+    async def scenario():
+        async with AsyncCrawlEngine(lambda url, html: {"url": url}, min_delay=0, max_delay=0) as engine:
+            await engine.scrape_frontier(frontier, on_result=on_result)
+
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http), \
+         patch.object(frontier, "mark_done", mark_done):
+        asyncio.run(scenario())
+    sink.close()
+    for url in URLS[:2]:
+        assert order.index(("written", url)) < order.index(("done", url))
+    assert sorted(r["url"] for r in iter_ndjson(tmp_path / "events.ndjson")) == URLS[:2]
+
+
+def test_failed_output_leaves_url_in_flight(frontier):
+    async def fake_http(self, url):
+        return "ok"
+
+    def on_result(url, data):
+        raise OSError("disk full")
+
+    frontier.add(URLS[:1])
+
+    async def scenario():
+        async with AsyncCrawlEngine(lambda url, html: {"url": url}, min_delay=0, max_delay=0) as engine:
+            await engine.scrape_frontier(frontier, on_result=on_result)
+
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http):
+        with pytest.raises(OSError):
+            asyncio.run(scenario())
+    assert frontier.state(URLS[0]) != "done"
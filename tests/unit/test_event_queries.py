@@ -0,0 +1,126 @@
+import pytest
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from database.event_queries import (
+    EVENT_INDEXES,
+    SUMMARY_INDEXES,
+    SUPERSEDED_INDEXES,
+    check_query_plans,
+    create_event_indexes,
+    listing_filter,
+    plan_problems,
+    plan_stages,
+    query_shapes,
+    upcoming_filter,
+    venue_events_filter,
+)
+from database.event_summaries import SUMMARIES_COLLECTION, sync_event_summaries
+
+NOW = datetime(2025, 7, 1, 12, 0)
+# CI sets MONGODB_TEST_URI to its mongod service; only without it may the plan test skip
+REQUIRE_MONGOD = bool(os.environ.get("MONGODB_TEST_URI"))
+MONGODB_TEST_URI = os.environ.get("MONGODB_TEST_URI", "mongodb://localhost:27017/")
+
+
+def _mongod_available() -> bool:
+    try:
+        client = MongoClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=300)
+        client.admin.command("ping")
+        client.close()
+        return True
+    except PyMongoError:
+        return False
+
+
+HAS_MONGOD = _mongod_available()
+
+
+def explain_of(plan):
+    return {"queryPlanner": {"winningPlan": plan}}
+
+
+IXSCAN_PLAN = {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {
+    "stage": "IXSCAN", "indexName": "listing_start_id_quality"}}}
+SORTED_COLLSCAN = {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}
+SORT_MERGE_PLAN = {"stage": "FETCH", "inputStage": {"stage": "SORT_MERGE", "inputStages": [
+    {"stage": "IXSCAN"}, {"stage": "IXSCAN"}]}}
+
+
+def test_plan_problems():
+    assert plan_problems(explain_of(IXSCAN_PLAN)) == []
+    assert plan_problems(explain_of(SORT_MERGE_PLAN)) == []
+    assert plan_problems(explain_of(SORTED_COLLSCAN)) == ["in-memory SORT", "COLLSCAN"]
+    assert plan_problems(explain_of(SORTED_COLLSCAN), allow_sort=True) == ["COLLSCAN"]
+    # Slot-based engine wraps the classic tree in queryPlan
+    assert plan_stages(explain_of({"queryPlan": IXSCAN_PLAN, "slotBasedPlan": {}})) == ["LIMIT", "FETCH", "IXSCAN"]
+
+
+def test_filters_match_api_shapes():
+    assert listing_filter(0.7, now=NOW) == {"_quality.overall": {"$gte": 0.7}, "dateTime.start": {"$gte": NOW}}
+    assert listing_filter(0.7, future_only=False, venue_keys=["a", "b"])["location.venueKey"] == {"$in": ["a", "b"]}
+    assert venue_events_filter(["pacha"], future_only=False) == {"location.venueKey": "pacha"}
+    assert upcoming_filter(7, 0.75, now=NOW)["dateTime.start"] == {"$gte": NOW, "$lte": NOW + timedelta(days=7)}
+
+
+def test_create_event_indexes_drops_superseded():
+    collection = MagicMock()
+    collection.index_information.return_value = {"_id_": {}, "dateTime.start_1__id_1": {}, "location.venue_1": {}}
+    create_event_indexes(collection)
+    dropped = [call[0][0] for call in collection.drop_index.call_args_list]
+    assert dropped == ["dateTime.start_1__id_1", "location.venue_1"]
+    collection.create_indexes.assert_called_once_with(EVENT_INDEXES)
+    assert all(name not in {i.document["name"] for i in EVENT_INDEXES} for name in SUPERSEDED_INDEXES)
+
+
+@pytest.fixture
+def seeded_db():
+    client = MongoClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=2000)
+    db = client["tickets_ibiza_events_plan_test"]
+    db.events.drop()
+    db[SUMMARIES_COLLECTION].drop()
+    rng = random.Random(7)
+    venues = [("Pacha", "pacha"), ("Amnesia", "amnesia"), ("Hï Ibiza", "hi-ibiza"), ("Hive", "hive")]
+    docs = []
+    for i in range(400):
+        venue, key = venues[i % len(venues)]
+        docs.append({
+            "url": f"https://example.com/event/{i}",
+            "title": f"{'Techno' if i % 3 else 'House'} night {i}",
+            "fullDescription": "Closing party",
+            "location": {"venue": venue, "venueKey": key},
+            "dateTime": {"start": NOW + timedelta(hours=rng.randint(-24 * 60, 24 * 60))},
+            "_quality": {"overall": round(rng.random(), 3)},
+            "scrapedAt": NOW,
+        })
+    db.events.insert_many(docs)
+    yield db
+    client.drop_database(db.name)
+    client.close()
+
+
+def test_mongod_reachable_when_configured():
+    if REQUIRE_MONGOD:
+        assert HAS_MONGOD, f"MONGODB_TEST_URI is set but no mongod answers at {MONGODB_TEST_URI}"
+
+
+@pytest.mark.skipif(not HAS_MONGOD, reason="no mongod reachable at MONGODB_TEST_URI")
+def test_endpoint_queries_use_indexes(seeded_db):
+    # Without the designed indexes the harness must notice
+    seeded_db.events.create_index([("title", "text"), ("fullDescription", "text")])
+    sync_event_summaries(seeded_db, now=NOW)
+    assert check_query_plans(seeded_db, query_shapes(NOW))
+
+    create_event_indexes(seeded_db.events)
+    create_event_indexes(seeded_db[SUMMARIES_COLLECTION], SUMMARY_INDEXES)
+    assert seeded_db[SUMMARIES_COLLECTION].count_documents({}) == 400
+    assert check_query_plans(seeded_db, query_shapes(NOW)) == {}
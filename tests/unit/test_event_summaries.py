@@ -0,0 +1,43 @@
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from database import event_summaries
+from database.event_summaries import (
+    SUMMARIES_COLLECTION,
+    SUMMARY_FIELDS,
+    summary_pipeline,
+    sync_event_summaries,
+)
+
+NOW = datetime(2025, 7, 1, 12, 0)
+
+
+def test_summary_pipeline_projects_only_listing_fields():
+    match, project, merge = summary_pipeline({"url": {"$in": ["u"]}}, NOW)
+    assert match == {"$match": {"url": {"$in": ["u"]}}}
+    assert set(project["$project"]) == set(SUMMARY_FIELDS) | {"syncedAt"}
+    assert not {"html", "fullDescription", "_validation", "lineUp"} & set(project["$project"])
+    assert merge["$merge"]["into"] == SUMMARIES_COLLECTION and merge["$merge"]["on"] == "_id"
+
+
+def test_sync_urls_in_batches(monkeypatch):
+    monkeypatch.setattr(event_summaries, "URL_BATCH_SIZE", 2)
+    db = MagicMock()
+    result = sync_event_summaries(db, ["c", "a", "b", "a"], now=NOW)
+    matches = [call[0][0][0]["$match"] for call in db.events.aggregate.call_args_list]
+    assert matches == [{"url": {"$in": ["a", "b"]}}, {"url": {"$in": ["c"]}}]
+    assert result == {"synced": 3, "removed": 0}
+    db.__getitem__.return_value.delete_many.assert_not_called()
+
+
+def test_full_sync_removes_orphans():
+    db = MagicMock()
+    db.__getitem__.return_value.delete_many.return_value.deleted_count = 4
+    assert sync_event_summaries(db, now=NOW) == {"synced": "all", "removed": 4}
+    assert db.events.aggregate.call_args[0][0][0] == {"$match": {}}
+    db.__getitem__.return_value.delete_many.assert_called_once_with({"syncedAt": {"$lt": NOW}})
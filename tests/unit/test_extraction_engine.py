@@ -0,0 +1,124 @@
+import pytest
+import os
+import sys
+
+from bs4 import BeautifulSoup
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from parse_components.extraction_engine import (
+    ExtractionEngine,
+    compile_selector,
+    element_string,
+    get_text,
+)
+from my_scrapers.mono_ticketmaster import MultiLayerEventScraper, WORDPRESS_EXTRACTOR
+
+import lxml.html
+
+EVENT_PAGE = """<html><head>
+<meta property="og:title" content="OG Title">
+<meta property="og:image" content="">
+<meta name="keywords" content="house, techno">
+<script>var nonce = "abc";</script>
+</head><body>
+<div class="header-date-widget">Today</div>
+<h1 class="entry-title">Glitterbox <!-- promo --> Closing</h1>
+<div class="wcs-event-date">Sat 5 Oct 2025</div>
+<div class="event-venue"><strong>Hï Ibiza</strong></div>
+<span class="woocommerce-price-amount">€45.00</span>
+<div class="entry-content">
+  <h3>Line <b>Up</b></h3>
+  <h4><strong>Line Up</strong></h4>
+  <!-- artists -->
+  <p>Purple Disco Machine<br>Melvo Baptiste<br> </p>
+  <h5>Line up</h5>
+  <ul><li>Purple Disco Machine</li><li>Honey Dijon</li></ul>
+  <a href="/tickets/help">Buy Tickets</a>
+  <a class="wcs-btn--action" href="/product/glitterbox">More</a>
+  <a href="https://fourvenues.com/glitterbox">Buy   tickets</a>
+  <style>.x{}</style>
+</div>
+</body></html>"""
+
+
+@pytest.fixture
+def scraper():
+    return MultiLayerEventScraper(use_browser=False)
+
+
+def legacy_extract(scraper, html):
+    soup = BeautifulSoup(html, "html.parser")
+    return (
+        scraper.extract_wordpress_data(soup),
+        scraper.extract_meta_data(soup),
+        scraper.extract_jsonld_data(soup),
+        scraper.extract_lineup_from_html(soup),
+        scraper.extract_ticket_url_from_html(soup),
+    )
+
+
+def engine_extract(html):
+    result = WORDPRESS_EXTRACTOR.extract(html)
+    return (result.fields, result.meta, result.jsonld, result.lineup, result.ticket_url)
+
+
+@pytest.mark.parametrize("html", [
+    EVENT_PAGE,
+    "<html><body><p>Nothing here</p></body></html>",
+    '<script type="application/ld+json">{"@graph": [{"@type": "WebPage"}, {"@type": "MusicEvent", "name": "LD"}]}</script>',
+    '<script type="application/ld+json">{bad json</script><script type="application/ld+json">{"@type": "MusicEvent", "name": "Second"}</script>',
+    '<div class="description">' + "x" * 800 + "</div>",
+])
+def test_engine_matches_beautifulsoup_extractors(scraper, html):
+    assert engine_extract(html) == legacy_extract(scraper, html)
+
+
+def test_first_matching_selector_wins_not_first_element(scraper):
+    # '[class*="date"]' matches earlier in the document, but '.wcs-event-date' has priority
+    result = WORDPRESS_EXTRACTOR.extract(EVENT_PAGE)
+    assert result.fields["date_text"] == "Sat 5 Oct 2025"
+    assert result.fields["venue"] == "Hï Ibiza"
+
+
+def test_parse_event_html_matches_soup_path(scraper):
+    fast = scraper.parse_event_html("https://ticketsibiza.com/e/1", EVENT_PAGE)
+    slow = scraper._parse_event_html_soup("https://ticketsibiza.com/e/1", EVENT_PAGE)
+    for volatile in ("scrapedAt", "updatedAt", "lastCheckedAt"):
+        fast.pop(volatile, None)
+        slow.pop(volatile, None)
+    assert fast == slow
+
+
+def test_empty_html_returns_empty_extraction():
+    result = WORDPRESS_EXTRACTOR.extract("   ")
+    assert result.fields == {} and result.jsonld is None and result.lineup == []
+
+
+@pytest.mark.parametrize("selector", ["div > p", "ul li", "a:hover", "h1, h2"])
+def test_unsupported_selectors_rejected(selector):
+    with pytest.raises(ValueError):
+        compile_selector(selector)
+
+
+def test_compound_selector_compilation():
+    compiled = compile_selector('a.btn.primary[href*="ticket"]#buy')
+    assert compiled.tag == "a"
+    assert compiled.classes == frozenset({"btn", "primary"})
+    assert compiled.element_id == "buy"
+    assert compiled.attributes == (("href", "*=", "ticket"),)
+
+
+def test_text_helpers_follow_beautifulsoup_semantics():
+    el = lxml.html.fragment_fromstring("<div> a <!-- c --><script>s</script><b> b </b>c</div>")
+    assert get_text(el) == "abc"
+    assert get_text(el, separator="|") == "a|b|c"
+    assert element_string(lxml.html.fragment_fromstring("<h3><b>Line Up</b></h3>")) == "Line Up"
+    assert element_string(lxml.html.fragment_fromstring("<h3>Line <b>Up</b></h3>")) is None
+
+
+def test_custom_site_fields():
+    engine = ExtractionEngine({"headline": ["h2.title", "h2"], "promoter": ['[data-role="promoter"]']})
+    result = engine.extract('<h2>Fallback</h2><h2 class="title">Main</h2><span data-role="promoter">Defected</span>')
+    assert result.fields == {"headline": "Main", "promoter": "Defected"}
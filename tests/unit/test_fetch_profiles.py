@@ -0,0 +1,139 @@
+import pytest
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components import browser_pool
+from scraping_components.browser_pool import BrowserPool
+from scraping_components.fetch_profiles import (
+    DEFAULT_PROFILE,
+    FetchProfile,
+    apply_profile,
+    apply_profile_async,
+    navigate,
+    profile_for,
+    wait_until_ready,
+)
+from scraping_components.readiness import READY_SCRIPT
+
+
+def fake_route(resource_type, url):
+    route = MagicMock()
+    route.request = SimpleNamespace(resource_type=resource_type, url=url)
+    return route
+
+
+def installed_handler(context):
+    (pattern, handler), _ = context.route.call_args
+    assert pattern == "**/*"
+    return handler
+
+
+@pytest.mark.parametrize("url, name", [
+    ("https://www.ticketsibiza.com/event/closing-party/", "ticketsibiza"),
+    ("https://ibiza-spotlight.com/night/events/2025/07", "ibiza-spotlight"),
+    ("https://m.ibiza-spotlight.com/night/events/2025/07", "ibiza-spotlight"),
+    ("https://notibiza-spotlight.com/", "default"),
+    ("https://example.com/", "default"),
+])
+def test_profile_for_matches_host_and_parent_domains(url, name):
+    assert profile_for(url).name == name
+
+
+def test_blocks_types_and_trackers_but_never_the_document():
+    profile = FetchProfile("test", blocked_resource_types={"image"}, blocked_urls=(r"tracker\.example",))
+    assert profile.blocks("image", "https://cdn.example.com/a.png")
+    assert profile.blocks("script", "https://tracker.example/t.js")
+    assert not profile.blocks("script", "https://example.com/app.js")
+    assert not profile.blocks("document", "https://tracker.example/")
+    assert DEFAULT_PROFILE.blocks("script", "https://www.googletagmanager.com/gtm.js")
+
+
+def test_invalid_profiles_rejected():
+    with pytest.raises(ValueError):
+        FetchProfile("bad", wait_until="idle")
+    with pytest.raises(ValueError):
+        FetchProfile("bad", blocked_resource_types={"document"})
+
+
+def test_apply_profile_installs_counting_route_on_context():
+    context = MagicMock()
+    blocked = []
+    apply_profile(context, DEFAULT_PROFILE, on_blocked=lambda: blocked.append(1))
+    context.set_default_navigation_timeout.assert_called_once_with(DEFAULT_PROFILE.navigation_timeout)
+    handle = installed_handler(context)
+
+    image, page = fake_route("image", "https://example.com/a.jpg"), fake_route("document", "https://example.com/")
+    handle(image)
+    handle(page)
+    image.abort.assert_called_once_with("blockedbyclient")
+    page.continue_.assert_called_once()
+    assert blocked == [1]
+
+
+def test_profile_without_blocking_installs_no_route():
+    context = MagicMock()
+    apply_profile(context, FetchProfile("open", blocked_resource_types=(), blocked_urls=()))
+    context.route.assert_not_called()
+    assert FetchProfile("open", blocked_resource_types=(), blocked_urls=()).context_options() == {}
+
+
+def test_async_route_handler_awaits_route_calls():
+    context = MagicMock(route=AsyncMock())
+    asyncio.run(apply_profile_async(context, DEFAULT_PROFILE))
+    handle = installed_handler(context)
+    route = MagicMock(abort=AsyncMock(), continue_=AsyncMock())
+    route.request = SimpleNamespace(resource_type="font", url="https://example.com/f.woff2")
+    asyncio.run(handle(route))
+    route.abort.assert_awaited_once_with("blockedbyclient")
+
+
+def test_navigate_checks_readiness_in_page_not_network_idle():
+    profile = FetchProfile("test", ready_selector="h1", ready_timeout=5000)
+    page = MagicMock()
+    page.evaluate.return_value = {"ready": True, "signal": "selector", "elapsed": 120.0}
+    assert navigate(page, "https://example.com/", profile) is page.goto.return_value
+    page.goto.assert_called_once_with("https://example.com/", wait_until="domcontentloaded",
+                                      timeout=profile.navigation_timeout)
+    (script, args), _ = page.evaluate.call_args
+    assert script == READY_SCRIPT
+    assert args == {"selector": "h1", "jsonldTypes": [], "quietMs": 0, "timeoutMs": 5000}
+    page.wait_for_load_state.assert_not_called()
+
+
+def test_missed_readiness_signal_is_not_an_error():
+    page = MagicMock()
+    page.wait_for_load_state.side_effect = TimeoutError("load never fired")
+    assert wait_until_ready(page, DEFAULT_PROFILE) is False
+    page.evaluate.return_value = {"ready": False, "signal": "timeout", "elapsed": 10000.0}
+    assert wait_until_ready(page, DEFAULT_PROFILE, selector="main") is False
+
+
+def test_pool_applies_profile_once_per_context():
+    playwright = MagicMock()
+    browser = playwright.chromium.launch.return_value
+    browser.is_connected.return_value = True
+    browser.new_context.side_effect = lambda **opts: MagicMock(name="context")
+    with patch.object(browser_pool, "sync_playwright") as mock_sync:
+        mock_sync.return_value.start.return_value = playwright
+        pool = BrowserPool(max_memory_mb=None)
+        profile = profile_for("https://ticketsibiza.com/event/x/")
+        for _ in range(3):
+            with pool.page(user_agent="UA-1", profile=profile):
+                pass
+        with pool.page(user_agent="UA-1"):
+            pass
+
+        profiled, plain = [call.kwargs for call in browser.new_context.call_args_list]
+        assert profiled == {"service_workers": "block", "user_agent": "UA-1"}
+        assert plain == {"user_agent": "UA-1"}
+        context = pool._idle[0].context
+        context.route.assert_called_once()
+        installed_handler(context)(fake_route("stylesheet", "https://ticketsibiza.com/style.css"))
+        assert pool.stats["requests_blocked"] == 1
+        pool.close()
@@ -0,0 +1,179 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from parse_components.embedded_json import find_embedded_event
+from scraping_components.crawl_engine import AsyncCrawlEngine
+from scraping_components.fetch_router import BROWSER, HTTP, HTTP_JSON, TIERS, FetchRouter, url_pattern
+
+EVENT = "https://ticketsibiza.com/event/closing-party-2025/"
+
+
+@pytest.fixture
+def router(tmp_path):
+    return FetchRouter(tmp_path / "router.sqlite3", min_samples=2, reprobe_every=0)
+
+
+@pytest.mark.parametrize("url, pattern", [
+    ("https://www.ticketsibiza.com/event/closing-party-2025/", ("ticketsibiza.com", "/event/*")),
+    ("https://www.ibiza-spotlight.com/night/events/2025/07", ("ibiza-spotlight.com", "/night/events/*")),
+    ("https://example.com/", ("example.com", "/")),
+    ("https://example.com/venues/", ("example.com", "/venues")),
+    ("https://example.com/night/events", ("example.com", "/night/*")),
+    ("https://example.com/e/12345", ("example.com", "/e/*")),
+])
+def test_url_pattern(url, pattern):
+    assert url_pattern(url) == pattern
+
+
+def test_unknown_pattern_starts_cheapest(router):
+    assert router.plan(EVENT) == list(TIERS)
+    assert router.plan(EVENT, available=[HTTP, BROWSER]) == [HTTP, BROWSER]
+
+
+def test_learns_to_skip_tiers_that_fall_short(router):
+    for _ in range(2):
+        router.record(EVENT, HTTP, False)
+        router.record(EVENT, HTTP_JSON, False)
+        router.record(EVENT, BROWSER, True)
+    # Same page type, different page
+    assert router.plan("https://ticketsibiza.com/event/opening/") == [BROWSER]
+    assert router.plan("https://ticketsibiza.com/venues/") == list(TIERS)
+
+
+def test_falls_back_to_most_capable_tier_when_nothing_works(router):
+    for tier in TIERS:
+        router.record(EVENT, tier, False)
+        router.record(EVENT, tier, False)
+    assert router.plan(EVENT) == [BROWSER]
+
+
+def test_reprobes_from_cheapest_tier(tmp_path):
+    router = FetchRouter(tmp_path / "router.sqlite3", min_samples=1, reprobe_every=3)
+    router.record(EVENT, HTTP, False)
+    router.record(EVENT, HTTP_JSON, False)
+    assert [router.plan(EVENT)[0] for _ in range(3)] == [BROWSER, BROWSER, HTTP]
+
+
+def test_counts_decay_so_recovery_is_noticed(tmp_path):
+    router = FetchRouter(tmp_path / "router.sqlite3", min_samples=2, window=4, reprobe_every=0)
+    for _ in range(4):
+        router.record(EVENT, HTTP, False)
+    for _ in range(3):
+        router.record(EVENT, HTTP, True)
+    attempts, successes = router.stats_for(EVENT)[HTTP]
+    assert (attempts, successes) == (3, 2)
+
+
+def test_statistics_persist_across_runs(tmp_path):
+    path = tmp_path / "router.sqlite3"
+    first = FetchRouter(path, min_samples=1)
+    first.record(EVENT, HTTP, False)
+    first.record(EVENT, HTTP_JSON, True)
+    first.close()
+
+    second = FetchRouter(path, min_samples=1, reprobe_every=0)
+    assert second.stats_for(EVENT) == {HTTP: (1, 0), HTTP_JSON: (1, 1)}
+    assert second.plan(EVENT) == [HTTP_JSON, BROWSER]
+    assert "ticketsibiza.com/event/*" in second.report()
+
+
+def test_records_are_written_in_batches(tmp_path):
+    path = tmp_path / "router.sqlite3"
+    router = FetchRouter(path, flush_every=3, flush_interval=3600)
+    with patch.object(router, "_flush", wraps=router._flush) as flush:
+        router.record(EVENT, HTTP, True)
+        router.record(EVENT, HTTP, True)
+        router.record(EVENT, HTTP_JSON, True)
+        router.record(EVENT, BROWSER, True)
+        assert flush.call_count == 1
+        assert FetchRouter(path).stats_for(EVENT) == {HTTP: (2, 2), HTTP_JSON: (1, 1)}
+        router.close()
+    assert FetchRouter(path).stats_for(EVENT)[BROWSER] == (1, 1)
+
+
+def test_constructing_router_does_not_touch_disk(tmp_path):
+    FetchRouter(tmp_path / "router.sqlite3").report()
+    assert not (tmp_path / "router.sqlite3").exists()
+
+
+def test_record_rejects_unknown_tier(router):
+    with pytest.raises(ValueError):
+        router.record(EVENT, "curl", True)
+
+
+def test_find_embedded_event_in_app_state():
+    state = {"props": {"pageProps": {"event": {
+        "title": "Closing Party", "startDate": "2025-10-05T23:00:00+02:00",
+        "venue": {"name": "Amnesia", "address": "Ctra. Ibiza a San Antonio"},
+        "lineup": ["Artist A", {"name": "Artist B"}],
+    }}}}
+    html = ('<html><script id="__NEXT_DATA__" type="application/json">'
+            + json.dumps(state) + "</script></html>")
+    event = find_embedded_event(html)
+    assert event["name"] == "Closing Party"
+    assert event["location"]["address"] == {"streetAddress": "Ctra. Ibiza a San Antonio"}
+    assert event["performer"] == [{"name": "Artist A"}, {"name": "Artist B"}]
+
+    assigned = '<script>window.__INITIAL_STATE__ = {"event": {"name": "X", "start": "2025-08-01"}};</script>'
+    assert find_embedded_event(assigned)["startDate"] == "2025-08-01"
+    assert find_embedded_event('<script type="application/json">{"menu": [1, 2]}</script>') is None
+
+
+def test_engine_auto_mode_goes_straight_to_learned_tier(router):
+    fetched = []
+
+    async def fake_http(self, url):
+        fetched.append(("http", url))
+        return "plain"
+
+    async def fake_browser(self, url):
+        fetched.append(("browser", url))
+        return "rendered"
+
+    def parse(url, html):
+        return {"title": html} if html == "rendered" else None
+
+    urls = [f"https://ticketsibiza.com/event/{name}/" for name in ("a", "b", "c")]
+
+    async def scenario():
+        async with AsyncCrawlEngine(parse, fetch_mode="auto", fetch_router=router) as engine:
+            return [await engine.scrape(url) for url in urls]
+
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http), \
+         patch.object(AsyncCrawlEngine, "fetch_browser", fake_browser):
+        results = asyncio.run(scenario())
+    assert results == [{"title": "rendered"}] * 3
+    # Two pages to learn HTTP falls short, then the browser only
+    assert [kind for kind, url in fetched] == ["http", "browser", "http", "browser", "browser"]
+
+
+def test_engine_auto_mode_uses_embedded_json_tier(router):
+    async def fake_http(self, url):
+        return "page"
+
+    engine = AsyncCrawlEngine(lambda url, html: None, fetch_mode="auto", fetch_router=router,
+                              parse_embedded=lambda url, html: {"title": "from json"})
+    with patch.object(AsyncCrawlEngine, "fetch_http", fake_http):
+        assert asyncio.run(engine.scrape(EVENT)) == {"title": "from json"}
+    assert router.stats_for(EVENT) == {HTTP: (1, 0), HTTP_JSON: (1, 1)}
+
+
+def test_engine_does_not_record_failed_fetches(router):
+    async def failed_http(self, url):
+        return None
+
+    async def fake_browser(self, url):
+        return "rendered"
+
+    engine = AsyncCrawlEngine(lambda url, html: {"title": html}, fetch_mode="auto", fetch_router=router)
+    with patch.object(AsyncCrawlEngine, "fetch_http", failed_http), \
+         patch.object(AsyncCrawlEngine, "fetch_browser", fake_browser):
+        assert asyncio.run(engine.scrape(EVENT)) == {"title": "rendered"}
+    assert router.stats_for(EVENT) == {BROWSER: (1, 1)}
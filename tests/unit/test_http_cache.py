@@ -0,0 +1,163 @@
+import pytest
+import io
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components.http_cache import (
+    CachingHTTPAdapter,
+    HTTPCache,
+    install_http_cache,
+)
+
+URL = "https://ticketsibiza.com/event/test/"
+BODY = b"<html><body><h1>Test Event</h1></body></html>"
+
+
+def make_response(request, status=200, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.raw = io.BytesIO(body)
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response.url = request.url
+    response.request = request
+    return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HTTPCache(cache_dir=tmp_path, default_ttl=0)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def session(cache):
+    session = requests.Session()
+    install_http_cache(session, cache)
+    return session
+
+
+def test_install_preserves_retry_configuration(cache):
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=Retry(total=7)))
+    install_http_cache(session, cache)
+    adapter = session.get_adapter(URL)
+    assert isinstance(adapter, CachingHTTPAdapter)
+    assert adapter.max_retries.total == 7
+
+
+def test_stale_entry_revalidated_with_validators(session, cache):
+    sent_headers = []
+
+    def fake_send(self, request, **kwargs):
+        sent_headers.append(dict(request.headers))
+        if len(sent_headers) == 1:
+            return make_response(request, 200, BODY, {"ETag": '"v1"', "Last-Modified": "Tue, 01 Jul 2025 10:00:00 GMT"})
+        return make_response(request, 304)
+
+    with patch.object(HTTPAdapter, "send", fake_send):
+        first = session.get(URL)
+        second = session.get(URL)
+
+    assert first.content == BODY
+    assert second.status_code == 200
+    assert second.content == BODY
+    assert second.from_cache
+    assert sent_headers[1]["If-None-Match"] == '"v1"'
+    assert sent_headers[1]["If-Modified-Since"] == "Tue, 01 Jul 2025 10:00:00 GMT"
+    assert cache.stats["revalidated"] == 1
+    assert cache.hit_rate() == 0.5
+
+
+def test_fresh_entry_served_without_network(tmp_path):
+    cache = HTTPCache(cache_dir=tmp_path, default_ttl=0, host_ttls={"ticketsibiza.com": 3600})
+    session = install_http_cache(requests.Session(), cache)
+    calls = []
+
+    def fake_send(self, request, **kwargs):
+        calls.append(request.url)
+        return make_response(request, 200, BODY, {"ETag": '"v1"'})
+
+    with patch.object(HTTPAdapter, "send", fake_send):
+        session.get(URL)
+        session.get(URL)
+    assert len(calls) == 1
+    assert cache.stats["hits"] == 1
+    cache.close()
+
+
+def test_host_ttl_matches_parent_domains(cache):
+    cache.host_ttls = {"ibiza-spotlight.com": 60}
+    assert cache.ttl_for("www.ibiza-spotlight.com") == 60
+    assert cache.ttl_for("ticketsibiza.com") == 0
+
+
+def test_changed_page_replaces_cached_body(session, cache):
+    bodies = iter([BODY, b"<html>updated</html>"])
+
+    def fake_send(self, request, **kwargs):
+        return make_response(request, 200, next(bodies), {"ETag": '"v%d"' % time.time_ns()})
+
+    with patch.object(HTTPAdapter, "send", fake_send):
+        session.get(URL)
+        second = session.get(URL)
+    assert second.content == b"<html>updated</html>"
+    assert cache.get(URL)["body"] == b"<html>updated</html>"
+
+
+def test_no_store_responses_are_not_cached(session, cache):
+    def fake_send(self, request, **kwargs):
+        return make_response(request, 200, BODY, {"Cache-Control": "no-store"})
+
+    with patch.object(HTTPAdapter, "send", fake_send):
+        session.get(URL)
+    assert cache.get(URL) is None
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = HTTPCache(cache_dir=tmp_path, max_bytes=2000, compression_level=0)
+    for i in range(5):
+        cache.put(f"https://example.com/{i}", 200, {}, os.urandom(600))
+        time.sleep(0.01)
+    cache.get("https://example.com/2")  # keep an older entry warm
+    cache.put("https://example.com/new", 200, {}, os.urandom(600))
+    assert cache.size_bytes() <= 2000
+    assert cache.get("https://example.com/2") is not None
+    assert cache.get("https://example.com/0") is None
+    assert cache.stats["evicted"] > 0
+    cache.close()
+
+
+def test_cached_response_behaves_like_a_consumed_one(tmp_path):
+    cache = HTTPCache(cache_dir=tmp_path, host_ttls={"ticketsibiza.com": 3600})
+    session = install_http_cache(requests.Session(), cache)
+
+    def fake_send(self, request, **kwargs):
+        return make_response(request, 200, BODY, {"Content-Type": "text/html; charset=utf-8"})
+
+    with patch.object(HTTPAdapter, "send", fake_send):
+        session.get(URL)
+        cached = session.get(URL)
+    assert cached.from_cache
+    assert cached._content_consumed
+    assert b"".join(cached.iter_content(8)) == BODY
+    assert cached.raw.status == 200
+    assert cached.raw.headers["Content-Type"] == "text/html; charset=utf-8"
+    cached.close()
+    cache.close()
+
+
+def test_freshness_is_opt_in_per_host(tmp_path):
+    cache = HTTPCache(cache_dir=tmp_path)
+    assert cache.ttl_for("ticketsibiza.com") == 0
+    cache.close()
@@ -0,0 +1,124 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from starlette.requests import Request
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from database.materialized_stats import (
+    OVERALL_ID,
+    QUALITY_BUCKETS,
+    QUALITY_STATS_COLLECTION,
+    STATS_MAX_AGE,
+    VENUE_STATS_COLLECTION,
+    is_stale,
+    quality_stats_pipeline,
+    refresh_materialized_stats,
+    venue_stats_pipeline,
+)
+from database.response_cache import DATA_VERSION_COLLECTION, ResponseCache
+
+NOW = datetime(2025, 7, 1, 12, 0)
+
+
+def test_pipelines_merge_into_view_collections():
+    venue = venue_stats_pipeline(NOW)
+    quality = quality_stats_pipeline(NOW)
+    assert venue[-1]["$merge"]["into"] == VENUE_STATS_COLLECTION
+    assert quality[-1]["$merge"]["into"] == QUALITY_STATS_COLLECTION
+    assert venue[-2]["$set"]["refreshedAt"] == NOW
+    assert quality[1]["$project"]["_id"] == {"$literal": OVERALL_ID}
+    assert set(quality[0]["$group"]) >= set(QUALITY_BUCKETS)
+
+
+def test_quality_buckets_are_half_open():
+    group = quality_stats_pipeline(NOW)[0]["$group"]
+    assert group["excellent"]["$sum"]["$cond"][0] == {"$gte": ["$_quality.overall", 0.9]}
+    assert group["poor"]["$sum"]["$cond"][0] == {"$lt": ["$_quality.overall", 0.7]}
+    assert group["good"]["$sum"]["$cond"][0] == {"$and": [
+        {"$gte": ["$_quality.overall", 0.8]}, {"$lt": ["$_quality.overall", 0.9]}
+    ]}
+
+
+@pytest.mark.parametrize("overall, stale", [
+    (None, True),
+    ({"totalEvents": 3}, True),
+    ({"refreshedAt": NOW - STATS_MAX_AGE - timedelta(seconds=1)}, True),
+    ({"refreshedAt": NOW - timedelta(minutes=1)}, False),
+])
+def test_is_stale(overall, stale):
+    assert is_stale(overall, now=NOW) is stale
+
+
+def test_refresh_runs_both_pipelines_and_drops_stale_venues():
+    db = MagicMock()
+    db.__getitem__.return_value.delete_many.return_value.deleted_count = 2
+    db.events.estimated_document_count.return_value = 10
+
+    result = refresh_materialized_stats(db, now=NOW)
+
+    assert db.events.aggregate.call_count == 2
+    db.__getitem__.return_value.delete_many.assert_called_once_with({"refreshedAt": {"$lt": NOW}})
+    assert result == {"refreshedAt": NOW, "staleVenuesRemoved": 2}
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+def make_db(overall):
+    quality = MagicMock()
+    quality.find_one = AsyncMock(return_value=overall)
+    venues = MagicMock()
+    venues.find.return_value = FakeCursor([{"venue": "Hï Ibiza", "avgQuality": 0.9, "eventCount": 4}])
+    versions = MagicMock()
+    versions.find_one = AsyncMock(return_value={"version": 1})
+    db = MagicMock()
+    db.__getitem__.side_effect = {QUALITY_STATS_COLLECTION: quality, VENUE_STATS_COLLECTION: venues,
+                                  DATA_VERSION_COLLECTION: versions}.get
+    return db
+
+
+def make_request(path):
+    return Request({
+        "type": "http", "method": "GET", "path": path, "query_string": b"",
+        "headers": [], "server": ("testserver", 80), "scheme": "http", "root_path": "",
+    })
+
+
+@pytest.mark.parametrize("age, refreshed", [(timedelta(minutes=1), False), (timedelta(hours=1), True)])
+def test_api_reads_views_and_refreshes_when_stale(monkeypatch, age, refreshed):
+    from database import api_server
+
+    overall = {"_id": OVERALL_ID, "totalEvents": 4, "averageQuality": 0.9,
+               "distribution": {"excellent": 4, "good": 0, "fair": 0, "poor": 0},
+               "refreshedAt": datetime.utcnow() - age}
+    refresh = AsyncMock()
+    monkeypatch.setattr(api_server, "refresh_materialized_stats_async", refresh)
+    monkeypatch.setattr(api_server, "db", make_db(overall))
+    monkeypatch.setattr(api_server, "response_cache", ResponseCache())
+
+    stats = asyncio.run(api_server.get_quality_stats())
+    venues = json.loads(asyncio.run(api_server.get_venues(make_request("/api/venues"))).body)
+
+    assert stats["totalEvents"] == 4
+    assert stats["topVenues"][0]["venue"] == "Hï Ibiza"
+    assert venues[0]["eventCount"] == 4
+    assert refresh.called is refreshed
+    api_server.db.events.aggregate.assert_not_called()
@@ -0,0 +1,118 @@
+import pytest
+import asyncio
+import os
+import statistics
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from database.method_stats import (
+    METHODS_COLLECTION,
+    WINDOWS_COLLECTION,
+    aggregate_from_scores,
+    combine_windows,
+    compact_legacy_method_stats,
+    histogram_bucket,
+    method_stats_operations,
+    summarize_method_stats,
+)
+
+SCORES = [0.55, 0.72, 0.81, 0.9, 0.93, 1.0]
+
+
+def apply(doc, update):
+    """Tiny stand-in for the server applying $inc/$min/$max/$set to one document"""
+    for path, amount in update["$inc"].items():
+        target = doc
+        *parents, leaf = path.split(".")
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[leaf] = target.get(leaf, 0) + amount
+    for field, value in update["$min"].items():
+        doc[field] = min(doc.get(field, value), value)
+    for field, value in update["$max"].items():
+        doc[field] = max(doc.get(field, value), value)
+    doc.update(update["$set"])
+    return doc
+
+
+@pytest.mark.parametrize("score, bucket", [(0.0, "b0"), (0.05, "b0"), (0.75, "b7"), (1.0, "b9"), (1.2, "b9")])
+def test_histogram_bucket(score, bucket):
+    assert histogram_bucket(score) == bucket
+
+
+def test_operations_are_fixed_size_increments():
+    now = datetime(2025, 6, 1, 22, 30)
+    ops = method_stats_operations("jsonld", 0.9, now=now)
+    assert [collection for collection, _ in ops] == [METHODS_COLLECTION, WINDOWS_COLLECTION]
+    update = ops[0][1]._doc
+    assert "$push" not in update
+    assert update["$inc"]["qualityHistogram.b9"] == 1
+    assert ops[1][1]._filter == {"method": "jsonld", "windowStart": datetime(2025, 6, 1)}
+    assert len(method_stats_operations("jsonld", 0.9, windowed=False)) == 1
+
+
+def test_incremental_updates_match_legacy_array():
+    doc = {"method": "jsonld"}
+    for score in SCORES:
+        apply(doc, method_stats_operations("jsonld", score, windowed=False)[0][1]._doc)
+    summary = summarize_method_stats(doc)
+    assert summary["totalUses"] == len(SCORES)
+    assert summary["avgQuality"] == round(statistics.mean(SCORES), 3)
+    assert summary["stdDev"] == round(statistics.pstdev(SCORES), 3)
+    assert (summary["minQuality"], summary["maxQuality"]) == (0.55, 1.0)
+    assert sum(summary["histogram"]) == len(SCORES)
+    assert 0.8 <= summary["p50"] <= 0.9
+
+    legacy = aggregate_from_scores(SCORES)
+    assert legacy["qualityHistogram"] == doc["qualityHistogram"]
+    assert legacy["qualitySum"] == pytest.approx(doc["qualitySum"])
+
+
+def test_combine_windows_merges_days():
+    day1, day2 = {"method": "html"}, {"method": "html"}
+    for score in SCORES[:3]:
+        apply(day1, method_stats_operations("html", score, windowed=False)[0][1]._doc)
+    for score in SCORES[3:]:
+        apply(day2, method_stats_operations("html", score, windowed=False)[0][1]._doc)
+    merged = summarize_method_stats(combine_windows([day1, day2]))
+    assert merged["totalUses"] == len(SCORES)
+    assert (merged["minQuality"], merged["maxQuality"]) == (0.55, 1.0)
+
+
+def test_compact_legacy_documents():
+    db = MagicMock()
+    collection = db.__getitem__.return_value
+    collection.find.return_value = [{"_id": 1, "method": "jsonld", "totalUses": 3, "qualityScores": [0.5, 0.9, 1.0]}]
+    assert compact_legacy_method_stats(db) == 1
+    update = collection.update_one.call_args[0][1]
+    assert update["$unset"] == {"qualityScores": ""}
+    assert update["$set"]["qualityHistogram"] == {"b5": 1, "b9": 2}
+
+
+def test_api_reports_methods_by_use():
+    from database import api_server
+
+    class Cursor:
+        def __init__(self, docs):
+            self.docs = docs
+
+        async def to_list(self, length=None):
+            return self.docs
+
+    docs = [
+        {"method": "html", "totalUses": 1, "qualitySum": 0.5, "qualitySumSq": 0.25, "qualityHistogram": {"b5": 1}},
+        {"method": "jsonld", "totalUses": 2, "qualitySum": 1.8, "qualitySumSq": 1.62, "qualityHistogram": {"b9": 2}},
+    ]
+    db = MagicMock()
+    db.__getitem__.return_value.find.return_value = Cursor(docs)
+    original, api_server.db = api_server.db, db
+    try:
+        result = asyncio.run(api_server.get_extraction_method_stats(window_days=None))
+    finally:
+        api_server.db = original
+    assert [r["method"] for r in result] == ["jsonld", "html"]
+    assert result[0]["avgQuality"] == 0.9
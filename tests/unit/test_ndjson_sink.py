@@ -0,0 +1,136 @@
+import pytest
+import gzip
+import json
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components.ndjson_sink import NDJSONSink, iter_ndjson, segment_paths
+
+
+def records(n):
+    return [{"url": f"https://ticketsibiza.com/event/{i}/", "title": f"Événement {i}"} for i in range(n)]
+
+
+@pytest.mark.parametrize("name", ["events.ndjson", "events.ndjson.gz"])
+def test_round_trip(tmp_path, name):
+    path = tmp_path / name
+    with NDJSONSink(path) as sink:
+        sink.write_many(records(25))
+    assert sink.count == 25
+    assert list(iter_ndjson(path)) == records(25)
+
+
+def test_gzip_output_is_compressed(tmp_path):
+    path = tmp_path / "events.ndjson.gz"
+    with NDJSONSink(path) as sink:
+        sink.write({"title": "Glitterbox"})
+    assert json.loads(gzip.decompress(path.read_bytes())) == {"title": "Glitterbox"}
+
+
+def test_rotation_by_size_keeps_order(tmp_path):
+    path = tmp_path / "events.ndjson"
+    with NDJSONSink(path, rotate_bytes=500) as sink:
+        sink.write_many(records(40))
+    assert len(sink.paths) > 1
+    assert segment_paths(path) == sink.paths
+    assert sink.paths[1].name == "events.1.ndjson"
+    assert all(p.stat().st_size < 500 + 100 for p in sink.paths)
+    assert list(iter_ndjson(path)) == records(40)
+
+
+def test_periodic_fsync(tmp_path):
+    with patch("scraping_components.ndjson_sink.os.fsync") as fsync:
+        with NDJSONSink(tmp_path / "events.ndjson", fsync_every=10, fsync_interval=3600) as sink:
+            sink.write_many(records(25))
+            assert fsync.call_count == 2
+    assert fsync.call_count == 3  # final sync on close
+
+
+def test_records_are_on_disk_before_close(tmp_path):
+    path = tmp_path / "events.ndjson.gz"
+    sink = NDJSONSink(path, fsync_every=5)
+    sink.write_many(records(12))
+    # Simulate a crash: the gzip stream was never finished
+    assert list(iter_ndjson(path)) == records(10)
+    sink.close()
+
+
+def test_reader_skips_truncated_last_line(tmp_path):
+    path = tmp_path / "events.ndjson"
+    path.write_text('{"a": 1}\n\n{"a": 2}\n{"a": 3, "tit', encoding="utf-8")
+    assert list(iter_ndjson(path)) == [{"a": 1}, {"a": 2}]
+
+
+def test_append_after_truncated_line_keeps_new_records(tmp_path):
+    path = tmp_path / "events.ndjson"
+    path.write_text('{"a": 1}\n{"a": 2, "tit', encoding="utf-8")
+    with NDJSONSink(path, append=True) as sink:
+        sink.write({"a": 3})
+    assert list(iter_ndjson(path)) == [{"a": 1}, {"a": 3}]
+    assert segment_paths(path) == [path]
+
+
+def test_append_to_compressed_output_starts_a_new_segment(tmp_path):
+    path = tmp_path / "events.ndjson.gz"
+    with gzip.open(path, "wb") as f:
+        f.write(b'{"a": 1}\n')
+    path.write_bytes(path.read_bytes()[:-6])  # Crash before the gzip trailer
+    with NDJSONSink(path, append=True) as sink:
+        sink.write({"a": 2})
+    assert segment_paths(path) == [path, tmp_path / "events.1.ndjson.gz"]
+    assert list(iter_ndjson(path)) == [{"a": 1}, {"a": 2}]
+
+
+def test_default_serializer_handles_datetimes(tmp_path):
+    path = tmp_path / "events.ndjson"
+    with NDJSONSink(path) as sink:
+        sink.write({"scrapedAt": datetime(2025, 7, 1, 23, 0)})
+    assert next(iter_ndjson(path)) == {"scrapedAt": "2025-07-01 23:00:00"}
+
+
+def test_write_after_close_raises(tmp_path):
+    sink = NDJSONSink(tmp_path / "events.ndjson")
+    sink.close()
+    with pytest.raises(ValueError):
+        sink.write({"a": 1})
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(iter_ndjson(tmp_path / "missing.ndjson"))
+
+
+def test_migration_streams_ndjson_in_batches(tmp_path):
+    from database.data_migration import DataMigration
+    with patch("database.data_migration.MongoClient"):
+        migration = DataMigration()
+    batch_sizes = []
+    events = MagicMock()
+    events.bulk_write.side_effect = lambda ops, ordered: batch_sizes.append(len(ops)) or MagicMock(
+        bulk_api_result={"nModified": 0, "nUpserted": len(ops)})
+    migration.db = {"events": events}
+    migration.parse_event_from_scraped_data = lambda data: dict(data)
+
+    path = tmp_path / "ticketsibiza_scraped_data.ndjson"
+    with NDJSONSink(path, rotate_bytes=300) as sink:
+        sink.write_many(records(6) + records(1))  # one duplicate
+    assert len(sink.paths) > 1
+
+    migration.migrate_events = lambda events: DataMigration.migrate_events(migration, events, batch_size=4)
+    with patch.object(migration, "print_migration_summary"), \
+            patch("database.data_migration.refresh_materialized_stats") as refresh, \
+            patch("database.data_migration.bump_data_version") as bump, \
+            patch("database.data_migration.sync_event_summaries") as sync:
+        migration.migrate_from_json_files(str(path))
+    refresh.assert_called_once_with(migration.db)
+    bump.assert_called_once_with(migration.db)
+    sync.assert_called_once_with(migration.db)
+
+    assert batch_sizes == [4, 2]
+    assert migration.stats["duplicates_found"] == 1
+    assert migration.stats["successfully_migrated"] == 6
@@ -0,0 +1,112 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from bson import ObjectId
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from database.pagination import (
+    CURSOR_FIELD, InvalidCursor, after_cursor, decode_cursor, encode_cursor, next_page
+)
+from database.response_cache import ResponseCache
+
+OID = ObjectId("65f0c0ffee0000000000abcd")
+START = datetime(2025, 7, 4, 23, 0)
+
+
+@pytest.mark.parametrize("start", [START, None])
+def test_cursor_round_trip(start):
+    token = encode_cursor(start, str(OID))
+    assert "=" not in token and "/" not in token
+    assert decode_cursor(token) == (start, OID)
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", encode_cursor(START, "nope")])
+def test_invalid_cursor_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+def test_after_cursor_continues_strictly_after_last_key():
+    base = {"_quality.overall": {"$gte": 0.7}}
+    assert after_cursor(base, None) is base
+    query = after_cursor(base, encode_cursor(START, OID))
+    assert query["$and"][0] == base
+    assert query["$and"][1]["$or"] == [
+        {"dateTime.start": {"$gt": START}},
+        {"dateTime.start": START, "_id": {"$gt": OID}},
+    ]
+
+
+def test_next_page_only_when_more_results():
+    docs = [{"_id": str(ObjectId()), CURSOR_FIELD: START} for _ in range(3)]
+    page, token = next_page(docs, 2)
+    assert page == docs[:2]
+    assert decode_cursor(token) == (START, ObjectId(docs[1]["_id"]))
+    assert next_page(docs, 3) == (docs, None)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def sort(self, spec):
+        self.calls.append(("sort", spec))
+        return self
+
+    def skip(self, n):
+        self.calls.append(("skip", n))
+        return self
+
+    def limit(self, n):
+        self.calls.append(("limit", n))
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs[:length]
+
+
+def make_request(query_string=b"limit=2"):
+    return Request({
+        "type": "http", "method": "GET", "path": "/api/events", "query_string": query_string,
+        "headers": [], "server": ("testserver", 80), "scheme": "http", "root_path": "",
+    })
+
+
+def test_get_events_pages_by_keyset(monkeypatch):
+    from database import api_server
+
+    docs = [{"_id": str(ObjectId()), "url": f"u{i}", "title": f"t{i}", "qualityScore": 0.9,
+             "venue": "Amnesia", "date": None, "status": None, CURSOR_FIELD: START} for i in range(3)]
+    cursor = FakeCursor(docs)
+    db = MagicMock()
+    db.__getitem__.return_value.find.return_value = cursor
+    db.__getitem__.return_value.find_one = AsyncMock(return_value=None)
+    monkeypatch.setattr(api_server, "db", db)
+    monkeypatch.setattr(api_server, "response_cache", ResponseCache())
+
+    response = asyncio.run(api_server.get_events(
+        make_request(), min_quality=0.7, venue=None, future_only=False,
+        limit=2, cursor=None, skip=0))
+    with pytest.raises(HTTPException):
+        asyncio.run(api_server.get_events(
+            make_request(b"limit=2&cursor=garbage"), min_quality=0.7, venue=None,
+            future_only=False, limit=2, cursor="garbage", skip=0))
+
+    events = json.loads(response.body)
+    assert [e["url"] for e in events] == ["u0", "u1"]
+    assert CURSOR_FIELD not in events[0]
+    assert ("skip", 0) not in cursor.calls and ("limit", 3) in cursor.calls
+    assert ("sort", [("dateTime.start", 1), ("_id", 1)]) in cursor.calls
+    token = response.headers["X-Next-Cursor"]
+    assert decode_cursor(token) == (START, ObjectId(docs[1]["_id"]))
+    assert f"cursor={token}" in response.headers["Link"]
@@ -1,12 +1,14 @@
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
+import random
 import sys
+from unittest.mock import patch
 
 # Add project root to sys.path to allow direct imports if the project is not installed.
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from database.quality_scorer import QualityScorer
+from database.quality_scorer import QualityScorer, quality_features
 
 # Helper function to create a QualityScorer instance
 @pytest.fixture
@@ -1167,6 +1169,148 @@ def test_get_recommendation_very_poor(scorer):
     recommendation = scorer._get_recommendation(0.55, ["title", "location", "dateTime"])
     assert "Poor data quality. Consider re-scraping with different extraction method." in recommendation
 
+# --- Tests for batch scoring parity ---
+PARITY_NOW = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def random_event(rng):
+    """Events mixing every branch of the field scorers, including malformed values"""
+    pick = rng.choice
+    start = pick([
+        None, "", "not a date", PARITY_NOW + timedelta(days=rng.randint(-60, 400), seconds=rng.randint(0, 86399)),
+        (PARITY_NOW - timedelta(days=30)).replace(tzinfo=None), PARITY_NOW + timedelta(days=365),
+        (PARITY_NOW + timedelta(days=3)).isoformat().replace("+00:00", "Z"),
+        (PARITY_NOW + timedelta(days=3)).astimezone(timezone(timedelta(hours=2))),
+    ])
+    event = {
+        "title": pick(["", None, "abc", "Event", "Carl Cox at Privilege Ibiza - 15th July 2025",
+                       "GLITTERBOX 25/05/2025", "!!! $$$ ###", " ഷോർട്ട് ഇവന്റ് ", "Hï Ibiza Opening Party"]),
+        "location": pick([{}, None, {"venue": "Unknown"}, {
+            "venue": pick([None, "Hï Ibiza", "Pacha Ibiza", "Club"]),
+            "address": pick([None, "", "Platja d'en Bossa"]),
+            "city": pick([None, "Ibiza", "San Antonio", "IBIZA Town"]),
+            "coordinates": pick([None, {}, {"lat": 38.9784, "lng": 1.4109}, {"lat": 40.4, "lng": -3.7},
+                                 {"lat": 0, "lng": 1.4}, {"lat": 38.8, "lng": 1.6}]),
+        }]),
+        "dateTime": pick([{}, None, {
+            "start": start,
+            "end": pick([None, PARITY_NOW]),
+            "displayText": pick([None, "", "Sun 25 May"]),
+            "timezone": pick([None, "Europe/Madrid", "CEST", "UTC"]),
+        }]),
+        "lineUp": [
+            {k: v for k, v in {"name": pick([None, "", "X", "Carl Cox"]), "headliner": pick([None, True, False]),
+                               "genre": pick([None, "Techno"])}.items() if v is not None or rng.random() < 0.3}
+            for _ in range(rng.randint(0, 4))
+        ],
+        "ticketInfo": pick([{}, None, {
+            "status": pick([None, "available", "sold out", "coming_soon"]),
+            "startingPrice": pick([None, 0, 19.99, 20, 45.5, 200, 250]),
+            "currency": pick([None, "EUR", "GBP"]),
+            "url": pick([None, "", "https://ticketsibiza.com/t", "ticketsibiza.com/t"]),
+            "provider": pick([None, "Tickets Ibiza"]),
+        }]),
+    }
+    for field in list(event):
+        if rng.random() < 0.1:
+            del event[field]
+    return event
+
+
+def test_batch_quality_matches_scalar_path(scorer):
+    rng = random.Random(20250601)
+    events = [random_event(rng) for _ in range(2000)] + [GOOD_EVENT_DATA, POOR_EVENT_DATA, {}]
+
+    batch = scorer.calculate_batch_quality(events, now=PARITY_NOW)
+    scalar = [scorer.calculate_event_quality(event, now=PARITY_NOW) for event in events]
+    for event, batch_result, scalar_result in zip(events, batch, scalar):
+        assert batch_result == scalar_result, event
+
+
+def test_score_batch_columns_are_bit_identical(scorer):
+    rng = random.Random(7)
+    events = [random_event(rng) for _ in range(500)]
+    scores = scorer.score_batch(quality_features(events), now=PARITY_NOW)
+    for i, event in enumerate(events):
+        quality = scorer.calculate_event_quality(event, now=PARITY_NOW)["_quality"]
+        assert scores["overall"][i] == quality["overall"]
+        for field, value in quality["scores"].items():
+            assert scores[field][i] == value
+
+
+def test_score_batch_accepts_plain_sequences(scorer):
+    features = {name: column.tolist() for name, column in quality_features([GOOD_EVENT_DATA]).items()}
+    scores = scorer.score_batch(features, now=datetime(2025, 7, 1))
+    assert scores["overall"].tolist() == [1.0]
+    assert scorer.score_batch(quality_features([]))["overall"].size == 0
+
+
+# --- Tests for incremental rescoring ---
+def stored(quality_data):
+    return {"_id": "abc", **quality_data}
+
+
+def test_rescore_event_without_stored_quality_sets_whole_subtrees(scorer):
+    quality_data, updates = scorer.rescore_event(GOOD_EVENT_DATA, None, now=PARITY_NOW)
+    full = scorer.calculate_event_quality(GOOD_EVENT_DATA, now=PARITY_NOW)
+    assert quality_data["_quality"]["scores"] == full["_quality"]["scores"]
+    assert quality_data["_quality"]["overall"] == full["_quality"]["overall"]
+    assert set(quality_data["_quality"]["inputs"]) == set(scorer.field_weights)
+    assert updates == quality_data
+
+
+def test_rescore_event_unchanged_event_updates_nothing(scorer):
+    first, _ = scorer.rescore_event(GOOD_EVENT_DATA, None, now=PARITY_NOW)
+    again, updates = scorer.rescore_event(GOOD_EVENT_DATA, stored(first), now=PARITY_NOW + timedelta(hours=1))
+    assert updates == {}
+    assert again == first
+
+
+def test_rescore_event_status_flip_touches_only_ticket_paths(scorer):
+    event = {**GOOD_EVENT_DATA, "ticketInfo": {"status": "available", "startingPrice": 60.0, "currency": "EUR"}}
+    first, _ = scorer.rescore_event(event, None, now=PARITY_NOW)
+    later = PARITY_NOW + timedelta(hours=1)
+
+    sold_out = {**event, "ticketInfo": {**event["ticketInfo"], "status": "sold_out"}}
+    with patch.object(scorer, "_score_title") as score_title:
+        quality_data, updates = scorer.rescore_event(sold_out, stored(first), now=later)
+    score_title.assert_not_called()
+    # Same score and flags: only the input hash and timestamp change
+    assert set(updates) == {"_quality.inputs.ticketInfo", "_quality.lastCalculated"}
+    assert quality_data["_validation"]["ticketInfo"] is first["_validation"]["ticketInfo"]
+
+    unknown = {**event, "ticketInfo": {**event["ticketInfo"], "status": "sold out"}}
+    quality_data, updates = scorer.rescore_event(unknown, stored(first), now=later)
+    assert set(updates) == {"_quality.inputs.ticketInfo", "_quality.scores.ticketInfo",
+                            "_validation.ticketInfo", "_quality.overall", "_quality.lastCalculated"}
+    assert updates["_validation.ticketInfo"]["flags"] == ["invalid_ticket_status"]
+    full = scorer.calculate_event_quality(unknown, now=later)["_quality"]
+    assert quality_data["_quality"]["overall"] == full["overall"]
+
+
+def test_rescore_event_rescores_dates_that_drift_out_of_range(scorer):
+    first, _ = scorer.rescore_event(GOOD_EVENT_DATA, None, now=PARITY_NOW)
+    much_later = datetime(2025, 9, 1, tzinfo=timezone.utc)
+    _, updates = scorer.rescore_event(GOOD_EVENT_DATA, stored(first), now=much_later)
+    assert "_quality.inputs.dateTime" in updates
+    assert updates["_validation.dateTime"]["flags"] == ["date_too_far_past"]
+    assert not any(".title" in path or ".lineUp" in path for path in updates)
+
+
+def test_rescore_event_fills_inputs_for_documents_scored_in_full(scorer):
+    legacy = scorer.calculate_event_quality(GOOD_EVENT_DATA, now=PARITY_NOW)
+    quality_data, updates = scorer.rescore_event(GOOD_EVENT_DATA, stored(legacy), now=PARITY_NOW)
+    assert {path for path in updates if path.startswith("_quality.inputs.")} == {
+        f"_quality.inputs.{field}" for field in scorer.field_weights
+    }
+    assert not any(path.startswith(("_quality.scores", "_validation")) for path in updates)
+    assert "_quality.overall" not in updates
+    # The returned document matches the full scoring it was derived from
+    assert quality_data["_quality"]["scores"] == legacy["_quality"]["scores"]
+    assert quality_data["_quality"]["overall"] == legacy["_quality"]["overall"]
+    assert quality_data["_validation"] == legacy["_validation"]
+
+
 # All planned unit tests for QualityScorer methods have been added.
 # Future considerations:
 # - Test with extremely long inputs or unusual unicode characters if not covered.
@@ -0,0 +1,143 @@
+import pytest
+import asyncio
+import math
+import os
+import sys
+import threading
+from email.utils import formatdate
+from unittest.mock import MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components.rate_limiter import (
+    HostRateController,
+    RateLimiter,
+    delay_options,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def controller(clock, **options):
+    options = {"rate": 1.0, "min_rate": 0.1, "max_rate": 2.0, "jitter": 0, **options}
+    return HostRateController(clock=clock, **options)
+
+
+def test_reservations_are_spaced_by_rate(clock):
+    bucket = controller(clock)
+    assert [bucket.reserve() for _ in range(3)] == [0, 1.0, 2.0]
+    clock.now += 10
+    assert bucket.reserve() == 0
+
+
+def test_burst_allows_back_to_back_requests(clock):
+    bucket = controller(clock, burst=3)
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0, 1.0]
+
+
+def test_throttling_halves_rate_once_per_interval(clock):
+    bucket = controller(clock)
+    bucket.record(429)
+    bucket.record(503)  # same overload reported by another in-flight request
+    assert bucket.rate == 0.5
+    clock.now += 2
+    bucket.record(None)
+    assert bucket.rate == 0.25
+    for _ in range(10):
+        clock.now += 10
+        bucket.record(429)
+    assert bucket.rate == 0.1
+    assert bucket.stats["throttled"] == 12 and bucket.stats["failures"] == 1
+
+
+def test_healthy_responses_raise_rate_up_to_max(clock):
+    bucket = controller(clock, healthy_after=2, increase=0.5)
+    for _ in range(3):
+        bucket.record(200)
+    assert bucket.rate == 1.5
+    bucket.record(500)  # errors reset the streak without slowing down
+    bucket.record(200)
+    assert bucket.rate == 1.5
+    for _ in range(10):
+        bucket.record(304)
+    assert bucket.rate == 2.0
+
+
+def test_retry_after_blocks_host(clock):
+    bucket = controller(clock)
+    bucket.record(429, retry_after=30)
+    assert bucket.reserve() == 30
+    assert bucket.snapshot()["blocked_for"] == 30
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(formatdate(1000 + 90, usegmt=True), now=1000) == 90
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_delay_options_match_old_sleep_range():
+    assert delay_options(0.5, 1.5) == {"rate": 1.0, "max_rate": 2.0}
+    assert delay_options(0, 0) == {"rate": math.inf, "max_rate": math.inf}
+
+
+def test_unbounded_host_backs_off_to_a_finite_rate(clock):
+    bucket = HostRateController(clock=clock, jitter=0, min_rate=0.01, **delay_options(0, 0))
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    bucket.record(429)
+    assert 0.01 <= bucket.rate < math.inf
+    bucket.reserve()
+    assert bucket.reserve() == pytest.approx(1 / bucket.rate)
+
+
+def test_limiter_shares_controller_per_host_and_reads_headers():
+    limiter = RateLimiter(rate=1.0, jitter=0)
+    first = limiter.controller("https://Example.com/a")
+    assert limiter.controller("https://example.com/b", rate=5.0) is first
+    assert first.rate == 1.0
+
+    limiter.record("https://example.com/c", 429, {"retry-after": "5"})
+    error = MagicMock(response=MagicMock(status_code=503, headers={}))
+    limiter.record_exception("https://other.org/", error)
+    metrics = limiter.metrics()
+    assert list(metrics) == ["example.com", "other.org"]
+    assert metrics["example.com"]["throttled"] == 1 and metrics["example.com"]["blocked_for"] > 4
+    assert "example.com" in limiter.report()
+
+
+def test_threads_and_tasks_draw_on_the_same_budget():
+    limiter = RateLimiter(rate=20.0, max_rate=20.0, jitter=0)
+    waits = []
+    lock = threading.Lock()
+
+    def worker():
+        wait = limiter.controller("https://example.com/").reserve()
+        with lock:
+            waits.append(wait)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    async def tasks():
+        return await asyncio.gather(*(limiter.acquire("https://example.com/") for _ in range(2)))
+
+    waits.extend(asyncio.run(tasks()))
+    # Six reservations spaced 50 ms apart, whoever made them
+    assert sorted(round(w / 0.05) for w in waits) == [0, 1, 2, 3, 4, 5]
@@ -0,0 +1,81 @@
+import pytest
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components.fetch_profiles import FetchProfile, profile_for
+from scraping_components.readiness import (
+    READY_SCRIPT,
+    ReadinessTelemetry,
+    ReadyResult,
+    wait_for_ready,
+    wait_for_ready_async,
+)
+
+
+@pytest.fixture
+def telemetry():
+    return ReadinessTelemetry()
+
+
+def page_answering(ready, signal, elapsed):
+    page = MagicMock()
+    page.evaluate.return_value = {"ready": ready, "signal": signal, "elapsed": elapsed}
+    return page
+
+
+def test_profile_predicates_are_passed_to_the_in_page_check(telemetry):
+    page = page_answering(True, "jsonld", 850.0)
+    profile = profile_for("https://ticketsibiza.com/event/closing-party/")
+    result = wait_for_ready(page, profile, telemetry=telemetry)
+    assert result == ReadyResult(True, "jsonld", 850.0)
+    page.evaluate.assert_called_once_with(READY_SCRIPT, {
+        "selector": "h1.entry-title", "jsonldTypes": ["Event"], "quietMs": 0,
+        "timeoutMs": profile.ready_timeout,
+    })
+
+
+def test_selector_override_and_quiet_window(telemetry):
+    page = page_answering(True, "selector", 400.0)
+    profile = profile_for("https://www.ibiza-spotlight.com/night/events/2025/07")
+    wait_for_ready(page, profile, selector="#calendar", telemetry=telemetry)
+    (_, args), _ = page.evaluate.call_args
+    assert args["selector"] == "#calendar" and args["quietMs"] == profile.quiet_ms
+
+
+def test_profile_without_predicates_waits_for_load_state(telemetry):
+    page = MagicMock()
+    page.evaluate.return_value = 1500.0
+    result = wait_for_ready(page, FetchProfile("plain", ready_state="load"), telemetry=telemetry)
+    page.wait_for_load_state.assert_called_once_with("load", timeout=10000)
+    assert result == ReadyResult(True, "load", 1500.0)
+
+
+def test_page_errors_are_recorded_not_raised(telemetry):
+    page = MagicMock()
+    page.evaluate.side_effect = RuntimeError("Execution context was destroyed")
+    result = wait_for_ready(page, FetchProfile("test", ready_selector="h1"), telemetry=telemetry)
+    assert result == ReadyResult(False, "error")
+    assert telemetry.summary("test")["signals"] == {"error": 1}
+
+
+def test_async_check(telemetry):
+    page = MagicMock(evaluate=AsyncMock(return_value={"ready": True, "signal": "quiet", "elapsed": 300.0}))
+    result = asyncio.run(wait_for_ready_async(page, FetchProfile("test", quiet_ms=200), telemetry=telemetry))
+    assert result.ready and result.signal == "quiet"
+
+
+def test_telemetry_distribution(telemetry):
+    for elapsed in (100.0, 200.0, 300.0, 400.0, 1000.0):
+        telemetry.record("site", ReadyResult(True, "selector", elapsed))
+    telemetry.record("site", ReadyResult(False, "timeout", 10000.0))
+    summary = telemetry.summary("site")
+    assert summary["checks"] == 6 and summary["ready"] == 5
+    assert (summary["p50_ms"], summary["p90_ms"], summary["max_ms"]) == (300.0, 1000.0, 1000.0)
+    assert summary["signals"] == {"selector": 5, "timeout": 1}
+    assert "site: 5/6 ready, p50 300ms" in telemetry.report()
+    assert ReadinessTelemetry().report() == "Time to ready: none"
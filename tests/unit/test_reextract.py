@@ -0,0 +1,77 @@
+import pytest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from database import reextract
+from parse_components.content_fingerprint import extraction_fingerprint
+from scraping_components.snapshot_store import DEFLATE, SnapshotStore
+
+PAGE = """<html><head><title>{title} | Tickets Ibiza</title>
+<script type="application/ld+json">{{"@type": "MusicEvent", "name": "{title}",
+"startDate": "2025-07-01T23:00:00", "location": {{"@type": "Place", "name": "Hï Ibiza"}}}}</script>
+</head><body><h1 class="entry-title">{title}</h1></body></html>"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(tmp_path, codec=DEFLATE, train_after=None)
+    reextract._init_worker(str(tmp_path))
+    return store
+
+
+def test_parser_for_routes_by_host():
+    assert reextract.parser_for("https://www.ibiza-spotlight.com/night/events/x")[0] == "mono_ibiza_spotlight_improved"
+    assert reextract.parser_for("https://ticketsibiza.com/event/x/") == reextract.DEFAULT_PARSER
+    assert reextract.parser_for("https://notibiza-spotlight.com/x") == reextract.DEFAULT_PARSER
+
+
+def test_extraction_fingerprint_ignores_run_timestamps():
+    event = {"title": "Glitterbox", "scrapedAt": 1, "_quality": {"overall": 0.9, "lastCalculated": 1}}
+    later = {"title": "Glitterbox", "scrapedAt": 2, "_quality": {"overall": 0.9, "lastCalculated": 2}}
+    assert extraction_fingerprint(event) == extraction_fingerprint(later)
+    assert extraction_fingerprint(event) != extraction_fingerprint({**event, "title": "Circoloco"})
+
+
+def test_reextract_event_skips_unchanged_results(store):
+    url = "https://ticketsibiza.com/event/glitterbox/"
+    digest = store.put(PAGE.format(title="Glitterbox"), url=url)
+
+    event = reextract.reextract_event((url, digest, None))
+    assert event["title"] == "Glitterbox"
+    assert event["htmlSnapshot"] == digest
+    assert event["location"]["venueKey"] == "hi-ibiza"
+    assert "html" not in event and "scrapedAt" not in event
+    assert "overall" in event["_quality"]
+
+    assert reextract.reextract_event((url, digest, event["extractionFingerprint"])) is None
+    assert reextract.reextract_event((url, "0" * 64, None)) is None
+
+
+def test_reextract_all_writes_only_changed_events(store, tmp_path):
+    pages = {f"https://ticketsibiza.com/event/{i}/": PAGE.format(title=f"Night {i}") for i in range(3)}
+    digests = {url: store.put(html, url=url) for url, html in pages.items()}
+    unchanged_url = "https://ticketsibiza.com/event/0/"
+    fingerprint = reextract.reextract_event((unchanged_url, digests[unchanged_url], None))["extractionFingerprint"]
+
+    db = MagicMock()
+    db.events.find.return_value.sort.return_value = [
+        {"url": url, "htmlSnapshot": digest,
+         **({"extractionFingerprint": fingerprint} if url == unchanged_url else {})}
+        for url, digest in digests.items()
+    ]
+    with patch("database.reextract.sync_event_summaries") as sync, \
+            patch("database.reextract.refresh_materialized_stats") as refresh, \
+            patch("database.reextract.bump_data_version") as bump:
+        stats = reextract.reextract_all(db, tmp_path, workers=2, window=2, chunksize=1)
+
+    assert stats == {"processed": 3, "changed": 2}
+    written = [op for call in db.__getitem__.return_value.bulk_write.call_args_list for op in call[0][0]]
+    updated = sorted(op._filter["url"] for op in written if hasattr(op, "_filter"))
+    assert updated == ["https://ticketsibiza.com/event/1/", "https://ticketsibiza.com/event/2/"]
+    sync.assert_called_once_with(db, set(updated))
+    refresh.assert_called_once_with(db)
+    bump.assert_called_once_with(db)
@@ -0,0 +1,126 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from starlette.requests import Request
+
+from database.response_cache import (
+    DATA_VERSION_COLLECTION,
+    EVENTS_VERSION_ID,
+    ResponseCache,
+    bump_data_version,
+    cache_key,
+    etag_matches,
+)
+
+
+def test_cache_key_normalizes_query_params():
+    assert cache_key("/api/events", [("limit", "5"), ("venue", "Pacha")]) == \
+        cache_key("/api/events", [("venue", "Pacha"), ("limit", "5"), ("cursor", "")])
+    assert cache_key("/api/events", [("limit", "5")]) != cache_key("/api/upcoming", [("limit", "5")])
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(ttl=10)
+    entry = cache.put("k", [1, 2], now=100.0)
+    assert cache.get("k", now=105.0) is entry
+    assert cache.get("k", now=111.0) is None
+    assert len(cache) == 0
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats["evictions"] == 1
+
+
+def test_version_change_invalidates():
+    cache = ResponseCache(version_check_interval=5)
+    cache.put("k", {"x": 1})
+    cache.observe_version(0, now=0.0)
+    assert cache.get("k") is not None
+    assert not cache.version_due(now=4.0) and cache.version_due(now=5.0)
+
+    cache.observe_version(1, now=5.0)
+    assert cache.get("k") is None
+    # A body rendered under the old version is not stored
+    cache.put("k", {"x": 1}, version=0)
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("header, match", [
+    (None, False), ('"abc"', True), ('W/"abc"', True), ('"zzz", "abc"', True), ("*", True), ('"zzz"', False),
+])
+def test_etag_matches(header, match):
+    assert etag_matches(header, '"abc"') is match
+
+
+def test_bump_data_version_upserts_counter():
+    db = MagicMock()
+    bump_data_version(db)
+    db.__getitem__.assert_called_with(DATA_VERSION_COLLECTION)
+    filter_, update = db.__getitem__.return_value.update_one.call_args[0]
+    assert filter_ == {"_id": EVENTS_VERSION_ID}
+    assert update["$inc"] == {"version": 1}
+    assert db.__getitem__.return_value.update_one.call_args[1] == {"upsert": True}
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+def make_request(headers=()):
+    return Request({
+        "type": "http", "method": "GET", "path": "/api/upcoming", "query_string": b"days=7",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "server": ("testserver", 80), "scheme": "http", "root_path": "",
+    })
+
+
+def test_upcoming_served_from_cache_with_etag(monkeypatch):
+    from database import api_server
+
+    doc = {"_id": "65f0c0ffee0000000000abcd", "url": "u", "title": "t", "venue": "Pacha",
+           "date": None, "qualityScore": 0.9, "status": None}
+    version = {"version": 3}
+    db = MagicMock()
+    db.__getitem__.return_value.find.return_value = FakeCursor([doc])
+    db.__getitem__.return_value.find_one = AsyncMock(side_effect=lambda *a, **k: version)
+    monkeypatch.setattr(api_server, "db", db)
+    monkeypatch.setattr(api_server, "response_cache", ResponseCache(version_check_interval=0))
+
+    def call(headers=()):
+        return asyncio.run(api_server.get_upcoming_events(make_request(headers), days=7, min_quality=0.75, limit=20))
+
+    first = call()
+    assert json.loads(first.body)[0]["venue"] == "Pacha"
+    etag = first.headers["ETag"]
+
+    second = call([("if-none-match", etag)])
+    assert second.status_code == 304 and second.headers["ETag"] == etag
+    assert db.__getitem__.return_value.find.call_count == 1
+
+    version["version"] = 4  # a scrape run wrote
+    call([("if-none-match", etag)])
+    assert db.__getitem__.return_value.find.call_count == 2
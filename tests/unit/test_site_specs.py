@@ -0,0 +1,116 @@
+import pytest
+import json
+import os
+import sys
+
+from bs4 import BeautifulSoup
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from parse_components.site_specs import (
+    SiteExtractor,
+    compile_spec,
+    css_to_xpath,
+    get_site_extractor,
+    load_spec,
+)
+from parse_components.extraction_engine import parse_document
+
+SPOTLIGHT_PAGE = """<html><body>
+<nav><h1>Ibiza Spotlight</h1></nav>
+<main><h1>Glitterbox <b>Closing</b></h1></main>
+<div class="promoter-info"><a href="/night/clubs/hi">Hï Ibiza</a></div>
+<time datetime="2025-10-04T23:00:00">Sat 4 Oct</time>
+<div class="event-info"><span class="time">23:00 - 06:00</span></div>
+<div class="buy-tickets"><span class="price">From 60 EUR</span></div>
+<div id="lineup"><ul><li>Purple Disco Machine</li><li> </li><li>Honey Dijon</li></ul></div>
+<section id="description"><p>Closing party.</p><p>Doors 23:00.</p></section>
+<div class="event-tags"><a>House</a><span class="tag-item">Disco</span></div>
+</body></html>"""
+
+CSS_CASES = [
+    "h1",
+    "main h1",
+    "div > a",
+    ".buy-tickets .price",
+    "a[href*='/night/clubs/'], .venue-name-class",
+    "[class*='event']",
+    "a[href^='/night']",
+    "a[href$='hi']",
+    "#lineup li",
+    "span.time",
+]
+
+
+@pytest.mark.parametrize("selector", CSS_CASES)
+def test_css_translation_matches_beautifulsoup(selector):
+    soup = BeautifulSoup(SPOTLIGHT_PAGE, "html.parser")
+    expected = [el.get_text(strip=True) for el in soup.select(selector)]
+    root = parse_document(SPOTLIGHT_PAGE)
+    actual = ["".join(t.strip() for t in el.itertext()) for el in root.xpath(css_to_xpath(selector))]
+    assert actual == expected
+
+
+def test_spotlight_event_spec():
+    fields = get_site_extractor("ibiza-spotlight-event").extract(SPOTLIGHT_PAGE)
+    assert fields["title"] == "GlitterboxClosing"  # main h1 beats the earlier nav h1
+    assert fields["venue"] == "Hï Ibiza"
+    assert fields["date_text"] == "2025-10-04T23:00:00"
+    assert (fields["start_time"].hour, fields["end_time"].hour) == (23, 6)
+    assert fields["price_value"] == 60.0 and fields["currency"] == "EUR"
+    assert fields["lineup"] == ["Purple Disco Machine", "Honey Dijon"]
+    assert fields["description"] == "Closing party.\nDoors 23:00."
+    assert fields["categories"] == ["House", "Disco"]
+
+
+def test_fallback_selectors_and_max_length():
+    fields = get_site_extractor("ibiza-spotlight-basic").extract(
+        "<h1>Party</h1><h1>Defected presents Eden</h1><p>" + "x" * 800 + "</p>"
+    )
+    assert fields == {"title": "Defected presents Eden", "description": "x" * 500}
+
+
+def test_card_spec_resolves_urls_and_prices():
+    card = ('<div class="card-ticket"><h3 class="h3"><a class="trackEventSpotlight" href="/night/events/x">'
+            'Eden</a></h3><time>23:30</time><span class="ticket-price">€45</span>'
+            '<div class="partyDj"><a>A</a><a>B</a></div></div>')
+    fields = get_site_extractor("ibiza-spotlight-card").extract(card, base_url="https://www.ibiza-spotlight.com")
+    assert fields["url"] == "https://www.ibiza-spotlight.com/night/events/x"
+    assert fields["start_time"].minute == 30
+    assert fields["price"] == 45.0
+    assert fields["djs"] == ["A", "B"]
+
+
+def test_required_field_missing_returns_none():
+    assert get_site_extractor("ticketsibiza-event").extract("<h1>Not an entry title</h1>") is None
+
+
+def test_identical_specs_share_one_compiled_extractor():
+    spec = {"site": "demo", "fields": {"title": ["h1"]}}
+    first = compile_spec(spec)
+    assert compile_spec(json.loads(json.dumps(spec))) is first
+    assert compile_spec({"site": "demo", "fields": {"title": ["h2"]}}) is not first
+
+
+def test_json_spec_files_load(tmp_path):
+    path = tmp_path / "demo.json"
+    path.write_text(json.dumps({"site": "demo", "fields": {"name": {"selectors": ["b"], "post": ["lower"]}}}))
+    extractor = get_site_extractor(str(path))
+    assert isinstance(extractor, SiteExtractor)
+    assert extractor.extract("<b>LOUD</b>") == {"name": "loud"}
+    assert load_spec(str(path)) is load_spec(str(path))
+
+
+@pytest.mark.parametrize("spec", [
+    {"fields": {}},
+    {"fields": {"a": {"selectors": ["div ~ p"]}}},
+    {"fields": {"a": {"selectors": ["h1"], "post": ["nope"]}}},
+    {"fields": {"a": {"selectors": ["h1"], "colour": "red"}}},
+    {"fields": {"a": {"from": "missing"}}},
+    {"fields": {"a": ["h1"]}, "required": ["b"]},
+    {"fields": {"a": [{"xpath": "//h1["}]}},
+])
+def test_invalid_specs_rejected_at_compile_time(spec):
+    with pytest.raises(ValueError):
+        compile_spec(spec)
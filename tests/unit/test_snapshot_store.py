@@ -0,0 +1,145 @@
+import pytest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from scraping_components.snapshot_store import (
+    DEFLATE,
+    SnapshotStore,
+    build_zlib_dictionary,
+    main,
+    snapshot_digest,
+    store_debug_snapshot,
+)
+from scraping_components import snapshot_store
+
+
+def page(i):
+    return ("<html><head><title>Event %d</title>\n"
+            "<link rel=\"stylesheet\" href=\"/wp-content/themes/ibiza/style.css\">\n"
+            "<script src=\"/wp-includes/js/jquery/jquery.min.js\"></script>\n"
+            "</head><body><header class=\"site-header\"><nav class=\"main-navigation\">\n"
+            "<ul><li><a href=\"/events\">Events</a></li><li><a href=\"/venues\">Venues</a></li></ul>\n"
+            "</nav></header><main><h1>Party night %d</h1><p>Lineup for night %d</p></main>\n"
+            "<footer class=\"site-footer\">Tickets Ibiza - All rights reserved</footer></body></html>\n"
+            % (i, i, i))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(tmp_path, codec=DEFLATE, train_after=None)
+
+
+def test_round_trip_and_dedup(store):
+    digest = store.put(page(1), url="https://x/1")
+    assert digest == snapshot_digest(page(1))
+    assert store.put(page(1), url="https://x/1") == digest
+    assert store.get(digest) == page(1)
+    assert digest in store
+    assert list(store.digests()) == [digest]
+    assert store.stats["stored"] == 1 and store.stats["deduplicated"] == 1
+
+
+def test_missing_digest_raises_key_error(store):
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_latest_by_url_follows_manifest(store):
+    store.put(page(1), url="https://x/e")
+    newer = store.put(page(2), url="https://x/e")
+    store.put(page(3))
+    assert store.latest_by_url() == {"https://x/e": newer}
+    assert [entry["url"] for entry in store.iter_manifest()] == ["https://x/e", "https://x/e"]
+
+
+def test_dictionary_shrinks_pages_and_keeps_old_objects_readable(tmp_path):
+    store = SnapshotStore(tmp_path, codec=DEFLATE, train_after=10)
+    old = [store.put(page(i)) for i in range(10)]
+    assert store._current_dict is not None
+
+    plain_size = store._object_path(old[0]).stat().st_size
+    new = store.put(page(100))
+    assert store._object_path(new).stat().st_size < plain_size
+    assert [store.get(d) for d in old] == [page(i) for i in range(10)]
+
+    # A fresh store picks up the current dictionary from disk
+    reopened = SnapshotStore(tmp_path, codec=DEFLATE, train_after=None)
+    assert reopened._current_dict == store._current_dict
+    assert reopened.get(new) == page(100)
+
+
+def test_concurrent_puts_train_the_dictionary_once(tmp_path):
+    import threading
+
+    store = SnapshotStore(tmp_path, codec=DEFLATE, train_after=8)
+    for i in range(7):
+        store.put(page(i))
+    trainings = []
+    real_train = store.train_dictionary
+
+    def slow_train():
+        trainings.append(1)
+        # Another put() crossing the threshold meanwhile must not train again
+        store.put(page(50))
+        return real_train()
+
+    with patch.object(store, "train_dictionary", side_effect=slow_train):
+        threads = [threading.Thread(target=store.put, args=(page(i),)) for i in (100, 101)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert trainings == [1]
+    assert store._current_dict is not None
+
+
+def test_debug_snapshots_reuse_one_store(tmp_path):
+    with patch.object(snapshot_store, "_shared_store", SnapshotStore(tmp_path, codec=DEFLATE, train_after=None)), \
+         patch.object(snapshot_store, "SnapshotStore") as constructor:
+        first = store_debug_snapshot(page(1), "https://x/1", "test")
+        store_debug_snapshot(page(2), "https://x/2", "test")
+        assert snapshot_store.get_shared_store().get(first) == page(1)
+    constructor.assert_not_called()
+
+
+def test_build_zlib_dictionary_keeps_common_lines_within_size():
+    samples = [page(i).encode() for i in range(8)]
+    dictionary = build_zlib_dictionary(samples, size=200)
+    assert len(dictionary) <= 200
+    assert b"Party night" not in dictionary
+
+
+def test_too_few_pages_to_train(store):
+    store.put(page(1))
+    assert store.train_dictionary() is None
+
+
+def test_cli_show_by_url(tmp_path, capsys):
+    store = SnapshotStore(tmp_path, codec=DEFLATE, train_after=None)
+    store.put(page(1), url="https://x/1")
+    assert main(["--root", str(tmp_path), "show", "https://x/1"]) == 0
+    assert "Party night 1" in capsys.readouterr().out
+    assert main(["--root", str(tmp_path), "show", "https://x/missing"]) == 1
+
+
+def test_migration_moves_html_out_of_events(store):
+    from database.data_migration import DataMigration
+    with patch("database.data_migration.MongoClient"):
+        migration = DataMigration()
+    migration.db = MagicMock()
+    migration.db.events.find.return_value = [
+        {"_id": 1, "url": "https://x/1", "html": page(1)},
+        {"_id": 2, "url": "https://x/2", "html": page(1)},
+    ]
+
+    assert migration.move_html_to_snapshots(store, batch_size=10) == 2
+    [ops] = [call[0][0] for call in migration.db.__getitem__.return_value.bulk_write.call_args_list]
+    digest = snapshot_digest(page(1))
+    assert [op._doc for op in ops] == [
+        {"$set": {"htmlSnapshot": digest}, "$unset": {"html": ""}}
+    ] * 2
+    assert store.stats["stored"] == 1
@@ -0,0 +1,114 @@
+import pytest
+import asyncio
+import os
+import re
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+# Add project root to sys.path to allow direct imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from starlette.requests import Request
+
+from database.response_cache import ResponseCache
+from database.venue_registry import (
+    VENUE_KEY_FIELD,
+    VenueRegistry,
+    annotate_venue_key,
+    backfill_venue_keys,
+    normalize_venue,
+)
+
+
+@pytest.mark.parametrize("name, slug", [
+    ("Hï Ibiza", "hi-ibiza"),
+    ("  HI  IBIZA ", "hi-ibiza"),
+    ("Ushuaïa", "ushuaia"),
+    ("DC-10", "dc-10"),
+    ("", ""),
+    (None, ""),
+])
+def test_normalize_venue(name, slug):
+    assert normalize_venue(name) == slug
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Hï Ibiza", "hi-ibiza"),
+    ("Hi Ibiza", "hi-ibiza"),
+    ("DC 10", "dc10"),
+    ("Ushuaïa Ibiza Beach Hotel", "ushuaia"),
+    ("Cova Santa", "cova-santa"),
+    ("   ", None),
+])
+def test_key_for_resolves_aliases(name, key):
+    assert VenueRegistry().key_for(name) == key
+
+
+def test_lookup_exact_or_anchored_prefix():
+    registry = VenueRegistry()
+    assert registry.lookup("hi ibiza") == "hi-ibiza"
+    assert registry.lookup("") is None
+
+    prefix = registry.lookup("ushuaia ib")
+    assert prefix["$in"][:-1] == ["ushuaia"]
+    pattern = prefix["$in"][-1]
+    assert pattern.pattern == "^" + re.escape("ushuaia-ib") and not pattern.flags & re.IGNORECASE
+
+    # Regex metacharacters in user input cannot widen the match
+    assert registry.lookup("a.*")["$in"][-1].pattern == "^a"
+
+
+def test_annotate_venue_key():
+    event = {"location": {"venue": "Hi Ibiza"}}
+    assert annotate_venue_key(event) == "hi-ibiza"
+    assert event["location"]["venueKey"] == "hi-ibiza"
+    assert annotate_venue_key({"location": None}) is None
+
+
+def test_backfill_updates_only_changed_keys():
+    db = MagicMock()
+    db.events.find.return_value = [
+        {"_id": 1, "location": {"venue": "Hï Ibiza"}},
+        {"_id": 2, "location": {"venue": "Pacha", "venueKey": "pacha"}},
+        {"_id": 3, "location": {"venue": "DC-10", "venueKey": "dc-10"}},
+    ]
+    assert backfill_venue_keys(db, batch_size=1) == 2
+    written = [call[0][0][0] for call in db.events.bulk_write.call_args_list]
+    assert [(op._filter["_id"], op._doc["$set"][VENUE_KEY_FIELD]) for op in written] == [
+        (1, "hi-ibiza"), (3, "dc10")
+    ]
+
+
+class FakeCursor:
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        return []
+
+
+def test_api_filters_on_indexed_venue_key(monkeypatch):
+    from fastapi import HTTPException
+    from database import api_server
+
+    db = MagicMock()
+    db.__getitem__.return_value.find.return_value = FakeCursor()
+    db.__getitem__.return_value.find_one = AsyncMock(return_value=None)
+    monkeypatch.setattr(api_server, "db", db)
+    monkeypatch.setattr(api_server, "response_cache", ResponseCache())
+    request = Request({
+        "type": "http", "method": "GET", "path": "/api/venues/Hi%20Ibiza/events", "query_string": b"",
+        "headers": [], "server": ("testserver", 80), "scheme": "http", "root_path": "",
+    })
+
+    asyncio.run(api_server.get_venue_events("Hï Ibiza", request, api_server.Response(),
+                                            future_only=False, limit=10, cursor=None))
+    query = db.__getitem__.return_value.find.call_args[0][0]
+    assert query == {VENUE_KEY_FIELD: "hi-ibiza"}
+
+    with pytest.raises(HTTPException):
+        asyncio.run(api_server.get_venue_events("  ", request, api_server.Response(),
+                                                future_only=False, limit=10, cursor=None))